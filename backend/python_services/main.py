@@ -9,27 +9,47 @@ import os
 import sys
 import uuid
 import json
+import time
 import asyncio
+import secrets
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Literal
 from datetime import datetime
 import uvicorn
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 
+from shared.jobstore import (create_job_store, DEFAULT_PAGE_SIZE, DEFAULT_TTL_SECONDS, STATUS_CANCELLED,
+                             STATUS_COMPLETED, STATUS_FAILED, STATUS_PROCESSING, STATUS_QUEUED,
+                             UNFINISHED_STATUSES)
+from shared.jobscheduler import JobScheduler, DEFAULT_JOBS_PER_WORKER, DEFAULT_WORKERS
+from shared.jobevents import JobEventHub
+from shared.metrics import HistogramMetric, StageMetrics, render_counters
+
 # Import service modules
 try:
     from services.assetanalysis import videoanalyzer
+    from services.assetanalysis.transcriptcache import CACHE_DIR_NAME, get_transcript_cache
+    from services.assetanalysis.transcriptionclient import WEBHOOK_AUTH_HEADER
+    from services.assetanalysis.analysisjobs import notify_transcript, run_analysis_job
 except ImportError as e:
     print(f"Warning: Could not import asset analysis services: {e}")
+    get_transcript_cache = None
+    run_analysis_job = None
 
 try:
     from services.ai_services.chatbot_backend import ChatbotBackend, list_conversations
+    from services.ai_services.claudeclient import close_client_pool
+    from services.ai_services.promptcache import USAGE_FIELDS, prompt_cache_stats
+    from services.ai_services.toolcalling.toolcaller import tool_caller
 except ImportError as e:
     print(f"Warning: Could not import chatbot services: {e}")
     ChatbotBackend = None
+    close_client_pool = None
+    prompt_cache_stats = None
+    tool_caller = None
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -49,12 +69,57 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global job tracking dictionary
-analysis_jobs: Dict[str, Dict[str, Any]] = {}
+# Analysis jobs persist in SQLite (WAL) so restarts and --reload keep them;
+# ANALYSIS_JOB_STORE=memory keeps them in memory instead
+job_store = create_job_store(
+    os.getenv("ANALYSIS_JOB_STORE", "sqlite"),
+    os.getenv("ANALYSIS_JOB_DB") or Path(__file__).parent / "data" / "analysis_jobs.db"
+)
+JOB_PURGE_INTERVAL_SECONDS = 3600
 
 # Global chatbot instances tracking
 chatbot_instances: Dict[str, Any] = {}  # Use Any instead of ChatbotBackend to avoid linter error
 
+# Analysis jobs run in a pool of worker processes (created on startup); this process
+# only enqueues them and reads their status from the job store
+job_scheduler: Optional[JobScheduler] = None
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", str(DEFAULT_WORKERS)))
+ANALYSIS_JOBS_PER_WORKER = int(os.getenv("ANALYSIS_JOBS_PER_WORKER", str(DEFAULT_JOBS_PER_WORKER)))
+# Jobs that may probe/extract audio, and upload/transcribe it, at once across all workers
+ANALYSIS_MAX_EXTRACTIONS = int(os.getenv("ANALYSIS_MAX_EXTRACTIONS", "4"))
+ANALYSIS_MAX_TRANSCRIPTIONS = int(os.getenv("ANALYSIS_MAX_TRANSCRIPTIONS", "16"))
+
+# Optional AssemblyAI completion webhooks. ASSEMBLYAI_WEBHOOK_URL must be the public URL of
+# POST /analysis/webhooks/assemblyai; without it, transcripts are only polled.
+ASSEMBLYAI_WEBHOOK_URL = os.getenv("ASSEMBLYAI_WEBHOOK_URL")
+ASSEMBLYAI_WEBHOOK_SECRET = os.getenv("ASSEMBLYAI_WEBHOOK_SECRET") or secrets.token_urlsafe(32)
+# Spawned analysis workers read the secret from the environment
+os.environ["ASSEMBLYAI_WEBHOOK_SECRET"] = ASSEMBLYAI_WEBHOOK_SECRET
+
+# Progress events for GET /analysis/status/{job_id}/events: the scheduler publishes every
+# job store change once, and each job's broadcaster fans it out to that job's subscribers
+job_events = JobEventHub()
+JOB_EVENT_FIELDS = ("status", "stage", "percent", "bytes_sent", "total_bytes", "assemblyai_status",
+                    "transcript_id", "message", "progress", "worker", "error", "output_file", "completed_at")
+JOB_EVENT_KEEPALIVE_SECONDS = 15
+
+# Histograms of the stage timings of jobs finished since the server started, for GET /metrics
+stage_metrics = StageMetrics()
+chatbot_ttft_metric = HistogramMetric("chatbot_time_to_first_token_seconds",
+                                      "Time from sending a chatbot message to its first streamed token")
+
+def on_job_update(job_id: str, fields: Dict[str, Any]) -> None:
+    """Scheduler update hook: push progress events and record finished jobs' stage timings"""
+    job_events.publish(job_id, fields)
+    if fields.get("status") in (STATUS_COMPLETED, STATUS_FAILED):
+        stage_metrics.observe_job(fields["status"], fields.get("stages"))
+
+def get_job_scheduler() -> JobScheduler:
+    """Return the running job scheduler, or raise 503 if analysis jobs cannot run"""
+    if job_scheduler is None:
+        raise HTTPException(status_code=503, detail="Asset analysis workers not available")
+    return job_scheduler
+
 # Request/Response models for Asset Analysis
 class AnalysisJobRequest(BaseModel):
     video_path: str
@@ -62,6 +127,43 @@ class AnalysisJobRequest(BaseModel):
     brief_path: Optional[str] = None
     custom_spell: Optional[List[Dict[str, Any]]] = None
     silence_threshold_ms: int = 1000
+    # "pipelined" uploads audio while it is being encoded instead of after extraction
+    pipeline_mode: Literal["sequential", "pipelined"] = "sequential"
+    # Also write a memory-mappable .transcript.cols file
+    columnar: bool = False
+    # Higher priority jobs are dispatched to the analysis workers first
+    priority: int = 0
+
+class AnalysisBatchRequest(BaseModel):
+    video_paths: List[str]
+    brief_path: Optional[str] = None
+    custom_spell: Optional[List[Dict[str, Any]]] = None
+    silence_threshold_ms: int = 1000
+    columnar: bool = False
+    priority: int = 0
+    # Optional limits for this batch's jobs, within the server-wide ANALYSIS_MAX_* limits
+    max_extractions: Optional[int] = None
+    max_transcriptions: Optional[int] = None
+
+class AnalysisBatchResponse(BaseModel):
+    batch_id: str
+    status: str
+    message: str
+    job_ids: List[str]
+    created_at: str
+
+class AnalysisReprocessRequest(BaseModel):
+    # Either the .transcript.json to reprocess or the video it was analyzed from
+    transcript_path: Optional[str] = None
+    video_path: Optional[str] = None
+    output_path: Optional[str] = None
+    brief_path: Optional[str] = None
+    silence_threshold_ms: int = 1000
+
+class AnalysisReprocessResponse(BaseModel):
+    output_file: str
+    elapsed_ms: float
+    result: Dict[str, Any]
 
 class AnalysisJobResponse(BaseModel):
     job_id: str
@@ -72,7 +174,7 @@ class AnalysisJobResponse(BaseModel):
 
 class AnalysisStatusResponse(BaseModel):
     job_id: str
-    status: str  # "queued", "processing", "completed", "failed"
+    status: str  # "queued", "processing", "completed", "failed", "cancelled"
     message: str
     progress: Optional[str] = None
     created_at: str
@@ -80,6 +182,15 @@ class AnalysisStatusResponse(BaseModel):
     result: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
     output_file: Optional[str] = None
+    batch_id: Optional[str] = None
+    priority: int = 0
+    worker: Optional[int] = None
+    # Structured progress: VideoAnalyzer stage, overall percent and AssemblyAI's transcript status
+    stage: Optional[str] = None
+    percent: Optional[float] = None
+    assemblyai_status: Optional[str] = None
+    # Per-stage wall time, CPU time, bytes in/out and peak memory (see services/assetanalysis/stagetrace.py)
+    stages: Optional[List[Dict[str, Any]]] = None
 
 # Request/Response models for Chatbot
 class ChatbotCreateRequest(BaseModel):
@@ -123,6 +234,9 @@ class ChatbotMessageResponse(BaseModel):
     conversation_id: str
     message_count: int
     error: Optional[str] = None
+    time_to_first_token_ms: Optional[float] = None
+    duration_ms: Optional[float] = None
+    usage: Optional[Dict[str, int]] = None
 
 class ChatbotConversationInfo(BaseModel):
     conversation_id: str
@@ -188,7 +302,10 @@ async def list_services():
             name="Asset Analysis", 
             description="Video analysis and transcription services",
             status="available",
-            endpoints=["/analysis/start", "/analysis/status/{job_id}", "/analysis/jobs"]
+            endpoints=["/analysis/start", "/analysis/batch", "/analysis/batch/{batch_id}",
+                       "/analysis/status/{job_id}", "/analysis/status/{job_id}/events", "/analysis/jobs", "/analysis/jobs/{job_id}/cancel",
+                       "/analysis/workers", "/metrics", "/analysis/reprocess", "/analysis/webhooks/assemblyai",
+                       "/analysis/cache/stats"]
         )
     ]
     
@@ -222,13 +339,14 @@ async def asset_analysis_status():
     return {"status": "Asset analysis services available", "services": ["video_analyzer", "transcription"]}
 
 @app.post("/analysis/start", response_model=AnalysisJobResponse)
-async def start_analysis(request: AnalysisJobRequest, background_tasks: BackgroundTasks):
+async def start_analysis(request: AnalysisJobRequest):
     """
     Start a new video analysis job
     
     This endpoint accepts a video file path and analysis parameters,
-    creates a job ID, and starts processing in the background.
+    creates a job ID, and queues it for the analysis workers.
     """
+    scheduler = get_job_scheduler()
     try:
         # Normalize the video path for Windows compatibility
         normalized_video_path = os.path.normpath(request.video_path)
@@ -260,6 +378,9 @@ async def start_analysis(request: AnalysisJobRequest, background_tasks: Backgrou
             "brief_path": request.brief_path,
             "custom_spell": request.custom_spell,
             "silence_threshold_ms": request.silence_threshold_ms,
+            "pipeline_mode": request.pipeline_mode,
+            "columnar": request.columnar,
+            "priority": request.priority,
             "created_at": datetime.now().isoformat(),
             "completed_at": None,
             "result": None,
@@ -268,11 +389,11 @@ async def start_analysis(request: AnalysisJobRequest, background_tasks: Backgrou
             "progress": "Job queued for processing"
         }
         
-        # Store job in global tracking
-        analysis_jobs[job_id] = job_data
+        # Store job in the job store
+        job_store.create(job_data)
         
-        # Start background processing
-        background_tasks.add_task(process_analysis_job, job_id)
+        # Queue for the analysis workers
+        scheduler.submit(job_id, request.priority)
         
         return AnalysisJobResponse(
             job_id=job_id,
@@ -287,6 +408,114 @@ async def start_analysis(request: AnalysisJobRequest, background_tasks: Backgrou
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create analysis job: {str(e)}")
 
+@app.post("/analysis/batch", response_model=AnalysisBatchResponse)
+async def start_analysis_batch(request: AnalysisBatchRequest):
+    """
+    Start analysis of many video files as one batch
+    
+    Creates one job per file (sharing a batch_id) and queues them all with the
+    batch's priority; the analysis workers run them concurrently, with at most
+    max_extractions of them extracting audio and max_transcriptions uploading
+    or transcribing at once.
+    """
+    scheduler = get_job_scheduler()
+    if not request.video_paths:
+        raise HTTPException(status_code=400, detail="video_paths is empty")
+    
+    video_paths = [os.path.normpath(path) for path in request.video_paths]
+    missing = [path for path in video_paths if not os.path.isfile(path)]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Video files not found: {', '.join(missing)}")
+    if len(set(video_paths)) != len(video_paths):
+        raise HTTPException(status_code=400, detail="video_paths contains duplicates")
+    if request.brief_path and not os.path.isfile(request.brief_path):
+        raise HTTPException(status_code=400, detail=f"Brief file not found: {request.brief_path}")
+    stage_limits = {stage: limit for stage, limit in (("extract", request.max_extractions),
+                                                      ("transcribe", request.max_transcriptions))
+                    if limit is not None}
+    if any(limit < 1 for limit in stage_limits.values()):
+        raise HTTPException(status_code=400, detail="max_extractions and max_transcriptions must be at least 1")
+    
+    batch_id = str(uuid.uuid4())
+    created_at = datetime.now().isoformat()
+    # Same-named files from different folders get distinct transcript files
+    output_stems = videoanalyzer.transcript_stems(video_paths)
+    job_ids = []
+    for video_path in video_paths:
+        job_id = str(uuid.uuid4())
+        job_store.create({
+            "job_id": job_id,
+            "batch_id": batch_id,
+            "status": "queued",
+            "message": "Analysis job created and queued for processing",
+            "video_path": video_path,
+            "output_path": None,
+            "brief_path": request.brief_path,
+            "custom_spell": request.custom_spell,
+            "silence_threshold_ms": request.silence_threshold_ms,
+            "pipeline_mode": "sequential",
+            "columnar": request.columnar,
+            "priority": request.priority,
+            "stage_limits": stage_limits,
+            "output_stem": output_stems[video_path],
+            "created_at": created_at,
+            "completed_at": None,
+            "result": None,
+            "error": None,
+            "output_file": None,
+            "progress": "Job queued for processing"
+        })
+        job_ids.append(job_id)
+    
+    for job_id in job_ids:
+        scheduler.submit(job_id, request.priority)
+    
+    return AnalysisBatchResponse(
+        batch_id=batch_id,
+        status="queued",
+        message=f"Batch of {len(job_ids)} analysis jobs queued for processing",
+        job_ids=job_ids,
+        created_at=created_at
+    )
+
+@app.get("/analysis/batch/{batch_id}")
+async def get_analysis_batch_status(batch_id: str):
+    """
+    Get aggregate progress of a batch plus the status of each of its jobs
+    """
+    jobs, total = job_store.list(batch_id=batch_id, limit=None)
+    if not total:
+        raise HTTPException(status_code=404, detail=f"Batch {batch_id} not found")
+    
+    jobs.sort(key=lambda job: job["created_at"])
+    counts = {status: 0 for status in (STATUS_QUEUED, STATUS_PROCESSING, STATUS_COMPLETED, STATUS_FAILED,
+                                       STATUS_CANCELLED)}
+    for job in jobs:
+        counts[job["status"]] = counts.get(job["status"], 0) + 1
+    finished = total - counts[STATUS_QUEUED] - counts[STATUS_PROCESSING]
+    if finished == total:
+        status = "completed"
+    else:
+        status = STATUS_PROCESSING if finished or counts[STATUS_PROCESSING] else STATUS_QUEUED
+    
+    return {
+        "batch_id": batch_id,
+        "status": status,
+        "total": total,
+        "counts": counts,
+        "percent": round(100 * finished / total, 1),
+        "created_at": jobs[0]["created_at"],
+        "completed_at": max(job["completed_at"] for job in jobs) if finished == total else None,
+        "jobs": [{
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "video_path": job["video_path"],
+            "progress": job.get("progress"),
+            "output_file": job.get("output_file"),
+            "error": job.get("error")
+        } for job in jobs]
+    }
+
 @app.get("/analysis/status/{job_id}", response_model=AnalysisStatusResponse)
 async def get_analysis_status(job_id: str):
     """
@@ -294,11 +523,10 @@ async def get_analysis_status(job_id: str):
     
     Returns current status, progress information, and results if completed.
     """
-    if job_id not in analysis_jobs:
+    job_data = job_store.get(job_id)
+    if job_data is None:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
     
-    job_data = analysis_jobs[job_id]
-    
     return AnalysisStatusResponse(
         job_id=job_data["job_id"],
         status=job_data["status"],
@@ -308,51 +536,250 @@ async def get_analysis_status(job_id: str):
         completed_at=job_data.get("completed_at"),
         result=job_data.get("result"),
         error=job_data.get("error"),
-        output_file=job_data.get("output_file")
+        output_file=job_data.get("output_file"),
+        batch_id=job_data.get("batch_id"),
+        priority=job_data.get("priority", 0),
+        worker=job_data.get("worker") if job_data["status"] == STATUS_PROCESSING else None,
+        stage=job_data.get("stage"),
+        percent=job_data.get("percent"),
+        assemblyai_status=job_data.get("assemblyai_status"),
+        stages=job_data.get("stages")
+    )
+
+@app.get("/analysis/status/{job_id}/events")
+async def stream_analysis_events(job_id: str):
+    """
+    Stream a job's progress as server-sent events instead of polling its status
+    
+    Each event is a "progress" message with the job's current status, stage,
+    percent, bytes uploaded and AssemblyAI status; the stream starts with the
+    current state and ends with a "done" message once the job has finished
+    (fetch GET /analysis/status/{job_id} for the result).
+    """
+    # Subscribe before reading the job so no change between the two is missed
+    queue = job_events.subscribe(job_id)
+    job_data = job_store.get(job_id)
+    if job_data is None:
+        job_events.unsubscribe(job_id, queue)
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    
+    def event(event_type: str, state: Dict[str, Any]) -> str:
+        return f"data: {json.dumps({'type': event_type, 'job_id': job_id, **state})}\n\n"
+    
+    async def generate_events():
+        try:
+            state = {field: job_data.get(field) for field in JOB_EVENT_FIELDS}
+            yield event("progress", state)
+            while state["status"] in UNFINISHED_STATUSES:
+                try:
+                    fields = await asyncio.wait_for(queue.get(), JOB_EVENT_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                changes = {field: fields[field] for field in JOB_EVENT_FIELDS if field in fields}
+                if changes:
+                    state.update(changes)
+                    yield event("progress", state)
+            yield event("done", state)
+        finally:
+            job_events.unsubscribe(job_id, queue)
+    
+    return StreamingResponse(
+        generate_events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"
+        }
     )
 
 @app.get("/analysis/jobs")
-async def list_analysis_jobs():
+async def list_analysis_jobs(status: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, offset: int = 0):
     """
-    List all analysis jobs with their current status
+    List analysis jobs with their current status, newest first
     
-    Returns a summary of all jobs in the system.
+    Optionally filtered by status; paginated with limit (1-500) and offset.
     """
-    jobs_summary = []
-    for job_id, job_data in analysis_jobs.items():
-        jobs_summary.append({
-            "job_id": job_id,
-            "status": job_data["status"],
-            "video_path": job_data["video_path"],
-            "created_at": job_data["created_at"],
-            "completed_at": job_data.get("completed_at")
-        })
+    if not 1 <= limit <= 500 or offset < 0:
+        raise HTTPException(status_code=400, detail="limit must be 1-500 and offset non-negative")
+    
+    jobs, total = job_store.list(status=status, limit=limit, offset=offset)
+    jobs_summary = [{
+        "job_id": job_data["job_id"],
+        "status": job_data["status"],
+        "video_path": job_data["video_path"],
+        "created_at": job_data["created_at"],
+        "completed_at": job_data.get("completed_at"),
+        "batch_id": job_data.get("batch_id")
+    } for job_data in jobs]
     
     return {
-        "total_jobs": len(analysis_jobs),
+        "total_jobs": total,
+        "limit": limit,
+        "offset": offset,
         "jobs": jobs_summary
     }
 
+@app.get("/analysis/cache/stats")
+async def get_transcript_cache_stats():
+    """
+    Get transcript cache statistics
+    
+    Returns entry count and size on disk, the size limit, and hit/miss/eviction
+    counters for this server process.
+    """
+    if get_transcript_cache is None:
+        raise HTTPException(status_code=503, detail="Asset analysis services not available")
+    
+    cache = get_transcript_cache(Path(__file__).parent / "data" / "analyzed" / CACHE_DIR_NAME)
+    return cache.stats()
+
+@app.post("/analysis/webhooks/assemblyai")
+async def assemblyai_webhook(request: Request):
+    """
+    AssemblyAI transcript completion webhook
+    
+    Only used when ASSEMBLYAI_WEBHOOK_URL points here. The callback only says that a
+    transcript finished; the transcription client then fetches it immediately instead
+    of waiting for its next (slow, fallback) poll. The notification is forwarded to
+    every analysis worker.
+    """
+    if not ASSEMBLYAI_WEBHOOK_URL:
+        raise HTTPException(status_code=404, detail="AssemblyAI webhooks are not enabled")
+    if not secrets.compare_digest(request.headers.get(WEBHOOK_AUTH_HEADER, ""), ASSEMBLYAI_WEBHOOK_SECRET):
+        raise HTTPException(status_code=401, detail="Invalid webhook token")
+    
+    try:
+        payload = await request.json()
+        transcript_id = payload["transcript_id"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Expected a JSON body with transcript_id")
+    
+    # Whichever worker is waiting for the transcript fetches it
+    if job_scheduler is not None:
+        job_scheduler.broadcast(transcript_id)
+    return {"transcript_id": transcript_id, "status": payload.get("status"), "accepted": job_scheduler is not None}
+
+@app.post("/analysis/reprocess", response_model=AnalysisReprocessResponse)
+async def reprocess_analysis(request: AnalysisReprocessRequest):
+    """
+    Re-derive words and silence markers from a stored raw transcript
+    
+    Use this when only silence_threshold_ms or the brief's speaker mapping
+    changed; nothing is re-extracted, uploaded or transcribed.
+    """
+    if not request.transcript_path and not request.video_path:
+        raise HTTPException(status_code=400, detail="Provide transcript_path or video_path")
+    
+    try:
+        from services.assetanalysis.videoanalyzer import VideoAnalyzer
+        analyzer = VideoAnalyzer(brief_path=request.brief_path)
+        transcript_path = request.transcript_path or analyzer.default_output_path(request.video_path)
+        if not os.path.isfile(transcript_path):
+            raise HTTPException(status_code=404, detail=f"Transcript not found: {transcript_path}")
+        
+        started = time.perf_counter()
+        result = await asyncio.to_thread(
+            analyzer.reprocess,
+            transcript_path,
+            silence_threshold_ms=request.silence_threshold_ms,
+            output_path=request.output_path
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+    except HTTPException:
+        raise
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to reprocess transcript: {str(e)}")
+    
+    return AnalysisReprocessResponse(
+        output_file=request.output_path or transcript_path,
+        elapsed_ms=elapsed_ms,
+        result=result
+    )
+
+@app.post("/analysis/jobs/{job_id}/cancel")
+async def cancel_analysis_job(job_id: str):
+    """
+    Cancel a queued or processing analysis job
+    
+    A queued job is cancelled immediately; a processing job is stopped by its
+    worker, and its status turns to "cancelled" shortly after.
+    """
+    job_data = job_store.get(job_id)
+    if job_data is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    if job_data["status"] not in UNFINISHED_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Cannot cancel job in '{job_data['status']}' status")
+    
+    outcome = get_job_scheduler().cancel(job_id)
+    if outcome is None:
+        # Unfinished but unknown to the scheduler (e.g. just finishing): nothing left to stop
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is not queued or running")
+    return {"job_id": job_id, "status": outcome}
+
+@app.get("/metrics")
+async def get_metrics(format: Literal["prometheus", "json"] = "prometheus"):
+    """
+    Aggregate analysis stage metrics since the server started
+    
+    Histograms of wall time, CPU time, bytes in/out and peak memory per stage,
+    finished job counts, chatbot time to first token, DaVinci Resolve
+    scripting calls per chatbot tool and Claude API calls and tokens (uncached
+    input, prompt cache writes and reads, output) per kind of call; Prometheus
+    text format by default, or JSON.
+    """
+    resolve_calls = tool_caller.resolve_call_stats() if tool_caller is not None else {}
+    claude_usage = prompt_cache_stats.snapshot() if prompt_cache_stats is not None else {}
+    if format == "json":
+        return {**stage_metrics.snapshot(),
+                "chatbot_time_to_first_token_seconds": chatbot_ttft_metric.snapshot(),
+                "resolve_calls": resolve_calls,
+                "claude_usage": claude_usage}
+    claude_counters = "".join(
+        render_counters(f"claude_{field}_total", f"Claude API {field.replace('_', ' ')}, by kind of call", "call",
+                        {call: totals[field] for call, totals in claude_usage.items()})
+        for field in ("calls",) + USAGE_FIELDS
+    ) if claude_usage else ""
+    return PlainTextResponse(
+        stage_metrics.render_prometheus()
+        + chatbot_ttft_metric.render_prometheus()
+        + render_counters("chatbot_tool_invocations_total", "Chatbot tool invocations, by tool", "tool",
+                          {tool: stats["invocations"] for tool, stats in resolve_calls.items()})
+        + render_counters("resolve_api_calls_total", "DaVinci Resolve scripting calls, by chatbot tool", "tool",
+                          {tool: stats["resolve_calls"] for tool, stats in resolve_calls.items()})
+        + claude_counters,
+        media_type="text/plain; version=0.0.4"
+    )
+
+@app.get("/analysis/workers")
+async def get_analysis_workers():
+    """
+    Get the analysis worker pool: queue length, and each worker's process and running jobs
+    """
+    return get_job_scheduler().stats()
+
 @app.delete("/analysis/jobs/{job_id}")
 async def delete_analysis_job(job_id: str):
     """
-    Delete a completed or failed analysis job from tracking
+    Delete a completed, failed or cancelled analysis job from tracking
     
-    Note: This only removes the job from memory tracking, not the output files.
+    Note: This only removes the job from the job store, not the output files.
     """
-    if job_id not in analysis_jobs:
+    job_data = job_store.get(job_id)
+    if job_data is None:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
     
-    job_data = analysis_jobs[job_id]
-    
-    # Only allow deletion of completed or failed jobs
-    if job_data["status"] in ["processing", "queued"]:
+    # Only allow deletion of finished jobs
+    if job_data["status"] in UNFINISHED_STATUSES:
         raise HTTPException(
             status_code=400, 
             detail=f"Cannot delete job in '{job_data['status']}' status"
         )
     
-    del analysis_jobs[job_id]
+    job_store.delete(job_id)
     
     return {"message": f"Job {job_id} deleted successfully"}
 
@@ -687,16 +1114,21 @@ async def send_chatbot_message_sync(conversation_id: str, request: ChatbotMessag
         chatbot = chatbot_instances[conversation_id]
         
         # Send message to chatbot
-        result = chatbot.send_message(request.message)
+        result = await chatbot.send_message_async(request.message)
         
         if result.get("success"):
+            if result.get("time_to_first_token_ms") is not None:
+                chatbot_ttft_metric.observe(result["time_to_first_token_ms"] / 1000)
             return ChatbotMessageResponse(
                 success=True,
                 response=result.get("response"),
                 thinking=result.get("thinking"),
                 tool_calls=result.get("tool_calls", []),
                 conversation_id=conversation_id,
-                message_count=result.get("message_count", 0)
+                message_count=result.get("message_count", 0),
+                time_to_first_token_ms=result.get("time_to_first_token_ms"),
+                duration_ms=result.get("duration_ms"),
+                usage=result.get("usage")
             )
         else:
             return ChatbotMessageResponse(
@@ -732,63 +1164,35 @@ async def send_chatbot_message_stream(conversation_id: str, request: ChatbotMess
     async def generate_stream():
         """Generate Server-Sent Events for streaming response"""
         
-        # Track the streaming content
-        streaming_data = {
-            "thinking": "",
-            "response": "",
-            "tool_calls": [],
-            "error": None
-        }
-        
-        # Store streaming events to send them out
-        streaming_events = []
+        # The exchange runs as a task; its callbacks hand events to this generator through a queue
+        events: asyncio.Queue = asyncio.Queue()
+        exchange = None
         
         def streaming_callback(stream_type: str, content: str):
-            """Callback to capture streaming content"""
-            nonlocal streaming_data, streaming_events
-            
-            print(f"Streaming callback: {stream_type} - {content[:100]}...")  # Debug log
-            
-            if stream_type == "thinking":
-                streaming_data["thinking"] += content
-                event_data = {
-                    "type": "thinking",
+            """Forward streamed content to the response as it arrives"""
+            if stream_type in ("thinking", "tool", "response"):
+                events.put_nowait({
+                    "type": stream_type,
                     "content": content,
                     "conversation_id": conversation_id
-                }
-                streaming_events.append(f"data: {json.dumps(event_data)}\n\n")
-            
-            elif stream_type == "tool":
-                event_data = {
-                    "type": "tool",
-                    "content": content,
-                    "conversation_id": conversation_id
-                }
-                streaming_events.append(f"data: {json.dumps(event_data)}\n\n")
-            
-            elif stream_type == "response":
-                streaming_data["response"] += content
-                event_data = {
-                    "type": "response",
-                    "content": content,
-                    "conversation_id": conversation_id
-                }
-                streaming_events.append(f"data: {json.dumps(event_data)}\n\n")
+                })
         
         try:
             # Send start event
             yield f"data: {json.dumps({'type': 'start', 'conversation_id': conversation_id})}\n\n"
             
-            # Send message to chatbot with streaming callback
-            print(f"Sending message to chatbot: {request.message}")
-            result = chatbot.send_message(request.message, streaming_callback=streaming_callback)
+            exchange = asyncio.ensure_future(
+                chatbot.send_message_async(request.message, streaming_callback=streaming_callback)
+            )
+            # Queued after every callback event, so the generator drains them first
+            exchange.add_done_callback(lambda _: events.put_nowait(None))
             
-            print(f"Chatbot result: success={result.get('success')}, tool_calls={len(result.get('tool_calls', []))}")
-            print(f"Collected {len(streaming_events)} streaming events")
+            while (event := await events.get()) is not None:
+                yield f"data: {json.dumps(event)}\n\n"
+            result = exchange.result()
             
-            # Send all collected streaming events first
-            for event in streaming_events:
-                yield event
+            if result.get("time_to_first_token_ms") is not None:
+                chatbot_ttft_metric.observe(result["time_to_first_token_ms"] / 1000)
             
             # Send completion event
             completion_data = {
@@ -796,7 +1200,10 @@ async def send_chatbot_message_stream(conversation_id: str, request: ChatbotMess
                 "success": result.get("success", False),
                 "conversation_id": conversation_id,
                 "message_count": result.get("message_count", 0),
-                "tool_calls": result.get("tool_calls", [])
+                "tool_calls": result.get("tool_calls", []),
+                "time_to_first_token_ms": result.get("time_to_first_token_ms"),
+                "duration_ms": result.get("duration_ms"),
+                "usage": result.get("usage")
             }
             
             if not result.get("success"):
@@ -812,6 +1219,10 @@ async def send_chatbot_message_stream(conversation_id: str, request: ChatbotMess
                 "conversation_id": conversation_id
             }
             yield f"data: {json.dumps(error_data)}\n\n"
+        finally:
+            # Client disconnected mid-stream: stop the exchange instead of paying for the rest
+            if exchange is not None and not exchange.done():
+                exchange.cancel()
     
     return StreamingResponse(
         generate_stream(),
@@ -877,150 +1288,63 @@ async def call_chatbot_tool(conversation_id: str, request: ChatbotToolRequest):
             error=str(e)
         )
 
-async def process_analysis_job(job_id: str):
-    """
-    Background task to process video analysis job with detailed progress updates
+async def purge_expired_jobs_periodically():
+    """Delete finished jobs older than the retention TTL, once an hour"""
+    while True:
+        await asyncio.sleep(JOB_PURGE_INTERVAL_SECONDS)
+        try:
+            await asyncio.to_thread(job_store.purge_expired, DEFAULT_TTL_SECONDS)
+        except Exception as e:
+            print(f"Warning: Could not purge expired analysis jobs: {e}")
+
+background_job_tasks: List[asyncio.Task] = []
+
+@app.on_event("startup")
+async def start_analysis_workers():
     """
-    def update_progress(message: str, status: str = "processing"):
-        """Helper function to update job progress"""
-        analysis_jobs[job_id]["progress"] = message
-        analysis_jobs[job_id]["message"] = message
-        if status != "processing":
-            analysis_jobs[job_id]["status"] = status
+    Apply job retention, start the analysis workers and requeue jobs interrupted by a restart
     
-    try:
-        # Update job status
-        analysis_jobs[job_id]["status"] = "processing"
-        update_progress("Initializing video analyzer...")
-        
-        # Get job parameters
-        job_data = analysis_jobs[job_id]
-        
-        # Add services path for imports
-        services_path = os.path.join(os.path.dirname(__file__), "services", "assetanalysis")
-        if services_path not in sys.path:
-            sys.path.insert(0, services_path)
-        
-        # Import and initialize VideoAnalyzer
-        from services.assetanalysis.videoanalyzer import VideoAnalyzer
-        
-        update_progress("Loading video analyzer...")
-        
-        # Create a custom analyzer with progress callback
-        class ProgressVideoAnalyzer(VideoAnalyzer):
-            def _poll_transcription(self, transcript_id: str):
-                """Override polling with progress updates"""
-                import time
-                import requests
-                
-                polling_endpoint = f"{self.BASE_URL}/transcript/{transcript_id}"
-                start_time = time.time()
-                
-                while True:
-                    try:
-                        response = requests.get(polling_endpoint, headers=self.headers, timeout=30)
-                        response.raise_for_status()
-                        result = response.json()
-                        
-                        status = result["status"]
-                        elapsed = time.time() - start_time
-                        
-                        # Update progress based on AssemblyAI status
-                        if status == "queued":
-                            update_progress(f"AssemblyAI: Transcription queued (elapsed: {elapsed:.0f}s)")
-                        elif status == "processing":
-                            update_progress(f"AssemblyAI: Transcribing audio (elapsed: {elapsed:.0f}s)")
-                        elif status == "completed":
-                            update_progress("AssemblyAI: Transcription completed, processing results...")
-                            return result
-                        elif status == "error":
-                            error_msg = result.get('error', 'Unknown error')
-                            raise RuntimeError(f"AssemblyAI transcription failed: {error_msg}")
-                        
-                        # Progressive backoff
-                        wait_time = min(5 + (elapsed // 60), 15)
-                        time.sleep(wait_time)
-                        
-                    except requests.RequestException as e:
-                        update_progress(f"AssemblyAI: Transcription in progress (connection retry)")
-                        time.sleep(10)
-        
-        analyzer = ProgressVideoAnalyzer(brief_path=job_data["brief_path"])
-        
-        update_progress("Analyzing video file...")
-        
-        # Override the analyzer's progress methods
-        original_probe = analyzer.probe_video_file
-        original_extract = analyzer.extract_audio
-        original_upload = analyzer.upload_audio_file
-        original_transcribe = analyzer.transcribe_audio
-        original_process = analyzer.process_transcript_to_words
-        
-        def probe_with_progress(file_path):
-            update_progress("Step 1/5: Reading video metadata...")
-            return original_probe(file_path)
-        
-        def extract_with_progress(video_path):
-            update_progress("Step 2/5: Extracting audio from video...")
-            return original_extract(video_path)
-        
-        def upload_with_progress(audio_file_path):
-            update_progress("Step 3/5: Uploading audio to AssemblyAI...")
-            return original_upload(audio_file_path)
-        
-        def transcribe_with_progress(audio_url, custom_spell=None):
-            update_progress("Step 4/5: Starting AssemblyAI transcription...")
-            return original_transcribe(audio_url, custom_spell)
-        
-        def process_with_progress(transcript_data, fps, timecode_offset_frames=0, silence_threshold_ms=1000):
-            update_progress("Step 5/5: Processing transcript results...")
-            return original_process(transcript_data, fps, timecode_offset_frames, silence_threshold_ms)
-        
-        # Monkey patch the methods
-        analyzer.probe_video_file = probe_with_progress
-        analyzer.extract_audio = extract_with_progress
-        analyzer.upload_audio_file = upload_with_progress
-        analyzer.transcribe_audio = transcribe_with_progress
-        analyzer.process_transcript_to_words = process_with_progress
-        
-        # Process the video with progress updates
-        result = analyzer.analyze(
-            video_path=job_data["video_path"],
-            output_path=None,  # Force using data/analyzed directory
-            custom_spell=job_data["custom_spell"],
-            brief_path=job_data["brief_path"],
-            silence_threshold_ms=job_data["silence_threshold_ms"]
-        )
-        
-        # Check for errors in result
-        if "error" in result:
-            analysis_jobs[job_id]["status"] = "failed"
-            analysis_jobs[job_id]["message"] = f"Analysis failed: {result['error']}"
-            analysis_jobs[job_id]["error"] = result["error"]
-            analysis_jobs[job_id]["completed_at"] = datetime.now().isoformat()
-            return
-        
-        # The output file path is determined by VideoAnalyzer.analyze() 
-        # It should now go to data/analyzed directory
-        video_filename = Path(job_data["video_path"]).stem
-        analyzed_dir = Path(__file__).parent.parent.parent / "data" / "analyzed"
-        output_file = str(analyzed_dir / f"{video_filename}.transcript.json")
-        
-        # Success - update job with results
-        analysis_jobs[job_id]["status"] = "completed"
-        analysis_jobs[job_id]["message"] = "Video analysis completed successfully"
-        analysis_jobs[job_id]["completed_at"] = datetime.now().isoformat()
-        analysis_jobs[job_id]["result"] = result
-        analysis_jobs[job_id]["output_file"] = output_file
-        analysis_jobs[job_id]["progress"] = "Analysis completed successfully"
-        
-    except Exception as e:
-        # Handle any processing errors
-        analysis_jobs[job_id]["status"] = "failed"
-        analysis_jobs[job_id]["message"] = f"Analysis failed with error: {str(e)}"
-        analysis_jobs[job_id]["error"] = str(e)
-        analysis_jobs[job_id]["completed_at"] = datetime.now().isoformat()
-        analysis_jobs[job_id]["progress"] = "Analysis failed"
+    Jobs that already have an AssemblyAI transcript ID wait for that transcript;
+    jobs interrupted earlier (probing, extraction, upload) start over.
+    """
+    global job_scheduler
+    job_store.purge_expired(DEFAULT_TTL_SECONDS)
+    background_job_tasks.append(asyncio.create_task(purge_expired_jobs_periodically()))
+    if run_analysis_job is None:
+        return
+    
+    job_events.bind(asyncio.get_running_loop())
+    job_scheduler = JobScheduler(job_store, run_analysis_job, workers=ANALYSIS_WORKERS,
+                                 jobs_per_worker=ANALYSIS_JOBS_PER_WORKER, on_broadcast=notify_transcript,
+                                 on_update=on_job_update,
+                                 stage_limits={"extract": ANALYSIS_MAX_EXTRACTIONS,
+                                               "transcribe": ANALYSIS_MAX_TRANSCRIPTIONS})
+    job_scheduler.start()
+    
+    recovered = job_store.unfinished()
+    for job_data in recovered:
+        if job_data.get("transcript_id"):
+            progress = f"Resuming AssemblyAI transcript {job_data['transcript_id']} after server restart"
+        else:
+            progress = "Restarting after server restart"
+        job_store.update(job_data["job_id"], status=STATUS_QUEUED, progress=progress,
+                         message="Analysis job requeued after a server restart")
+        job_scheduler.submit(job_data["job_id"], job_data.get("priority", 0))
+    if recovered:
+        print(f"Recovered {len(recovered)} unfinished analysis jobs")
+
+@app.on_event("shutdown")
+async def stop_analysis_workers():
+    """Stop the analysis workers (their running jobs are recovered on the next start) and close the Claude client pool"""
+    global job_scheduler
+    for task in background_job_tasks:
+        task.cancel()
+    background_job_tasks.clear()
+    if job_scheduler is not None:
+        await asyncio.to_thread(job_scheduler.stop)
+        job_scheduler = None
+    if close_client_pool is not None:
+        await close_client_pool()
 
 # Error handlers
 @app.exception_handler(404)
@@ -1047,10 +1371,20 @@ def main():
     print("  - API Documentation: http://localhost:8000/docs")
     print("  - Health Check: http://localhost:8000/health") 
     print("  - Services List: http://localhost:8000/services")
+    print("  - Metrics: http://localhost:8000/metrics")
     print("  - Asset Analysis:")
     print("    - Start Analysis: POST /analysis/start")
+    print("    - Start Batch: POST /analysis/batch")
+    print("    - Batch Status: GET /analysis/batch/{batch_id}")
     print("    - Check Status: GET /analysis/status/{job_id}")
+    print("    - Progress Events (SSE): GET /analysis/status/{job_id}/events")
     print("    - List Jobs: GET /analysis/jobs")
+    print("    - Cancel Job: POST /analysis/jobs/{job_id}/cancel")
+    print(f"    - Workers: GET /analysis/workers ({ANALYSIS_WORKERS} workers x {ANALYSIS_JOBS_PER_WORKER} jobs)")
+    print("    - Reprocess Transcript: POST /analysis/reprocess")
+    print("    - Cache Stats: GET /analysis/cache/stats")
+    print("    - AssemblyAI Webhook: POST /analysis/webhooks/assemblyai" +
+          ("" if ASSEMBLYAI_WEBHOOK_URL else " (disabled, set ASSEMBLYAI_WEBHOOK_URL)"))
     
     if ChatbotBackend is not None:
         print("  - AI Chatbot:")
@@ -86,15 +86,14 @@ def print_project_info(chatbot: ChatbotBackend):
 def enhanced_streaming_callback(stream_type: str, content: str):
     """Enhanced streaming callback with better formatting and indicators."""
     if stream_type == "thinking":
-        # For thinking content, print in dim gray with thinking indicator
-        print(f"\033[2;37m💭 {content}\033[0m", end="", flush=True)
+        # For thinking content (streamed in pieces), print in dim gray
+        print(f"\033[2;37m{content}\033[0m", end="", flush=True)
     elif stream_type == "tool":
         # For tool usage, print in bright cyan with tool indicator
         print(f"\033[96m🔧 {content}\033[0m", flush=True)
     elif stream_type == "response":
-        # For response content, print in normal color with response indicator
-        if content.strip():  # Only print non-empty content
-            print(f"{content}", end="", flush=True)
+        # For response content, print each streamed piece as it arrives
+        print(f"{content}", end="", flush=True)
 
 def test_tool_interactive(chatbot: ChatbotBackend):
     """Interactive tool testing interface."""
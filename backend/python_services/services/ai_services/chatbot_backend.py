@@ -8,18 +8,22 @@ import time
 from datetime import datetime
 from typing import Dict, Any, Optional, List, Callable
 from dotenv import load_dotenv
-import anthropic
-from anthropic import Anthropic
 
 # Handle imports that work both when run directly and as a module
 try:
     # Try relative imports first (when run as module)
     from .prompts.prompts_chatbot import system_prompt, user_prompt, welcome_prompt
     from .toolcalling.toolcaller import tool_caller, get_tool_schemas_for_claude
+    from .toolcalling.toolexecutor import tool_executor
+    from .claudeclient import close_client_pool, get_client_pool
+    from .promptcache import add_usage, cached_system, cached_tools, prompt_cache_stats, usage_dict, with_cache_breakpoint
 except ImportError:
     # Fall back to absolute imports (when run directly)
     from prompts.prompts_chatbot import system_prompt, user_prompt, welcome_prompt
     from toolcalling.toolcaller import tool_caller, get_tool_schemas_for_claude
+    from toolcalling.toolexecutor import tool_executor
+    from claudeclient import close_client_pool, get_client_pool
+    from promptcache import add_usage, cached_system, cached_tools, prompt_cache_stats, usage_dict, with_cache_breakpoint
 
 # Set up logging
 logging.basicConfig(
@@ -52,7 +56,7 @@ class ChatbotBackend:
         """Initialize the chatbot backend with optional conversation ID."""
         self.conversation_id = conversation_id or self._generate_conversation_id()
         self.conversation_history: List[Dict[str, str]] = []
-        self.client = None
+        self.api_key = None
         self.project_data = None
         self.enable_tools = enable_tools
         self._initialize_client()
@@ -70,12 +74,12 @@ class ChatbotBackend:
         return f"chat_{timestamp}"
     
     def _initialize_client(self):
-        """Initialize the Claude API client."""
+        """Check the Claude API key; requests use the event loop's shared client pool."""
         api_key = os.environ.get("claude_api_key")
         if not api_key:
             raise ValueError("Claude API key not found. Set claude_api_key in .env file.")
         
-        self.client = Anthropic(api_key=api_key)
+        self.api_key = api_key
         logger.info("Claude client initialized successfully")
     
     def _ensure_conversations_dir(self):
@@ -174,6 +178,46 @@ class ChatbotBackend:
         """Get recent conversation history for context."""
         return self.conversation_history[-max_exchanges:] if self.conversation_history else []
     
+    async def _stream_completion(
+        self,
+        completion_params: Dict[str, Any],
+        streaming_callback: Optional[Callable[[str, str], None]],
+        timing: Dict[str, Optional[float]],
+        usage: Dict[str, int]
+    ) -> Any:
+        """
+        Run one Messages API call with streaming and return the final message.
+        
+        Thinking and text deltas are passed to the streaming callback as they
+        arrive, and tool uses as soon as Claude starts them. The time of the
+        first streamed token of the exchange is recorded in timing["first_token"],
+        and the call's token counts are added to usage and prompt_cache_stats.
+        Waits for a free request slot of the shared client pool first.
+        """
+        def emit(stream_type: str, content: str):
+            if timing["first_token"] is None:
+                timing["first_token"] = time.perf_counter()
+            if streaming_callback:
+                streaming_callback(stream_type, content)
+        
+        pool = get_client_pool(self.api_key)
+        async with pool.request_slot():
+            async with pool.client.messages.stream(**completion_params) as stream:
+                async for event in stream:
+                    if event.type == "content_block_start" and event.content_block.type == "tool_use":
+                        emit("tool", f"\n🔧 Using tool: {event.content_block.name}")
+                    elif event.type == "content_block_delta":
+                        if event.delta.type == "thinking_delta":
+                            emit("thinking", event.delta.thinking)
+                        elif event.delta.type == "text_delta":
+                            emit("response", event.delta.text)
+                final_message = await stream.get_final_message()
+        
+        call_usage = usage_dict(final_message.usage)
+        prompt_cache_stats.record("chatbot", call_usage)
+        add_usage(usage, call_usage)
+        return final_message
+    
     async def send_message_async(
         self,
         message: str,
@@ -181,16 +225,17 @@ class ChatbotBackend:
     ) -> Dict[str, Any]:
         """Send a message to Claude and get a response asynchronously with proper sequential tool calling."""
         
-        if not self.client:
+        if not self.api_key:
             raise ValueError("Claude client not initialized")
         
         try:
-            # Get prompts with conversation history and project context
+            # Get prompts with conversation history and project context. The tools and
+            # system prompt are the same for every call and form the cached prefix.
             system_prompt_text = system_prompt(self.project_data or {})
             user_prompt_text = user_prompt(message, self.get_recent_history(), self.project_data or {})
             
             # Get available tools for Claude function calling (if enabled)
-            tools = get_tool_schemas_for_claude() if self.enable_tools else None
+            tools = cached_tools(get_tool_schemas_for_claude()) if self.enable_tools else None
             
             logger.info(f"Sending message to Claude API (conversation: {self.conversation_id})")
             if self.enable_tools and tools:
@@ -205,6 +250,8 @@ class ChatbotBackend:
             all_tool_calls = []
             thinking_content = ""
             final_response = ""
+            timing = {"started": time.perf_counter(), "first_token": None}
+            usage = {}
             
             # Implement proper sequential tool calling loop
             while True:
@@ -212,36 +259,29 @@ class ChatbotBackend:
                 completion_params = {
                     "model": CLAUDE_MODEL,
                     "max_tokens": MAX_TOKENS,
-                    "system": system_prompt_text,
-                    "messages": messages,
+                    "system": cached_system(system_prompt_text),
+                    # Each call of the tool loop reads the previous call's messages from the cache
+                    "messages": with_cache_breakpoint(messages),
                     "thinking": {"type": "enabled", "budget_tokens": THINKING_BUDGET},
                 }
                 
                 if self.enable_tools and tools:
                     completion_params["tools"] = tools
                 
-                # Get Claude's response
-                response = self.client.messages.create(**completion_params)
-                
-                # Extract thinking content if available
-                if hasattr(response, 'thinking') and response.thinking:
-                    thinking_content += response.thinking
-                    if streaming_callback:
-                        streaming_callback("thinking", response.thinking)
+                # Get Claude's response, streaming it to the callback as it is generated
+                response = await self._stream_completion(completion_params, streaming_callback, timing, usage)
                 
                 # Check if Claude wants to use tools
                 tool_calls_in_response = []
                 text_content = ""
                 
                 for content_block in response.content:
-                    if content_block.type == "text":
+                    if content_block.type == "thinking":
+                        thinking_content += content_block.thinking
+                    elif content_block.type == "text":
                         text_content += content_block.text
-                        if streaming_callback:
-                            streaming_callback("response", content_block.text)
                     elif content_block.type == "tool_use":
                         tool_calls_in_response.append(content_block)
-                        if streaming_callback:
-                            streaming_callback("tool", f"\n🔧 Using tool: {content_block.name}")
                 
                 # Add Claude's response to the message history
                 assistant_message = {"role": "assistant", "content": response.content}
@@ -252,45 +292,50 @@ class ChatbotBackend:
                     final_response = text_content
                     break
                 
-                # Execute all tool calls and add results to messages
+                # Execute the tool calls (read-only tools concurrently) and add results to messages
+                if streaming_callback:
+                    for tool_call in tool_calls_in_response:
+                        streaming_callback("tool", f"\nExecuting {tool_call.name}...")
+                
+                futures = tool_executor.submit_async(
+                    [(tool_call.name, tool_call.input) for tool_call in tool_calls_in_response]
+                )
+                
+                # Provide feedback to user as each tool finishes
+                if streaming_callback:
+                    for next_done in asyncio.as_completed(futures):
+                        record = await next_done
+                        tool_name, tool_result = record["tool_name"], record["result"]
+                        if tool_result.get("success"):
+                            streaming_callback("tool", f"✅ {tool_name} completed ({record['duration_ms']:.0f}ms)")
+                            # Show a brief summary of the result
+                            if "result" in tool_result:
+                                result_summary = str(tool_result["result"])[:100]
+                                streaming_callback("tool", f"Result: {result_summary}...")
+                        else:
+                            streaming_callback("tool", f"❌ {tool_name} failed: {tool_result.get('error', 'Unknown error')}")
+                
+                # Results go back in tool_use order
                 tool_result_content = []
                 
-                for tool_call in tool_calls_in_response:
-                    tool_name = tool_call.name
-                    tool_input = tool_call.input
-                    tool_id = tool_call.id
-                    
-                    if streaming_callback:
-                        streaming_callback("tool", f"\nExecuting {tool_name}...")
-                    
-                    # Execute the tool
-                    tool_result = tool_caller.call_tool(tool_name, tool_input)
+                for tool_call, future in zip(tool_calls_in_response, futures):
+                    record = await future
                     
                     # Track this tool call
                     all_tool_calls.append({
-                        "tool_name": tool_name,
-                        "tool_id": tool_id,
-                        "input": tool_input,
-                        "result": tool_result
+                        "tool_name": tool_call.name,
+                        "tool_id": tool_call.id,
+                        "input": tool_call.input,
+                        "result": record["result"],
+                        "duration_ms": record["duration_ms"]
                     })
                     
                     # Add tool result to the content array for this user message
                     tool_result_content.append({
                         "type": "tool_result",
-                        "tool_use_id": tool_id,
-                        "content": json.dumps(tool_result)
+                        "tool_use_id": tool_call.id,
+                        "content": json.dumps(record["result"])
                     })
-                    
-                    # Provide feedback to user
-                    if streaming_callback:
-                        if tool_result.get("success"):
-                            streaming_callback("tool", f"✅ {tool_name} completed")
-                            # Show a brief summary of the result
-                            if "result" in tool_result:
-                                result_summary = str(tool_result["result"])[:100]
-                                streaming_callback("tool", f"Result: {result_summary}...")
-                        else:
-                            streaming_callback("tool", f"❌ {tool_name} failed: {tool_result.get('error', 'Unknown error')}")
                 
                 # Add all tool results as a single user message
                 if tool_result_content:
@@ -307,13 +352,22 @@ class ChatbotBackend:
             # Add to conversation history
             self.add_to_history(message, final_response)
             
+            finished = time.perf_counter()
+            time_to_first_token_ms = ((timing["first_token"] - timing["started"]) * 1000
+                                      if timing["first_token"] is not None else None)
+            logger.info(f"Exchange finished in {(finished - timing['started']) * 1000:.0f}ms, "
+                        f"time to first token: {time_to_first_token_ms or 0:.0f}ms")
+            
             return {
                 "success": True,
                 "response": final_response,
                 "thinking": thinking_content,
                 "tool_calls": all_tool_calls,
                 "conversation_id": self.conversation_id,
-                "message_count": len(self.conversation_history)
+                "message_count": len(self.conversation_history),
+                "time_to_first_token_ms": time_to_first_token_ms,
+                "duration_ms": (finished - timing["started"]) * 1000,
+                "usage": usage
             }
         
         except Exception as e:
@@ -329,30 +383,29 @@ class ChatbotBackend:
         message: str,
         streaming_callback: Optional[Callable[[str, str], None]] = None
     ) -> Dict[str, Any]:
-        """Synchronous wrapper around the async send_message function."""
+        """
+        Synchronous wrapper around send_message_async, for scripts and the CLI.
         
-        # Get the current event loop or create a new one (fix deprecation warning)
-        try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            # No running loop, create a new one
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+        Runs the exchange on a temporary event loop, which gets (and then closes)
+        its own client pool. Async callers should await send_message_async instead.
+        """
+        
+        async def exchange() -> Dict[str, Any]:
             try:
-                return loop.run_until_complete(
-                    self.send_message_async(message, streaming_callback)
-                )
+                return await self.send_message_async(message, streaming_callback)
             finally:
-                loop.close()
-        else:
-            # There's already a running loop, we need to run in a new thread
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(
-                    asyncio.run, 
-                    self.send_message_async(message, streaming_callback)
-                )
-                return future.result()
+                await close_client_pool()
+        
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No running loop, run the exchange on a new one
+            return asyncio.run(exchange())
+        
+        # There's already a running loop, we need to run in a new thread
+        import concurrent.futures
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            return executor.submit(asyncio.run, exchange()).result()
     
     def get_welcome_message(self) -> str:
         """Get the welcome message for new conversations."""
@@ -381,14 +434,24 @@ class ChatbotBackend:
         """Get list of available tools."""
         return tool_caller.get_available_tools()
 
+# Stream type of the last piece stream_to_console printed
+_last_stream_type: Optional[str] = None
+
 def stream_to_console(stream_type: str, content: str):
     """
     Console streaming callback for testing and demonstration.
     Formats the output for better readability including tool usage.
     """
+    global _last_stream_type
+    starts_block = stream_type != _last_stream_type
+    if starts_block and "thinking" in (stream_type, _last_stream_type) and _last_stream_type in ("thinking", "response"):
+        # Thinking blocks get lines of their own (tool lines already end with a newline)
+        print()
+    _last_stream_type = stream_type
     if stream_type == "thinking":
-        # For thinking content, print in gray/dim
-        print(f"\033[90m[Thinking] {content}\033[0m", end="")
+        # For thinking content (streamed in pieces), print in gray/dim with one label per block
+        label = "[Thinking] " if starts_block else ""
+        print(f"\033[90m{label}{content}\033[0m", end="")
     elif stream_type == "tool":
         # For tool usage, print in blue/cyan
         print(f"\033[96m{content}\033[0m")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Shared AsyncAnthropic client for chatbot conversations.
+
+Instead of a client per ChatbotBackend, each event loop (the API server has
+one) gets a single ClaudeClientPool: one AsyncAnthropic client, so its
+kept-alive HTTP connections to the API are reused across conversations.
+Every request gets a timeout, and a semaphore bounds how many requests are
+in flight at once; callers beyond the limit wait for a free slot. When the
+API key changes, the loop gets a new pool and the old one's client is
+closed once its requests in flight have finished.
+"""
+
+import os
+import asyncio
+import logging
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Set
+
+from anthropic import AsyncAnthropic, Timeout
+
+logger = logging.getLogger(__name__)
+
+# Constants
+REQUEST_TIMEOUT_SECONDS = float(os.getenv("CLAUDE_REQUEST_TIMEOUT_SECONDS", "300"))
+CONNECT_TIMEOUT_SECONDS = 10
+MAX_CONCURRENT_REQUESTS = int(os.getenv("CLAUDE_MAX_CONCURRENT_REQUESTS", "8"))
+MAX_RETRIES = 2
+
+
+class ClaudeClientPool:
+    """An AsyncAnthropic client with pooled connections and a bound on concurrent requests."""
+
+    def __init__(
+        self,
+        api_key: str,
+        max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+        timeout_seconds: float = REQUEST_TIMEOUT_SECONDS
+    ):
+        self.api_key = api_key
+        self.max_concurrent_requests = max_concurrent_requests
+        # The client's HTTP connection pool is shared by every conversation using it
+        self.client = AsyncAnthropic(
+            api_key=api_key,
+            timeout=Timeout(timeout_seconds, connect=CONNECT_TIMEOUT_SECONDS),
+            max_retries=MAX_RETRIES
+        )
+        # Held for the whole of a request, including reading its stream
+        self.request_slots = asyncio.Semaphore(max_concurrent_requests)
+        self.requests_in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @asynccontextmanager
+    async def request_slot(self) -> AsyncIterator[None]:
+        """Hold one of the request slots (waiting for a free one) for the duration of a request."""
+        async with self.request_slots:
+            self.requests_in_flight += 1
+            self._idle.clear()
+            try:
+                yield
+            finally:
+                self.requests_in_flight -= 1
+                if not self.requests_in_flight:
+                    self._idle.set()
+
+    async def close(self) -> None:
+        await self.client.close()
+
+    async def close_when_idle(self) -> None:
+        """Close the client once the requests in flight have finished."""
+        await self._idle.wait()
+        await self.close()
+
+
+# One pool per event loop: httpx connections cannot be shared between loops
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, ClaudeClientPool]" = weakref.WeakKeyDictionary()
+# Replaced pools waiting to close (referenced so the tasks are not garbage collected)
+_closing: Set[asyncio.Task] = set()
+
+
+def get_client_pool(api_key: str) -> ClaudeClientPool:
+    """Return the running event loop's client pool, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None or pool.api_key != api_key:
+        if pool is not None:
+            task = loop.create_task(pool.close_when_idle())
+            _closing.add(task)
+            task.add_done_callback(_closing.discard)
+        pool = _pools[loop] = ClaudeClientPool(api_key)
+        logger.info(f"Claude client pool created (max {pool.max_concurrent_requests} concurrent requests)")
+    return pool
+
+
+async def close_client_pool() -> None:
+    """Close the running event loop's client pool, if it has one (e.g. on shutdown)."""
+    pool: Optional[ClaudeClientPool] = _pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool.close()
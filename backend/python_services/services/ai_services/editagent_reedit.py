@@ -6,7 +6,7 @@ import asyncio
 from pathlib import Path
 import time
 from datetime import datetime
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 import glob
 import argparse
 from dotenv import load_dotenv
@@ -17,10 +17,22 @@ from jsonschema import validate
 # Handle imports that work both when run directly and as a module
 try:
     # Try relative imports first (when run as module)
-    from .prompts.prompts_reedit import system_prompt, user_prompt
+    from .prompts.prompts_reedit import system_prompt, user_prompt, user_prompt_context
+    from .transcriptencoding import (INCLUDE_WORD_CONFIDENCE, build_segment_index, encode_transcript,
+                                      estimate_tokens)
+    from .segmentclips import expand_segment_clips
+    from .timelinestream import TimelineStreamError, TimelineStreamParser
+    from .editoperations import OPERATIONS_SCHEMA, apply_edit_operations, timeline_outline
+    from .promptcache import cached_system, cached_text, prompt_cache_stats, usage_dict
 except ImportError:
     # Fall back to absolute imports (when run directly)
-    from prompts.prompts_reedit import system_prompt, user_prompt
+    from prompts.prompts_reedit import system_prompt, user_prompt, user_prompt_context
+    from transcriptencoding import (INCLUDE_WORD_CONFIDENCE, build_segment_index, encode_transcript,
+                                    estimate_tokens)
+    from segmentclips import expand_segment_clips
+    from timelinestream import TimelineStreamError, TimelineStreamParser
+    from editoperations import OPERATIONS_SCHEMA, apply_edit_operations, timeline_outline
+    from promptcache import cached_system, cached_text, prompt_cache_stats, usage_dict
 
 # Set up logging
 logging.basicConfig(
@@ -181,8 +193,8 @@ def load_project_data() -> Dict[str, str]:
     except Exception as e:
         raise ValueError(f"Error loading project data: {e}")
 
-def load_transcript_data() -> Dict[str, Any]:
-    """Load transcript data from the analyzed directory."""
+def find_transcript_file() -> Path:
+    """Find the transcript JSON file in the analyzed directory."""
     if not ANALYZED_DIR.exists():
         raise FileNotFoundError(f"Analyzed directory not found at: {ANALYZED_DIR}")
     
@@ -198,11 +210,25 @@ def load_transcript_data() -> Dict[str, Any]:
             logger.warning(f"  - {f.name}")
         logger.warning("Using the first one found...")
     
-    transcript_path = transcript_files[0]
+    return transcript_files[0]
+
+def load_transcript_data(transcript_path: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Load transcript data from the analyzed directory.
+    
+    Uses the memory-mapped .transcript.cols copy when it is up to date, which
+    presents the same keys and words lazily instead of parsing the whole JSON.
+    """
+    transcript_path = transcript_path or find_transcript_file()
     
     try:
-        with open(transcript_path, "r", encoding="utf-8") as f:
-            transcript_data = json.load(f)
+        # Import the columnar transcript loader from asset analysis
+        assetanalysis_dir = SCRIPT_DIR.parent / "assetanalysis"
+        if str(assetanalysis_dir) not in sys.path:
+            sys.path.insert(0, str(assetanalysis_dir))
+        from transcriptcolumns import load_transcript
+        
+        transcript_data = load_transcript(transcript_path)
         
         logger.info(f"Loaded transcript from: {transcript_path}")
         
@@ -223,6 +249,17 @@ def load_transcript_data() -> Dict[str, Any]:
     except Exception as e:
         raise ValueError(f"Error loading transcript: {e}")
 
+def load_transcript_segments(transcript_path: Path, transcript_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Load the transcript's segment index (<name>.segments.json), rebuilding it when missing or stale."""
+    assetanalysis_dir = SCRIPT_DIR.parent / "assetanalysis"
+    if str(assetanalysis_dir) not in sys.path:
+        sys.path.insert(0, str(assetanalysis_dir))
+    from transcriptsegments import load_segment_index
+    
+    segment_index = load_segment_index(transcript_path, transcript_data)
+    logger.info(f"Transcript has {len(segment_index['segments'])} segments")
+    return segment_index
+
 def load_existing_timeline(timeline_path: Path) -> Dict[str, Any]:
     """Load existing timeline JSON from file."""
     try:
@@ -254,22 +291,82 @@ def load_existing_timeline(timeline_path: Path) -> Dict[str, Any]:
         raise ValueError(f"Error loading timeline: {e}")
 
 def load_prompts(existing_timeline: Dict[str, Any], transcript_data: Dict[str, Any], 
-                user_brief: str, proj_name: str, user_instructions: str) -> Tuple[str, str]:
-    """Load system prompt and format user prompt with all required data."""
+                user_brief: str, proj_name: str, user_instructions: str,
+                include_confidence: bool = INCLUDE_WORD_CONFIDENCE,
+                segment_index: Optional[Dict[str, Any]] = None) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Load system prompt and format user prompt with all required data.
+    
+    The user prompt is returned as two content blocks: the transcript and brief, which
+    are the same for every re-edit of the project and end the cached prefix (see
+    promptcache.py), then an outline of the current timeline and the instructions.
+    """
     system = system_prompt()
     
-    # Convert data to JSON strings
-    existing_timeline_json = json.dumps(existing_timeline, indent=2)
-    transcript_json = json.dumps(transcript_data, indent=2)
+    # One row per clip; the model answers with edit operations on these clips
+    timeline_outline_json = json.dumps(timeline_outline(existing_timeline), separators=(",", ":"), ensure_ascii=False)
+    # Speaker segments instead of one dict per word (see transcriptencoding.py)
+    transcript_json, _ = encode_transcript(transcript_data, include_confidence=include_confidence,
+                                           segment_index=segment_index)
+    logger.info(f"Transcript encoded in ~{estimate_tokens(transcript_json)} tokens")
     
+    context = user_prompt_context(
+        transcript_json=transcript_json,
+        brief=user_brief,
+        project_name=proj_name or "Unknown Project"
+    )
     user = user_prompt(
-        existing_timeline_json=existing_timeline_json,
-        transcript_json=transcript_json, 
-        brief=user_brief, 
-        project_name=proj_name or "Unknown Project",
+        timeline_outline_json=timeline_outline_json,
         user_instructions=user_instructions
     )
-    return system, user
+    return system, [cached_text(context), {"type": "text", "text": user}]
+
+def parse_timeline_response(response_content: str, segment_index: Optional[Dict[str, Any]] = None,
+                            existing_timeline: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Parse Claude's response text as timeline JSON and validate it against TARGET_SCHEMA.
+    
+    A response with "operations" is a list of edit operations, applied to a copy
+    of existing_timeline (see editoperations.py). A whole timeline is accepted
+    too; with the transcript's segment index, its clips given as segment_ids are
+    first expanded to frame-accurate clips (see segmentclips.py).
+    """
+    # Clean markdown formatting if present
+    cleaned_response = response_content.strip()
+    if cleaned_response.startswith("```json"):
+        # Remove opening ```json
+        cleaned_response = cleaned_response[7:]
+    if cleaned_response.startswith("```"):
+        # Remove opening ``` (in case it's just ```)
+        cleaned_response = cleaned_response[3:]
+    if cleaned_response.endswith("```"):
+        # Remove closing ```
+        cleaned_response = cleaned_response[:-3]
+    
+    # Final strip
+    cleaned_response = cleaned_response.strip()
+    
+    result = json.loads(cleaned_response)
+    
+    if isinstance(result, dict) and "operations" in result:
+        if existing_timeline is None or segment_index is None:
+            raise ValueError("Edit operations need the existing timeline and the transcript's segment index")
+        validate(instance=result, schema=OPERATIONS_SCHEMA)
+        operations = result["operations"]
+        kinds = ", ".join(sorted({operation["op"] for operation in operations})) or "none"
+        logger.info(f"Applying {len(operations)} edit operations ({kinds}) to the existing timeline")
+        if result.get("notes"):
+            logger.info(f"Edit notes: {result['notes']}")
+        result = apply_edit_operations(existing_timeline, operations, segment_index)
+        if isinstance(result.get("timeline", {}).get("metadata"), dict):
+            result["timeline"]["metadata"]["generated_by"] = "editagent_reedit"
+    elif segment_index is not None:
+        expanded = expand_segment_clips(result, segment_index)
+        logger.info(f"Expanded {expanded} clips from segment IDs")
+    
+    # Validate against schema
+    validate(instance=result, schema=TARGET_SCHEMA)
+    return result
 
 async def process_reedit_async(
     existing_timeline: Dict[str, Any],
@@ -277,9 +374,18 @@ async def process_reedit_async(
     user_brief: str,
     user_instructions: str,
     output_filename: Optional[str] = None,
-    streaming_callback: Optional[callable] = None
+    streaming_callback: Optional[callable] = None,
+    segment_index: Optional[Dict[str, Any]] = None,
+    timeline_callback: Optional[callable] = None
 ) -> Dict[str, Any]:
-    """Process a timeline re-edit using Claude API with streaming and thinking features."""
+    """
+    Process a timeline re-edit using Claude API with streaming and thinking features.
+    
+    The response is parsed as it streams (see timelinestream.py): each completed
+    edit operation is passed to timeline_callback(kind, position, item) with kind
+    "operation" (or "clip" and "track" for a whole-timeline reply), and a response
+    that is not valid JSON stops the stream early.
+    """
     logger.info("Starting timeline re-editing")
     
     try:
@@ -290,9 +396,14 @@ async def process_reedit_async(
         
         client = Anthropic(api_key=api_key)
         
+        # Clips are chosen by segment ID and expanded locally
+        if segment_index is None:
+            segment_index = build_segment_index(transcript_data)
+        
         # Get prompts
         system_prompt_text, user_prompt_text = load_prompts(
-            existing_timeline, transcript_data, user_brief, project_name or "Unknown Project", user_instructions
+            existing_timeline, transcript_data, user_brief, project_name or "Unknown Project", user_instructions,
+            segment_index=segment_index
         )
         
         # Create a message with streaming
@@ -302,11 +413,14 @@ async def process_reedit_async(
         thinking_content = ""
         response_content = ""
         
+        # Completed clips are handed on while the rest of the response streams
+        parser = TimelineStreamParser(TARGET_SCHEMA, segment_index)
+        
         # Create completion with proper streaming handling
         with client.messages.stream(
             model=CLAUDE_MODEL,
             max_tokens=MAX_TOKENS,
-            system=system_prompt_text,
+            system=cached_system(system_prompt_text),
             messages=[{"role": "user", "content": user_prompt_text}],
             thinking={"type": "enabled", "budget_tokens": THINKING_BUDGET},
         ) as stream:
@@ -322,30 +436,21 @@ async def process_reedit_async(
                             response_content += event.delta.text
                             if streaming_callback:
                                 streaming_callback("response", event.delta.text)
+                            # Raises TimelineStreamError, closing the stream, at the first structural error
+                            for kind, track_index, item in parser.feed(event.delta.text):
+                                if timeline_callback:
+                                    timeline_callback(kind, track_index, item)
+            
+            logger.info(f"Streamed {parser.clips_completed} clips in {parser.tracks_completed} tracks")
+            
+            # Record how much of the prompt was served from the prompt cache
+            prompt_cache_stats.record("reedit", usage_dict(stream.get_final_message().usage))
         
         # Parse the JSON response
         try:
             logger.info("Parsing Claude's response as JSON")
             
-            # Clean markdown formatting if present
-            cleaned_response = response_content.strip()
-            if cleaned_response.startswith("```json"):
-                # Remove opening ```json
-                cleaned_response = cleaned_response[7:]
-            if cleaned_response.startswith("```"):
-                # Remove opening ``` (in case it's just ```)
-                cleaned_response = cleaned_response[3:]
-            if cleaned_response.endswith("```"):
-                # Remove closing ```
-                cleaned_response = cleaned_response[:-3]
-            
-            # Final strip
-            cleaned_response = cleaned_response.strip()
-            
-            result = json.loads(cleaned_response)
-            
-            # Validate against schema
-            validate(instance=result, schema=TARGET_SCHEMA)
+            result = parse_timeline_response(response_content, segment_index, existing_timeline)
             
             # Add iteration tracking to metadata
             original_duration = existing_timeline.get("summary", {}).get("timeline_duration_frames", 0)
@@ -369,6 +474,10 @@ async def process_reedit_async(
             logger.error(f"Error validating or processing result: {str(e)}")
             return {"error": str(e)}
     
+    except TimelineStreamError as e:
+        logger.error(f"Stopped the response early, it is not valid timeline JSON: {e}")
+        return {"error": "JSON structure error", "details": str(e)}
+    
     except Exception as e:
         logger.error(f"Error processing re-edit: {str(e)}")
         return {"error": str(e)}
@@ -379,7 +488,9 @@ def process_reedit(
     user_brief: str,
     user_instructions: str,
     output_filename: Optional[str] = None,
-    streaming_callback: Optional[callable] = None
+    streaming_callback: Optional[callable] = None,
+    segment_index: Optional[Dict[str, Any]] = None,
+    timeline_callback: Optional[callable] = None
 ) -> Dict[str, Any]:
     """Synchronous wrapper around the async process_reedit function."""
     
@@ -397,7 +508,9 @@ def process_reedit(
                     user_brief,
                     user_instructions,
                     output_filename, 
-                    streaming_callback
+                    streaming_callback,
+                    segment_index,
+                    timeline_callback
                 )
             )
             return future.result()
@@ -413,7 +526,9 @@ def process_reedit(
                     user_brief,
                     user_instructions,
                     output_filename, 
-                    streaming_callback
+                    streaming_callback,
+                    segment_index,
+                    timeline_callback
                 )
             )
         finally:
@@ -620,10 +735,13 @@ def main_reedit_workflow(user_instructions: Optional[str] = None, silent: bool =
         
         # Load transcript data
         print_if_not_silent("\nLoading transcript...")
-        transcript_data = load_transcript_data()
+        transcript_path = find_transcript_file()
+        transcript_data = load_transcript_data(transcript_path)
+        segment_index = load_transcript_segments(transcript_path, transcript_data)
         timecode_offset = transcript_data.get("timecode_offset_frames", 0)
         print_if_not_silent(f"✓ Transcript loaded from: {ANALYZED_DIR}")
         print_if_not_silent(f"✓ Timecode offset: {timecode_offset} frames")
+        print_if_not_silent(f"✓ Segments: {len(segment_index['segments'])}")
         
         # Step 4: Load the exported JSON from timeline_ref
         print_if_not_silent("\nSTEP 4: Loading exported timeline JSON")
@@ -683,8 +801,12 @@ def main_reedit_workflow(user_instructions: Optional[str] = None, silent: bool =
             user_brief,
             user_instructions,
             output_filename=str(output_filename),
-            streaming_callback=streaming_callback
+            streaming_callback=streaming_callback,
+            segment_index=segment_index
         )
+        # Release a memory-mapped transcript now, so its .cols file can be replaced (e.g. by reprocessing)
+        if hasattr(transcript_data, "close"):
+            transcript_data.close()
         
         print_if_not_silent("\n\nRe-editing complete.")
         
@@ -6,7 +6,7 @@ import asyncio
 from pathlib import Path
 import time
 from datetime import datetime
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 import glob
 from dotenv import load_dotenv
 import anthropic
@@ -17,9 +17,19 @@ from jsonschema import validate
 try:
     # Try relative imports first (when run as module)
     from .prompts.prompts_roughcut import system_prompt, user_prompt
+    from .transcriptencoding import (INCLUDE_WORD_CONFIDENCE, build_segment_index, encode_transcript,
+                                      estimate_tokens)
+    from .segmentclips import expand_segment_clips
+    from .timelinestream import TimelineStreamError, TimelineStreamParser
+    from .promptcache import cached_system, cached_text, prompt_cache_stats, usage_dict
 except ImportError:
     # Fall back to absolute imports (when run directly)
     from prompts.prompts_roughcut import system_prompt, user_prompt
+    from transcriptencoding import (INCLUDE_WORD_CONFIDENCE, build_segment_index, encode_transcript,
+                                    estimate_tokens)
+    from segmentclips import expand_segment_clips
+    from timelinestream import TimelineStreamError, TimelineStreamParser
+    from promptcache import cached_system, cached_text, prompt_cache_stats, usage_dict
 
 # Set up logging
 logging.basicConfig(
@@ -186,8 +196,8 @@ def load_project_data() -> Dict[str, str]:
     except Exception as e:
         raise ValueError(f"Error loading project data: {e}")
 
-def load_transcript_data() -> Dict[str, Any]:
-    """Load transcript data from the analyzed directory."""
+def find_transcript_file() -> Path:
+    """Find the transcript JSON file in the analyzed directory."""
     if not ANALYZED_DIR.exists():
         raise FileNotFoundError(f"Analyzed directory not found at: {ANALYZED_DIR}")
     
@@ -203,11 +213,25 @@ def load_transcript_data() -> Dict[str, Any]:
             logger.warning(f"  - {f.name}")
         logger.warning("Using the first one found...")
     
-    transcript_path = transcript_files[0]
+    return transcript_files[0]
+
+def load_transcript_data(transcript_path: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Load transcript data from the analyzed directory.
+    
+    Uses the memory-mapped .transcript.cols copy when it is up to date, which
+    presents the same keys and words lazily instead of parsing the whole JSON.
+    """
+    transcript_path = transcript_path or find_transcript_file()
     
     try:
-        with open(transcript_path, "r", encoding="utf-8") as f:
-            transcript_data = json.load(f)
+        # Import the columnar transcript loader from asset analysis
+        assetanalysis_dir = SCRIPT_DIR.parent / "assetanalysis"
+        if str(assetanalysis_dir) not in sys.path:
+            sys.path.insert(0, str(assetanalysis_dir))
+        from transcriptcolumns import load_transcript
+        
+        transcript_data = load_transcript(transcript_path)
         
         logger.info(f"Loaded transcript from: {transcript_path}")
         
@@ -228,12 +252,65 @@ def load_transcript_data() -> Dict[str, Any]:
     except Exception as e:
         raise ValueError(f"Error loading transcript: {e}")
 
-def load_prompts(transcript_data: Dict[str, Any], user_brief: str, proj_name: str) -> Tuple[str, str]:
-    """Load system prompt and format user prompt with transcript data and brief."""
+def load_transcript_segments(transcript_path: Path, transcript_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Load the transcript's segment index (<name>.segments.json), rebuilding it when missing or stale."""
+    assetanalysis_dir = SCRIPT_DIR.parent / "assetanalysis"
+    if str(assetanalysis_dir) not in sys.path:
+        sys.path.insert(0, str(assetanalysis_dir))
+    from transcriptsegments import load_segment_index
+    
+    segment_index = load_segment_index(transcript_path, transcript_data)
+    logger.info(f"Transcript has {len(segment_index['segments'])} segments")
+    return segment_index
+
+def load_prompts(transcript_data: Dict[str, Any], user_brief: str, proj_name: str,
+                 include_confidence: bool = INCLUDE_WORD_CONFIDENCE,
+                segment_index: Optional[Dict[str, Any]] = None) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Load system prompt and format user prompt with transcript data and brief.
+    
+    The user prompt is returned as content blocks: it only depends on the transcript
+    and brief, so the whole request is a cached prefix (see promptcache.py).
+    """
     system = system_prompt()
-    transcript_json = json.dumps(transcript_data, indent=2)
+    # Speaker segments instead of one dict per word (see transcriptencoding.py)
+    transcript_json, _ = encode_transcript(transcript_data, include_confidence=include_confidence,
+                                           segment_index=segment_index)
+    logger.info(f"Transcript encoded in ~{estimate_tokens(transcript_json)} tokens")
     user = user_prompt(transcript_json=transcript_json, brief=user_brief, project_name=proj_name or "Unknown Project")
-    return system, user
+    return system, [cached_text(user)]
+
+def parse_timeline_response(response_content: str, segment_index: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Parse Claude's response text as timeline JSON and validate it against TARGET_SCHEMA.
+    
+    With the transcript's segment index, clips given as segment_ids are first
+    expanded to frame-accurate clips (see segmentclips.py).
+    """
+    # Clean markdown formatting if present
+    cleaned_response = response_content.strip()
+    if cleaned_response.startswith("```json"):
+        # Remove opening ```json
+        cleaned_response = cleaned_response[7:]
+    if cleaned_response.startswith("```"):
+        # Remove opening ``` (in case it's just ```)
+        cleaned_response = cleaned_response[3:]
+    if cleaned_response.endswith("```"):
+        # Remove closing ```
+        cleaned_response = cleaned_response[:-3]
+    
+    # Final strip
+    cleaned_response = cleaned_response.strip()
+    
+    result = json.loads(cleaned_response)
+    
+    if segment_index is not None:
+        expanded = expand_segment_clips(result, segment_index)
+        logger.info(f"Expanded {expanded} clips from segment IDs")
+    
+    # Validate against schema
+    validate(instance=result, schema=TARGET_SCHEMA)
+    return result
 
 def analyze_transcript_quality(transcript_data: Dict[str, Any]) -> Dict[str, Any]:
     """Analyze transcript quality based on confidence scores and provide insights."""
@@ -312,9 +389,17 @@ async def process_transcript_async(
     transcript_data: Dict[str, Any], 
     user_brief: str,
     output_filename: Optional[str] = None,
-    streaming_callback: Optional[callable] = None
+    streaming_callback: Optional[callable] = None,
+    segment_index: Optional[Dict[str, Any]] = None,
+    timeline_callback: Optional[callable] = None
 ) -> Dict[str, Any]:
-    """Process a transcript using Claude API with streaming and thinking features."""
+    """
+    Process a transcript using Claude API with streaming and thinking features.
+    
+    The response is parsed as it streams (see timelinestream.py): each completed clip
+    and track is passed to timeline_callback(kind, track_index, item) with kind "clip"
+    or "track", and a response that is not valid timeline JSON stops the stream early.
+    """
     logger.info("Starting transcript processing")
     
     try:
@@ -325,8 +410,13 @@ async def process_transcript_async(
         
         client = Anthropic(api_key=api_key)
         
+        # Clips are chosen by segment ID and expanded locally
+        if segment_index is None:
+            segment_index = build_segment_index(transcript_data)
+        
         # Get prompts
-        system_prompt, user_prompt = load_prompts(transcript_data, user_brief, project_name)
+        system_prompt, user_prompt = load_prompts(transcript_data, user_brief, project_name,
+                                                  segment_index=segment_index)
         
         # Create a message with streaming
         logger.info("Sending request to Claude API with thinking enabled")
@@ -335,11 +425,14 @@ async def process_transcript_async(
         thinking_content = ""
         response_content = ""
         
+        # Completed clips are handed on while the rest of the response streams
+        parser = TimelineStreamParser(TARGET_SCHEMA, segment_index)
+        
         # Create completion with proper streaming handling
         with client.messages.stream(
             model=CLAUDE_MODEL,
             max_tokens=MAX_TOKENS,
-            system=system_prompt,
+            system=cached_system(system_prompt),
             messages=[{"role": "user", "content": user_prompt}],
             thinking={"type": "enabled", "budget_tokens": THINKING_BUDGET},
         ) as stream:
@@ -355,30 +448,21 @@ async def process_transcript_async(
                             response_content += event.delta.text
                             if streaming_callback:
                                 streaming_callback("response", event.delta.text)
+                            # Raises TimelineStreamError, closing the stream, at the first structural error
+                            for kind, track_index, item in parser.feed(event.delta.text):
+                                if timeline_callback:
+                                    timeline_callback(kind, track_index, item)
+            
+            logger.info(f"Streamed {parser.clips_completed} clips in {parser.tracks_completed} tracks")
+            
+            # Record how much of the prompt was served from the prompt cache
+            prompt_cache_stats.record("roughcut", usage_dict(stream.get_final_message().usage))
         
         # Parse the JSON response
         try:
             logger.info("Parsing Claude's response as JSON")
             
-            # Clean markdown formatting if present
-            cleaned_response = response_content.strip()
-            if cleaned_response.startswith("```json"):
-                # Remove opening ```json
-                cleaned_response = cleaned_response[7:]
-            if cleaned_response.startswith("```"):
-                # Remove opening ``` (in case it's just ```)
-                cleaned_response = cleaned_response[3:]
-            if cleaned_response.endswith("```"):
-                # Remove closing ```
-                cleaned_response = cleaned_response[:-3]
-            
-            # Final strip
-            cleaned_response = cleaned_response.strip()
-            
-            result = json.loads(cleaned_response)
-            
-            # Validate against schema
-            validate(instance=result, schema=TARGET_SCHEMA)
+            result = parse_timeline_response(response_content, segment_index)
             
             # Save to file if output_filename is specified
             if output_filename:
@@ -396,6 +480,10 @@ async def process_transcript_async(
             logger.error(f"Error validating or processing result: {str(e)}")
             return {"error": str(e)}
     
+    except TimelineStreamError as e:
+        logger.error(f"Stopped the response early, it is not valid timeline JSON: {e}")
+        return {"error": "JSON structure error", "details": str(e)}
+    
     except Exception as e:
         logger.error(f"Error processing transcript: {str(e)}")
         return {"error": str(e)}
@@ -404,7 +492,9 @@ def process_transcript(
     transcript_data: Dict[str, Any], 
     user_brief: str,
     output_filename: Optional[str] = None,
-    streaming_callback: Optional[callable] = None
+    streaming_callback: Optional[callable] = None,
+    segment_index: Optional[Dict[str, Any]] = None,
+    timeline_callback: Optional[callable] = None
 ) -> Dict[str, Any]:
     """Synchronous wrapper around the async process_transcript function."""
     
@@ -420,7 +510,9 @@ def process_transcript(
                     transcript_data, 
                     user_brief,
                     output_filename, 
-                    streaming_callback
+                    streaming_callback,
+                    segment_index,
+                    timeline_callback
                 )
             )
             return future.result()
@@ -434,7 +526,9 @@ def process_transcript(
                     transcript_data, 
                     user_brief,
                     output_filename, 
-                    streaming_callback
+                    streaming_callback,
+                    segment_index,
+                    timeline_callback
                 )
             )
         finally:
@@ -561,10 +655,13 @@ def main_roughcut_workflow(silent: bool = False) -> Dict[str, Any]:
         
         # Load transcript data
         print_if_not_silent("\nLoading transcript...")
-        transcript_data = load_transcript_data()
+        transcript_path = find_transcript_file()
+        transcript_data = load_transcript_data(transcript_path)
+        segment_index = load_transcript_segments(transcript_path, transcript_data)
         timecode_offset = transcript_data.get("timecode_offset_frames", 0)
         print_if_not_silent(f"✓ Transcript loaded from: {ANALYZED_DIR}")
         print_if_not_silent(f"✓ Timecode offset: {timecode_offset} frames")
+        print_if_not_silent(f"✓ Segments: {len(segment_index['segments'])}")
         
         print_if_not_silent("\nSTEP 3: Analyzing transcript quality")
         print_if_not_silent("="*60)
@@ -614,8 +711,12 @@ def main_roughcut_workflow(silent: bool = False) -> Dict[str, Any]:
             transcript_data, 
             user_brief, 
             output_filename=str(output_filename),
-            streaming_callback=streaming_callback
+            streaming_callback=streaming_callback,
+            segment_index=segment_index
         )
+        # Release a memory-mapped transcript now, so its .cols file can be replaced (e.g. by reprocessing)
+        if hasattr(transcript_data, "close"):
+            transcript_data.close()
         
         print_if_not_silent("\n\nRough cut generation complete.")
         
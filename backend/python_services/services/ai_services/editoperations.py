@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Edit operations for re-edits: the model returns the change, not a new timeline.
+
+A re-edit used to send the current timeline and ask Claude to write the
+whole modified timeline back, so output tokens and latency grew with the
+timeline even for "remove the second speaker's intro". The reedit prompt
+now sends a compact outline of the timeline (timeline_outline()) and asks
+for a list of operations:
+
+    {"op": "delete", "clip": 3}
+    {"op": "trim", "clip": 2, "segment_ids": [14, 16]}
+    {"op": "trim", "clip": 2, "start_frame": 187100}          (in, out or both)
+    {"op": "move", "clip": 5, "to": 0}
+    {"op": "insert", "segment_ids": [40, 42], "at": 1}
+
+"clip" is a clip_index of the current timeline; "to" and "at" are positions
+in the clip order as it is when the operation runs. Operations run in order
+on the first track and the tracks linked to it, i.e. with the same clips
+(usually the video and its audio). Other tracks, such as music or B-roll,
+are left as they are.
+
+Frames in the outline and the operations are start-inclusive and end-exclusive,
+like segment frame_in/frame_out; they are derived from each clip's
+start_frame and duration_frames, whatever end_frame convention the
+timeline file uses, and written back with an inclusive end_frame.
+
+apply_edit_operations() patches a copy of the loaded timeline: new and
+trimmed frame ranges come from the transcript's segment index (see
+segmentclips.py) and must lie within the transcript; clips are renumbered
+and the durations recomputed afterwards.
+"""
+
+import copy
+from typing import Any, Dict, List
+
+try:
+    # Try relative imports first (when run as module)
+    from .segmentclips import expand_clip, frame_range, media_reference, range_end, update_timeline_totals
+except ImportError:
+    # Fall back to absolute imports (when run directly)
+    from segmentclips import expand_clip, frame_range, media_reference, range_end, update_timeline_totals
+
+OPERATIONS = ("delete", "trim", "move", "insert")
+
+OPERATIONS_SCHEMA = {
+    "type": "object",
+    "required": ["operations"],
+    "properties": {
+        "operations": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["op"],
+                "properties": {
+                    "op": {"enum": list(OPERATIONS)},
+                    "clip": {"type": "integer"},
+                    "to": {"type": "integer"},
+                    "at": {"type": "integer"},
+                    "segment_ids": {"type": "array", "items": {"type": "integer"}, "minItems": 1, "maxItems": 2},
+                    "start_frame": {"type": "integer"},
+                    "end_frame": {"type": "integer"}
+                }
+            }
+        },
+        "notes": {"type": "string"}
+    }
+}
+
+# Fields of each clip row in timeline_outline()
+CLIP_COLUMNS = ["clip_index", "start_frame", "end_frame", "segment_ids", "text"]
+
+
+def _clip_key(clip: Dict[str, Any]) -> tuple:
+    source_range = clip.get("source_range", {})
+    return clip.get("clip_index"), source_range.get("start_frame"), source_range.get("duration_frames")
+
+
+def linked_tracks(timeline: Dict[str, Any]) -> List[int]:
+    """Positions of the first track and the tracks with the same clips; edit operations apply to these."""
+    tracks = timeline.get("tracks") or []
+    if not tracks:
+        return []
+    first_keys = [_clip_key(clip) for clip in tracks[0].get("clips") or []]
+    return [0] + [position for position, track in enumerate(tracks[1:], 1)
+                  if [_clip_key(clip) for clip in track.get("clips") or []] == first_keys]
+
+
+def timeline_outline(timeline: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The current timeline as the reedit prompt sends it: one row per clip.
+
+    Tracks with the same clips as the first track (the usual linked audio
+    track) are listed as "same_clips_as_track" instead of repeating them.
+    Other tracks are listed with "edited": false, as context only.
+    """
+    tracks = timeline.get("tracks") or []
+    linked = linked_tracks(timeline)
+    outline = {
+        "fps": (timeline.get("timeline") or {}).get("fps"),
+        "duration_frames": (timeline.get("summary") or {}).get("timeline_duration_frames"),
+        "clip_columns": CLIP_COLUMNS,
+        "tracks": []
+    }
+    for position, track in enumerate(tracks):
+        clips = track.get("clips") or []
+        entry = {"track_index": track.get("track_index", position), "kind": track.get("kind")}
+        if position and position in linked:
+            entry["same_clips_as_track"] = tracks[0].get("track_index", 0)
+        else:
+            if position not in linked:
+                entry["edited"] = False
+            entry["clips"] = [
+                [clip.get("clip_index"), clip["source_range"]["start_frame"], range_end(clip["source_range"]),
+                 (clip.get("metadata") or {}).get("segment_ids"), (clip.get("metadata") or {}).get("text", "")]
+                for clip in clips
+            ]
+        outline["tracks"].append(entry)
+    return outline
+
+
+def _transcript_range(segment_index: Dict[str, Any]) -> tuple:
+    start = segment_index.get("timecode_offset_frames", 0)
+    return start, start + segment_index.get("duration_frames", 0)
+
+
+def _check_range(clip: Dict[str, Any], segment_index: Dict[str, Any], operation: str) -> None:
+    """A clip's source range must be non-empty and lie within the transcript."""
+    source_range = clip["source_range"]
+    start, end = source_range["start_frame"], range_end(source_range)
+    first, last = _transcript_range(segment_index)
+    if not start < end:
+        raise ValueError(f"{operation}: empty frame range {start}-{end}")
+    if start < first or end > last:
+        raise ValueError(f"{operation}: frames {start}-{end} are outside the transcript ({first}-{last})")
+
+
+def _find(clips: List[Dict[str, Any]], clip: Dict[str, Any]) -> int:
+    return next(position for position, candidate in enumerate(clips) if candidate is clip)
+
+
+def _position(operation: Dict[str, Any], field: str, name: str, limit: int) -> int:
+    if field not in operation:
+        raise ValueError(f"{name}: missing '{field}'")
+    position = operation[field]
+    if not 0 <= position <= limit:
+        raise ValueError(f"{name}: position {position} is outside 0-{limit}")
+    return position
+
+
+def _trim(clip: Dict[str, Any], operation: Dict[str, Any], segment_index: Dict[str, Any], name: str) -> None:
+    if "segment_ids" in operation:
+        clip["segment_ids"] = operation["segment_ids"]
+        _expand(clip, segment_index, name)
+        return
+    if "start_frame" not in operation and "end_frame" not in operation:
+        raise ValueError(f"{name}: give segment_ids, start_frame or end_frame")
+    source_range = clip["source_range"]
+    start = operation.get("start_frame", source_range["start_frame"])
+    end = operation.get("end_frame", range_end(source_range))
+    clip["source_range"] = {**source_range, **frame_range(start, end, source_range.get("fps"))}
+    # The clip no longer plays exactly these segments
+    (clip.get("metadata") or {}).pop("segment_ids", None)
+
+
+def _expand(clip: Dict[str, Any], segment_index: Dict[str, Any], name: str) -> Dict[str, Any]:
+    try:
+        return expand_clip(clip, segment_index)
+    except ValueError as e:
+        raise ValueError(f"{name}: {e}")
+
+
+def _new_clip(track: Dict[str, Any], segment_ids: List[int], segment_index: Dict[str, Any],
+              name: str) -> Dict[str, Any]:
+    """A clip playing segment_ids, named and referenced like the (linked) track's other clips."""
+    template = next(iter(track.get("clips") or []), None)
+    clip = {
+        "clip_index": 0,
+        "name": template["name"] if template else segment_index.get("file_name", ""),
+        "segment_ids": list(segment_ids),
+        "metadata": {},
+        "media_reference": copy.deepcopy(template["media_reference"]) if template else media_reference(segment_index)
+    }
+    return _expand(clip, segment_index, name)
+
+
+def apply_edit_operations(timeline: Dict[str, Any], operations: List[Dict[str, Any]],
+                          segment_index: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Apply edit operations to a copy of a timeline (see module docstring).
+
+    Args:
+        timeline: The current timeline; not changed
+        operations: The operations, in order
+        segment_index: The transcript's segment index
+
+    Returns:
+        The edited timeline, with clips renumbered and durations recomputed
+
+    Raises:
+        ValueError: If an operation refers to a missing clip or segment, or a
+            resulting frame range is empty or outside the transcript
+    """
+    edited = copy.deepcopy(timeline)
+    tracks = [edited["tracks"][position] for position in linked_tracks(edited)]
+    # Clips by their clip_index in the current timeline, per linked track
+    by_index = [{clip.get("clip_index"): clip for clip in track.get("clips") or []} for track in tracks]
+
+    for number, operation in enumerate(operations):
+        kind = operation.get("op")
+        name = f"Operation {number} ({kind})"
+        if kind not in OPERATIONS:
+            raise ValueError(f"{name}: unknown operation")
+        if kind == "insert" and "segment_ids" not in operation:
+            raise ValueError(f"{name}: missing 'segment_ids'")
+        if kind != "insert" and not any(operation.get("clip") in clips for clips in by_index):
+            raise ValueError(f"{name}: no clip {operation.get('clip')!r} in the current timeline")
+
+        for track, clips_by_index in zip(tracks, by_index):
+            clips = track.setdefault("clips", [])
+            if kind == "insert":
+                position = _position(operation, "at", name, len(clips))
+                clip = _new_clip(track, operation["segment_ids"], segment_index, name)
+                _check_range(clip, segment_index, name)
+                clips.insert(position, clip)
+                continue
+
+            clip = clips_by_index.get(operation["clip"])
+            if clip is None:
+                continue
+            if not any(candidate is clip for candidate in clips):
+                raise ValueError(f"{name}: clip {operation['clip']} was already deleted")
+            if kind == "delete":
+                clips.pop(_find(clips, clip))
+            elif kind == "move":
+                clips.pop(_find(clips, clip))
+                clips.insert(_position(operation, "to", name, len(clips)), clip)
+            else:
+                _trim(clip, operation, segment_index, name)
+                _check_range(clip, segment_index, name)
+
+    for track in tracks:
+        for position, clip in enumerate(track.get("clips") or []):
+            clip["clip_index"] = position
+    update_timeline_totals(edited)
+    return edited
+
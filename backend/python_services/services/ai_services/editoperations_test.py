@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Edit Operations Test Script
+
+Applies re-edit operations to a recorded timeline (data/timelineprocessing)
+with the sample transcript in data/analyzed, without calling the Claude API:
+- Delete, trim, move and insert patch the linked video and audio tracks in
+  sync, and leave unlinked tracks (music) alone
+- Frame ranges are checked against the transcript, and bad operations rejected
+- An operations reply parses through the reedit agent and is a fraction of
+  the size of the whole timeline it replaces
+"""
+
+import sys
+import json
+from pathlib import Path
+
+# Add the ai_services directory to Python path for imports
+script_dir = Path(__file__).parent
+sys.path.insert(0, str(script_dir))
+
+DATA_DIR = script_dir.parent.parent / "data"
+TRANSCRIPT_PATH = DATA_DIR / "analyzed" / "20250509_MTC_2206.transcript.json"
+TIMELINE_PATH = DATA_DIR / "timelineprocessing" / "timeline_edited" / "Nice_Touch_launch_Video_reedit_v2_20250627_173230.json"
+# Exported from Resolve by otio2json.py, with inclusive end_frame
+EXPORTED_TIMELINE_PATH = DATA_DIR / "timelineprocessing" / "timeline_ref" / "exported_timeline.json"
+
+
+def load_fixtures(timeline_path=TIMELINE_PATH):
+    from transcriptsegments import build_segment_index
+
+    with open(TRANSCRIPT_PATH, "r", encoding="utf-8") as f:
+        segment_index = build_segment_index(json.load(f))
+    with open(timeline_path, "r", encoding="utf-8") as f:
+        timeline = json.load(f)
+    return timeline, segment_index
+
+
+def clip_starts(track):
+    return [clip["source_range"]["start_frame"] for clip in track["clips"]]
+
+
+def test_apply_operations():
+    """Each kind of operation patches the linked tracks; clips are renumbered and totals recomputed."""
+    print("🔍 Testing delete, trim, move and insert...")
+
+    from jsonschema import validate
+    from editagent_reedit import TARGET_SCHEMA
+    from editoperations import apply_edit_operations
+
+    timeline, segment_index = load_fixtures()
+    original = json.dumps(timeline)
+    segments = segment_index["segments"]
+    starts = clip_starts(timeline["tracks"][0])
+    clip_3 = timeline["tracks"][0]["clips"][3]["source_range"]
+
+    operations = [
+        {"op": "delete", "clip": 1},
+        {"op": "move", "clip": 6, "to": 0},
+        {"op": "trim", "clip": 2, "segment_ids": [20, 21]},
+        {"op": "trim", "clip": 3, "end_frame": clip_3["start_frame"] + clip_3["duration_frames"] - 10},
+        {"op": "insert", "segment_ids": [5, 5], "at": 2},
+    ]
+    edited = apply_edit_operations(timeline, operations, segment_index)
+    assert json.dumps(timeline) == original, "The existing timeline was changed"
+    validate(instance=edited, schema=TARGET_SCHEMA)
+
+    video, audio = edited["tracks"]
+    assert clip_starts(video) == clip_starts(audio), "Video and audio tracks are out of sync"
+    assert clip_starts(video) == [starts[6], starts[0], segments[5]["frame_in"], segments[20]["frame_in"],
+                                  starts[3], starts[4], starts[5]]
+    assert [clip["clip_index"] for clip in video["clips"]] == list(range(7))
+    inserted = video["clips"][2]
+    assert inserted["source_range"]["duration_frames"] == segments[5]["frame_out"] - segments[5]["frame_in"]
+    assert inserted["source_range"]["end_frame"] == segments[5]["frame_out"] - 1
+    assert inserted["metadata"]["text"] == segments[5]["text"]
+    assert inserted["media_reference"] == timeline["tracks"][0]["clips"][0]["media_reference"]
+    assert video["clips"][4]["source_range"]["duration_frames"] == clip_3["duration_frames"] - 10
+
+    duration = sum(clip["source_range"]["duration_frames"] for clip in video["clips"])
+    assert edited["summary"]["timeline_duration_frames"] == duration
+    assert video["metadata"]["total_clips"] == 7 and edited["summary"]["total_clips"] == 14
+
+    print(f"✅ {len(operations)} operations applied: {len(video['clips'])} clips per track, {duration} frames")
+    return True
+
+
+def test_trim_frames():
+    """Start-only and end-only trims keep the other end, whatever end_frame convention the file uses."""
+    print("\n🔍 Testing frame trims on an exported timeline...")
+
+    from editoperations import apply_edit_operations, timeline_outline
+
+    timeline, segment_index = load_fixtures(EXPORTED_TIMELINE_PATH)
+    source_range = timeline["tracks"][0]["clips"][0]["source_range"]
+    start, duration = source_range["start_frame"], source_range["duration_frames"]
+    assert source_range["end_frame"] == start + duration - 1, "Expected an inclusive end_frame in the export"
+
+    # The outline gives the exclusive end, like a segment's frame_out
+    assert timeline_outline(timeline)["tracks"][0]["clips"][0][2] == start + duration
+
+    trims = {
+        "start only": ({"start_frame": start + 44}, start + 44, duration - 44),
+        "end only": ({"end_frame": start + duration - 20}, start, duration - 20),
+        "both": ({"start_frame": start + 10, "end_frame": start + 110}, start + 10, 100),
+    }
+    for name, (frames, expected_start, expected_duration) in trims.items():
+        edited = apply_edit_operations(timeline, [{"op": "trim", "clip": 0, **frames}], segment_index)
+        for track in edited["tracks"]:
+            trimmed = track["clips"][0]["source_range"]
+            assert trimmed["start_frame"] == expected_start, name
+            assert trimmed["duration_frames"] == expected_duration, f"{name}: {trimmed['duration_frames']} frames"
+            assert trimmed["end_frame"] == expected_start + expected_duration - 1, name
+        print(f"✅ {name}: {expected_duration} frames from {expected_start}")
+    return True
+
+
+def test_unlinked_track_untouched():
+    """A music track with its own clips is neither edited nor used as an insert template."""
+    print("\n🔍 Testing an unlinked music track...")
+
+    from editoperations import apply_edit_operations, timeline_outline
+
+    timeline, segment_index = load_fixtures()
+    reference = timeline["tracks"][0]["clips"][0]
+    music_clips = []
+    for clip_index in range(3):
+        music_clip = json.loads(json.dumps(reference))
+        music_clip.update({"clip_index": clip_index, "name": "music.wav", "metadata": {}})
+        music_clip["media_reference"].update({"target_url": "music.wav", "filename": "music.wav"})
+        music_clip["source_range"]["start_frame"] = clip_index * 1000
+        music_clips.append(music_clip)
+    music = {"track_index": 2, "name": "Music", "kind": "Audio", "metadata": {}, "clips": music_clips}
+    timeline["tracks"].append(music)
+    original_music = json.dumps(music)
+
+    outline = timeline_outline(timeline)
+    assert outline["tracks"][1]["same_clips_as_track"] == 0 and "edited" not in outline["tracks"][0]
+    assert outline["tracks"][2]["edited"] is False and len(outline["tracks"][2]["clips"]) == 3
+
+    operations = [{"op": "delete", "clip": 1}, {"op": "insert", "segment_ids": [5, 6], "at": 0}]
+    edited = apply_edit_operations(timeline, operations, segment_index)
+    video, audio, edited_music = edited["tracks"]
+    assert clip_starts(video) == clip_starts(audio) and len(video["clips"]) == 7
+    assert video["clips"][0]["name"] == reference["name"] != "music.wav"
+    assert [clip["name"] for clip in edited_music["clips"]] == ["music.wav"] * 3
+    assert edited_music["clips"] == json.loads(original_music)["clips"], "The music track was edited"
+
+    print(f"✅ Video and audio edited in sync; music track kept its {len(edited_music['clips'])} clips")
+    return True
+
+
+def test_rejects_bad_operations():
+    """Missing clips, unknown segments and frames outside the transcript are rejected."""
+    print("\n🔍 Testing operation validation...")
+
+    from editoperations import apply_edit_operations
+
+    timeline, segment_index = load_fixtures()
+    first_frame = segment_index["timecode_offset_frames"]
+    last_frame = first_frame + segment_index["duration_frames"]
+    cases = {
+        "unknown clip": [{"op": "delete", "clip": 99}],
+        "deleted twice": [{"op": "delete", "clip": 0}, {"op": "trim", "clip": 0, "segment_ids": [1, 2]}],
+        "unknown segment": [{"op": "insert", "segment_ids": [len(segment_index["segments"])], "at": 0}],
+        "position out of range": [{"op": "move", "clip": 0, "to": 50}],
+        "trim before the transcript": [{"op": "trim", "clip": 0, "start_frame": first_frame - 1}],
+        "trim past the transcript": [{"op": "trim", "clip": 6, "end_frame": last_frame + 1}],
+        "empty trim": [{"op": "trim", "clip": 0, "start_frame": 200000, "end_frame": 200000}],
+    }
+    for name, operations in cases.items():
+        try:
+            apply_edit_operations(timeline, operations, segment_index)
+            print(f"❌ {name}: not rejected")
+            return False
+        except ValueError as e:
+            print(f"✅ {name}: {e}")
+    return True
+
+
+def test_reedit_reply_size():
+    """An operations reply streams and parses through the reedit agent, at a fraction of the size."""
+    print("\n🔍 Testing an operations reply through the reedit agent...")
+
+    import editagent_reedit
+    from editoperations import timeline_outline
+    from timelinestream import TimelineStreamParser
+
+    timeline, segment_index = load_fixtures()
+    reply = json.dumps({"operations": [{"op": "delete", "clip": 1}], "notes": "Removed the history section"})
+
+    parser = TimelineStreamParser(editagent_reedit.TARGET_SCHEMA, segment_index)
+    events = parser.feed(reply)
+    parser.close()
+    assert events == [("operation", 0, {"op": "delete", "clip": 1})]
+
+    result = editagent_reedit.parse_timeline_response(f"```json\n{reply}\n```", segment_index, timeline)
+    assert result["summary"]["total_clips"] == 12
+    assert result["timeline"]["metadata"]["generated_by"] == "editagent_reedit"
+
+    # What the model used to write back for the same change
+    whole_timeline = json.dumps(result, indent=2)
+    outline = json.dumps(timeline_outline(timeline), separators=(",", ":"))
+    assert "same_clips_as_track" in outline
+    assert len(reply) * 20 < len(whole_timeline)
+    assert len(outline) * 3 < len(json.dumps(timeline, indent=2))
+
+    print(f"✅ Reply of {len(reply)} characters instead of {len(whole_timeline)}; "
+          f"timeline sent as {len(outline)} characters instead of {len(json.dumps(timeline, indent=2))}")
+    return True
+
+
+def main():
+    """Run all tests and provide summary."""
+    print("🧪 Edit Operations Test Suite")
+    print("=" * 50)
+
+    tests = [
+        ("Apply Operations", test_apply_operations),
+        ("Trim Frames", test_trim_frames),
+        ("Unlinked Track Untouched", test_unlinked_track_untouched),
+        ("Rejects Bad Operations", test_rejects_bad_operations),
+        ("Reedit Reply Size", test_reedit_reply_size),
+    ]
+
+    results = []
+
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+        except Exception as e:
+            print(f"❌ {test_name} crashed: {e!r}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{'✅ PASS' if result else '❌ FAIL'} {test_name}")
+    print(f"\n📊 Results: {passed} passed, {len(results) - passed} failed")
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Prompt caching for the Claude calls.
+
+Each roughcut, reedit and chatbot request starts with a large part that does
+not change between calls: the system prompt, the tool schemas and, for the
+edit agents, the transcript and brief. The request builders put that part
+first, byte-identical across calls, and mark its end with cache_control so
+the API serves it from the prompt cache instead of processing it again:
+
+- cached_system() / cached_text() make a text block ending a cached prefix;
+- cached_tools() marks the last tool schema (tools come before the system
+  prompt in the cached prefix);
+- with_cache_breakpoint() marks the last message, so each request of a
+  chatbot tool loop reads the previous request's messages from the cache.
+
+The usage of every call (uncached input, cache writes, cache reads, output
+tokens) is logged and added to prompt_cache_stats per kind of call, which
+GET /metrics reports.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CACHE_CONTROL = {"type": "ephemeral"}
+
+# Token counts in the Messages API usage object
+USAGE_FIELDS = ("input_tokens", "cache_creation_input_tokens", "cache_read_input_tokens", "output_tokens")
+
+
+def cached_text(text: str) -> Dict[str, Any]:
+    """A text content block that ends a cached prefix."""
+    return {"type": "text", "text": text, "cache_control": dict(CACHE_CONTROL)}
+
+
+def cached_system(text: str) -> List[Dict[str, Any]]:
+    """A system prompt as a cached text block."""
+    return [cached_text(text)]
+
+
+def cached_tools(tools: Optional[List[Dict[str, Any]]]) -> Optional[List[Dict[str, Any]]]:
+    """A copy of the tool schemas with the last one marked for caching."""
+    if not tools:
+        return tools
+    tools = list(tools)
+    tools[-1] = {**tools[-1], "cache_control": dict(CACHE_CONTROL)}
+    return tools
+
+
+def with_cache_breakpoint(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    A copy of the messages with the last content block of the last message marked for caching.
+
+    The messages themselves are not changed, so earlier breakpoints do not pile up
+    (a request may have at most 4). SDK content blocks are left unmarked.
+    """
+    if not messages:
+        return messages
+    last = messages[-1]
+    content = last["content"]
+    if isinstance(content, str):
+        content = [cached_text(content)]
+    elif content and isinstance(content[-1], dict):
+        content = list(content[:-1]) + [{**content[-1], "cache_control": dict(CACHE_CONTROL)}]
+    else:
+        return messages
+    return list(messages[:-1]) + [{**last, "content": content}]
+
+
+def usage_dict(usage: Any) -> Dict[str, int]:
+    """The token counts of a Messages API usage object (missing counts are 0)."""
+    return {field: getattr(usage, field, None) or 0 for field in USAGE_FIELDS}
+
+
+def add_usage(total: Dict[str, int], usage: Dict[str, int]) -> Dict[str, int]:
+    """Add one call's token counts to a running total (in place); returns the total."""
+    for field in USAGE_FIELDS:
+        total[field] = total.get(field, 0) + usage.get(field, 0)
+    return total
+
+
+def cache_hit_ratio(usage: Dict[str, int]) -> Optional[float]:
+    """Share of the input tokens read from the cache, or None without input."""
+    total_input = sum(usage.get(field, 0) for field in USAGE_FIELDS if field != "output_tokens")
+    return usage.get("cache_read_input_tokens", 0) / total_input if total_input else None
+
+
+class PromptCacheStats:
+    """Token counts of Claude calls since the process started, per kind of call; thread-safe."""
+
+    def __init__(self):
+        self._totals: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, usage: Dict[str, int]) -> None:
+        """Add one call's usage (see usage_dict) and log it."""
+        with self._lock:
+            totals = self._totals.setdefault(kind, {"calls": 0})
+            totals["calls"] += 1
+            add_usage(totals, usage)
+        ratio = cache_hit_ratio(usage)
+        logger.info(f"Claude {kind} call: {usage['input_tokens']} uncached input tokens, "
+                    f"{usage['cache_creation_input_tokens']} written to and {usage['cache_read_input_tokens']} "
+                    f"read from the prompt cache ({(ratio or 0) * 100:.0f}% hit), {usage['output_tokens']} output tokens")
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Per kind of call: calls and the totals of USAGE_FIELDS."""
+        with self._lock:
+            return {kind: dict(totals) for kind, totals in self._totals.items()}
+
+
+# Process-wide stats (the edit agents also run inside the API server, as chatbot tools)
+prompt_cache_stats = PromptCacheStats()
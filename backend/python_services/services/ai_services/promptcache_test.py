@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Prompt Cache Test Script
+
+Checks the request layout used for prompt caching, without calling the
+Claude API:
+- The edit agents' prompts start with a cached prefix that is byte-identical
+  across calls, and the parts that change come after it
+- Marking tools and messages for caching does not change the originals
+- Usage from the API is added up per kind of call
+"""
+
+import sys
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add the ai_services directory to Python path for imports
+script_dir = Path(__file__).parent
+sys.path.insert(0, str(script_dir))
+
+TRANSCRIPT_PATH = script_dir.parent.parent / "data" / "analyzed" / "20250509_MTC_2206.transcript.json"
+
+
+def test_stable_prefix():
+    """The system prompt, transcript and brief are the same bytes whatever the timeline and instructions."""
+    print("🔍 Testing the cached prefix of the edit agent prompts...")
+
+    import editagent_reedit
+    import editagent_roughcut
+    from promptcache import CACHE_CONTROL, cached_system
+    from transcriptsegments import build_segment_index
+
+    with open(TRANSCRIPT_PATH, "r", encoding="utf-8") as f:
+        transcript = json.load(f)
+    segment_index = build_segment_index(transcript)
+
+    requests = [
+        editagent_reedit.load_prompts({"tracks": [], "summary": {"total_clips": count}}, transcript,
+                                      "brief", "Project", instructions, segment_index=segment_index)
+        for count, instructions in ((1, "Make it shorter"), (7, "Open with the product demo"))
+    ]
+    (system_a, user_a), (system_b, user_b) = requests
+    assert json.dumps(cached_system(system_a)) == json.dumps(cached_system(system_b))
+    assert json.dumps(user_a[0]) == json.dumps(user_b[0]), "The cached user block changed between re-edits"
+    assert user_a[0]["cache_control"] == CACHE_CONTROL and "cache_control" not in user_a[1]
+    assert '"segments":[[0,' in user_a[0]["text"] and "Make it shorter" in user_a[1]["text"]
+    assert user_a[1]["text"] != user_b[1]["text"]
+
+    _, roughcut_user = editagent_roughcut.load_prompts(transcript, "brief", "Project", segment_index=segment_index)
+    assert len(roughcut_user) == 1 and roughcut_user[0]["cache_control"] == CACHE_CONTROL
+
+    print(f"✅ Re-edit prefix of {len(system_a) + len(user_a[0]['text'])} characters is identical across calls")
+    return True
+
+
+def test_breakpoints_do_not_mutate():
+    """cached_tools and with_cache_breakpoint mark copies, leaving one breakpoint per request."""
+    print("\n🔍 Testing cache breakpoints...")
+
+    from promptcache import cached_tools, with_cache_breakpoint
+    from toolcalling.toolcaller import get_tool_schemas_for_claude
+
+    tools = get_tool_schemas_for_claude()
+    before = json.dumps(tools)
+    marked = cached_tools(tools)
+    assert json.dumps(tools) == before, "cached_tools changed the tool schemas"
+    assert "cache_control" in marked[-1] and not any("cache_control" in tool for tool in marked[:-1])
+    assert json.dumps(cached_tools(get_tool_schemas_for_claude())) == json.dumps(marked), "Tool schemas are not stable"
+
+    messages = [{"role": "user", "content": "Hello"}]
+    first = with_cache_breakpoint(messages)
+    assert messages == [{"role": "user", "content": "Hello"}]
+    assert first[0]["content"][0]["cache_control"]
+
+    messages.append({"role": "assistant", "content": [SimpleNamespace(type="tool_use")]})
+    messages.append({"role": "user", "content": [{"type": "tool_result", "tool_use_id": "1", "content": "{}"}]})
+    second = with_cache_breakpoint(messages)
+    assert "cache_control" in second[-1]["content"][-1] and "cache_control" not in messages[-1]["content"][-1]
+    assert second[0] is messages[0], "Earlier messages should not be marked again"
+
+    print(f"✅ Last of {len(tools)} tools and last message marked on copies")
+    return True
+
+
+def test_usage_stats():
+    """Usage objects with missing cache fields count as 0, and calls add up per kind."""
+    print("\n🔍 Testing usage accounting...")
+
+    from promptcache import PromptCacheStats, add_usage, cache_hit_ratio, usage_dict
+
+    first = usage_dict(SimpleNamespace(input_tokens=120, cache_creation_input_tokens=9000,
+                                       cache_read_input_tokens=None, output_tokens=300))
+    second = usage_dict(SimpleNamespace(input_tokens=80, cache_read_input_tokens=9000, output_tokens=200))
+    assert first["cache_read_input_tokens"] == 0 and second["cache_creation_input_tokens"] == 0
+    assert round(cache_hit_ratio(second), 3) == round(9000 / 9080, 3) and cache_hit_ratio({}) is None
+
+    stats = PromptCacheStats()
+    stats.record("reedit", first)
+    stats.record("reedit", second)
+    stats.record("chatbot", second)
+    snapshot = stats.snapshot()
+    assert snapshot["reedit"] == add_usage({"calls": 2}, add_usage(dict(first), second))
+    assert snapshot["chatbot"]["calls"] == 1 and snapshot["chatbot"]["cache_read_input_tokens"] == 9000
+
+    print(f"✅ {snapshot['reedit']['cache_read_input_tokens']} cached input tokens over 2 re-edit calls")
+    return True
+
+
+def main():
+    """Run all tests and provide summary."""
+    print("🧪 Prompt Cache Test Suite")
+    print("=" * 50)
+
+    tests = [
+        ("Stable Prefix", test_stable_prefix),
+        ("Breakpoints Do Not Mutate", test_breakpoints_do_not_mutate),
+        ("Usage Stats", test_usage_stats),
+    ]
+
+    results = []
+
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+        except Exception as e:
+            print(f"❌ {test_name} crashed: {e!r}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{'✅ PASS' if result else '❌ FAIL'} {test_name}")
+    print(f"\n📊 Results: {passed} passed, {len(results) - passed} failed")
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
@@ -37,18 +37,8 @@ Timeline JSON Schema
         {
           "clip_index": <integer>,
           "name": <string>,
-          "metadata": {
-            "speaker": <string>,
-            "text": <string>,
-            "avg_confidence": <number>,
-            "original_segment_id": <integer>
-          },
-          "source_range": {
-            "start_frame": <integer>,
-            "duration_frames": <integer>,
-            "end_frame": <integer>,
-            "fps": <number>
-          },
+          "segment_ids": [<first segment id>, <last segment id>],
+          "metadata": {},
           "media_reference": {
             "type": "ExternalReference",
             "target_url": <string>,
@@ -73,9 +63,21 @@ Timeline JSON Schema
   }
 }
 
+Transcript Format  
+The transcript JSON lists speaker segments instead of single words  
+1 segment_columns names the fields of each row in segments: id, speaker, frame_in, frame_out, avg_confidence, text and, when present, word_confidence (one score per word of text)  
+2 A segment is one sentence or phrase by one speaker and frame_in to frame_out covers all of its words, so segment boundaries are the cut points  
+3 silences lists [frame_in, frame_out] of each silence longer than silence_threshold_ms  
+
+Clips  
+1 Give each clip as segment_ids [first id, last id], a run of consecutive segments it plays from the start of the first to the end of the last  
+2 Do not write frame numbers: source_range and the clip metadata (speaker, text, avg_confidence, original_segment_id) are filled in from the segments  
+3 A clip may cover segments of more than one speaker but not a silence you want to omit, so end the clip before it and start a new one after it  
+4 Give timeline, track and summary durations as your best estimate, they are recomputed from the clips  
+
 Editing Guidelines  
 1 Use silence markers to identify natural cut points and omit silences longer than the threshold  
-2 Use confidence scores to prefer high reliability segments avoid words under confidence 0.7  
+2 Use confidence scores to prefer high reliability segments avoid segments (or words) under confidence 0.7  
 3 Always pick the last take when phrases repeat  
 4 Preserve chronological order but feel free to arrange for better narrative flow  
 5 End clips at sentence boundaries or adjacent to silence markers  
@@ -83,7 +85,7 @@ Editing Guidelines
 7 ALWAYS CHECK YOUR TIMING within clips and ensure it's likely to be the best possible take and contributing to the narrative.
 
 Error Handling  
-1 If clips overlap adjust frame ranges rather than error out  
+1 If clips overlap adjust segment ranges rather than error out  
 2 If uncertain make a reasonable assumption but still output valid JSON  
 
 Processing  
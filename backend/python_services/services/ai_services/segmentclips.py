@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Expand segment-ID clips in an edit agent's timeline into frame-accurate clips.
+
+The roughcut and reedit prompts send the transcript as a segment index (see
+transcriptencoding.py) and ask the model to give each clip as
+"segment_ids": [first_id, last_id], a run of consecutive segments, instead
+of copying frame numbers. expand_segment_clips() turns those clips back into
+the timeline schema locally:
+
+- source_range runs from the first segment's frame_in to the last segment's
+  frame_out, at the transcript's fps;
+- segment frame_out is exclusive, while timeline JSON end_frame is inclusive
+  (start_frame + duration_frames - 1, as otio2json.py writes it); see
+  frame_range() and range_end();
+- metadata gets the segments' speaker(s), text, word-weighted average
+  confidence, original_segment_id (the first segment) and segment_ids;
+- a missing media_reference is filled in from the transcript's file and range.
+
+Clips that already have a source_range and no segment_ids (e.g. clips a
+re-edit keeps from an older timeline) are left alone. Track and timeline
+totals are recomputed when any clip was expanded.
+"""
+
+from typing import Any, Dict, List
+
+
+def _segment_run(segments: List[Dict[str, Any]], segment_ids: Any) -> List[Dict[str, Any]]:
+    """The segments from the first to the last of segment_ids; raises ValueError for bad IDs."""
+    if isinstance(segment_ids, int):
+        segment_ids = [segment_ids]
+    if not isinstance(segment_ids, list) or not segment_ids or not all(isinstance(i, int) for i in segment_ids):
+        raise ValueError(f"segment_ids must be [first_id, last_id], got {segment_ids!r}")
+    first, last = segment_ids[0], segment_ids[-1]
+    if not 0 <= first <= last < len(segments):
+        raise ValueError(f"Unknown or reversed segment_ids {segment_ids!r} (segments 0-{len(segments) - 1})")
+    return segments[first:last + 1]
+
+
+def frame_range(start: int, end: int, fps: float) -> Dict[str, Any]:
+    """A timeline JSON range playing frames start to end (exclusive)."""
+    return {"start_frame": start, "duration_frames": end - start, "end_frame": end - 1, "fps": fps}
+
+
+def range_end(frame_range: Dict[str, Any]) -> int:
+    """The exclusive end of a timeline JSON range, from start_frame and duration_frames."""
+    return frame_range["start_frame"] + frame_range["duration_frames"]
+
+
+def media_reference(segment_index: Dict[str, Any]) -> Dict[str, Any]:
+    """ExternalReference to the transcript's source file, covering all of its frames."""
+    fps = segment_index.get("fps")
+    start = segment_index.get("timecode_offset_frames", 0)
+    duration = segment_index.get("duration_frames", 0)
+    file_name = segment_index.get("file_name", "")
+    return {
+        "type": "ExternalReference",
+        "target_url": file_name,
+        "filename": file_name,
+        "available_range": {"start_frame": start, "duration_frames": duration,
+                            "end_frame": start + duration - 1, "fps": fps}
+    }
+
+
+def expand_clip(clip: Dict[str, Any], segment_index: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill in a segment-ID clip's source_range, metadata and media_reference (in place)."""
+    run = _segment_run(segment_index["segments"], clip.pop("segment_ids"))
+    fps = segment_index.get("fps")
+    clip["source_range"] = frame_range(run[0]["frame_in"], run[-1]["frame_out"], fps)
+
+    speakers = list(dict.fromkeys(segment["speaker"] for segment in run))
+    weighted = [(segment["avg_confidence"], segment["word_end"] - segment["word_start"])
+                for segment in run if segment["avg_confidence"] is not None]
+    word_count = sum(count for _, count in weighted)
+    metadata = clip.get("metadata") if isinstance(clip.get("metadata"), dict) else {}
+    metadata.update({
+        "speaker": ",".join(speakers),
+        "text": " ".join(segment["text"] for segment in run),
+        "avg_confidence": round(sum(c * n for c, n in weighted) / word_count, 3) if word_count else None,
+        "original_segment_id": run[0]["id"],
+        "segment_ids": [run[0]["id"], run[-1]["id"]]
+    })
+    clip["metadata"] = metadata
+    if not clip.get("media_reference"):
+        clip["media_reference"] = media_reference(segment_index)
+    return clip
+
+
+def expand_segment_clips(timeline: Dict[str, Any], segment_index: Dict[str, Any]) -> int:
+    """
+    Expand every clip given by segment_ids in a timeline (in place).
+
+    Returns:
+        The number of clips expanded
+
+    Raises:
+        ValueError: If a clip refers to segments that do not exist
+    """
+    expanded = 0
+    for track in timeline.get("tracks") or []:
+        for clip in track.get("clips") or []:
+            if isinstance(clip, dict) and "segment_ids" in clip:
+                expand_clip(clip, segment_index)
+                expanded += 1
+    if expanded:
+        update_timeline_totals(timeline)
+    return expanded
+
+
+def update_track_totals(track: Dict[str, Any]) -> int:
+    """Recompute a track's duration and clip count from its clips' source ranges; returns the duration."""
+    clips = track.get("clips") or []
+    duration = sum(clip.get("source_range", {}).get("duration_frames", 0) for clip in clips)
+    track.setdefault("metadata", {}).update({"total_clips": len(clips), "track_duration_frames": duration})
+    return duration
+
+
+def update_timeline_totals(timeline: Dict[str, Any]) -> None:
+    """Recompute track and timeline durations and clip counts from the clips' source ranges."""
+    durations = []
+    total_clips = 0
+    for track in timeline["tracks"]:
+        durations.append(update_track_totals(track))
+        total_clips += len(track.get("clips") or [])
+
+    timeline_duration = max(durations, default=0)
+    summary = timeline.setdefault("summary", {})
+    summary.update({"total_tracks": len(timeline["tracks"]), "total_clips": total_clips,
+                    "timeline_duration_frames": timeline_duration})
+    timeline_info = timeline.get("timeline")
+    if isinstance(timeline_info, dict) and isinstance(timeline_info.get("metadata"), dict):
+        timeline_info["metadata"]["actual_duration_frames"] = timeline_duration
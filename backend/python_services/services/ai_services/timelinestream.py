@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Incremental parsing of an edit agent's streamed timeline JSON.
+
+The roughcut and reedit agents used to collect every text delta and only
+parse the response once the stream ended, so a malformed response was found
+after minutes of generation. TimelineStreamParser is fed the deltas as they
+arrive and:
+
+- checks the JSON structure as it goes (brackets, key/value/comma order,
+  strings and literals), raising TimelineStreamError at the first error, so
+  the agent can stop the stream;
+- returns each clip of tracks[].clips[] as soon as its object is complete,
+  expanded from segment IDs (see segmentclips.py) and checked against the
+  clip schema, then each track when it is complete, with those clips;
+- returns each edit operation of a re-edit's operations[] (see
+  editoperations.py) as soon as it is complete.
+
+A leading markdown code fence and a closing fence after the JSON are
+allowed, as in parse_timeline_response(). The complete response is still
+parsed and validated as a whole when the stream ends; the parser only lets
+timeline building start early and bad responses fail early.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from jsonschema import ValidationError, validate
+
+try:
+    # Try relative imports first (when run as module)
+    from .segmentclips import expand_clip, update_track_totals
+except ImportError:
+    # Fall back to absolute imports (when run directly)
+    from segmentclips import expand_clip, update_track_totals
+
+WHITESPACE = " \t\r\n"
+
+# Characters of numbers and the true/false/null literals
+SCALAR_CHARS = set("0123456789+-.eEtrufalsn")
+
+# A completed item: ("clip", its track's position, clip), ("track", position, track)
+# or ("operation", position, operation)
+TimelineEvent = Tuple[str, int, Dict[str, Any]]
+
+
+class TimelineStreamError(ValueError):
+    """The streamed response is not (the start of) a valid timeline JSON object."""
+
+
+class _Container:
+    """An open object or array: where it starts in the buffer and what it expects next."""
+
+    __slots__ = ("kind", "start", "key", "index", "expect", "last_key")
+
+    def __init__(self, kind: str, start: int, key: Optional[str], index: int):
+        self.kind = kind            # "{" or "["
+        self.start = start          # Buffer position of the opening bracket
+        self.key = key              # Key of this container in its parent object
+        self.index = index          # Position of this container in its parent array
+        self.expect = "first"       # "first", "key", "key_string", "colon", "value" or "comma"
+        self.last_key = None        # Last key read in an object
+
+
+class TimelineStreamParser:
+    """
+    Parse a timeline JSON response delta by delta (see module docstring).
+
+    Args:
+        schema: The agent's TARGET_SCHEMA; its track and clip item schemas are
+            checked as tracks and clips complete
+        segment_index: The transcript's segment index, to expand clips given as segment_ids
+    """
+
+    def __init__(self, schema: Optional[Dict[str, Any]] = None, segment_index: Optional[Dict[str, Any]] = None):
+        track_schema = (schema or {}).get("properties", {}).get("tracks", {}).get("items")
+        self.track_schema = track_schema
+        self.clip_schema = (track_schema or {}).get("properties", {}).get("clips", {}).get("items")
+        self.segment_index = segment_index
+
+        self._buffer = ""
+        self._pos = 0
+        self._phase = "preamble"        # "preamble", "json" or "trailer"
+        self._stack: List[_Container] = []
+        self._string_start: Optional[int] = None
+        self._escape = False
+        self._scalar_start: Optional[int] = None
+        self._counts: List[int] = []    # Values seen so far in each open array
+        self._clips: List[Dict[str, Any]] = []   # Clips of the track being parsed
+        self._expanded = False
+
+        self.clips_completed = 0
+        self.tracks_completed = 0
+
+    @property
+    def done(self) -> bool:
+        """Whether the top-level object is complete."""
+        return self._phase == "trailer"
+
+    def feed(self, delta: str) -> List[TimelineEvent]:
+        """
+        Consume the next text delta.
+
+        Returns:
+            The clips and tracks completed by this delta, in order
+
+        Raises:
+            TimelineStreamError: At the first structural error or invalid clip/track
+        """
+        self._buffer += delta
+        events: List[TimelineEvent] = []
+        if self._phase == "preamble":
+            self._skip_preamble()
+        if self._phase == "json":
+            self._scan(events)
+        if self._phase == "trailer":
+            trailer = self._buffer[self._pos:].strip(WHITESPACE + "`")
+            if trailer:
+                raise TimelineStreamError(f"Unexpected text after the timeline JSON: {trailer[:40]!r}")
+            self._pos = len(self._buffer)
+        return events
+
+    def close(self) -> None:
+        """Check that the stream ended with a complete timeline object."""
+        if not self.done:
+            raise TimelineStreamError(
+                f"Response ended before the timeline JSON was complete ({self.clips_completed} clips parsed)"
+            )
+
+    def _error(self, message: str) -> TimelineStreamError:
+        context = self._buffer[max(0, self._pos - 40):self._pos + 1]
+        return TimelineStreamError(f"{message} at character {self._pos} (near {context!r})")
+
+    def _skip_preamble(self) -> None:
+        """Skip whitespace and an opening code fence; the JSON must start with {."""
+        text = self._buffer[self._pos:]
+        stripped = text.lstrip(WHITESPACE)
+        if stripped.startswith("```"):
+            newline = stripped.find("\n")
+            if newline < 0:
+                return
+            stripped = stripped[newline + 1:].lstrip(WHITESPACE)
+        elif "```".startswith(stripped):
+            # Empty so far, or the start of a fence
+            return
+        if not stripped:
+            self._pos = len(self._buffer) - len(text)
+            return
+        self._pos = len(self._buffer) - len(stripped)
+        if stripped[0] != "{":
+            raise self._error("Response does not start with a JSON object")
+        self._phase = "json"
+
+    def _scan(self, events: List[TimelineEvent]) -> None:
+        buffer = self._buffer
+        end = len(buffer)
+        pos = self._pos
+        while pos < end:
+            self._pos = pos
+            char = buffer[pos]
+
+            if self._string_start is not None:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    start, self._string_start = self._string_start, None
+                    self._end_string(start, pos)
+                elif char < " ":
+                    raise self._error("Control character in string")
+                pos += 1
+                continue
+
+            if self._scalar_start is not None:
+                if char in SCALAR_CHARS:
+                    pos += 1
+                    continue
+                self._end_scalar(pos)
+
+            if char in WHITESPACE:
+                pos += 1
+                continue
+
+            container = self._stack[-1] if self._stack else None
+            if char == '"':
+                if container is not None and container.kind == "{" and container.expect in ("first", "key"):
+                    container.expect = "key_string"
+                else:
+                    self._begin_value()
+                self._string_start = pos
+            elif char in "{[":
+                self._begin_value()
+                self._push(char, pos)
+            elif char in "}]":
+                self._close(char, pos, events)
+                if not self._stack:
+                    self._pos = pos + 1
+                    self._phase = "trailer"
+                    return
+            elif char == ":":
+                if container is None or container.kind != "{" or container.expect != "colon":
+                    raise self._error("Unexpected ':'")
+                container.expect = "value"
+            elif char == ",":
+                if container is None or container.expect != "comma":
+                    raise self._error("Unexpected ','")
+                container.expect = "key" if container.kind == "{" else "value"
+            elif char in SCALAR_CHARS:
+                self._begin_value()
+                self._scalar_start = pos
+            else:
+                raise self._error(f"Unexpected character {char!r}")
+            pos += 1
+        self._pos = pos
+
+    def _begin_value(self) -> None:
+        """Check that the current container accepts a value here."""
+        if not self._stack:
+            # Only the top-level object itself; anything else is caught by the preamble check
+            return
+        container = self._stack[-1]
+        if container.kind == "{":
+            if container.expect != "value":
+                messages = {"colon": "Expected ':'", "comma": "Expected ',' or '}'"}
+                raise self._error(messages.get(container.expect, "Expected a key"))
+        elif container.expect not in ("first", "value"):
+            raise self._error("Expected ',' or ']'")
+        container.expect = "comma"
+
+    def _push(self, kind: str, pos: int) -> None:
+        parent = self._stack[-1] if self._stack else None
+        key = parent.last_key if parent is not None and parent.kind == "{" else None
+        index = 0
+        if parent is not None and parent.kind == "[":
+            index = self._counts[-1]
+            self._counts[-1] += 1
+        self._stack.append(_Container(kind, pos, key, index))
+        self._counts.append(0)
+
+    def _close(self, char: str, pos: int, events: List[TimelineEvent]) -> None:
+        container = self._stack[-1] if self._stack else None
+        if container is None or container.kind != ("{" if char == "}" else "["):
+            raise self._error(f"Unexpected '{char}'")
+        if container.expect not in ("first", "comma"):
+            raise self._error(f"Unexpected '{char}' after ',' or ':'")
+        self._stack.pop()
+        self._counts.pop()
+        if char == "}":
+            self._completed_object(container, pos, events)
+
+    def _end_string(self, start: int, pos: int) -> None:
+        container = self._stack[-1]
+        if container.kind == "{" and container.expect == "key_string":
+            container.last_key = json.loads(self._buffer[start:pos + 1])
+            container.expect = "colon"
+        elif container.kind == "[":
+            self._counts[-1] += 1
+
+    def _end_scalar(self, pos: int) -> None:
+        start, self._scalar_start = self._scalar_start, None
+        token = self._buffer[start:pos]
+        try:
+            json.loads(token)
+        except ValueError:
+            raise self._error(f"Invalid literal {token!r}")
+        if self._stack[-1].kind == "[":
+            self._counts[-1] += 1
+
+    def _completed_object(self, container: _Container, pos: int, events: List[TimelineEvent]) -> None:
+        """Hand out the object just closed if it is a clip, a track or an edit operation."""
+        depth = len(self._stack)
+        # root { tracks [ track { clips [ clip {
+        if depth == 4 and self._stack[3].key == "clips" and self._stack[1].key == "tracks":
+            clip = json.loads(self._buffer[container.start:pos + 1])
+            if self.segment_index is not None and "segment_ids" in clip:
+                try:
+                    expand_clip(clip, self.segment_index)
+                except ValueError as e:
+                    raise self._error(f"Clip {container.index}: {e}")
+                self._expanded = True
+            self._check(clip, self.clip_schema, f"Clip {container.index} of track {self._stack[2].index}")
+            self._clips.append(clip)
+            self.clips_completed += 1
+            events.append(("clip", self._stack[2].index, clip))
+        elif depth == 2 and container.key is None and self._stack[1].key == "tracks":
+            track = json.loads(self._buffer[container.start:pos + 1])
+            if isinstance(track.get("clips"), list):
+                track["clips"] = self._clips
+                if self._expanded:
+                    update_track_totals(track)
+            self._clips = []
+            self._expanded = False
+            self._check(track, self.track_schema, f"Track {container.index}")
+            self.tracks_completed += 1
+            events.append(("track", container.index, track))
+        elif depth == 2 and container.key is None and self._stack[1].key == "operations":
+            events.append(("operation", container.index, json.loads(self._buffer[container.start:pos + 1])))
+
+    def _check(self, item: Dict[str, Any], schema: Optional[Dict[str, Any]], name: str) -> None:
+        if schema is None:
+            return
+        try:
+            validate(instance=item, schema=schema)
+        except ValidationError as e:
+            raise self._error(f"{name} is invalid: {e.message}")
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Timeline Stream Test Script
+
+Replays recorded Claude responses (timelines in data/timelineprocessing)
+through the incremental timeline parser in small deltas, without calling
+the Claude API:
+- Every clip and track is handed out once complete, equal to the parsed JSON
+- Clips given as segment IDs are expanded as they stream
+- Malformed responses and invalid clips fail at the delta that breaks them
+"""
+
+import sys
+import json
+import random
+from pathlib import Path
+
+# Add the ai_services directory to Python path for imports
+script_dir = Path(__file__).parent
+sys.path.insert(0, str(script_dir))
+
+DATA_DIR = script_dir.parent.parent / "data"
+TRANSCRIPT_PATH = DATA_DIR / "analyzed" / "20250509_MTC_2206.transcript.json"
+RECORDED_RESPONSES = [
+    DATA_DIR / "timelineprocessing" / "timeline_edited" / "Nice_Touch_launch_Video_reedit_v2_20250627_173230.json",
+    DATA_DIR / "timelineprocessing" / "timeline_ref" / "exported_timeline.json",
+]
+
+
+def stream(parser, text, seed=0, max_delta=24):
+    """Feed text in random-sized deltas; returns the events and the number of deltas fed."""
+    rng = random.Random(seed)
+    events = []
+    position = deltas = 0
+    while position < len(text):
+        size = rng.randint(1, max_delta)
+        events += parser.feed(text[position:position + size])
+        position += size
+        deltas += 1
+    return events, deltas
+
+
+def test_replay_recorded_responses():
+    """Clips and tracks come out in order, equal to the response parsed as a whole."""
+    print("🔍 Testing replay of recorded responses...")
+
+    from editagent_roughcut import TARGET_SCHEMA
+    from timelinestream import TimelineStreamParser
+
+    for path in RECORDED_RESPONSES:
+        response_content = path.read_text(encoding="utf-8")
+        timeline = json.loads(response_content)
+        for seed, reply in enumerate((response_content, f"```json\n{response_content}\n```")):
+            parser = TimelineStreamParser(TARGET_SCHEMA)
+            events, deltas = stream(parser, reply, seed)
+            parser.close()
+
+            clips = [item for kind, _, item in events if kind == "clip"]
+            tracks = [item for kind, _, item in events if kind == "track"]
+            assert clips == [clip for track in timeline["tracks"] for clip in track["clips"]]
+            assert tracks == timeline["tracks"]
+            # Each track's clips come before the track itself
+            kinds = [(kind, track_index) for kind, track_index, _ in events]
+            for track_index, track in enumerate(timeline["tracks"]):
+                position = kinds.index(("track", track_index))
+                assert kinds[position - len(track["clips"]):position] == [("clip", track_index)] * len(track["clips"])
+        print(f"✅ {path.name}: {len(clips)} clips in {len(tracks)} tracks over {deltas} deltas")
+    return True
+
+
+def test_segment_ids_expand_while_streaming():
+    """Segment-ID clips are handed out expanded, the same as after the whole response is parsed."""
+    print("\n🔍 Testing segment ID expansion while streaming...")
+
+    import editagent_roughcut
+    from timelinestream import TimelineStreamParser
+    from transcriptsegments import build_segment_index
+
+    with open(TRANSCRIPT_PATH, "r", encoding="utf-8") as f:
+        segment_index = build_segment_index(json.load(f))
+    starts = [segment["frame_in"] for segment in segment_index["segments"]]
+
+    timeline = json.loads(RECORDED_RESPONSES[0].read_text(encoding="utf-8"))
+    for track in timeline["tracks"]:
+        for clip in track["clips"]:
+            source_range = clip.pop("source_range")
+            first = max(i for i, frame in enumerate(starts) if frame <= source_range["start_frame"])
+            last = max(i for i, frame in enumerate(starts) if frame < source_range["end_frame"])
+            clip["segment_ids"] = [first, last]
+            clip["metadata"] = {}
+    reply = json.dumps(timeline, indent=2)
+
+    parser = TimelineStreamParser(editagent_roughcut.TARGET_SCHEMA, segment_index)
+    events, _ = stream(parser, reply)
+    parsed = editagent_roughcut.parse_timeline_response(reply, segment_index)
+    assert [item for kind, _, item in events if kind == "clip"] == \
+        [clip for track in parsed["tracks"] for clip in track["clips"]]
+    assert [item for kind, _, item in events if kind == "track"] == parsed["tracks"]
+
+    print(f"✅ {parser.clips_completed} clips expanded as they streamed")
+    return True
+
+
+def test_early_abort():
+    """Structural errors and invalid clips raise at the delta that contains them."""
+    print("\n🔍 Testing early abort on malformed responses...")
+
+    from editagent_roughcut import TARGET_SCHEMA
+    from timelinestream import TimelineStreamError, TimelineStreamParser
+
+    response_content = RECORDED_RESPONSES[0].read_text(encoding="utf-8")
+    first_clip_end = response_content.index('"media_reference"')
+    cases = {
+        "prose before the JSON": "Here is the timeline:\n" + response_content,
+        "missing comma": response_content.replace('"clip_index": 0,', '"clip_index": 0', 1),
+        "mismatched bracket": response_content.replace('"clips": [', '"clips": {', 1),
+        "invalid literal": response_content.replace('"clip_index": 0', '"clip_index": zero', 1),
+        "clip without source_range": response_content.replace('"source_range"', '"range"', 1),
+    }
+
+    for name, reply in cases.items():
+        parser = TimelineStreamParser(TARGET_SCHEMA)
+        fed = 0
+        try:
+            for position in range(0, len(reply), 16):
+                fed = position + 16
+                parser.feed(reply[position:fed])
+            print(f"❌ {name}: no error")
+            return False
+        except TimelineStreamError as e:
+            # Every error above is in or before the first clip
+            assert fed < first_clip_end + 2000, f"{name}: error only found after {fed} characters"
+            print(f"✅ {name}: stopped after {fed}/{len(reply)} characters ({e})")
+
+    parser = TimelineStreamParser(TARGET_SCHEMA)
+    parser.feed(response_content[:len(response_content) // 2])
+    try:
+        parser.close()
+        print("❌ A truncated response should not close cleanly")
+        return False
+    except TimelineStreamError:
+        pass
+    return True
+
+
+def main():
+    """Run all tests and provide summary."""
+    print("🧪 Timeline Stream Test Suite")
+    print("=" * 50)
+
+    tests = [
+        ("Replay Recorded Responses", test_replay_recorded_responses),
+        ("Segment IDs Expand While Streaming", test_segment_ids_expand_while_streaming),
+        ("Early Abort", test_early_abort),
+    ]
+
+    results = []
+
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+        except Exception as e:
+            print(f"❌ {test_name} crashed: {e!r}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{'✅ PASS' if result else '❌ FAIL'} {test_name}")
+    print(f"\n📊 Results: {passed} passed, {len(results) - passed} failed")
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
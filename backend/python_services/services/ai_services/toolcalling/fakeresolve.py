@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+In-process fake of the DaVinci Resolve scripting object model, for tests.
+
+Covers what the chatbot tools use: Resolve -> ProjectManager -> Project ->
+Timeline -> TimelineItem -> MediaPoolItem (clips with the same name share a
+media pool item, like clips cut from one source). Every method call is
+counted in FakeResolve.calls, and connects in FakeResolve.connects.
+restart() makes every call raise until the next connect(), like handles
+left over from before a Resolve restart.
+
+    resolve = FakeResolve.with_timeline("Interview", {1: ["A001", "A002"]})
+    connection = ResolveConnection(connect=resolve.connect)
+"""
+
+import itertools
+from typing import Any, Dict, List, Optional
+
+_ids = itertools.count(1)
+
+
+class _FakeObject:
+    def __init__(self, resolve: "FakeResolve"):
+        self._resolve = resolve
+
+    def __getattribute__(self, name: str) -> Any:
+        attribute = object.__getattribute__(self, name)
+        if name[:1].isupper() and callable(attribute):
+            resolve = object.__getattribute__(self, "_resolve")
+            if resolve.restarted:
+                raise RuntimeError("Stale Resolve object (Resolve was restarted)")
+            resolve.calls += 1
+        return attribute
+
+
+class FakeMediaPoolItem(_FakeObject):
+    def __init__(self, resolve: "FakeResolve", name: str):
+        super().__init__(resolve)
+        self.name = name
+
+    def GetMediaId(self) -> str:
+        return f"media-{self.name}"
+
+    def GetClipProperty(self, key: Optional[str] = None) -> Any:
+        properties = {"File Path": f"/media/{self.name}.mov", "Resolution": "1920x1080", "FPS": 25}
+        return properties if key is None else properties.get(key, "")
+
+
+class FakeTimelineItem(_FakeObject):
+    def __init__(self, resolve: "FakeResolve", name: str, start: int, duration: int):
+        super().__init__(resolve)
+        self.name, self.start, self.duration = name, start, duration
+        self.properties: Dict[str, Any] = {}
+        self.media_pool_item = resolve.media_pool_item(name)
+
+    def GetName(self) -> str:
+        return self.name
+
+    def GetStart(self) -> int:
+        return self.start
+
+    def GetEnd(self) -> int:
+        return self.start + self.duration
+
+    def GetDuration(self) -> int:
+        return self.duration
+
+    def GetMediaPoolItem(self) -> FakeMediaPoolItem:
+        return self.media_pool_item
+
+    def SetProperty(self, properties: Dict[str, Any]) -> bool:
+        self.properties.update(properties)
+        return True
+
+
+class FakeTimeline(_FakeObject):
+    def __init__(self, resolve: "FakeResolve", name: str, tracks: Dict[int, List[str]]):
+        super().__init__(resolve)
+        self.name = name
+        self.unique_id = f"timeline-{next(_ids)}"
+        self.tracks: Dict[int, List[FakeTimelineItem]] = {}
+        for track_index, clip_names in tracks.items():
+            position = 0
+            self.tracks[track_index] = []
+            for clip_name in clip_names:
+                self.tracks[track_index].append(FakeTimelineItem(resolve, clip_name, position, 100))
+                position += 100
+
+    def GetName(self) -> str:
+        return self.name
+
+    def GetUniqueId(self) -> str:
+        return self.unique_id
+
+    def GetStartFrame(self) -> int:
+        return 0
+
+    def GetEndFrame(self) -> int:
+        return max((item.start + item.duration for items in self.tracks.values() for item in items), default=0) - 1
+
+    def GetStartTimecode(self) -> str:
+        return "01:00:00:00"
+
+    def GetTrackCount(self, track_type: str) -> int:
+        return len(self.tracks) if track_type == "video" else 0
+
+    def GetItemListInTrack(self, track_type: str, track_index: int) -> List[FakeTimelineItem]:
+        return list(self.tracks.get(track_index, [])) if track_type == "video" else []
+
+
+class FakeProject(_FakeObject):
+    def __init__(self, resolve: "FakeResolve", name: str):
+        super().__init__(resolve)
+        self.name = name
+        self.timelines: List[FakeTimeline] = []
+        self.current_timeline: Optional[FakeTimeline] = None
+
+    def add_timeline(self, name: str, tracks: Dict[int, List[str]]) -> FakeTimeline:
+        timeline = FakeTimeline(self._resolve, name, tracks)
+        self.timelines.append(timeline)
+        if self.current_timeline is None:
+            self.current_timeline = timeline
+        return timeline
+
+    def GetName(self) -> str:
+        return self.name
+
+    def GetTimelineCount(self) -> int:
+        return len(self.timelines)
+
+    def GetTimelineByIndex(self, index: int) -> Optional[FakeTimeline]:
+        return self.timelines[index - 1] if 1 <= index <= len(self.timelines) else None
+
+    def GetCurrentTimeline(self) -> Optional[FakeTimeline]:
+        return self.current_timeline
+
+    def SetCurrentTimeline(self, timeline: FakeTimeline) -> bool:
+        self.current_timeline = timeline
+        return True
+
+
+class FakeProjectManager(_FakeObject):
+    def __init__(self, resolve: "FakeResolve"):
+        super().__init__(resolve)
+        self.current_project: Optional[FakeProject] = None
+
+    def GetCurrentProject(self) -> Optional[FakeProject]:
+        return self.current_project
+
+
+class FakeResolve(_FakeObject):
+    def __init__(self):
+        self.calls = 0
+        self.connects = 0
+        self.restarted = False
+        super().__init__(self)
+        self.project_manager = FakeProjectManager(self)
+        self.media_pool_items: Dict[str, FakeMediaPoolItem] = {}
+
+    @classmethod
+    def with_timeline(cls, timeline_name: str, tracks: Dict[int, List[str]], project_name: str = "Project") -> "FakeResolve":
+        """A Resolve with one open project whose current timeline has the given clips per video track."""
+        resolve = cls()
+        resolve.project_manager.current_project = FakeProject(resolve, project_name)
+        resolve.project_manager.current_project.add_timeline(timeline_name, tracks)
+        return resolve
+
+    def media_pool_item(self, name: str) -> FakeMediaPoolItem:
+        """The media pool item of a source; clips cut from the same source share it."""
+        if name not in self.media_pool_items:
+            self.media_pool_items[name] = FakeMediaPoolItem(self, name)
+        return self.media_pool_items[name]
+
+    def connect(self):
+        """Connect function for ResolveConnection: returns (resolve, error)."""
+        self.connects += 1
+        self.restarted = False
+        return self, None
+
+    def restart(self) -> None:
+        """Make calls through existing handles fail until the next connect()."""
+        self.restarted = True
+
+    def GetVersion(self) -> List[Any]:
+        return [19, 0, 0, 0, ""]
+
+    def GetProjectManager(self) -> FakeProjectManager:
+        return self.project_manager
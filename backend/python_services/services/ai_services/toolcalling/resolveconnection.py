@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Cached connection to DaVinci Resolve for the chatbot tools.
+
+Every Resolve scripting call crosses into the Resolve process, and each tool
+used to reconnect and walk GetProjectManager -> GetCurrentProject ->
+GetCurrentTimeline before doing any work. ResolveConnection keeps the Resolve
+and project manager handles for the life of the process and memoizes the
+current project and timeline handles:
+
+- Memoized handles are trusted for HANDLE_TTL_SECONDS, which covers the burst
+  of tool calls in one Claude turn. After that, the next use re-reads the
+  current project and timeline and compares the timeline's unique ID (the
+  project name when there is no timeline) with the memoized one.
+- When the project or timeline changed, or invalidate() is called (ToolCaller
+  does after tools that modify Resolve or fail), the handles are dropped and
+  the generation counter goes up, so caches built on them know to refresh.
+- A handle that fails (e.g. Resolve was restarted) causes one reconnect.
+
+All calls made through the connection's handles are counted per tool; use
+tool_scope(tool_name) around a tool and call_stats() to read the counts.
+The connect function is injectable, so a fake Resolve object model can stand
+in for Resolve in tests.
+"""
+
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# How long memoized project/timeline handles are used without re-checking them
+HANDLE_TTL_SECONDS = 2.0
+
+_PLAIN_TYPES = (str, bytes, int, float, bool)
+
+
+def connect_to_resolve() -> Tuple[Optional[Any], Optional[str]]:
+    """Connect to the running DaVinci Resolve - following exportotio.py pattern. Returns (resolve, error)."""
+    try:
+        # Import DaVinci Resolve API
+        import DaVinciResolveScript as dvr_script
+
+        # Connect to DaVinci Resolve
+        resolve = dvr_script.scriptapp("Resolve")
+
+        if not resolve:
+            return None, "Could not connect to DaVinci Resolve. Make sure DaVinci Resolve is running and scripting is enabled."
+
+        return resolve, None
+
+    except ImportError as e:
+        return None, f"Could not import DaVinciResolveScript module: {e}. Make sure the DaVinci Resolve scripting environment is properly configured."
+    except Exception as e:
+        return None, f"Error connecting to DaVinci Resolve: {e}"
+
+
+class _CountingProxy:
+    """Wraps a Resolve scripting object so that each method call is counted."""
+
+    __slots__ = ("_target", "_connection")
+
+    def __init__(self, target: Any, connection: "ResolveConnection"):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_connection", connection)
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._target, name)
+        if not callable(attribute):
+            return attribute
+        connection = self._connection
+
+        def call(*args, **kwargs):
+            connection._count_call()
+            result = attribute(*(_unwrap(arg) for arg in args),
+                               **{key: _unwrap(value) for key, value in kwargs.items()})
+            return connection._wrap(result)
+
+        return call
+
+    def __bool__(self) -> bool:
+        return bool(self._target)
+
+    def __repr__(self) -> str:
+        return f"<counted {self._target!r}>"
+
+
+def _unwrap(value: Any) -> Any:
+    """Resolve objects to pass back into Resolve calls (e.g. SetCurrentTimeline)."""
+    if isinstance(value, _CountingProxy):
+        return value._target
+    if isinstance(value, list):
+        return [_unwrap(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _unwrap(item) for key, item in value.items()}
+    return value
+
+
+class ResolveConnection:
+    """Process-wide Resolve handle with memoized current project and timeline handles; thread-safe."""
+
+    def __init__(self, connect: Callable[[], Tuple[Optional[Any], Optional[str]]] = connect_to_resolve,
+                 handle_ttl_seconds: float = HANDLE_TTL_SECONDS):
+        """
+        Args:
+            connect: Returns (resolve, error); defaults to connecting through DaVinciResolveScript
+            handle_ttl_seconds: How long project/timeline handles are used before re-checking them
+        """
+        self._connect = connect
+        self.handle_ttl_seconds = handle_ttl_seconds
+        self.generation = 0
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._resolve = None
+        self._project_manager = None
+        self._project = None
+        self._timeline = None
+        self._identity: Optional[str] = None
+        self._checked_at = 0.0
+
+    # ----- call counting -----
+
+    @contextmanager
+    def tool_scope(self, tool_name: str) -> Iterator[None]:
+        """Count the Resolve calls made on this thread as calls of the given tool."""
+        previous = getattr(self._local, "tool", None)
+        self._local.tool = tool_name
+        with self._lock:
+            stats = self._counts.setdefault(tool_name, {"invocations": 0, "resolve_calls": 0})
+            stats["invocations"] += 1
+        try:
+            yield
+        finally:
+            self._local.tool = previous
+
+    def _count_call(self) -> None:
+        tool_name = getattr(self._local, "tool", None) or "other"
+        with self._lock:
+            stats = self._counts.setdefault(tool_name, {"invocations": 0, "resolve_calls": 0})
+            stats["resolve_calls"] += 1
+
+    def _wrap(self, value: Any) -> Any:
+        if value is None or isinstance(value, _PLAIN_TYPES):
+            return value
+        if isinstance(value, list):
+            return [self._wrap(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self._wrap(item) for key, item in value.items()}
+        return _CountingProxy(value, self)
+
+    def call_stats(self) -> Dict[str, Dict[str, int]]:
+        """Per tool: invocations and Resolve scripting calls made."""
+        with self._lock:
+            return {tool_name: dict(stats) for tool_name, stats in self._counts.items()}
+
+    # ----- handles -----
+
+    def get_resolve(self) -> Tuple[Optional[Any], Optional[str]]:
+        """The Resolve handle, connecting on first use. Returns (resolve, error)."""
+        with self._lock:
+            if self._resolve is None:
+                self._count_call()
+                resolve, error = self._connect()
+                if error:
+                    return None, error
+                self._resolve = self._wrap(resolve)
+                self._project_manager = None
+            return self._resolve, None
+
+    def _get_project_manager(self) -> Tuple[Optional[Any], Optional[str]]:
+        resolve, error = self.get_resolve()
+        if error:
+            return None, error
+        if self._project_manager is None:
+            self._project_manager = resolve.GetProjectManager()
+            if not self._project_manager:
+                self._project_manager = None
+                return None, "Could not get the DaVinci Resolve project manager"
+        return self._project_manager, None
+
+    def _read_current(self) -> Optional[str]:
+        """Re-read the current project and timeline; returns an error message or None."""
+        project_manager, error = self._get_project_manager()
+        if error:
+            return error
+        project = project_manager.GetCurrentProject()
+        timeline = project.GetCurrentTimeline() if project else None
+        if timeline:
+            identity = f"timeline:{timeline.GetUniqueId() or timeline.GetName()}"
+        else:
+            identity = f"project:{project.GetName()}" if project else None
+        if identity != self._identity:
+            if self._identity is not None:
+                logger.info("Resolve project or timeline changed; dropping cached handles")
+            self.generation += 1
+        self._project, self._timeline, self._identity = project, timeline, identity
+        self._checked_at = time.monotonic()
+        return None
+
+    def _refresh(self) -> Optional[str]:
+        """Make sure the memoized handles are current; returns an error message or None."""
+        if self._identity is not None and time.monotonic() - self._checked_at < self.handle_ttl_seconds:
+            return None
+        try:
+            return self._read_current()
+        except Exception as e:
+            # The handles went stale (e.g. Resolve restarted): reconnect once
+            logger.warning(f"Resolve handles failed ({e}); reconnecting")
+            self._drop(reconnect=True)
+            try:
+                return self._read_current()
+            except Exception as e:
+                self._drop(reconnect=True)
+                return f"Error talking to DaVinci Resolve: {e}"
+
+    def current_project(self) -> Tuple[Optional[Any], Optional[str]]:
+        """The current project handle. Returns (project, error)."""
+        with self._lock:
+            error = self._refresh()
+            if error:
+                return None, error
+            if not self._project:
+                return None, "No project is currently open"
+            return self._project, None
+
+    def current_timeline(self) -> Tuple[Optional[Any], Optional[str]]:
+        """The current timeline handle. Returns (timeline, error)."""
+        with self._lock:
+            project, error = self.current_project()
+            if error:
+                return None, error
+            if not self._timeline:
+                return None, "No timeline is currently active"
+            return self._timeline, None
+
+    def timeline_key(self) -> str:
+        """Identity of the current timeline (or project), '' if unknown."""
+        with self._lock:
+            error = self._refresh()
+            return "" if error else self._identity or ""
+
+    def _drop(self, reconnect: bool = False) -> None:
+        self._project = self._timeline = self._identity = None
+        self._checked_at = 0.0
+        self.generation += 1
+        if reconnect:
+            self._resolve = self._project_manager = None
+
+    def invalidate(self, reconnect: bool = False) -> None:
+        """Drop the memoized project and timeline handles (e.g. after a tool changed them), and optionally the connection."""
+        with self._lock:
+            self._drop(reconnect)
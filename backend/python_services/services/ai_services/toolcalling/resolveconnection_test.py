@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Resolve Connection Test Script
+
+Runs the chatbot's Resolve tools against the in-process fake Resolve
+(fakeresolve.py), so no DaVinci Resolve installation is needed. Checks that:
+- Repeated tool calls reuse one connection and the memoized project/timeline
+- Switching timelines is noticed once the handles' TTL has passed
+- Tools that modify Resolve invalidate the handles
+- Stale handles (Resolve restarted) cause one reconnect
+- Resolve calls are counted per tool
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add the toolcalling directory to Python path for imports
+script_dir = Path(__file__).parent
+sys.path.insert(0, str(script_dir))
+
+
+def make_tool_caller(resolve, handle_ttl_seconds=60.0):
+    from toolcaller import ToolCaller
+    from resolveconnection import ResolveConnection
+
+    return ToolCaller(ResolveConnection(connect=resolve.connect, handle_ttl_seconds=handle_ttl_seconds))
+
+
+def test_memoized_handles():
+    """Five timeline info calls connect once and walk to the timeline once."""
+    print("🔍 Testing memoized handles...")
+
+    from fakeresolve import FakeResolve
+
+    resolve = FakeResolve.with_timeline("Interview", {1: ["A001", "A002"], 2: ["B001"]})
+    caller = make_tool_caller(resolve)
+
+    for _ in range(5):
+        result = caller.call_tool("get_resolve_timeline_info")
+        assert result["success"] and result["result"]["name"] == "Interview", result
+
+    # One connect, one walk to the timeline (4 calls), then 7 calls per tool reading the timeline info
+    assert resolve.connects == 1, f"Connected {resolve.connects} times"
+    stats = caller.resolve_call_stats()["get_resolve_timeline_info"]
+    assert stats["invocations"] == 5
+    assert stats["resolve_calls"] == resolve.calls + 1, f"Counted {stats}, fake saw {resolve.calls} (+1 connect)"
+    assert stats["resolve_calls"] == 1 + 4 + 5 * 7, f"Handles were not reused: {stats}"
+    print(f"✅ 5 calls, 1 connect, {stats['resolve_calls']} Resolve calls in total")
+    return True
+
+
+def test_timeline_switch_and_invalidation():
+    """A timeline switch is seen after the TTL; a mutating tool invalidates right away."""
+    print("\n🔍 Testing timeline switch and invalidation...")
+
+    from fakeresolve import FakeResolve
+
+    resolve = FakeResolve.with_timeline("Interview", {1: ["A001"]})
+    project = resolve.project_manager.current_project
+    selects = project.add_timeline("Selects", {1: ["S001", "S002", "S003"]})
+    caller = make_tool_caller(resolve, handle_ttl_seconds=0.05)
+
+    assert caller.call_tool("get_resolve_timeline_info")["result"]["name"] == "Interview"
+    generation = caller.resolve.generation
+
+    project.current_timeline = selects
+    time.sleep(0.1)
+    assert caller.call_tool("get_resolve_timeline_info")["result"]["name"] == "Selects"
+    assert caller.resolve.generation > generation, "Timeline switch did not bump the generation"
+
+    generation = caller.resolve.generation
+    result = caller.call_tool("apply_zoom_to_clips", {"clips": [{"track_index": 1, "clip_index": 2, "zoom_value": 1.2}]})
+    assert result["result"]["applied"] == 1, result
+    assert selects.tracks[1][1].properties["ZoomX"] == 1.2
+    assert caller.resolve.generation > generation, "Mutating tool did not invalidate the handles"
+    print("✅ Timeline switch noticed after the TTL; zoom tool invalidated the handles")
+    return True
+
+
+def test_reconnect_after_restart():
+    """Handles that fail after a Resolve restart are replaced by one reconnect."""
+    print("\n🔍 Testing reconnect after restart...")
+
+    from fakeresolve import FakeResolve
+
+    resolve = FakeResolve.with_timeline("Interview", {1: ["A001"]})
+    caller = make_tool_caller(resolve, handle_ttl_seconds=0.0)
+
+    assert caller.call_tool("list_clips_in_tracks")["result"]["total_clips"] == 1
+    resolve.restart()
+    result = caller.call_tool("list_clips_in_tracks")
+    assert result["success"] and result["result"]["total_clips"] == 1, result
+    assert resolve.connects == 2, f"Expected one reconnect, connected {resolve.connects} times"
+    print("✅ Reconnected once and the tool succeeded")
+    return True
+
+
+def main():
+    """Run all tests and provide summary."""
+    print("🧪 Resolve Connection Test Suite")
+    print("=" * 50)
+
+    tests = [
+        ("Memoized Handles", test_memoized_handles),
+        ("Timeline Switch and Invalidation", test_timeline_switch_and_invalidation),
+        ("Reconnect After Restart", test_reconnect_after_restart),
+    ]
+
+    results = []
+
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+        except Exception as e:
+            print(f"❌ {test_name} crashed: {e!r}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{'✅ PASS' if result else '❌ FAIL'} {test_name}")
+    print(f"\n📊 Results: {passed} passed, {len(results) - passed} failed")
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
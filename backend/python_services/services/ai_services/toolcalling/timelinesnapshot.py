@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Cached snapshots of the clips on the current timeline's tracks.
+
+Listing a timeline's clips costs several scripting calls per clip, so on long
+timelines list_clips_in_tracks took seconds. TimelineSnapshotCache builds the
+listing once per timeline and track type and reuses it while the timeline's
+fingerprint is unchanged:
+
+- The fingerprint is the track count, the item count of each track and the
+  end frame: a handful of calls, however many clips there are.
+- Building a snapshot reads each clip's name, start and end and its media
+  pool item once. Media properties (file path, resolution, fps) are read in
+  one GetClipProperty() call per media pool item and shared by every clip
+  using it, across snapshots.
+- Tools that modify Resolve call invalidate(), since some edits (e.g. a zoom)
+  do not change the fingerprint. Invalidating, or a fingerprint change, also
+  drops the media properties, so relinked or replaced media is read afresh.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+# Handle imports that work both when run directly and as a module
+try:
+    from .resolveconnection import ResolveConnection
+except ImportError:
+    from resolveconnection import ResolveConnection
+
+logger = logging.getLogger(__name__)
+
+
+class TimelineSnapshotCache:
+    """Per-timeline, per-track-type clip listings, checked against a cheap fingerprint; thread-safe."""
+
+    def __init__(self, connection: ResolveConnection):
+        self.connection = connection
+        self._snapshots: Dict[Tuple[str, str], Tuple[Tuple[Any, ...], Dict[str, Any]]] = {}
+        self._media_properties: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        """Drop all snapshots and media properties (e.g. after a tool modified the timeline)."""
+        with self._lock:
+            self._snapshots.clear()
+            self._media_properties.clear()
+
+    def get(self, track_type: str = "video") -> Tuple[Optional[Dict[str, Any]], Optional[str], bool]:
+        """
+        The current timeline's clips on tracks of one type.
+
+        Returns:
+            (snapshot, error, from_cache); the snapshot has track_type, track_count,
+            total_clips, tracks and timeline_name, as list_clips_in_tracks returns
+        """
+        timeline, error = self.connection.current_timeline()
+        if error:
+            return None, error, False
+        key = (self.connection.timeline_key(), track_type)
+
+        track_count = timeline.GetTrackCount(track_type)
+        track_items = [timeline.GetItemListInTrack(track_type, track_index) or []
+                       for track_index in range(1, track_count + 1)]
+        fingerprint = (track_count, tuple(len(items) for items in track_items), timeline.GetEndFrame())
+
+        with self._lock:
+            cached = self._snapshots.get(key)
+            if cached is not None and cached[0] == fingerprint:
+                return cached[1], None, True
+            if cached is not None:
+                # The timeline changed, so its media may have been relinked or replaced too
+                self._media_properties.clear()
+
+        snapshot = self._build(timeline, track_type, track_items)
+        with self._lock:
+            self._snapshots[key] = (fingerprint, snapshot)
+        return snapshot, None, False
+
+    def _media_info(self, media_item: Any) -> Dict[str, Any]:
+        """File path, resolution and fps of a media pool item, read once per item."""
+        media_id = media_item.GetMediaId()
+        with self._lock:
+            if media_id and media_id in self._media_properties:
+                return self._media_properties[media_id]
+        properties = media_item.GetClipProperty() or {}
+        info = {
+            "source_file": properties.get("File Path") or "Unknown",
+            "resolution": f"{properties.get('Resolution')}",
+            "fps": properties.get("FPS")
+        }
+        if media_id:
+            with self._lock:
+                self._media_properties[media_id] = info
+        return info
+
+    def _build(self, timeline: Any, track_type: str, track_items: List[List[Any]]) -> Dict[str, Any]:
+        tracks_info = []
+        total_clips = 0
+
+        # Iterate through each track (1-based indexing)
+        for track_index, track_clips in enumerate(track_items, 1):
+            track_info = {
+                "track_index": track_index,
+                "clip_count": len(track_clips),
+                "clips": []
+            }
+
+            for clip_index, clip in enumerate(track_clips, 1):  # 1-based indexing
+                try:
+                    start, end = clip.GetStart(), clip.GetEnd()
+                    clip_info = {
+                        "clip_index": clip_index,
+                        "name": clip.GetName(),
+                        "start": start,
+                        "end": end,
+                        "duration": end - start
+                    }
+
+                    media_item = clip.GetMediaPoolItem()
+                    media_info = {"source_file": "Unknown"}
+                    if media_item:
+                        try:
+                            media_info = self._media_info(media_item)
+                        except Exception as e:
+                            logger.warning(f"Could not read media properties of clip {clip_index} on track {track_index}: {e}")
+                    clip_info["source_file"] = media_info["source_file"]
+
+                    # For video clips, add resolution info
+                    if track_type == "video" and "resolution" in media_info:
+                        clip_info["resolution"] = media_info["resolution"]
+                        clip_info["fps"] = media_info["fps"]
+
+                    track_info["clips"].append(clip_info)
+                    total_clips += 1
+
+                except Exception as e:
+                    logger.warning(f"Could not get info for clip {clip_index} on track {track_index}: {e}")
+                    track_info["clips"].append({
+                        "clip_index": clip_index,
+                        "name": "Unknown",
+                        "error": str(e)
+                    })
+
+            tracks_info.append(track_info)
+
+        snapshot = {
+            "track_type": track_type,
+            "track_count": len(track_items),
+            "total_clips": total_clips,
+            "tracks": tracks_info,
+            "timeline_name": timeline.GetName()
+        }
+        if not track_items:
+            snapshot["message"] = f"No {track_type} tracks found in current timeline"
+        return snapshot
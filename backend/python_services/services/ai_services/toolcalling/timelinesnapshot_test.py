@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Timeline Snapshot Cache Test Script
+
+Runs list_clips_in_tracks against the in-process fake Resolve
+(fakeresolve.py) on a 600-clip timeline. Checks that:
+- A snapshot reads each media pool item's properties once
+- Repeated listings of an unchanged timeline cost only the fingerprint calls
+- Changing the timeline's item counts, or running a mutating tool, rebuilds it
+  and re-reads the media properties
+"""
+
+import sys
+from pathlib import Path
+
+# Add the toolcalling directory to Python path for imports
+script_dir = Path(__file__).parent
+sys.path.insert(0, str(script_dir))
+
+TRACKS = 2
+CLIPS_PER_TRACK = 300
+SOURCES = 20
+
+
+def make_timeline():
+    from fakeresolve import FakeResolve
+    from toolcaller import ToolCaller
+    from resolveconnection import ResolveConnection
+
+    # 600 clips cut from 20 source files
+    tracks = {track_index: [f"SRC{n % SOURCES:03d}" for n in range(CLIPS_PER_TRACK)]
+              for track_index in range(1, TRACKS + 1)}
+    resolve = FakeResolve.with_timeline("Long Interview", tracks)
+    caller = ToolCaller(ResolveConnection(connect=resolve.connect))
+    return resolve, caller
+
+
+def test_snapshot_cost():
+    """The first listing costs about four calls per clip plus one per source; the second only the fingerprint."""
+    print("🔍 Testing snapshot build and cache hit...")
+
+    resolve, caller = make_timeline()
+    clips = TRACKS * CLIPS_PER_TRACK
+
+    first = caller.call_tool("list_clips_in_tracks", {"track_type": "video"})["result"]
+    build_calls = resolve.calls
+    assert first["total_clips"] == clips and not first["from_cache"], first.get("error")
+    clip = first["tracks"][0]["clips"][1]
+    assert clip == {"clip_index": 2, "name": "SRC001", "start": 100, "end": 200, "duration": 100,
+                    "source_file": "/media/SRC001.mov", "resolution": "1920x1080", "fps": 25}, clip
+    # Name, start, end, media pool item and media ID per clip; properties once per source
+    assert build_calls <= clips * 5 + SOURCES + TRACKS + 10, f"Build took {build_calls} calls"
+
+    resolve.calls = 0
+    second = caller.call_tool("list_clips_in_tracks", {"track_type": "video"})["result"]
+    assert second["from_cache"] and second["tracks"] == first["tracks"]
+    assert resolve.calls <= TRACKS + 2, f"Cache hit took {resolve.calls} calls"
+    print(f"✅ Build: {build_calls} calls for {clips} clips; cache hit: {resolve.calls} calls")
+    return True
+
+
+def test_change_detection():
+    """Removing a clip changes the fingerprint; a mutating tool invalidates the snapshot and media properties."""
+    print("\n🔍 Testing change detection...")
+
+    resolve, caller = make_timeline()
+    timeline = resolve.project_manager.current_project.current_timeline
+    caller.call_tool("list_clips_in_tracks")
+
+    def relink(path):
+        properties = {"File Path": path, "Resolution": "3840x2160", "FPS": 25}
+        resolve.media_pool_item("SRC000").GetClipProperty = lambda key=None: properties if key is None else properties.get(key, "")
+
+    relink("/media/relinked/SRC000.mov")
+    timeline.tracks[2].pop()
+    listing = caller.call_tool("list_clips_in_tracks")["result"]
+    assert not listing["from_cache"] and listing["tracks"][1]["clip_count"] == CLIPS_PER_TRACK - 1
+    assert listing["tracks"][0]["clips"][0]["source_file"] == "/media/relinked/SRC000.mov", "Stale media properties"
+    assert caller.call_tool("list_clips_in_tracks")["result"]["from_cache"]
+
+    relink("/media/replaced/SRC000.mov")
+    caller.call_tool("apply_zoom_to_clips", {"clips": [{"track_index": 1, "clip_index": 1, "zoom_value": 1.1}]})
+    listing = caller.call_tool("list_clips_in_tracks")["result"]
+    assert not listing["from_cache"], "Zoom did not invalidate"
+    assert listing["tracks"][0]["clips"][0]["source_file"] == "/media/replaced/SRC000.mov", "Stale media properties"
+    print("✅ Rebuilt, with fresh media properties, after the item count changed and after a mutating tool")
+    return True
+
+
+def main():
+    """Run all tests and provide summary."""
+    print("🧪 Timeline Snapshot Cache Test Suite")
+    print("=" * 50)
+
+    tests = [
+        ("Snapshot Cost", test_snapshot_cost),
+        ("Change Detection", test_change_detection),
+    ]
+
+    results = []
+
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+        except Exception as e:
+            print(f"❌ {test_name} crashed: {e!r}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{'✅ PASS' if result else '❌ FAIL'} {test_name}")
+    print(f"\n📊 Results: {passed} passed, {len(results) - passed} failed")
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
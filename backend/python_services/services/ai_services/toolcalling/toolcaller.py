@@ -7,6 +7,14 @@ from pathlib import Path
 from typing import Dict, Any, List, Optional, Callable
 import importlib.util
 
+# Handle imports that work both when run directly and as a module
+try:
+    from .resolveconnection import ResolveConnection
+    from .timelinesnapshot import TimelineSnapshotCache
+except ImportError:
+    from resolveconnection import ResolveConnection
+    from timelinesnapshot import TimelineSnapshotCache
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -22,8 +30,10 @@ TOOL_DIRECTORY_PATH = TOOLCALLING_DIR / "tooldiretory.json"
 class ToolCaller:
     """Main tool calling system for the chatbot."""
     
-    def __init__(self):
-        """Initialize the tool caller."""
+    def __init__(self, resolve_connection: Optional[ResolveConnection] = None):
+        """Initialize the tool caller (optionally with a given Resolve connection, e.g. to a fake Resolve)."""
+        self.resolve = resolve_connection or ResolveConnection()
+        self.snapshots = TimelineSnapshotCache(self.resolve)
         self.tools = {}
         self.categories = {}
         self.tool_functions = {}
@@ -70,6 +80,7 @@ class ToolCaller:
             "export_current_timeline": self._export_current_timeline,
             "check_resolve_environment": self._check_resolve_environment,
             "apply_zoom_to_clip": self._apply_zoom_to_clip,
+            "apply_zoom_to_clips": self._apply_zoom_to_clips,
             "list_clips_in_tracks": self._list_clips_in_tracks,
             "reedit_timeline": self._reedit_timeline,
             "test_reedit_environment": self._test_reedit_environment,
@@ -125,7 +136,14 @@ class ToolCaller:
             logger.info(f"Calling tool: {tool_name} with parameters: {parameters}")
             
             # Call the tool function
-            result = self.tool_functions[tool_name](**parameters)
+            with self.resolve.tool_scope(tool_name):
+                result = self.tool_functions[tool_name](**parameters)
+            
+            # Tools that change Resolve may switch timelines; errors may mean stale handles
+            if self.mutates_resolve(tool_name):
+                self.snapshots.invalidate()
+            if self.mutates_resolve(tool_name) or (isinstance(result, dict) and "error" in result):
+                self.resolve.invalidate()
             
             return {
                 "success": True,
@@ -135,6 +153,7 @@ class ToolCaller:
         
         except Exception as e:
             logger.error(f"Error calling tool '{tool_name}': {e}")
+            self.resolve.invalidate()
             return {
                 "success": False,
                 "error": str(e),
@@ -144,23 +163,20 @@ class ToolCaller:
     # ===== DAVINCI RESOLVE TOOL FUNCTIONS =====
     
     def _get_resolve_api(self):
-        """Helper function to get DaVinci Resolve API connection - following exportotio.py pattern."""
-        try:
-            # Import DaVinci Resolve API
-            import DaVinciResolveScript as dvr_script
-            
-            # Connect to DaVinci Resolve
-            resolve = dvr_script.scriptapp("Resolve")
-            
-            if not resolve:
-                return None, "Could not connect to DaVinci Resolve. Make sure DaVinci Resolve is running and scripting is enabled."
-            
-            return resolve, None
-        
-        except ImportError as e:
-            return None, f"Could not import DaVinciResolveScript module: {e}. Make sure the DaVinci Resolve scripting environment is properly configured."
-        except Exception as e:
-            return None, f"Error connecting to DaVinci Resolve: {e}"
+        """Helper function to get the (cached) DaVinci Resolve API connection."""
+        return self.resolve.get_resolve()
+    
+    def mutates_resolve(self, tool_name: str) -> bool:
+        """Whether a tool modifies the Resolve project (flagged in the tool directory)."""
+        return bool(self.tools.get(tool_name, {}).get("mutates_resolve"))
+    
+    def current_timeline_key(self) -> str:
+        """Identity of the current timeline, which the editing tools act on ('' if unknown)."""
+        return self.resolve.timeline_key()
+    
+    def resolve_call_stats(self) -> Dict[str, Dict[str, int]]:
+        """Per tool: invocations and Resolve scripting calls made."""
+        return self.resolve.call_stats()
     
     def _test_resolve_connection(self) -> Dict[str, Any]:
         """Test if DaVinci Resolve is running and accessible."""
@@ -184,6 +200,8 @@ class ToolCaller:
             }
         
         except Exception as e:
+            # The cached connection may be stale (e.g. Resolve restarted); reconnect next time
+            self.resolve.invalidate(reconnect=True)
             return {
                 "connected": False,
                 "error": f"Connected but could not get version info: {e}"
@@ -234,19 +252,12 @@ class ToolCaller:
     
     def _get_resolve_project_info(self) -> Dict[str, Any]:
         """Get information about the currently open project in DaVinci Resolve - following exportotio.py pattern."""
-        resolve, error = self._get_resolve_api()
+        current_project, error = self.resolve.current_project()
         
         if error:
             return {"error": error}
         
         try:
-            # Following the exact pattern from exportotio.py
-            project_manager = resolve.GetProjectManager()
-            current_project = project_manager.GetCurrentProject()
-            
-            if not current_project:
-                return {"error": "No project is currently open in DaVinci Resolve"}
-            
             # Get project info - following exportotio.py pattern
             project_info = {
                 "name": current_project.GetName(),
@@ -256,7 +267,7 @@ class ToolCaller:
             }
             
             # Try to get current timeline name
-            current_timeline = current_project.GetCurrentTimeline()
+            current_timeline, _ = self.resolve.current_timeline()
             if current_timeline:
                 project_info["current_timeline_name"] = current_timeline.GetName()
             
@@ -267,24 +278,12 @@ class ToolCaller:
     
     def _get_resolve_timeline_info(self) -> Dict[str, Any]:
         """Get information about the current timeline in DaVinci Resolve - following exportotio.py pattern."""
-        resolve, error = self._get_resolve_api()
+        current_timeline, error = self.resolve.current_timeline()
         
         if error:
             return {"error": error}
         
         try:
-            # Following the exact pattern from exportotio.py
-            project_manager = resolve.GetProjectManager()
-            current_project = project_manager.GetCurrentProject()
-            
-            if not current_project:
-                return {"error": "No project is currently open"}
-            
-            current_timeline = current_project.GetCurrentTimeline()
-            
-            if not current_timeline:
-                return {"error": "No timeline is currently active"}
-            
             # Following exportotio.py's get_timeline_info function
             timeline_info = {
                 "name": current_timeline.GetName(),
@@ -306,22 +305,15 @@ class ToolCaller:
     
     def _list_resolve_timelines(self) -> Dict[str, Any]:
         """List all timelines in the current DaVinci Resolve project - following exportotio.py pattern."""
-        resolve, error = self._get_resolve_api()
+        current_project, error = self.resolve.current_project()
         
         if error:
             return {"error": error}
         
         try:
-            # Following the exact pattern from exportotio.py
-            project_manager = resolve.GetProjectManager()
-            current_project = project_manager.GetCurrentProject()
-            
-            if not current_project:
-                return {"error": "No project is currently open"}
-            
             timeline_count = current_project.GetTimelineCount()
             timelines = []
-            current_timeline = current_project.GetCurrentTimeline()
+            current_timeline, _ = self.resolve.current_timeline()
             current_timeline_name = current_timeline.GetName() if current_timeline else None
             
             # DaVinci uses 1-based indexing
@@ -346,19 +338,12 @@ class ToolCaller:
     
     def _get_resolve_media_pool_info(self, include_clips: bool = False) -> Dict[str, Any]:
         """Get information about the media pool in the current DaVinci Resolve project."""
-        resolve, error = self._get_resolve_api()
+        current_project, error = self.resolve.current_project()
         
         if error:
             return {"error": error}
         
         try:
-            # Following the exact pattern from exportotio.py
-            project_manager = resolve.GetProjectManager()
-            current_project = project_manager.GetCurrentProject()
-            
-            if not current_project:
-                return {"error": "No project is currently open"}
-            
             media_pool = current_project.GetMediaPool()
             root_folder = media_pool.GetRootFolder()
             
@@ -447,24 +432,12 @@ class ToolCaller:
         description: str = ""
     ) -> Dict[str, Any]:
         """Apply zoom settings to a specific clip for punch-ins and framing adjustments."""
-        resolve, error = self._get_resolve_api()
+        current_timeline, error = self.resolve.current_timeline()
         
         if error:
             return {"error": error}
         
         try:
-            # Following the exact pattern from exportotio.py
-            project_manager = resolve.GetProjectManager()
-            current_project = project_manager.GetCurrentProject()
-            
-            if not current_project:
-                return {"error": "No project is currently open"}
-            
-            current_timeline = current_project.GetCurrentTimeline()
-            
-            if not current_timeline:
-                return {"error": "No timeline is currently active"}
-            
             # Get the specific track
             track_count = current_timeline.GetTrackCount("video")
             if track_index > track_count or track_index < 1:
@@ -482,158 +455,157 @@ class ToolCaller:
             if not target_clip:
                 return {"error": f"Could not access clip {clip_index} on track {track_index}"}
             
-            # Get clip name for logging
-            clip_name = target_clip.GetName()
+            return self._zoom_clip(target_clip, track_index, clip_index, zoom_value, lock_axes, description)
+        
+        except Exception as e:
+            return {"error": f"Error applying zoom: {e}"}
+    
+    def _zoom_clip(
+        self,
+        target_clip,
+        track_index: int,
+        clip_index: int,
+        zoom_value: float,
+        lock_axes: bool = True,
+        description: str = ""
+    ) -> Dict[str, Any]:
+        """Apply zoom settings to a timeline item and describe the outcome."""
+        # Get clip name for logging
+        clip_name = target_clip.GetName()
+        
+        # Apply zoom using DaVinci Resolve's multiplier system
+        # 1.0 = normal size, 1.1 = 10% zoom in, 1.2 = 20% zoom in, etc.
+        zoom_properties = {}
+        
+        # Lock axes together if requested (recommended for uniform punch-ins)
+        if lock_axes:
+            zoom_properties["ZoomGang"] = True
+        
+        # Set zoom multipliers
+        zoom_properties["ZoomX"] = zoom_value
+        zoom_properties["ZoomY"] = zoom_value
+        
+        # Apply zoom settings
+        success = target_clip.SetProperty(zoom_properties)
+        
+        if success:
+            # Prepare result summary
+            result = {
+                "success": True,
+                "clip_name": clip_name,
+                "track_index": track_index,
+                "clip_index": clip_index,
+                "zoom_applied": {
+                    "zoom_value": zoom_value,
+                    "lock_axes": lock_axes,
+                    "properties_set": zoom_properties
+                },
+                "description": description,
+                "message": f"Zoom {zoom_value}x applied to '{clip_name}' on track {track_index}"
+            }
             
-            # Apply zoom using DaVinci Resolve's multiplier system
-            # 1.0 = normal size, 1.1 = 10% zoom in, 1.2 = 20% zoom in, etc.
-            zoom_properties = {}
+            # Add descriptive summary
+            if zoom_value > 1.0:
+                zoom_change = int((zoom_value - 1.0) * 100)
+                result["zoom_summary"] = f"{zoom_change}% zoom in"
+            elif zoom_value < 1.0:
+                zoom_change = int((1.0 - zoom_value) * 100)
+                result["zoom_summary"] = f"{zoom_change}% zoom out"
+            else:
+                result["zoom_summary"] = "no zoom change (1.0x)"
             
-            # Lock axes together if requested (recommended for uniform punch-ins)
             if lock_axes:
-                zoom_properties["ZoomGang"] = True
-            
-            # Set zoom multipliers
-            zoom_properties["ZoomX"] = zoom_value
-            zoom_properties["ZoomY"] = zoom_value
+                result["zoom_summary"] += " (axes locked)"
             
-            # Apply zoom settings
-            success = target_clip.SetProperty(zoom_properties)
-            
-            if success:
-                # Prepare result summary
-                result = {
-                    "success": True,
-                    "clip_name": clip_name,
-                    "track_index": track_index,
-                    "clip_index": clip_index,
-                    "zoom_applied": {
-                        "zoom_value": zoom_value,
-                        "lock_axes": lock_axes,
-                        "properties_set": zoom_properties
-                    },
-                    "description": description,
-                    "message": f"Zoom {zoom_value}x applied to '{clip_name}' on track {track_index}"
-                }
-                
-                # Add descriptive summary
-                if zoom_value > 1.0:
-                    zoom_change = int((zoom_value - 1.0) * 100)
-                    result["zoom_summary"] = f"{zoom_change}% zoom in"
-                elif zoom_value < 1.0:
-                    zoom_change = int((1.0 - zoom_value) * 100)
-                    result["zoom_summary"] = f"{zoom_change}% zoom out"
-                else:
-                    result["zoom_summary"] = "no zoom change (1.0x)"
-                
-                if lock_axes:
-                    result["zoom_summary"] += " (axes locked)"
-                
-                return result
-            else:
-                return {
-                    "success": False,
-                    "error": f"Failed to apply zoom to clip '{clip_name}' on track {track_index}",
-                    "clip_name": clip_name,
-                    "track_index": track_index,
-                    "clip_index": clip_index
-                }
-        
-        except Exception as e:
-            return {"error": f"Error applying zoom: {e}"}
+            return result
+        else:
+            return {
+                "success": False,
+                "error": f"Failed to apply zoom to clip '{clip_name}' on track {track_index}",
+                "clip_name": clip_name,
+                "track_index": track_index,
+                "clip_index": clip_index
+            }
     
-    def _list_clips_in_tracks(self, track_type: str = "video") -> Dict[str, Any]:
-        """List all clips across tracks with their positions and details."""
-        resolve, error = self._get_resolve_api()
+    def _apply_zoom_to_clips(
+        self,
+        clips: List[Dict[str, Any]],
+        lock_axes: bool = True,
+        description: str = ""
+    ) -> Dict[str, Any]:
+        """Apply zoom settings to many clips at once, fetching the timeline and each track's clips only once."""
+        current_timeline, error = self.resolve.current_timeline()
         
         if error:
             return {"error": error}
         
         try:
-            # Following the exact pattern from exportotio.py
-            project_manager = resolve.GetProjectManager()
-            current_project = project_manager.GetCurrentProject()
-            
-            if not current_project:
-                return {"error": "No project is currently open"}
-            
-            current_timeline = current_project.GetCurrentTimeline()
-            
-            if not current_timeline:
-                return {"error": "No timeline is currently active"}
-            
-            # Get track count for the specified type
-            track_count = current_timeline.GetTrackCount(track_type)
-            
-            if track_count == 0:
-                return {
-                    "track_type": track_type,
-                    "track_count": 0,
-                    "tracks": [],
-                    "message": f"No {track_type} tracks found in current timeline"
-                }
-            
-            tracks_info = []
-            total_clips = 0
-            
-            # Iterate through each track (1-based indexing)
-            for track_index in range(1, track_count + 1):
-                track_clips = current_timeline.GetItemListInTrack(track_type, track_index)
+            track_count = current_timeline.GetTrackCount("video")
+            track_items: Dict[int, List[Any]] = {}
+            results = []
+            
+            for spec in clips:
+                track_index = spec.get("track_index")
+                clip_index = spec.get("clip_index")
+                zoom_value = spec.get("zoom_value")
+                item = {"track_index": track_index, "clip_index": clip_index}
                 
-                track_info = {
-                    "track_index": track_index,
-                    "clip_count": len(track_clips) if track_clips else 0,
-                    "clips": []
-                }
+                if not isinstance(track_index, int) or track_index > track_count or track_index < 1:
+                    results.append({**item, "success": False,
+                                    "error": f"Invalid track index {track_index}. Video tracks available: 1-{track_count}"})
+                    continue
+                if zoom_value is None:
+                    results.append({**item, "success": False, "error": "Missing zoom_value"})
+                    continue
                 
-                if track_clips:
-                    for clip_index, clip in enumerate(track_clips, 1):  # 1-based indexing
-                        try:
-                            clip_info = {
-                                "clip_index": clip_index,
-                                "name": clip.GetName(),
-                                "start": clip.GetStart(),
-                                "end": clip.GetEnd(),
-                                "duration": clip.GetDuration()
-                            }
-                            
-                            # Try to get additional properties safely
-                            try:
-                                clip_info["source_file"] = clip.GetMediaPoolItem().GetClipProperty("File Path") if clip.GetMediaPoolItem() else "Unknown"
-                            except:
-                                clip_info["source_file"] = "Unknown"
-                            
-                            # For video clips, try to get resolution info
-                            if track_type == "video":
-                                try:
-                                    media_item = clip.GetMediaPoolItem()
-                                    if media_item:
-                                        clip_info["resolution"] = f"{media_item.GetClipProperty('Resolution')}"
-                                        clip_info["fps"] = media_item.GetClipProperty("FPS")
-                                except:
-                                    pass
-                            
-                            track_info["clips"].append(clip_info)
-                            total_clips += 1
-                        
-                        except Exception as e:
-                            logger.warning(f"Could not get info for clip {clip_index} on track {track_index}: {e}")
-                            track_info["clips"].append({
-                                "clip_index": clip_index,
-                                "name": "Unknown",
-                                "error": str(e)
-                            })
+                # Each track's clips are fetched once for the whole batch
+                if track_index not in track_items:
+                    track_items[track_index] = current_timeline.GetItemListInTrack("video", track_index) or []
+                track_clips = track_items[track_index]
                 
-                tracks_info.append(track_info)
+                if not isinstance(clip_index, int) or clip_index > len(track_clips) or clip_index < 1:
+                    results.append({**item, "success": False,
+                                    "error": f"Invalid clip index {clip_index}. Clips available on track {track_index}: 1-{len(track_clips)}"})
+                    continue
+                
+                target_clip = track_clips[clip_index - 1]
+                if not target_clip:
+                    results.append({**item, "success": False,
+                                    "error": f"Could not access clip {clip_index} on track {track_index}"})
+                    continue
+                
+                try:
+                    results.append(self._zoom_clip(
+                        target_clip, track_index, clip_index, float(zoom_value),
+                        spec.get("lock_axes", lock_axes), spec.get("description", description)
+                    ))
+                except Exception as e:
+                    results.append({**item, "success": False, "error": f"Error applying zoom: {e}"})
             
+            applied = sum(1 for result in results if result.get("success"))
             return {
-                "track_type": track_type,
-                "track_count": track_count,
-                "total_clips": total_clips,
-                "tracks": tracks_info,
-                "timeline_name": current_timeline.GetName()
+                "success": applied == len(results),
+                "applied": applied,
+                "failed": len(results) - applied,
+                "results": results,
+                "description": description,
+                "timeline_name": current_timeline.GetName(),
+                "message": f"Zoom applied to {applied} of {len(results)} clips"
             }
         
+        except Exception as e:
+            return {"error": f"Error applying zoom: {e}"}
+    
+    def _list_clips_in_tracks(self, track_type: str = "video") -> Dict[str, Any]:
+        """List all clips across tracks with their positions and details (from the timeline snapshot cache)."""
+        try:
+            snapshot, error, from_cache = self.snapshots.get(track_type)
+            
+            if error:
+                return {"error": error}
+            
+            return {**snapshot, "from_cache": from_cache}
+        
         except Exception as e:
             return {"error": f"Error listing clips: {e}"}
     
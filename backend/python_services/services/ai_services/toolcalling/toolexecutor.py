@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Concurrent execution of the tool calls in one Claude response.
+
+Claude often asks for several tools at once (e.g. five apply_zoom_to_clip
+calls, or project and timeline info together). ToolExecutor runs the
+read-only ones concurrently on a thread pool. From the first tool flagged
+"mutates_resolve" in the tool directory on, the batch's calls run one after
+another, in the order Claude gave them, as a single chain on the pool
+holding the lock of the timeline they act on: mutations from concurrent
+conversations never interleave on one timeline, and a read-only call after
+a mutation sees (and caches) the timeline as that mutation left it. The
+chain starts once the read-only calls before it have finished, so none of
+them can cache a timeline snapshot from before the mutations.
+
+Each call's future resolves to a record with its tool_name, input, result
+and duration_ms, and the futures are returned in the order of the calls.
+"""
+
+import time
+import asyncio
+import logging
+import threading
+import concurrent.futures
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Handle imports that work both when run directly and as a module
+try:
+    from .toolcaller import ToolCaller, tool_caller
+except ImportError:
+    from toolcaller import ToolCaller, tool_caller
+
+logger = logging.getLogger(__name__)
+
+# Threads for running tools; read-only calls beyond this wait for a free thread
+TOOL_WORKERS = 8
+
+
+class ToolExecutor:
+    """Runs batches of tool calls: read-only tools concurrently, mutating tools serialized per timeline."""
+
+    def __init__(self, caller: ToolCaller, max_workers: int = TOOL_WORKERS):
+        self.caller = caller
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool")
+        self._timeline_locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def timeline_lock(self, key: str) -> threading.Lock:
+        """The lock serializing mutations of one timeline."""
+        with self._locks_lock:
+            if key not in self._timeline_locks:
+                self._timeline_locks[key] = threading.Lock()
+            return self._timeline_locks[key]
+
+    def _call(self, tool_name: str, tool_input: Dict[str, Any]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        result = self.caller.call_tool(tool_name, tool_input)
+        return {
+            "tool_name": tool_name,
+            "input": tool_input,
+            "result": result,
+            "duration_ms": (time.perf_counter() - started) * 1000
+        }
+
+    def _run_in_order(self, earlier: List[concurrent.futures.Future],
+                      calls: List[Tuple[str, Dict[str, Any], concurrent.futures.Future]]) -> None:
+        # Submitted before this chain, so they are already running or next in the pool's queue
+        concurrent.futures.wait(earlier)
+        # One batch's mutations hold the lock together, so another conversation's cannot land in between
+        with self.timeline_lock(self.caller.current_timeline_key()):
+            for tool_name, tool_input, future in calls:
+                try:
+                    future.set_result(self._call(tool_name, tool_input))
+                except Exception as e:
+                    future.set_exception(e)
+
+    def submit(self, calls: Sequence[Tuple[str, Optional[Dict[str, Any]]]]) -> List[concurrent.futures.Future]:
+        """
+        Start a batch of (tool_name, input) calls.
+
+        Returns one future per call, in the order of the calls, each resolving
+        to a record with tool_name, input, result and duration_ms.
+        """
+        futures: List[concurrent.futures.Future] = []
+        chain = []  # The first mutation and every call after it
+        for tool_name, tool_input in calls:
+            tool_input = tool_input or {}
+            if chain or self.caller.mutates_resolve(tool_name):
+                future = concurrent.futures.Future()
+                chain.append((tool_name, tool_input, future))
+            else:
+                future = self._pool.submit(self._call, tool_name, tool_input)
+            futures.append(future)
+        if chain:
+            self._pool.submit(self._run_in_order, futures[:len(futures) - len(chain)], chain)
+        return futures
+
+    def submit_async(self, calls: Sequence[Tuple[str, Optional[Dict[str, Any]]]]) -> List[asyncio.Future]:
+        """submit() for the running event loop: awaitable futures, in the order of the calls."""
+        return [asyncio.wrap_future(future) for future in self.submit(calls)]
+
+    def run(self, calls: Sequence[Tuple[str, Optional[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        """Run a batch of calls and return their records, in the order of the calls."""
+        return [future.result() for future in self.submit(calls)]
+
+
+# Global instance for easy access
+tool_executor = ToolExecutor(tool_caller)
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Tool Executor Test Script
+
+Checks, with a fake tool caller (no DaVinci Resolve needed), that:
+- Read-only tool calls in one batch run concurrently
+- Mutating tool calls run one at a time, in order, on each timeline
+- Read-only calls after a mutation in a batch wait for it, and the mutation
+  waits for the read-only calls before it
+- Records come back in the order of the calls, with their latency
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+
+# Add the toolcalling directory to Python path for imports
+script_dir = Path(__file__).parent
+sys.path.insert(0, str(script_dir))
+
+TOOL_SECONDS = 0.2
+
+
+class FakeToolCaller:
+    """Stands in for ToolCaller: sleeps per call and records what ran concurrently."""
+
+    def __init__(self):
+        self.tools = {
+            "get_resolve_timeline_info": {},
+            "list_clips_in_tracks": {},
+            "apply_zoom_to_clip": {"mutates_resolve": True},
+        }
+        self.timeline = "Project/Timeline 1"
+        self.running = 0
+        self.max_running = 0
+        self.mutations_running = 0
+        self.max_mutations_running = 0
+        self.mutation_order = []
+        self.events = []
+        self._lock = threading.Lock()
+
+    def mutates_resolve(self, tool_name):
+        return bool(self.tools[tool_name].get("mutates_resolve"))
+
+    def current_timeline_key(self):
+        return self.timeline
+
+    def call_tool(self, tool_name, parameters=None):
+        mutating = self.mutates_resolve(tool_name)
+        with self._lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            if mutating:
+                self.mutations_running += 1
+                self.max_mutations_running = max(self.max_mutations_running, self.mutations_running)
+                self.mutation_order.append(parameters["clip_index"])
+            self.events.append(("start", tool_name))
+        time.sleep(TOOL_SECONDS)
+        with self._lock:
+            self.events.append(("end", tool_name))
+            self.running -= 1
+            if mutating:
+                self.mutations_running -= 1
+        return {"success": True, "tool_name": tool_name, "result": parameters}
+
+
+def test_read_only_concurrent():
+    """Five read-only calls take about as long as one."""
+    print("🔍 Testing concurrent read-only tools...")
+
+    from toolexecutor import ToolExecutor
+
+    caller = FakeToolCaller()
+    executor = ToolExecutor(caller)
+    calls = [("list_clips_in_tracks", {"track_type": f"video-{n}"}) for n in range(5)]
+
+    started = time.perf_counter()
+    records = executor.run(calls)
+    elapsed = time.perf_counter() - started
+
+    assert caller.max_running == 5, f"Expected 5 calls at once, saw {caller.max_running}"
+    assert elapsed < 2 * TOOL_SECONDS, f"Batch took {elapsed:.2f}s"
+    assert [record["input"] for record in records] == [params for _, params in calls], "Records out of order"
+    assert all(record["duration_ms"] >= TOOL_SECONDS * 1000 * 0.9 for record in records)
+    print(f"✅ 5 read-only calls in {elapsed:.2f}s, records in call order with durations")
+    return True
+
+
+def test_mutations_serialized():
+    """Mutating calls run one at a time, in order, even from two batches at once, while reads overlap them."""
+    print("\n🔍 Testing serialized mutating tools...")
+
+    from toolexecutor import ToolExecutor
+
+    caller = FakeToolCaller()
+    executor = ToolExecutor(caller)
+    first = [("apply_zoom_to_clip", {"clip_index": n}) for n in (1, 2, 3)]
+    second = [("get_resolve_timeline_info", {}), ("apply_zoom_to_clip", {"clip_index": 4})]
+
+    started = time.perf_counter()
+    first_futures = executor.submit(first)
+    second_futures = executor.submit(second)
+    records = [future.result() for future in first_futures + second_futures]
+    elapsed = time.perf_counter() - started
+
+    assert caller.max_mutations_running == 1, "Mutations of one timeline overlapped"
+    assert caller.mutation_order[:3] == [1, 2, 3], f"Mutations out of order: {caller.mutation_order}"
+    assert caller.max_running == 2, "The read-only call should run alongside the mutations"
+    assert [record["tool_name"] for record in records] == [name for name, _ in first + second]
+    assert elapsed >= 4 * TOOL_SECONDS * 0.9
+    print(f"✅ 4 mutations serialized in {elapsed:.2f}s, read-only call ran alongside")
+    return True
+
+
+def test_reads_ordered_around_mutations():
+    """In a batch with a mutation, reads before it finish first and reads after it start after it."""
+    print("\n🔍 Testing read-only calls around a mutation...")
+
+    from toolexecutor import ToolExecutor
+
+    caller = FakeToolCaller()
+    executor = ToolExecutor(caller)
+    calls = [("get_resolve_timeline_info", {}), ("apply_zoom_to_clip", {"clip_index": 1}),
+             ("list_clips_in_tracks", {}), ("get_resolve_timeline_info", {})]
+    records = executor.run(calls)
+
+    assert [record["tool_name"] for record in records] == [name for name, _ in calls]
+    assert caller.events == [("start", "get_resolve_timeline_info"), ("end", "get_resolve_timeline_info"),
+                             ("start", "apply_zoom_to_clip"), ("end", "apply_zoom_to_clip"),
+                             ("start", "list_clips_in_tracks"), ("end", "list_clips_in_tracks"),
+                             ("start", "get_resolve_timeline_info"), ("end", "get_resolve_timeline_info")], \
+        f"Unexpected order: {caller.events}"
+    print("✅ Mutation ran after the read before it; the reads after it ran in order once it finished")
+    return True
+
+
+def main():
+    """Run all tests and provide summary."""
+    print("🧪 Tool Executor Test Suite")
+    print("=" * 50)
+
+    tests = [
+        ("Concurrent Read-Only Tools", test_read_only_concurrent),
+        ("Serialized Mutations", test_mutations_serialized),
+        ("Reads Ordered Around Mutations", test_reads_ordered_around_mutations),
+    ]
+
+    results = []
+
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+        except Exception as e:
+            print(f"❌ {test_name} crashed: {e!r}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{'✅ PASS' if result else '❌ FAIL'} {test_name}")
+    print(f"\n📊 Results: {passed} passed, {len(results) - passed} failed")
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
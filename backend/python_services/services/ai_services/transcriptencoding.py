@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Compact transcript encoding for the roughcut and reedit prompts.
+
+The edit agents used to send the transcript as json.dumps(transcript, indent=2):
+one indented dict per word, repeating the word/speaker/frame_in/frame_out/
+confidence keys thousands of times, plus the full_transcript text a second
+time. For a long interview that was most of the input tokens.
+
+encode_transcript() sends the transcript's segment index instead (see
+assetanalysis/transcriptsegments.py):
+
+- Each segment (a sentence or phrase by one speaker) has one frame range, so
+  every sentence boundary is still a cut point, and the model picks clips by
+  segment ID (see segmentclips.py).
+- Segments are rows under "segment_columns" rather than dicts with keys, and
+  silence markers are [frame_in, frame_out] pairs.
+- Per-word confidence is dropped; each segment keeps its average confidence
+  (rounded to 2 places). include_confidence=True (EDITAGENT_WORD_CONFIDENCE=1
+  for the edit agents) adds the per-word values.
+- The JSON has no indentation or spaces after separators.
+
+With report=True, encode_transcript() also compares the size with the
+indented dump it replaces. That serializes the whole verbose transcript (and
+loads a columnar transcript's words), so it is for measuring, not for every
+prompt. Token counts are estimates (about 4 characters per token), not
+tokenizer counts.
+"""
+
+import os
+import sys
+import json
+import math
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+# The segmenter lives with the other transcript formats in asset analysis
+assetanalysis_dir = Path(__file__).parent.parent / "assetanalysis"
+if str(assetanalysis_dir) not in sys.path:
+    sys.path.insert(0, str(assetanalysis_dir))
+from transcriptsegments import HEADER_KEYS, build_segment_index
+
+# Whether the edit agents send per-word confidence by default
+INCLUDE_WORD_CONFIDENCE = os.getenv("EDITAGENT_WORD_CONFIDENCE", "").lower() in ("1", "true", "yes")
+
+# Rough characters per token for Claude on JSON-heavy text
+CHARS_PER_TOKEN = 4
+
+SEGMENT_COLUMNS = ["id", "speaker", "frame_in", "frame_out", "avg_confidence", "text"]
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of prompt text."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _segment_row(segment: Dict[str, Any], words: Optional[List[Mapping[str, Any]]]) -> List[Any]:
+    avg_confidence = segment["avg_confidence"]
+    row = [segment["id"], segment["speaker"], segment["frame_in"], segment["frame_out"],
+           None if avg_confidence is None else round(avg_confidence, 2), segment["text"]]
+    if words is not None:
+        row.append([None if word.get("confidence") is None else round(word["confidence"], 2)
+                    for word in words[segment["word_start"]:segment["word_end"]]])
+    return row
+
+
+def compact_transcript(transcript_data: Mapping[str, Any], include_confidence: bool = False,
+                       segment_index: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    The transcript as metadata, segment rows and silences (see module docstring).
+
+    Args:
+        transcript_data: Transcript with "words" and metadata
+        include_confidence: Add each word's confidence to its segment
+        segment_index: The transcript's segment index; built from the words when not given
+    """
+    if segment_index is None:
+        segment_index = build_segment_index(transcript_data)
+    words = transcript_data["words"] if include_confidence else None
+    compact = {key: segment_index[key] for key in HEADER_KEYS if key in segment_index}
+    compact["segment_columns"] = SEGMENT_COLUMNS + (["word_confidence"] if include_confidence else [])
+    compact["segments"] = [_segment_row(segment, words) for segment in segment_index["segments"]]
+    compact["silences"] = segment_index["silences"]
+    return compact
+
+
+def encode_transcript(transcript_data: Mapping[str, Any], include_confidence: bool = False,
+                      segment_index: Optional[Dict[str, Any]] = None,
+                      report: bool = False) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Encode a transcript (a dict or a lazily loaded columnar transcript) for a prompt.
+
+    Args:
+        transcript_data: Transcript with "words" and metadata
+        include_confidence: Add each word's confidence to its segment
+        segment_index: The transcript's segment index; built from the words when not given
+        report: Also measure the indented dump this replaces (serializes the whole transcript)
+
+    Returns:
+        (transcript_json, savings); savings is None when report is False, otherwise
+        segments, words, characters and estimated tokens before and after
+    """
+    compact = compact_transcript(transcript_data, include_confidence, segment_index)
+    transcript_json = json.dumps(compact, separators=(",", ":"), ensure_ascii=False, default=list)
+    if not report:
+        return transcript_json, None
+
+    # dict()/default=list also serialize a lazily loaded columnar transcript
+    verbose_chars = len(json.dumps(dict(transcript_data), indent=2, default=list))
+    compact_chars = len(transcript_json)
+    savings = {
+        "segments": len(compact["segments"]),
+        "words": sum(len(row[5].split(" ")) for row in compact["segments"]),
+        "verbose_chars": verbose_chars,
+        "compact_chars": compact_chars,
+        "verbose_tokens_estimate": math.ceil(verbose_chars / CHARS_PER_TOKEN),
+        "compact_tokens_estimate": estimate_tokens(transcript_json),
+        "saved_percent": round(100 * (1 - compact_chars / verbose_chars), 1) if verbose_chars else 0.0
+    }
+    return transcript_json, savings
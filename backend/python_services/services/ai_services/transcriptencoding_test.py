@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Transcript Encoding Test Script
+
+Checks the compact transcript encoding used by the roughcut and reedit
+prompts against the sample transcript in data/analyzed, without calling
+the Claude API:
+- Every word and silence marker is kept, in order, with its frames
+- Per-word confidence is only sent when asked for
+- The encoding is much smaller than the indented JSON it replaces
+- Recorded Claude responses (timelines in data/timelineprocessing) replay
+  through the agents' response parsing and their cuts still land on the
+  encoding's segment boundaries
+- Responses giving clips as segment IDs expand to frame-accurate clips
+"""
+
+import sys
+import json
+from pathlib import Path
+
+# Add the ai_services directory to Python path for imports
+script_dir = Path(__file__).parent
+sys.path.insert(0, str(script_dir))
+
+DATA_DIR = script_dir.parent.parent / "data"
+TRANSCRIPT_PATH = DATA_DIR / "analyzed" / "20250509_MTC_2206.transcript.json"
+RECORDED_RESPONSES = [
+    DATA_DIR / "timelineprocessing" / "timeline_edited" / "Nice_Touch_launch_Video_reedit_v2_20250627_173230.json",
+    DATA_DIR / "timelineprocessing" / "timeline_ref" / "exported_timeline.json",
+]
+
+# A cut counts as on a segment boundary within this many seconds
+CUT_TOLERANCE_SECONDS = 1.0
+MIN_ALIGNED_CUTS = 0.9
+
+
+def load_sample_transcript():
+    with open(TRANSCRIPT_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_encoding_keeps_every_word():
+    """Segments cover every word in order, and silences every silence marker."""
+    print("🔍 Testing that the encoding keeps every word...")
+
+    from transcriptencoding import compact_transcript
+    from transcriptsegments import SILENCE_WORD
+
+    transcript = load_sample_transcript()
+    compact = compact_transcript(transcript)
+    words = [word for word in transcript["words"] if word["word"] != SILENCE_WORD]
+    silences = [[word["frame_in"], word["frame_out"]] for word in transcript["words"] if word["word"] == SILENCE_WORD]
+
+    encoded_words = " ".join(row[5] for row in compact["segments"]).split(" ")
+    assert encoded_words == [word["word"] for word in words], "Segment text does not match the words"
+    assert compact["silences"] == silences
+
+    columns = compact["segment_columns"]
+    assert "word_confidence" not in columns and "confidence" not in json.dumps(compact["segments"])
+    previous_out = None
+    position = 0
+    for row in compact["segments"]:
+        segment = dict(zip(columns, row))
+        segment_words = words[position:position + len(segment["text"].split(" "))]
+        position += len(segment_words)
+        assert segment["frame_in"] == segment_words[0]["frame_in"]
+        assert segment["frame_out"] == segment_words[-1]["frame_out"]
+        assert {word["speaker"] for word in segment_words} == {segment["speaker"]}
+        assert previous_out is None or segment["frame_in"] >= previous_out, f"Segment {segment['id']} overlaps"
+        previous_out = segment["frame_out"]
+    assert compact["timecode_offset_frames"] == transcript["timecode_offset_frames"]
+
+    print(f"✅ {len(words)} words in {len(compact['segments'])} segments, {len(silences)} silences")
+    return True
+
+
+def test_confidence_and_savings():
+    """Per-word confidence is opt-in, and the encoding is much smaller than the indented dump."""
+    print("\n🔍 Testing confidence option and token savings...")
+
+    from transcriptencoding import encode_transcript
+
+    transcript = load_sample_transcript()
+    transcript_json, savings = encode_transcript(transcript, report=True)
+    with_confidence_json, with_confidence = encode_transcript(transcript, include_confidence=True, report=True)
+    assert encode_transcript(transcript) == (transcript_json, None), "Prompts should not pay for the report"
+
+    compact = json.loads(with_confidence_json)
+    assert compact["segment_columns"][-1] == "word_confidence"
+    for row in compact["segments"]:
+        assert len(row[-1]) == len(row[5].split(" ")), f"Segment {row[0]} has the wrong number of confidences"
+
+    assert savings["words"] == with_confidence["words"]
+    assert savings["verbose_chars"] == len(json.dumps(transcript, indent=2))
+    assert savings["compact_chars"] == len(transcript_json) < with_confidence["compact_chars"]
+    assert savings["saved_percent"] >= 80, f"Only {savings['saved_percent']}% smaller"
+
+    print(f"✅ ~{savings['verbose_tokens_estimate']} -> ~{savings['compact_tokens_estimate']} tokens "
+          f"({savings['saved_percent']}% smaller), ~{with_confidence['compact_tokens_estimate']} with word confidence")
+    return True
+
+
+def test_replay_recorded_responses():
+    """Recorded responses parse and validate offline, and their cuts fall on segment boundaries."""
+    print("\n🔍 Testing replay of recorded responses...")
+
+    import editagent_reedit
+    import editagent_roughcut
+    from transcriptencoding import compact_transcript
+
+    transcript = load_sample_transcript()
+    compact = compact_transcript(transcript)
+    tolerance = CUT_TOLERANCE_SECONDS * transcript["fps"]
+    cut_points = sorted({frame for row in compact["segments"] for frame in (row[2], row[3])})
+    first_frame, last_frame = compact["segments"][0][2], compact["segments"][-1][3]
+
+    for path in RECORDED_RESPONSES:
+        response_content = path.read_text(encoding="utf-8")
+        # Replies wrapped in a markdown code block must parse the same way
+        for reply in (response_content, f"```json\n{response_content}\n```"):
+            for agent in (editagent_roughcut, editagent_reedit):
+                assert agent.parse_timeline_response(reply) == json.loads(response_content)
+
+        timeline = json.loads(response_content)
+        cuts = aligned = 0
+        for track in timeline["tracks"]:
+            for clip in track["clips"]:
+                source_range = clip["source_range"]
+                start, end = source_range["start_frame"], source_range["end_frame"]
+                assert first_frame - tolerance <= start < end <= last_frame + tolerance, \
+                    f"{path.name}: clip {clip['clip_index']} is outside the transcript"
+                for frame in (start, end):
+                    cuts += 1
+                    aligned += min(abs(frame - point) for point in cut_points) <= tolerance
+        assert aligned / cuts >= MIN_ALIGNED_CUTS, f"{path.name}: only {aligned}/{cuts} cuts on segment boundaries"
+        print(f"✅ {path.name}: {aligned}/{cuts} cuts on segment boundaries")
+
+    # The prompts the agents build carry the encoding, not the per-word dump
+    _, user_content = editagent_roughcut.load_prompts(transcript, "brief", "Project")
+    user_prompt = user_content[0]["text"]
+    assert '"segments":[[0,' in user_prompt and '"frame_in": ' not in user_prompt
+    return True
+
+
+def test_expand_segment_ids():
+    """Clips given as segment_ids expand to the segments' frames, metadata and totals."""
+    print("\n🔍 Testing segment ID expansion...")
+
+    import editagent_reedit
+    import editagent_roughcut
+    from transcriptsegments import build_segment_index
+
+    transcript = load_sample_transcript()
+    segment_index = build_segment_index(transcript)
+    segments = segment_index["segments"]
+
+    # The recorded re-edit, with each clip re-expressed as the run of segments it starts and ends in
+    recorded = json.loads(RECORDED_RESPONSES[0].read_text(encoding="utf-8"))
+    starts = [segment["frame_in"] for segment in segments]
+    for track in recorded["tracks"]:
+        for clip in track["clips"]:
+            source_range = clip.pop("source_range")
+            first = max(i for i, frame in enumerate(starts) if frame <= source_range["start_frame"])
+            last = max(i for i, frame in enumerate(starts) if frame < source_range["end_frame"])
+            clip["segment_ids"] = [first, last]
+            clip["metadata"] = {}
+    recorded["summary"]["timeline_duration_frames"] = 0
+    reply = json.dumps(recorded)
+
+    for agent in (editagent_roughcut, editagent_reedit):
+        result = agent.parse_timeline_response(reply, segment_index)
+        clips = [clip for track in result["tracks"] for clip in track["clips"]]
+        for clip in clips:
+            first, last = clip["metadata"]["segment_ids"]
+            source_range = clip["source_range"]
+            assert source_range["start_frame"] == segments[first]["frame_in"]
+            assert source_range["duration_frames"] == segments[last]["frame_out"] - segments[first]["frame_in"]
+            # Timeline JSON end_frame is inclusive, as otio2json writes it
+            assert source_range["end_frame"] == segments[last]["frame_out"] - 1
+            assert clip["metadata"]["original_segment_id"] == first
+            assert clip["metadata"]["text"].startswith(segments[first]["text"])
+        video_duration = sum(clip["source_range"]["duration_frames"] for clip in result["tracks"][0]["clips"])
+        assert result["summary"]["timeline_duration_frames"] == video_duration
+        assert result["tracks"][0]["metadata"]["track_duration_frames"] == video_duration
+
+    recorded["tracks"][0]["clips"][0]["segment_ids"] = [len(segments), len(segments)]
+    bad_reply = json.dumps(recorded)
+    try:
+        editagent_roughcut.parse_timeline_response(bad_reply, segment_index)
+        print("❌ An unknown segment ID should be rejected")
+        return False
+    except ValueError:
+        pass
+
+    print(f"✅ {len(clips)} clips expanded from segment IDs ({video_duration} frames); unknown IDs rejected")
+    return True
+
+
+def main():
+    """Run all tests and provide summary."""
+    print("🧪 Transcript Encoding Test Suite")
+    print("=" * 50)
+
+    tests = [
+        ("Encoding Keeps Every Word", test_encoding_keeps_every_word),
+        ("Confidence and Savings", test_confidence_and_savings),
+        ("Replay Recorded Responses", test_replay_recorded_responses),
+        ("Expand Segment IDs", test_expand_segment_ids),
+    ]
+
+    results = []
+
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+        except Exception as e:
+            print(f"❌ {test_name} crashed: {e!r}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{'✅ PASS' if result else '❌ FAIL'} {test_name}")
+    print(f"\n📊 Results: {passed} passed, {len(results) - passed} failed")
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Analysis job runner for the API server's worker processes.
+
+run_analysis_job is the JobScheduler runner: it executes one analysis job
+(a job store record) with VideoAnalyzer.analyze_async, or resume_async when an
+AssemblyAI transcript ID was saved before a restart, and publishes progress
+and the outcome through the scheduler's update(**fields) callable, including
+the job's stage timings ("stages") as each stage finishes. Each
+worker process has one AsyncTranscriptionClient on its event loop, shared by
+all the jobs it runs. Extraction and transcription run in the scheduler's
+"extract" and "transcribe" stage slots, which limit them across all workers
+(and within a batch, by the job's stage_limits).
+"""
+
+import os
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+# Handle imports that work both when run directly and as a module
+try:
+    from .videoanalyzer import VideoAnalyzer
+    from .transcriptionclient import AsyncTranscriptionClient
+    from .stagetrace import StageTracer
+except ImportError:
+    from videoanalyzer import VideoAnalyzer
+    from transcriptionclient import AsyncTranscriptionClient
+    from stagetrace import StageTracer
+
+from shared.jobscheduler import stage_slot
+
+logger = logging.getLogger(__name__)
+
+# Progress messages for VideoAnalyzer stages
+ANALYSIS_STAGE_MESSAGES = {
+    "probe": "Step 1/5: Reading video metadata...",
+    "extract": "Step 2/5: Extracting audio from video...",
+    "upload": "Step 3/5: Uploading audio to AssemblyAI...",
+    "transcribe": "Step 4/5: Starting AssemblyAI transcription...",
+    "process": "Step 5/5: Processing transcript results..."
+}
+
+# Overall job percentage at the start and end of each VideoAnalyzer stage
+STAGE_PERCENT = {
+    "probe": (0, 5),
+    "extract": (5, 20),
+    "upload": (20, 40),
+    "transcribe": (40, 90),
+    "process": (90, 100)
+}
+
+# This worker process's transcription client (created on its event loop on first use)
+_transcription_client: Optional[AsyncTranscriptionClient] = None
+
+
+def get_transcription_client() -> Optional[AsyncTranscriptionClient]:
+    """
+    Return this process's AsyncTranscriptionClient, configured from the environment.
+
+    Must be called from the worker's event loop. Returns None when no AssemblyAI API
+    key is configured (VideoAnalyzer then reports the missing key itself).
+    """
+    global _transcription_client
+    if _transcription_client is None and os.environ.get("ASSEMBLYAI_API_KEY"):
+        _transcription_client = AsyncTranscriptionClient(
+            os.environ["ASSEMBLYAI_API_KEY"],
+            VideoAnalyzer.BASE_URL,
+            webhook_url=os.environ.get("ASSEMBLYAI_WEBHOOK_URL"),
+            webhook_secret=os.environ.get("ASSEMBLYAI_WEBHOOK_SECRET")
+        )
+    return _transcription_client
+
+
+def notify_transcript(transcript_id: str) -> None:
+    """Scheduler broadcast handler: forward an AssemblyAI webhook to this worker's client."""
+    if _transcription_client is not None:
+        _transcription_client.notify(transcript_id)
+
+
+def stage_percent(stage: str, details: Dict[str, Any]) -> Optional[float]:
+    """Overall job percentage for a progress event (upload advances with the bytes sent)."""
+    if stage not in STAGE_PERCENT:
+        return None
+    start, end = STAGE_PERCENT[stage]
+    if stage == "upload" and details.get("total_bytes"):
+        return start + (end - start) * min(details.get("bytes_sent", 0) / details["total_bytes"], 1.0)
+    if stage == "transcribe" and details.get("status") == "completed":
+        return end
+    return start
+
+
+def job_progress_reporter(update: Callable[..., None]) -> Callable[[str, Dict[str, Any]], None]:
+    """
+    Progress callback for VideoAnalyzer that publishes a job's progress
+
+    Publishes the progress message plus structured fields (stage, percent,
+    bytes_sent/total_bytes and assemblyai_status) whenever one of them changes;
+    upload progress is published per whole percent, not per chunk. Also publishes
+    the AssemblyAI transcript ID as soon as it is known, so the job can be resumed
+    without re-transcribing if the server restarts.
+    """
+    published: Dict[str, Any] = {}
+
+    def report_progress(stage: str, details: Dict[str, Any]) -> None:
+        status = details.get("status")
+        message = ANALYSIS_STAGE_MESSAGES.get(stage)
+        if stage == "upload" and details.get("total_bytes"):
+            message = f"{message} {100 * details['bytes_sent'] / details['total_bytes']:.0f}%"
+        elif stage == "transcribe" and status in ("queued", "processing"):
+            activity = "Transcription queued" if status == "queued" else "Transcribing audio"
+            message = f"AssemblyAI: {activity} (elapsed: {details.get('elapsed_seconds', 0):.0f}s)"
+        elif stage == "transcribe" and status == "completed":
+            message = "AssemblyAI: Transcription completed, processing results..."
+
+        candidates = {"stage": stage, "transcript_id": details.get("transcript_id")}
+        percent = stage_percent(stage, details)
+        if percent is not None:
+            candidates["percent"] = int(percent)
+        if message:
+            candidates["progress"] = candidates["message"] = message
+        if stage == "upload":
+            candidates["bytes_sent"] = details.get("bytes_sent")
+            candidates["total_bytes"] = details.get("total_bytes")
+        if stage == "transcribe" and status:
+            candidates["assemblyai_status"] = status
+
+        fields = {key: value for key, value in candidates.items()
+                  if value is not None and published.get(key) != value}
+        # bytes_sent changes with every chunk; only publish it along with another change
+        if fields.keys() <= {"bytes_sent"}:
+            return
+        published.update(fields)
+        update(**fields)
+
+    return report_progress
+
+
+def result_fields(result: Dict[str, Any], output_file: str) -> Dict[str, Any]:
+    """Job store fields for a finished analysis result."""
+    if "error" in result:
+        return {
+            "status": "failed",
+            "message": f"Analysis failed: {result['error']}",
+            "error": result["error"],
+            "completed_at": datetime.now().isoformat(),
+            "progress": "Analysis failed"
+        }
+    return {
+        "status": "completed",
+        "message": "Video analysis completed successfully",
+        "completed_at": datetime.now().isoformat(),
+        "percent": 100,
+        "result": result,
+        "output_file": output_file,
+        "progress": "Analysis completed successfully"
+    }
+
+
+async def run_analysis_job(job: Dict[str, Any], update: Callable[..., None]) -> None:
+    """
+    Run one analysis job in a worker process.
+
+    Args:
+        job: Job store record (video_path, brief_path, custom_spell, silence_threshold_ms,
+            pipeline_mode, columnar, batch_id, stage_limits, output_stem and, for an
+            interrupted job, transcript_id)
+        update: Publishes job store fields for this job
+    """
+    def update_progress(message: str) -> None:
+        update(progress=message, message=message)
+
+    tracer = StageTracer(on_stage=lambda timing: update(stages=tracer.timings()))
+
+    update_progress("Loading video analyzer...")
+    analyzer = VideoAnalyzer(
+        brief_path=job["brief_path"],
+        progress_callback=job_progress_reporter(update),
+        transcription_client=get_transcription_client(),
+        tracer=tracer,
+        stage_slot=stage_slot
+    )
+
+    # The transcript is written to the data/analyzed directory
+    output_path = analyzer.default_output_path(job["video_path"], job.get("output_stem"))
+
+    if job.get("transcript_id"):
+        # Interrupted after submission: wait for the existing transcript instead of paying again
+        update_progress(f"Resuming: waiting for AssemblyAI transcript {job['transcript_id']}...")
+        result = await analyzer.resume_async(
+            job["video_path"],
+            job["transcript_id"],
+            output_path=output_path,
+            custom_spell=job["custom_spell"],
+            silence_threshold_ms=job["silence_threshold_ms"],
+            columnar=job["columnar"]
+        )
+    else:
+        update_progress("Analyzing video file...")
+        result = await analyzer.analyze_async(
+            video_path=job["video_path"],
+            output_path=output_path,
+            custom_spell=job["custom_spell"],
+            brief_path=job["brief_path"],
+            silence_threshold_ms=job["silence_threshold_ms"],
+            pipeline_mode=job["pipeline_mode"],
+            columnar=job["columnar"]
+        )
+
+    update(**result_fields(result, output_path), stages=tracer.timings())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Audio Extraction Benchmark
+
+Compares wall time, peak RSS and output size of the PyAV streaming engine
+against the MoviePy WAV engine on a real media file. Each run happens in a
+fresh process so peak RSS is not polluted by earlier runs; MoviePy decodes
+through an ffmpeg subprocess, so child-process peak RSS is reported too.
+
+Usage:
+    python audioextract_benchmark.py path/to/video.mp4 [--repeat 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+import multiprocessing
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Add the services directory to Python path for imports
+script_dir = Path(__file__).parent
+services_dir = script_dir.parent
+sys.path.insert(0, str(services_dir))
+
+ENGINES = ("pyav", "moviepy")
+
+
+def _peak_rss_mb(who: str) -> Optional[float]:
+    """Peak resident set size in MB, or None where `resource` is unavailable (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    target = resource.RUSAGE_SELF if who == "self" else resource.RUSAGE_CHILDREN
+    peak = resource.getrusage(target).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_engine(engine: str, video_path: str, results: "multiprocessing.Queue") -> None:
+    """Run one extraction in this (fresh) process and report its measurements."""
+    from assetanalysis.audioextractor import extract_audio_pyav, extract_audio_moviepy
+
+    baseline_rss = _peak_rss_mb("self")
+    start = time.perf_counter()
+    if engine == "pyav":
+        audio_path = extract_audio_pyav(video_path)
+    else:
+        audio_path = extract_audio_moviepy(video_path)
+    wall = time.perf_counter() - start
+
+    output_mb = os.path.getsize(audio_path) / (1024 * 1024)
+    os.unlink(audio_path)
+
+    results.put({
+        "engine": engine,
+        "wall_seconds": wall,
+        "baseline_rss_mb": baseline_rss,
+        "peak_rss_mb": _peak_rss_mb("self"),
+        "peak_child_rss_mb": _peak_rss_mb("children"),
+        "output_mb": output_mb
+    })
+
+
+def benchmark(video_path: str, engine: str) -> Dict[str, Any]:
+    """Run a single engine in a spawned process and return its measurements."""
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_run_engine, args=(engine, video_path, results))
+    process.start()
+    process.join()
+    if process.exitcode != 0:
+        raise RuntimeError(f"{engine} run failed with exit code {process.exitcode}")
+    return results.get()
+
+
+def _format_mb(value: Optional[float]) -> str:
+    return f"{value:9.1f}" if value is not None else "      n/a"
+
+
+def main():
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description="Benchmark PyAV vs MoviePy audio extraction")
+    parser.add_argument("video_path", help="Path to the video file")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per engine (best wall time is reported)")
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.video_path):
+        print(f"❌ Video file not found: {args.video_path}")
+        return 1
+
+    input_mb = os.path.getsize(args.video_path) / (1024 * 1024)
+    print(f"🎬 Benchmarking audio extraction on {args.video_path} ({input_mb:.1f}MB)")
+    print("=" * 78)
+    print(f"{'engine':<10}{'wall s':>10}{'base RSS':>11}{'peak RSS':>11}{'child RSS':>11}{'output MB':>11}")
+
+    for engine in args.engines:
+        runs = [benchmark(args.video_path, engine) for _ in range(args.repeat)]
+        best = min(runs, key=lambda r: r["wall_seconds"])
+        peak = max((r["peak_rss_mb"] or 0) for r in runs) if best["peak_rss_mb"] is not None else None
+        print(f"{engine:<10}{best['wall_seconds']:10.2f} {_format_mb(best['baseline_rss_mb'])} "
+              f"{_format_mb(peak)} {_format_mb(best['peak_child_rss_mb'])} {best['output_mb']:10.2f}")
+
+    print("=" * 78)
+    print("RSS values in MB. 'base RSS' is the process before extraction starts.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Audio extraction engines for VideoAnalyzer.
+
+The PyAV engine demuxes only the audio stream of an open container, resamples
+it to 16 kHz mono and encodes it to a compact speech codec while it decodes, so
+only a handful of packets are ever held in memory and the temp file is a few MB
+per hour of footage. The MoviePy engine is the original full-rate WAV export and
+is kept as a fallback for containers PyAV cannot decode.
+"""
+
+import os
+import logging
+import tempfile
+from typing import Any, BinaryIO, Dict, Optional, Union
+
+import av
+
+logger = logging.getLogger(__name__)
+
+# Engine names accepted by VideoAnalyzer(audio_engine=...)
+ENGINE_PYAV = "pyav"
+ENGINE_MOVIEPY = "moviepy"
+AUDIO_ENGINES = (ENGINE_PYAV, ENGINE_MOVIEPY)
+
+# AssemblyAI resamples everything to 16 kHz mono internally, so anything above
+# that is wasted bandwidth
+SPEECH_SAMPLE_RATE = 16000
+SPEECH_LAYOUT = "mono"
+
+# Speech codec name -> encoder, container format, file suffix and bit rate
+SPEECH_CODECS = {
+    "opus": {"encoder": "libopus", "format": "ogg", "suffix": ".ogg", "bit_rate": 32000},
+    "flac": {"encoder": "flac", "format": "flac", "suffix": ".flac", "bit_rate": None},
+}
+DEFAULT_SPEECH_CODEC = "opus"
+
+
+def select_speech_codec(preferred: str = DEFAULT_SPEECH_CODEC) -> str:
+    """Return the preferred speech codec if this FFmpeg build can encode it, else FLAC."""
+    if preferred not in SPEECH_CODECS:
+        raise ValueError(f"Unknown speech codec '{preferred}'. Choose from: {', '.join(SPEECH_CODECS)}")
+    if SPEECH_CODECS[preferred]["encoder"] in av.codecs_available:
+        return preferred
+    logger.warning(f"Encoder for '{preferred}' not available in this FFmpeg build, using FLAC")
+    return "flac"
+
+
+def encode_speech_audio(container: "av.container.InputContainer",
+                        output: Union[str, BinaryIO],
+                        codec: str = DEFAULT_SPEECH_CODEC,
+                        sample_rate: int = SPEECH_SAMPLE_RATE) -> Dict[str, Any]:
+    """
+    Decode the audio stream of an open container and encode it as speech audio.
+
+    Only audio packets are demuxed; video packets are never decoded. Output is
+    written incrementally to `output`, which can be a path or any writable
+    binary file object (it does not need to be seekable).
+
+    Args:
+        container: Open PyAV input container
+        output: Destination path or writable file object
+        codec: Key into SPEECH_CODECS
+        sample_rate: Output sample rate in Hz
+
+    Returns:
+        Dict with codec, sample_rate, duration_seconds and bytes_in (compressed
+        audio bytes read from the source)
+
+    Raises:
+        RuntimeError: If the container has no audio stream
+    """
+    audio_stream = next(iter(container.streams.audio), None)
+    if audio_stream is None:
+        raise RuntimeError("No audio stream found in video file")
+    if not audio_stream.codec_context.is_open:
+        audio_stream.thread_type = "AUTO"
+
+    codec_info = SPEECH_CODECS[codec]
+    resampler = av.AudioResampler(format="s16", layout=SPEECH_LAYOUT, rate=sample_rate)
+
+    output_container = av.open(output, mode="w", format=codec_info["format"])
+    try:
+        output_stream = output_container.add_stream(codec_info["encoder"], rate=sample_rate)
+        output_stream.codec_context.layout = SPEECH_LAYOUT
+        if codec_info["bit_rate"]:
+            output_stream.codec_context.bit_rate = codec_info["bit_rate"]
+
+        samples_written = 0
+        bytes_in = 0
+
+        def encode(frames) -> None:
+            nonlocal samples_written
+            for frame in frames:
+                frame.pts = samples_written
+                samples_written += frame.samples
+                for packet in output_stream.encode(frame):
+                    output_container.mux(packet)
+
+        # demux() yields a final empty packet that flushes the decoder
+        for packet in container.demux(audio_stream):
+            bytes_in += packet.size
+            for frame in packet.decode():
+                encode(resampler.resample(frame))
+
+        # Flush the resampler and the encoder
+        encode(resampler.resample(None))
+        for packet in output_stream.encode(None):
+            output_container.mux(packet)
+    finally:
+        output_container.close()
+
+    return {
+        "codec": codec,
+        "sample_rate": sample_rate,
+        "duration_seconds": samples_written / sample_rate,
+        "bytes_in": bytes_in
+    }
+
+
+def extract_audio_pyav(video_path: str, codec: str = DEFAULT_SPEECH_CODEC,
+                       container: Optional["av.container.InputContainer"] = None) -> str:
+    """
+    Extract speech audio to a compact temporary file using PyAV.
+
+    Args:
+        video_path: Path to the video file
+        codec: Key into SPEECH_CODECS
+        container: Already-open container for video_path; opened here if None
+
+    Returns:
+        Path to the temporary audio file (caller deletes it)
+    """
+    codec = select_speech_codec(codec)
+    audio_file = tempfile.NamedTemporaryFile(suffix=SPEECH_CODECS[codec]["suffix"], delete=False)
+    audio_path = audio_file.name
+    audio_file.close()
+
+    try:
+        if container is not None:
+            stats = encode_speech_audio(container, audio_path, codec)
+        else:
+            with av.open(video_path) as container:
+                stats = encode_speech_audio(container, audio_path, codec)
+    except Exception:
+        if os.path.exists(audio_path):
+            os.unlink(audio_path)
+        raise
+
+    file_size_mb = os.path.getsize(audio_path) / (1024 * 1024)
+    logger.info(f"Extracted {stats['duration_seconds']:.1f}s of {codec} audio "
+                f"at {stats['sample_rate']} Hz mono: {file_size_mb:.2f}MB")
+    return audio_path
+
+
+def extract_audio_moviepy(video_path: str) -> str:
+    """
+    Extract audio as a full-rate WAV using MoviePy (fallback engine).
+
+    Returns:
+        Path to the temporary WAV file (caller deletes it)
+    """
+    # Imported lazily: MoviePy is only needed when the fallback engine runs
+    from moviepy import VideoFileClip
+
+    # Create temporary file for audio
+    audio_file = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
+    audio_path = audio_file.name
+    audio_file.close()
+
+    # Load video and extract audio using MoviePy
+    video_clip = VideoFileClip(video_path)
+
+    try:
+        if video_clip.audio is None:
+            raise RuntimeError("No audio stream found in video file")
+
+        # Extract audio with optimal settings for transcription
+        audio_clip = video_clip.audio
+
+        # Export audio as WAV with settings optimized for speech recognition
+        audio_clip.write_audiofile(audio_path)
+
+        # Clean up clips
+        audio_clip.close()
+
+        # Log quality metrics
+        file_size_mb = os.path.getsize(audio_path) / (1024 * 1024)
+        logger.info(f"Extracted audio: {file_size_mb:.2f}MB")
+
+        return audio_path
+
+    except Exception:
+        if os.path.exists(audio_path):
+            os.unlink(audio_path)
+        raise
+
+    finally:
+        # Always clean up the video clip
+        video_clip.close()
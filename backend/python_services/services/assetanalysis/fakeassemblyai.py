@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for AssemblyAI's v2 API, for tests.
+
+FakeAssemblyAI serves /upload (chunked bodies, with injectable dropped
+connections and error statuses) and /transcript on a background thread;
+every transcript completes with FAKE_WORDS.
+
+    with FakeAssemblyAI(polls_until_complete=2) as server:
+        analyzer.BASE_URL = server.base_url
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+
+FAKE_WORDS = [
+    {"text": "Hello", "start": 0, "end": 400, "confidence": 0.98, "speaker": "A"},
+    {"text": "again.", "start": 2000, "end": 2400, "confidence": 0.95, "speaker": "B"}
+]
+
+
+class FakeAssemblyAI:
+    """
+    Local HTTP server that mimics AssemblyAI's v2 API.
+
+    POST /v2/upload accepts chunked bodies with injectable failures; POST
+    /v2/transcript queues a transcript that GET /v2/transcript/{id} reports as
+    completed after `polls_until_complete` polls (or as failed when its
+    audio_url contains "error").
+    """
+
+    def __init__(self, polls_until_complete: int = 0):
+        self.received: List[bytes] = []
+        self.attempts = 0
+        # Per-attempt behaviour: "drop" closes the socket mid-body, an int is returned as the status
+        self.failures: List = []
+        self.polls_until_complete = polls_until_complete
+        self.transcripts: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                if self.path.endswith("/transcript"):
+                    request = json.loads(self._read_body())
+                    with server.lock:
+                        transcript_id = f"t{len(server.transcripts) + 1}"
+                        server.transcripts[transcript_id] = {"request": request, "polls": 0}
+                    self._reply(200, json.dumps({"id": transcript_id, "status": "queued"}).encode())
+                    return
+
+                server.attempts += 1
+                failure = server.failures.pop(0) if server.failures else None
+                if failure == "drop":
+                    self.rfile.read(1024)
+                    self.close_connection = True
+                    self.connection.shutdown(2)
+                    return
+
+                body = self._read_body()
+                if isinstance(failure, int):
+                    self._reply(failure, b'{"error": "injected failure"}')
+                    return
+
+                server.received.append(body)
+                self._reply(200, b'{"upload_url": "https://cdn.example/upload/abc"}')
+
+            def do_GET(self):
+                transcript_id = self.path.rsplit("/", 1)[-1]
+                with server.lock:
+                    transcript = server.transcripts.get(transcript_id)
+                    if transcript is None:
+                        self._reply(404, b'{"error": "not found"}')
+                        return
+                    transcript["polls"] += 1
+                    done = transcript["polls"] > server.polls_until_complete
+                    failed = "error" in transcript["request"]["audio_url"]
+                body = {"id": transcript_id, "status": "completed" if done else "processing"}
+                if done and failed:
+                    body.update({"status": "error", "error": "injected transcription failure"})
+                elif done:
+                    body.update({"text": " ".join(w["text"] for w in FAKE_WORDS), "words": FAKE_WORDS,
+                                 "audio_duration": 3})
+                self._reply(200, json.dumps(body).encode())
+
+            def _read_body(self) -> bytes:
+                if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+                    chunks = []
+                    while True:
+                        size = int(self.rfile.readline().strip(), 16)
+                        if size == 0:
+                            self.rfile.readline()
+                            return b"".join(chunks)
+                        chunks.append(self.rfile.read(size))
+                        self.rfile.readline()
+                return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+            def _reply(self, status: int, body: bytes):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}/v2"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+MediaSession - a single open PyAV container shared by the analysis stages.
+
+Probing and audio extraction both need the container; opening it once means
+the container headers are parsed and the streams scanned once, which matters
+on network-mounted camera originals. Stream metadata and the start-timecode
+search are cached on the session so later stages never touch the file again.
+"""
+
+import os
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+import av
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMECODE = "00:00:00:00"
+
+
+class MediaSession:
+    """An open media file plus cached stream metadata, usable as a context manager."""
+
+    def __init__(self, file_path: str, timecode_parser: Callable[[dict], Optional[str]]):
+        """
+        Open the media file.
+
+        Args:
+            file_path: Path to the media file
+            timecode_parser: Callable that extracts a timecode string from a metadata dict
+
+        Raises:
+            RuntimeError: If the file does not exist
+        """
+        self.file_path = os.path.normpath(file_path)
+        if not os.path.exists(self.file_path):
+            raise RuntimeError(f"Video file not found: {self.file_path}")
+
+        self._timecode_parser = timecode_parser
+        self.container = av.open(self.file_path)
+
+        # Cache stream handles and metadata once
+        self.streams = tuple(self.container.streams)
+        self.video_stream = next(iter(self.container.streams.video), None)
+        self.audio_stream = next(iter(self.container.streams.audio), None)
+        self.stream_metadata: List[Dict[str, str]] = [dict(stream.metadata or {}) for stream in self.streams]
+        self.container_metadata: Dict[str, str] = dict(self.container.metadata or {})
+
+        # Filled in lazily
+        self.probe: Optional[Dict[str, Any]] = None
+        self._start_timecode: Optional[str] = None
+        self._demux_started = False
+
+        logger.debug(f"Opened media session for {self.file_path} ({len(self.streams)} streams)")
+
+    @property
+    def file_name(self) -> str:
+        return os.path.basename(self.file_path)
+
+    @property
+    def start_timecode(self) -> str:
+        """Start timecode from stream or container metadata (searched once, then cached)."""
+        if self._start_timecode is None:
+            self._start_timecode = self._find_start_timecode()
+        return self._start_timecode
+
+    def _find_start_timecode(self) -> str:
+        start_timecode = DEFAULT_TIMECODE
+        # 1. Search all streams for a timecode in metadata
+        for metadata in self.stream_metadata:
+            if metadata:
+                tc = self._timecode_parser(metadata)
+                if tc:
+                    start_timecode = tc
+                    break
+        # 2. Check container metadata if not found
+        if start_timecode == DEFAULT_TIMECODE and self.container_metadata:
+            tc = self._timecode_parser(self.container_metadata)
+            if tc:
+                start_timecode = tc
+        # 3. Check video stream metadata if not found
+        if start_timecode == DEFAULT_TIMECODE and self.video_stream is not None and self.video_stream.metadata:
+            tc = self._timecode_parser(dict(self.video_stream.metadata))
+            if tc:
+                start_timecode = tc
+        return start_timecode
+
+    def demux_container(self) -> "av.container.InputContainer":
+        """Return the container positioned at the start of the file for a fresh demux pass."""
+        if self._demux_started:
+            self.container.seek(0)
+        self._demux_started = True
+        return self.container
+
+    def close(self) -> None:
+        if self.container is not None:
+            self.container.close()
+            self.container = None
+
+    def __enter__(self) -> "MediaSession":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
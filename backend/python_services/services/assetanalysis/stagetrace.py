@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Stage timing for the analysis pipeline.
+
+VideoAnalyzer wraps each stage of a video's analysis (probe, extract,
+upload, transcribe, process, segment) in StageTracer.stage(), which records a
+StageTiming with:
+
+- wall_seconds: elapsed time
+- cpu_seconds: CPU time of the thread that ran the stage, plus that of child
+  processes (ffmpeg) reaped meanwhile; None for stages spent awaiting on an
+  event loop, whose thread is shared with other work
+- bytes_in / bytes_out: bytes read and produced or sent, where known
+- peak_rss_bytes: the process's peak resident memory at the end of the stage
+  (a high-water mark, so the stage that raised it is the one where it jumps;
+  None where the platform does not report it)
+"""
+
+import os
+import sys
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Pipeline stages, in order
+STAGES = ("probe", "extract", "upload", "transcribe", "process", "segment")
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process so far, or None if unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _children_cpu_seconds() -> float:
+    times = os.times()
+    return times.children_user + times.children_system
+
+
+@dataclass
+class StageTiming:
+    """Measurements of one stage of one video's analysis."""
+    stage: str
+    started_at: float  # Unix time
+    wall_seconds: float = 0.0
+    cpu_seconds: Optional[float] = None
+    bytes_in: Optional[int] = None
+    bytes_out: Optional[int] = None
+    peak_rss_bytes: Optional[int] = None
+    video_path: Optional[str] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class StageTracer:
+    """Collects the StageTimings of an analyzer's stages; thread-safe."""
+
+    def __init__(self, on_stage: Optional[Callable[[StageTiming], None]] = None):
+        """
+        Args:
+            on_stage: Called with each StageTiming as its stage finishes
+        """
+        self.on_stage = on_stage
+        self._timings: List[StageTiming] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def stage(self, name: str, video_path: Optional[str] = None, cpu: bool = True) -> Iterator[StageTiming]:
+        """
+        Time a stage. Set bytes_in/bytes_out on the yielded StageTiming as they become known.
+
+        Args:
+            name: Stage name (see STAGES)
+            video_path: Video the stage works on
+            cpu: Measure CPU time; pass False for stages that await on a shared event loop
+        """
+        timing = StageTiming(name, time.time(), video_path=video_path)
+        thread_id = threading.get_ident()
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time() + _children_cpu_seconds() if cpu else None
+        previous = getattr(self._local, "current", None)
+        if cpu:
+            # Synchronous stages run on one thread, so nested code can find their timing
+            self._local.current = timing
+        try:
+            yield timing
+        except BaseException as e:
+            timing.error = str(e) or type(e).__name__
+            raise
+        finally:
+            if cpu:
+                self._local.current = previous
+            timing.wall_seconds = time.perf_counter() - wall_start
+            if cpu_start is not None and threading.get_ident() == thread_id:
+                timing.cpu_seconds = time.thread_time() + _children_cpu_seconds() - cpu_start
+            timing.peak_rss_bytes = peak_rss_bytes()
+            self.add(timing)
+
+    def current(self) -> Optional[StageTiming]:
+        """The synchronous stage running on the calling thread, if any."""
+        return getattr(self._local, "current", None)
+
+    def add(self, timing: StageTiming) -> None:
+        """Record a finished stage (e.g. one timed in a worker process)."""
+        with self._lock:
+            self._timings.append(timing)
+        if self.on_stage is not None:
+            try:
+                self.on_stage(timing)
+            except Exception as e:
+                logger.warning(f"Stage callback failed for stage '{timing.stage}': {e}")
+
+    def timings(self, video_path: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Recorded stages as dicts, oldest first, optionally only those of one video."""
+        with self._lock:
+            return [timing.to_dict() for timing in self._timings
+                    if video_path is None or timing.video_path == video_path]
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache and compact storage of raw AssemblyAI transcripts.
+
+Entries are keyed by a sampled fingerprint of the media file plus a hash of
+the transcription config (speech_model, custom_spelling, ...), so re-running an
+analysis on the same clip with the same settings skips extraction, upload and
+transcription entirely. Each entry is one gzipped JSON file; the file mtime is
+the LRU timestamp, which keeps the cache consistent across processes without a
+shared index. The cache is bounded by total size on disk.
+
+The same compact gzipped form is written next to each .transcript.json so the
+word list can be re-derived with new parameters without re-transcribing.
+"""
+
+import os
+import gzip
+import json
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_NAME = ".transcript_cache"
+ENTRY_SUFFIX = ".json.gz"
+DEFAULT_MAX_BYTES = int(os.environ.get("TRANSCRIPT_CACHE_MAX_MB", "1024")) * 1024 * 1024
+
+# Analysis output; its sidecars are named <name><suffix> (see transcript_base())
+TRANSCRIPT_SUFFIX = ".transcript.json"
+
+# Raw transcript sidecar written next to <name>.transcript.json
+RAW_TRANSCRIPT_SUFFIX = ".assemblyai.json.gz"
+
+# Fields kept in compact raw transcripts (everything process_transcript_to_words reads)
+RAW_TOP_LEVEL_FIELDS = ("id", "status", "text", "audio_duration", "language_code", "speech_model")
+RAW_WORD_FIELDS = ("text", "start", "end", "confidence", "speaker")
+
+# Fingerprint sampling: 16 evenly spaced 64 KB blocks, always including the first and last
+FINGERPRINT_SAMPLES = 16
+FINGERPRINT_BLOCK_SIZE = 64 * 1024
+
+
+def media_fingerprint(file_path: Union[str, Path], samples: int = FINGERPRINT_SAMPLES,
+                      block_size: int = FINGERPRINT_BLOCK_SIZE) -> str:
+    """
+    Fast content fingerprint of a media file.
+
+    Hashes the file size plus `samples` evenly spaced blocks, so it reads about
+    1 MB regardless of file size. Small files are hashed in full.
+    """
+    size = os.path.getsize(file_path)
+    digest = hashlib.sha256(f"size:{size}".encode())
+    with open(file_path, "rb") as f:
+        if size <= samples * block_size:
+            digest.update(f.read())
+        else:
+            for i in range(samples):
+                f.seek((size - block_size) * i // (samples - 1))
+                digest.update(f.read(block_size))
+    return digest.hexdigest()[:32]
+
+
+def config_fingerprint(config: Dict[str, Any]) -> str:
+    """Stable hash of a transcription config dict."""
+    canonical = json.dumps(config, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def compact_raw_transcript(transcript: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop the parts of an AssemblyAI response that word processing never reads."""
+    compact = {field: transcript[field] for field in RAW_TOP_LEVEL_FIELDS if field in transcript}
+    compact["words"] = [
+        {field: word[field] for field in RAW_WORD_FIELDS if field in word}
+        for word in transcript.get("words") or []
+    ]
+    return compact
+
+
+def write_raw_transcript(path: Union[str, Path], transcript: Dict[str, Any]) -> None:
+    """Atomically write a compact, gzipped raw transcript."""
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+        json.dump(compact_raw_transcript(transcript), f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def read_raw_transcript(path: Union[str, Path]) -> Dict[str, Any]:
+    """Read a raw transcript written by write_raw_transcript."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def transcript_base(transcript_path: Union[str, Path]) -> str:
+    """
+    `<name>` of `<name>.transcript.json` (or the file's stem for any other name).
+
+    Every sidecar of a transcript (raw transcript, columnar copy, segment index)
+    is named `<name><suffix>` from this, so they always stay together.
+    """
+    transcript_path = Path(transcript_path)
+    name = transcript_path.name
+    return name[:-len(TRANSCRIPT_SUFFIX)] if name.endswith(TRANSCRIPT_SUFFIX) else transcript_path.stem
+
+
+def raw_transcript_path(transcript_path: Union[str, Path]) -> Path:
+    """Sidecar path for the raw transcript of `<name>.transcript.json`."""
+    return Path(transcript_path).with_name(f"{transcript_base(transcript_path)}{RAW_TRANSCRIPT_SUFFIX}")
+
+
+class TranscriptCache:
+    """Size-bounded LRU cache of raw transcripts in a directory."""
+
+    def __init__(self, cache_dir: Union[str, Path], max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key_for(self, media_path: Union[str, Path], config: Dict[str, Any]) -> str:
+        """Cache key for a media file transcribed with the given config."""
+        return f"{media_fingerprint(media_path)}-{config_fingerprint(config)}"
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{ENTRY_SUFFIX}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached transcript for `key`, or None on a miss."""
+        path = self._entry_path(key)
+        try:
+            transcript = read_raw_transcript(path)
+            os.utime(path)  # Mark as most recently used
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable cache entry {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        logger.info(f"Transcript cache hit: {key}")
+        return transcript
+
+    def put(self, key: str, transcript: Dict[str, Any]) -> None:
+        """Store a transcript and evict least recently used entries over the size limit."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._entry_path(key)
+        write_raw_transcript(path, transcript)
+        logger.info(f"Cached transcript {key} ({path.stat().st_size / 1024:.0f}KB)")
+        self.evict()
+
+    def _entries(self) -> List[Tuple[Path, os.stat_result]]:
+        if not self.cache_dir.exists():
+            return []
+        entries = []
+        for path in self.cache_dir.glob(f"*{ENTRY_SUFFIX}"):
+            try:
+                entries.append((path, path.stat()))
+            except FileNotFoundError:
+                continue  # Evicted by another process
+        return entries
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache fits in max_bytes."""
+        entries = sorted(self._entries(), key=lambda entry: entry[1].st_mtime)
+        total = sum(stat.st_size for _, stat in entries)
+        removed = 0
+        for path, stat in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+            removed += 1
+        if removed:
+            with self._lock:
+                self.evictions += removed
+            logger.info(f"Evicted {removed} transcript cache entries")
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry counts and sizes on disk plus hit/miss counters for this process."""
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            "cache_dir": str(self.cache_dir),
+            "entries": len(entries),
+            "total_bytes": sum(stat.st_size for _, stat in entries),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+# One cache object per directory so hit/miss counters are shared within a process
+_caches: Dict[Path, TranscriptCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_transcript_cache(cache_dir: Union[str, Path], max_bytes: int = DEFAULT_MAX_BYTES) -> TranscriptCache:
+    """Return the shared TranscriptCache for `cache_dir`."""
+    cache_dir = Path(cache_dir).resolve()
+    with _caches_lock:
+        if cache_dir not in _caches:
+            _caches[cache_dir] = TranscriptCache(cache_dir, max_bytes)
+        return _caches[cache_dir]
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Columnar, memory-mappable transcript format (<name>.transcript.cols).
+
+A .transcript.json stores one dict per word with repeated keys, so large
+transcripts are big on disk and every reader parses all of it. The columnar
+file stores the same data as parallel arrays:
+
+    magic (8 bytes) | header length (uint32) | reserved (uint32) | header JSON
+    | 64-byte aligned arrays
+
+The header holds the transcript metadata and the offset, dtype and length of
+each array: frame_in, frame_out, confidence, speaker_code and word_code per
+word, the speaker table and a UTF-8 word string table (unique words, indexed
+by word_code), plus silence durations. Arrays are read straight from the
+memory-mapped file, so opening a transcript only parses the header.
+
+ColumnarTranscript presents the usual transcript dict lazily: metadata comes
+from the header and transcript["words"] is a sequence whose items are built on
+access, with the same keys and values as the JSON file. The words do not refer
+back to the transcript, so the map is released as soon as neither is
+referenced; close() (or a with block) releases it right away, e.g. before the
+.cols file is replaced, which Windows refuses while it is mapped.
+"""
+
+import os
+import json
+import mmap
+import struct
+import logging
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+
+# Handle imports that work both when run directly and as a module
+try:
+    from .transcriptcache import transcript_base
+except ImportError:
+    from transcriptcache import transcript_base
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"NTTCOLS\x01"
+FORMAT_VERSION = 1
+COLUMNAR_SUFFIX = ".transcript.cols"
+ALIGNMENT = 64
+PREAMBLE = struct.Struct("<8sII")  # magic, header length, reserved
+
+# Keys whose values live in arrays rather than the header
+WORDS_KEY = "words"
+FULL_TRANSCRIPT_KEY = "full_transcript"
+
+# Rows built per batch when iterating over all words
+ITER_BATCH = 65536
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def columnar_path(transcript_path: Union[str, Path]) -> Path:
+    """Columnar sidecar path for `<name>.transcript.json`."""
+    return Path(transcript_path).with_name(f"{transcript_base(transcript_path)}{COLUMNAR_SUFFIX}")
+
+
+def _string_table(strings: List[str]) -> Dict[str, np.ndarray]:
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return {"offsets": offsets, "bytes": np.frombuffer(b"".join(encoded), dtype=np.uint8)}
+
+
+def write_columnar_transcript(path: Union[str, Path], transcript: Dict[str, Any]) -> None:
+    """
+    Atomically write a transcript dict (as produced by VideoAnalyzer) in columnar form.
+
+    Raises:
+        ValueError: If the transcript has no words list (e.g. a failed analysis)
+    """
+    words = transcript.get(WORDS_KEY)
+    if not isinstance(words, list):
+        raise ValueError("Transcript has no words list")
+    count = len(words)
+
+    speaker_codes: Dict[str, int] = {}
+    word_codes: Dict[str, int] = {}
+    durations = [word["duration_ms"] for word in words if "duration_ms" in word]
+    integer_durations = all(isinstance(d, int) and not isinstance(d, bool) for d in durations)
+
+    arrays = {
+        "frame_in": np.fromiter((word["frame_in"] for word in words), dtype=np.int64, count=count),
+        "frame_out": np.fromiter((word["frame_out"] for word in words), dtype=np.int64, count=count),
+        "confidence": np.fromiter(
+            (np.nan if word.get("confidence") is None else word["confidence"] for word in words),
+            dtype=np.float64, count=count
+        ),
+        "speaker_code": np.fromiter(
+            (speaker_codes.setdefault(word["speaker"], len(speaker_codes)) for word in words),
+            dtype=np.int32, count=count
+        ),
+        "word_code": np.fromiter(
+            (word_codes.setdefault(word["word"], len(word_codes)) for word in words),
+            dtype=np.int32, count=count
+        ),
+        "has_duration": np.fromiter(("duration_ms" in word for word in words), dtype=np.bool_, count=count),
+        "duration_ms": np.array(durations, dtype=np.int64 if integer_durations else np.float64),
+    }
+    for prefix, strings in (("word_table", list(word_codes)), ("speaker_table", list(speaker_codes))):
+        for name, array in _string_table(strings).items():
+            arrays[f"{prefix}_{name}"] = array
+    arrays[FULL_TRANSCRIPT_KEY] = np.frombuffer(
+        str(transcript.get(FULL_TRANSCRIPT_KEY, "")).encode("utf-8"), dtype=np.uint8
+    )
+
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        layout[name] = {"dtype": array.dtype.str, "offset": offset, "length": int(array.size)}
+        offset = _align(offset + array.nbytes)
+
+    header = json.dumps({
+        "version": FORMAT_VERSION,
+        "keys": list(transcript),
+        "metadata": {k: v for k, v in transcript.items() if k not in (WORDS_KEY, FULL_TRANSCRIPT_KEY)},
+        "word_count": count,
+        "arrays": layout
+    }, ensure_ascii=False).encode("utf-8")
+    data_start = _align(PREAMBLE.size + len(header))
+
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(PREAMBLE.pack(MAGIC, len(header), 0))
+        f.write(header)
+        for name, array in arrays.items():
+            f.write(b"\0" * (data_start + layout[name]["offset"] - f.tell()))
+            f.write(array.tobytes())
+    os.replace(tmp_path, path)
+
+
+class ColumnarWords(Sequence):
+    """Lazy sequence of word dicts backed by the transcript's arrays."""
+
+    def __init__(self, transcript: "ColumnarTranscript"):
+        # The arrays and tables only: a reference to the transcript would be a cycle keeping the map open
+        self._columns = transcript.columns
+        self._speakers = transcript.speakers_table
+        self._word_table = transcript.word_table
+        self._length = transcript.word_count
+        # Silence durations are stored densely; map word index -> duration index
+        self._duration_index = np.cumsum(self._columns["has_duration"]) - 1
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("word index out of range")
+        return self._row(index)
+
+    def _row(self, i: int) -> Dict[str, Any]:
+        columns = self._columns
+        row = {
+            "word": self._word_table.text(int(columns["word_code"][i])),
+            "speaker": self._speakers[int(columns["speaker_code"][i])],
+            "frame_in": int(columns["frame_in"][i]),
+            "frame_out": int(columns["frame_out"][i]),
+            "confidence": _confidence(columns["confidence"][i].item())
+        }
+        if columns["has_duration"][i]:
+            row["duration_ms"] = columns["duration_ms"][self._duration_index[i]].item()
+        return row
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        columns = self._columns
+        speakers = self._speakers
+        word_text = self._word_table.text
+        durations = iter(columns["duration_ms"].tolist())
+        for start in range(0, self._length, ITER_BATCH):
+            batch = slice(start, start + ITER_BATCH)
+            for word_code, speaker_code, frame_in, frame_out, confidence, has_duration in zip(
+                    columns["word_code"][batch].tolist(), columns["speaker_code"][batch].tolist(),
+                    columns["frame_in"][batch].tolist(), columns["frame_out"][batch].tolist(),
+                    columns["confidence"][batch].tolist(), columns["has_duration"][batch].tolist()):
+                row = {
+                    "word": word_text(word_code),
+                    "speaker": speakers[speaker_code],
+                    "frame_in": frame_in,
+                    "frame_out": frame_out,
+                    "confidence": _confidence(confidence)
+                }
+                if has_duration:
+                    row["duration_ms"] = next(durations)
+                yield row
+
+
+class _WordTable:
+    """The word string table, decoding each word once on first use."""
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        self._offsets = columns["word_table_offsets"]
+        self._bytes = columns["word_table_bytes"]
+        self._strings: List[Optional[str]] = [None] * (len(self._offsets) - 1)
+
+    def text(self, code: int) -> str:
+        text = self._strings[code]
+        if text is None:
+            text = self._strings[code] = _table_string(self._offsets, self._bytes, code)
+        return text
+
+
+def _table_string(offsets: np.ndarray, data: np.ndarray, code: int) -> str:
+    return data[offsets[code]:offsets[code + 1]].tobytes().decode("utf-8")
+
+
+def _confidence(value: float) -> Optional[float]:
+    return None if value != value else value  # NaN marks a missing confidence
+
+
+class ColumnarTranscript(Mapping):
+    """Read-only, memory-mapped view of a .transcript.cols file."""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Args:
+            path: Path to a .transcript.cols file
+
+        Raises:
+            ValueError: If the file is not a columnar transcript of a supported version
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, header_length, _ = PREAMBLE.unpack_from(self._mmap, 0)
+            if magic != MAGIC:
+                raise ValueError(f"Not a columnar transcript: {self.path}")
+            header = json.loads(self._mmap[PREAMBLE.size:PREAMBLE.size + header_length])
+            if header["version"] != FORMAT_VERSION:
+                raise ValueError(f"Unsupported columnar transcript version {header['version']}")
+        except Exception:
+            self._mmap.close()
+            raise
+
+        self._keys: List[str] = header["keys"]
+        self.metadata: Dict[str, Any] = header["metadata"]
+        self.word_count: int = header["word_count"]
+
+        data_start = _align(PREAMBLE.size + header_length)
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.frombuffer(self._mmap, dtype=np.dtype(spec["dtype"]), count=spec["length"],
+                                offset=data_start + spec["offset"])
+            for name, spec in header["arrays"].items()
+        }
+        speaker_offsets = self.columns["speaker_table_offsets"]
+        self.speakers_table = [_table_string(speaker_offsets, self.columns["speaker_table_bytes"], i)
+                               for i in range(len(speaker_offsets) - 1)]
+        self.word_table = _WordTable(self.columns)
+        self._words: Optional[ColumnarWords] = None
+
+    def word_text(self, code: int) -> str:
+        """Word string for a word_code (decoded once, then cached)."""
+        return self.word_table.text(code)
+
+    def __getitem__(self, key: str) -> Any:
+        if key == WORDS_KEY and key in self._keys:
+            if self._words is None:
+                self._words = ColumnarWords(self)
+            return self._words
+        if key == FULL_TRANSCRIPT_KEY and key in self._keys:
+            return self.columns[FULL_TRANSCRIPT_KEY].tobytes().decode("utf-8")
+        return self.metadata[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialize the full transcript dict, identical to the .transcript.json contents."""
+        return {key: list(self[key]) if key == WORDS_KEY else self[key] for key in self._keys}
+
+    def close(self) -> None:
+        """Release the memory map (skipped while arrays or words from this transcript are still referenced)."""
+        self.columns = {}
+        self.word_table = None
+        self._words = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            logger.debug(f"Columnar transcript {self.path.name} still referenced, leaving it mapped")
+
+    def __enter__(self) -> "ColumnarTranscript":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def load_transcript(transcript_path: Union[str, Path]) -> Mapping:
+    """
+    Load a .transcript.json, preferring its columnar sidecar when one is up to date.
+
+    Returns:
+        A ColumnarTranscript, or the parsed JSON dict when there is no usable sidecar
+    """
+    transcript_path = Path(transcript_path)
+    cols_path = columnar_path(transcript_path)
+    try:
+        if cols_path.stat().st_mtime >= transcript_path.stat().st_mtime:
+            return ColumnarTranscript(cols_path)
+        logger.info(f"Ignoring stale columnar transcript {cols_path.name}")
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not open columnar transcript {cols_path.name}: {e}")
+
+    with open(transcript_path, "r", encoding="utf-8") as f:
+        return json.load(f)
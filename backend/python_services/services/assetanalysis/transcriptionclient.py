@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Asyncio AssemblyAI transcription client.
+
+All outstanding transcripts share one pooled httpx.AsyncClient and a single
+poller task, so waiting for a transcript costs no thread: each caller awaits a
+future that the poller resolves. Poll intervals adapt to the audio duration
+(AssemblyAI finishes in a fraction of real time, so there is no point checking
+a one-hour file every five seconds), and when a webhook URL is configured
+AssemblyAI's completion callback triggers an immediate fetch through
+notify(), with slow polling kept only as a fallback.
+
+Sync code (the CLI, worker threads) can schedule coroutines on the client's
+loop with run_coroutine(); a client that is first used that way runs on a
+shared background event loop thread.
+"""
+
+import time
+import asyncio
+import logging
+import threading
+import concurrent.futures
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = "https://api.assemblyai.com/v2"
+DEFAULT_MAX_CONNECTIONS = 16
+REQUEST_TIMEOUT_SECONDS = 30
+
+# Adaptive polling: expect completion after a base delay plus a fraction of the audio duration
+EXPECTED_BASE_SECONDS = 15
+EXPECTED_REALTIME_FACTOR = 0.3
+MIN_POLL_SECONDS = 3
+MAX_POLL_SECONDS = 60
+POLL_RETRY_SECONDS = 10            # After a failed status request
+WEBHOOK_FALLBACK_POLL_SECONDS = 120  # With webhooks, polling only guards against lost callbacks
+
+# Header AssemblyAI sends with webhook requests when a webhook secret is configured
+WEBHOOK_AUTH_HEADER = "X-Transcript-Webhook-Token"
+
+StatusCallback = Callable[[str, str, float], None]  # (transcript_id, status, elapsed_seconds)
+
+
+def poll_interval(elapsed: float, audio_duration: Optional[float] = None, webhook: bool = False) -> float:
+    """
+    Seconds to wait before the next status request for a transcript.
+
+    Without an audio duration this is the original progressive backoff (5s,
+    growing by a second per minute up to 15s). With one, the first polls are
+    spread over the expected processing time and tighten as it approaches; once
+    it has passed, polling falls back to the progressive backoff.
+    """
+    if webhook:
+        return WEBHOOK_FALLBACK_POLL_SECONDS
+    if not audio_duration:
+        return min(5 + (elapsed // 60), 15)
+    remaining = EXPECTED_BASE_SECONDS + audio_duration * EXPECTED_REALTIME_FACTOR - elapsed
+    if remaining <= 0:
+        return min(5 + (-remaining // 60), 15)
+    return min(max(remaining / 2, MIN_POLL_SECONDS), MAX_POLL_SECONDS)
+
+
+@dataclass
+class _PendingTranscript:
+    transcript_id: str
+    future: asyncio.Future
+    audio_duration: Optional[float]
+    on_status: Optional[StatusCallback]
+    started: float = field(default_factory=time.monotonic)
+    next_poll: float = 0.0
+    waiters: int = 0
+
+
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_loop_lock = threading.Lock()
+
+
+def background_event_loop() -> asyncio.AbstractEventLoop:
+    """Shared event loop running in a daemon thread, for clients used from sync code."""
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="transcription-loop", daemon=True).start()
+            _background_loop = loop
+        return _background_loop
+
+
+class AsyncTranscriptionClient:
+    """Submit AssemblyAI transcriptions and wait for all of them with one poller."""
+
+    def __init__(self, api_key: str, base_url: str = DEFAULT_BASE_URL,
+                 webhook_url: Optional[str] = None, webhook_secret: Optional[str] = None,
+                 max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 loop: Optional[asyncio.AbstractEventLoop] = None):
+        """
+        Args:
+            api_key: AssemblyAI API key
+            base_url: API base URL (overridable for a local fake server)
+            webhook_url: Public URL AssemblyAI should call on completion (see notify())
+            webhook_secret: Value AssemblyAI sends back in the WEBHOOK_AUTH_HEADER header
+            max_connections: Size of the HTTP connection pool
+            loop: Event loop the client runs on (default: the loop it is first awaited on,
+                or the shared background loop when first used through run_coroutine())
+        """
+        self.api_key = api_key
+        self.base_url = base_url
+        self.webhook_url = webhook_url
+        self.webhook_secret = webhook_secret
+        self.max_connections = max_connections
+        self._http: Optional[httpx.AsyncClient] = None
+        self._loop = loop
+        self._pending: Dict[str, _PendingTranscript] = {}
+        self._poller: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is None:
+            self._loop = loop
+        elif self._loop is not loop:
+            raise RuntimeError("AsyncTranscriptionClient is bound to a different event loop")
+        if self._http is None:
+            limits = httpx.Limits(max_connections=self.max_connections,
+                                  max_keepalive_connections=self.max_connections)
+            self._http = httpx.AsyncClient(headers={"Authorization": self.api_key},
+                                           timeout=REQUEST_TIMEOUT_SECONDS, limits=limits)
+            self._wakeup = asyncio.Event()
+
+    def run_coroutine(self, coro: Awaitable[Any]) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the client's event loop from another thread.
+
+        Raises:
+            RuntimeError: If called from the client's own event loop (it would deadlock on .result())
+        """
+        if self._loop is None:
+            self._loop = background_event_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            raise RuntimeError("run_coroutine called from the client's event loop; await the coroutine instead")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    @property
+    def outstanding(self) -> int:
+        """Number of transcripts currently being waited for."""
+        return len(self._pending)
+
+    async def submit(self, audio_url: str, config: Dict[str, Any]) -> str:
+        """
+        Submit a transcription request and return its transcript ID.
+
+        Raises:
+            RuntimeError: If AssemblyAI rejects the request
+        """
+        self._bind_loop()
+        json_data = {"audio_url": audio_url, **config}
+        if self.webhook_url:
+            json_data["webhook_url"] = self.webhook_url
+            if self.webhook_secret:
+                json_data["webhook_auth_header_name"] = WEBHOOK_AUTH_HEADER
+                json_data["webhook_auth_header_value"] = self.webhook_secret
+
+        response = await self._http.post(f"{self.base_url}/transcript", json=json_data)
+        if response.status_code != 200:
+            error_message = f"Transcription request failed: {response.text}"
+            logger.error(error_message)
+            raise RuntimeError(error_message)
+        return response.json()["id"]
+
+    async def wait(self, transcript_id: str, audio_duration: Optional[float] = None,
+                   on_status: Optional[StatusCallback] = None, poll_now: bool = False) -> Dict[str, Any]:
+        """
+        Wait for a submitted transcript to complete.
+
+        Args:
+            transcript_id: ID returned by submit()
+            audio_duration: Audio length in seconds, used to pace polling
+            on_status: Called with (transcript_id, status, elapsed_seconds) after each status check
+            poll_now: Check the status right away, e.g. for a transcript submitted before a restart
+
+        Returns:
+            The completed AssemblyAI transcript
+
+        Raises:
+            RuntimeError: If the transcription fails
+        """
+        self._bind_loop()
+        pending = self._pending.get(transcript_id)
+        if pending is None:
+            pending = _PendingTranscript(transcript_id, self._loop.create_future(), audio_duration, on_status)
+            pending.next_poll = pending.started + (0 if poll_now else self._interval(pending))
+            self._pending[transcript_id] = pending
+        if self._poller is None or self._poller.done():
+            self._poller = self._loop.create_task(self._poll_loop())
+        pending.waiters += 1
+        self._wakeup.set()
+        try:
+            # Shielded so one cancelled waiter does not cancel the shared future
+            return await asyncio.shield(pending.future)
+        except asyncio.CancelledError:
+            pending.waiters -= 1
+            if pending.waiters == 0 and self._pending.get(transcript_id) is pending:
+                # Nobody is waiting any more, so stop polling for it
+                del self._pending[transcript_id]
+                pending.future.cancel()
+            raise
+
+    async def transcribe(self, audio_url: str, config: Dict[str, Any], audio_duration: Optional[float] = None,
+                         on_status: Optional[StatusCallback] = None) -> Dict[str, Any]:
+        """Submit a transcription and wait for it to complete."""
+        transcript_id = await self.submit(audio_url, config)
+        logger.info(f"Transcription submitted. ID: {transcript_id}")
+        if on_status is not None:
+            on_status(transcript_id, "queued", 0.0)
+        return await self.wait(transcript_id, audio_duration, on_status)
+
+    def notify(self, transcript_id: str) -> bool:
+        """
+        Fetch a transcript now (called from the webhook endpoint on the client's loop).
+
+        Returns:
+            True if the transcript is being waited for by this client
+        """
+        pending = self._pending.get(transcript_id)
+        if pending is None:
+            return False
+        pending.next_poll = 0.0
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return True
+
+    def _interval(self, pending: _PendingTranscript) -> float:
+        return poll_interval(time.monotonic() - pending.started, pending.audio_duration, bool(self.webhook_url))
+
+    async def _poll_loop(self) -> None:
+        """Single task that polls every due transcript and resolves its waiters."""
+        while self._pending:
+            self._wakeup.clear()
+            now = time.monotonic()
+            due = [pending for pending in self._pending.values() if pending.next_poll <= now]
+            if due:
+                await asyncio.gather(*(self._poll(pending) for pending in due))
+                continue
+            delay = min(pending.next_poll for pending in self._pending.values()) - now
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll(self, pending: _PendingTranscript) -> None:
+        transcript_id = pending.transcript_id
+        if pending.future.done():
+            self._pending.pop(transcript_id, None)
+            return
+        try:
+            response = await self._http.get(f"{self.base_url}/transcript/{transcript_id}")
+            response.raise_for_status()
+            result = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning(f"Polling error for {transcript_id}: {e}, retrying...")
+            pending.next_poll = time.monotonic() + POLL_RETRY_SECONDS
+            return
+
+        status = result["status"]
+        elapsed = time.monotonic() - pending.started
+        logger.info(f"Transcript {transcript_id} status: {status} (elapsed: {elapsed:.1f}s)")
+        if pending.on_status is not None:
+            try:
+                pending.on_status(transcript_id, status, elapsed)
+            except Exception as e:
+                logger.warning(f"Status callback failed for {transcript_id}: {e}")
+
+        if status == "completed":
+            self._pending.pop(transcript_id, None)
+            pending.future.set_result(result)
+        elif status == "error":
+            self._pending.pop(transcript_id, None)
+            pending.future.set_exception(RuntimeError(f"Transcription failed: {result.get('error', 'Unknown error')}"))
+        else:
+            pending.next_poll = time.monotonic() + self._interval(pending)
+
+    async def aclose(self) -> None:
+        """Cancel outstanding waits and close the connection pool."""
+        for pending in self._pending.values():
+            pending.future.cancel()
+        self._pending.clear()
+        if self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
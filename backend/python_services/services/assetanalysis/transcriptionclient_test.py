@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+AsyncTranscriptionClient Test Script
+
+Runs the asyncio transcription client against the local AssemblyAI stand-in
+(fakeassemblyai.py) to verify:
+- One poller task for many outstanding transcripts, without over-polling
+- Failed transcripts raising RuntimeError
+- Webhook notification fetching a transcript at once
+- Adaptive poll intervals
+"""
+
+import sys
+from pathlib import Path
+
+# Add the services directory to Python path for imports
+script_dir = Path(__file__).parent
+services_dir = script_dir.parent
+sys.path.insert(0, str(services_dir))
+
+from assetanalysis.fakeassemblyai import FAKE_WORDS, FakeAssemblyAI
+
+
+def test_async_client_multiplexing():
+    """One poller task serves many outstanding transcripts."""
+    print("\n🔍 Testing async transcription client multiplexing...")
+
+    import asyncio
+    from assetanalysis.transcriptionclient import AsyncTranscriptionClient
+
+    async def run(server):
+        client = AsyncTranscriptionClient("test", server.base_url)
+        # Poll fast instead of pacing by audio duration, but only once all 8 are outstanding;
+        # otherwise the first could complete before the last is submitted
+        all_submitted = asyncio.Event()
+        client._interval = lambda pending: 0.05 if all_submitted.is_set() else 60
+        statuses = []
+        try:
+            waits = asyncio.gather(*(
+                client.transcribe(f"https://cdn.example/upload/{i}", {"speaker_labels": True}, 60,
+                                  lambda transcript_id, status, elapsed: statuses.append(status))
+                for i in range(8)
+            ))
+            while client.outstanding < 8:
+                await asyncio.sleep(0.01)
+            all_submitted.set()
+            for transcript_id in list(server.transcripts):
+                client.notify(transcript_id)
+            poller = client._poller
+            results = await waits
+            assert client._poller is poller, "Expected one poller task for all transcripts"
+            failed = await asyncio.gather(client.transcribe("https://cdn.example/upload/error", {}),
+                                          return_exceptions=True)
+            assert client.outstanding == 0
+            return results, statuses, failed[0]
+        finally:
+            await client.aclose()
+
+    with FakeAssemblyAI(polls_until_complete=2) as server:
+        results, statuses, failure = asyncio.run(run(server))
+        assert all(r["status"] == "completed" and r["words"] == FAKE_WORDS for r in results)
+        assert len({r["id"] for r in results}) == 8
+        assert all(t["polls"] == 3 for t in server.transcripts.values()), "Transcripts were over-polled"
+        assert all(t["request"]["speaker_labels"] for t in list(server.transcripts.values())[:8])
+    assert statuses.count("completed") == 8 and "processing" in statuses
+    assert isinstance(failure, RuntimeError) and "injected transcription failure" in str(failure)
+
+    print("✅ 8 transcripts completed on one poller; failed transcript raised RuntimeError")
+    return True
+
+
+def test_async_client_webhook():
+    """Webhook notification fetches a transcript at once instead of waiting for the fallback poll."""
+    print("\n🔍 Testing webhook completion...")
+
+    import time
+    import asyncio
+    from assetanalysis.transcriptionclient import (AsyncTranscriptionClient, WEBHOOK_AUTH_HEADER,
+                                                   WEBHOOK_FALLBACK_POLL_SECONDS, poll_interval)
+
+    async def run(server):
+        client = AsyncTranscriptionClient("test", server.base_url, webhook_url="https://app.example/hook",
+                                          webhook_secret="secret")
+        try:
+            transcript_id = await client.submit("https://cdn.example/upload/abc", {})
+            waiter = asyncio.ensure_future(client.wait(transcript_id, audio_duration=3))
+            await asyncio.sleep(0.1)
+            assert not waiter.done() and server.transcripts[transcript_id]["polls"] == 0
+            assert client.notify(transcript_id) and not client.notify("unknown")
+            start = time.monotonic()
+            result = await asyncio.wait_for(waiter, timeout=5)
+            return result, time.monotonic() - start
+        finally:
+            await client.aclose()
+
+    with FakeAssemblyAI() as server:
+        result, elapsed = asyncio.run(run(server))
+        request = server.transcripts["t1"]["request"]
+    assert result["status"] == "completed" and elapsed < 1
+    assert request["webhook_url"] == "https://app.example/hook"
+    assert request["webhook_auth_header_name"] == WEBHOOK_AUTH_HEADER
+    assert request["webhook_auth_header_value"] == "secret"
+
+    # Adaptive intervals: long audio polls rarely at first, short audio soon, overdue jobs back off
+    assert poll_interval(0, 3600) == 60 and 3 <= poll_interval(0, 10) <= 10
+    assert poll_interval(600, 60) == 14 and poll_interval(0) == 5
+    assert poll_interval(0, 60, webhook=True) == WEBHOOK_FALLBACK_POLL_SECONDS
+
+    print(f"✅ Webhook notification completed the wait in {elapsed * 1000:.0f}ms")
+    return True
+
+
+def main():
+    """Run all tests and provide summary."""
+    print("🧪 AsyncTranscriptionClient Test Suite")
+    print("=" * 50)
+
+    tests = [
+        ("Async Client Multiplexing", test_async_client_multiplexing),
+        ("Async Client Webhook", test_async_client_webhook),
+    ]
+
+    results = []
+
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+        except Exception as e:
+            print(f"❌ {test_name} crashed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{'✅ PASS' if result else '❌ FAIL'} {test_name}")
+    print(f"\n📊 Results: {passed} passed, {len(results) - passed} failed")
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
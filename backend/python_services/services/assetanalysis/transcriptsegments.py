@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Segment index of a transcript (<name>.segments.json).
+
+Clips are cut at sentence or speaker boundaries, so the edit agents work with
+utterance segments rather than single words. The segmenter runs after
+process_transcript_to_words and splits the word list:
+
+- at speaker changes and **SILENCE** markers,
+- after words ending a sentence (. ? !),
+- after MAX_SEGMENT_WORDS words, so long unpunctuated runs still have cut points.
+
+Each segment has an ID (its position, in time order, so the same transcript
+always gets the same IDs), speaker, frame range (first word's frame_in to last
+word's frame_out), text, average confidence and the range of its words in the
+transcript's word list. Silence markers are listed separately.
+
+The index is written next to the transcript by VideoAnalyzer. Segment IDs are
+only meaningful for the transcript they were cut from (reprocessing with a new
+silence threshold moves the boundaries), so the index records a fingerprint of
+the transcript file and the silence threshold, and load_segment_index() rebuilds
+it when it is missing or either one no longer matches.
+"""
+
+import os
+import json
+import hashlib
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+
+# Handle imports that work both when run directly and as a module
+try:
+    from .transcriptcache import transcript_base
+except ImportError:
+    from transcriptcache import transcript_base
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 2
+SEGMENTS_SUFFIX = ".segments.json"
+SILENCE_WORD = "**SILENCE**"
+
+# Longest segment, so that long unpunctuated runs still have cut points
+MAX_SEGMENT_WORDS = 40
+
+# Transcript metadata copied into the index
+HEADER_KEYS = ("file_name", "fps", "duration_frames", "timecode_offset_frames", "speakers", "silence_threshold_ms")
+
+
+def segments_path(transcript_path: Union[str, Path]) -> Path:
+    """Segment index path for `<name>.transcript.json`."""
+    return Path(transcript_path).with_name(f"{transcript_base(transcript_path)}{SEGMENTS_SUFFIX}")
+
+
+def transcript_fingerprint(transcript_path: Union[str, Path]) -> str:
+    """SHA-1 of a transcript file's contents, recorded in its segment index."""
+    digest = hashlib.sha1()
+    with open(transcript_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _ends_sentence(word: str) -> bool:
+    return word.rstrip("\"')").endswith((".", "?", "!"))
+
+
+def _segment(segment_id: int, word_start: int, words: List[Dict[str, Any]]) -> Dict[str, Any]:
+    confidences = [word["confidence"] for word in words if word.get("confidence") is not None]
+    return {
+        "id": segment_id,
+        "speaker": words[0].get("speaker"),
+        "frame_in": words[0]["frame_in"],
+        "frame_out": words[-1]["frame_out"],
+        "text": " ".join(word["word"] for word in words),
+        "avg_confidence": round(sum(confidences) / len(confidences), 3) if confidences else None,
+        "word_start": word_start,
+        "word_end": word_start + len(words)
+    }
+
+
+def segment_words(words: Iterable[Mapping[str, Any]]) -> Dict[str, List[Any]]:
+    """
+    Split a transcript word list into segments.
+
+    Returns:
+        {"segments": [...], "silences": [[frame_in, frame_out], ...]}; word_start
+        and word_end (exclusive) of a segment index into the given words
+    """
+    segments: List[Dict[str, Any]] = []
+    silences: List[List[int]] = []
+    current: List[Dict[str, Any]] = []
+    current_start = 0
+
+    for position, word in enumerate(words):
+        if word.get("word") == SILENCE_WORD:
+            if current:
+                segments.append(_segment(len(segments), current_start, current))
+                current = []
+            silences.append([word["frame_in"], word["frame_out"]])
+            continue
+        if current and word.get("speaker") != current[-1].get("speaker"):
+            segments.append(_segment(len(segments), current_start, current))
+            current = []
+        if not current:
+            current_start = position
+        current.append(word)
+        if _ends_sentence(word["word"]) or len(current) >= MAX_SEGMENT_WORDS:
+            segments.append(_segment(len(segments), current_start, current))
+            current = []
+    if current:
+        segments.append(_segment(len(segments), current_start, current))
+
+    return {"segments": segments, "silences": silences}
+
+
+def build_segment_index(transcript: Mapping[str, Any], fingerprint: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Segment index of a transcript dict (or a lazily loaded columnar transcript).
+
+    Args:
+        transcript: The transcript
+        fingerprint: transcript_fingerprint() of the file the transcript was saved to,
+            required for the index to be reused by load_segment_index()
+    """
+    words = transcript.get("words", [])
+    index = {"format_version": FORMAT_VERSION, "source_fingerprint": fingerprint}
+    index.update({key: transcript[key] for key in HEADER_KEYS if key in transcript})
+    # Columnar transcripts may hold the speaker list as a sequence type
+    if "speakers" in index:
+        index["speakers"] = list(index["speakers"])
+    index["word_count"] = len(words)
+    index.update(segment_words(words))
+    return index
+
+
+def write_segment_index(path: Union[str, Path], index: Dict[str, Any]) -> None:
+    """Atomically write a segment index."""
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def load_segment_index(transcript_path: Union[str, Path], transcript: Optional[Mapping[str, Any]] = None,
+                       persist: bool = True) -> Dict[str, Any]:
+    """
+    The segment index of a .transcript.json, rebuilt when missing or stale.
+
+    An index is stale when it was cut from a different transcript file (by
+    fingerprint) or with a different silence threshold than the loaded transcript.
+
+    Args:
+        transcript_path: Path to the transcript
+        transcript: The already loaded transcript, used when the index has to be rebuilt
+        persist: Write a rebuilt index next to the transcript
+
+    Returns:
+        The segment index
+    """
+    transcript_path = Path(transcript_path)
+    index_path = segments_path(transcript_path)
+    fingerprint = transcript_fingerprint(transcript_path)
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if (index.get("format_version") == FORMAT_VERSION and index.get("source_fingerprint") == fingerprint
+                and (transcript is None
+                     or index.get("silence_threshold_ms") == transcript.get("silence_threshold_ms"))):
+            return index
+        logger.info(f"Rebuilding stale segment index {index_path.name}")
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read segment index {index_path.name}: {e}")
+
+    if transcript is None:
+        with open(transcript_path, "r", encoding="utf-8") as f:
+            transcript = json.load(f)
+    index = build_segment_index(transcript, fingerprint)
+    if persist:
+        try:
+            write_segment_index(index_path, index)
+        except OSError as e:
+            logger.warning(f"Could not save segment index {index_path.name}: {e}")
+    return index
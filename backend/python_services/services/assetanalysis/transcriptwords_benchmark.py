@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Transcript Word Processing Benchmark
+
+Compares the vectorized words_to_frames path against the per-word loop on
+synthetic AssemblyAI transcripts (10k, 100k and 1M words by default) and checks
+that both produce identical output.
+
+Usage:
+    python transcriptwords_benchmark.py [--sizes 10000 100000 1000000] [--repeat 3]
+"""
+
+import sys
+import time
+import random
+import logging
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add the services directory to Python path for imports
+script_dir = Path(__file__).parent
+services_dir = script_dir.parent
+sys.path.insert(0, str(services_dir))
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+FPS = 23.976
+TIMECODE_OFFSET_FRAMES = 86_314  # 01:00:00:00 at 23.976
+
+
+def synthetic_words(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """AssemblyAI-shaped words with speaker turns, pauses, blanks and bad timestamps."""
+    rng = random.Random(seed)
+    speakers = ["A", "B", "C", "D"]
+    speaker = "A"
+    words = []
+    t = 0
+    for _ in range(count):
+        if rng.random() < 0.05:
+            speaker = rng.choice(speakers)
+        t += rng.choice((0, 20, 40, 80, 120, 300)) if rng.random() > 0.03 else rng.randint(800, 4000)
+        duration = rng.randint(80, 600)
+        end = t + duration if rng.random() > 0.001 else t  # Occasional zero-length word
+        words.append({
+            "text": "word" if rng.random() > 0.001 else " ",
+            "start": t,
+            "end": end,
+            "confidence": round(rng.uniform(0.5, 1.0), 4),
+            "speaker": speaker
+        })
+        t = end
+    return words
+
+
+def _time(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description="Benchmark vectorized vs per-word transcript processing")
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES), help="Word counts")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size (best wall time is reported)")
+    parser.add_argument("--silence-threshold", type=int, default=1000)
+    args = parser.parse_args()
+
+    from assetanalysis.videoanalyzer import VideoAnalyzer
+    from assetanalysis.transcriptwords import words_to_frames
+
+    # Keep per-word logging out of the measurement
+    logging.disable(logging.WARNING)
+    analyzer = VideoAnalyzer(assemblyai_api_key="benchmark")
+    mapping = analyzer.brief_parser.get_speaker_mapping()
+
+    def label(speaker):
+        return analyzer._normalize_speaker_label(speaker, mapping)
+
+    print("⏱️  Benchmarking transcript word processing")
+    print("=" * 66)
+    print(f"{'words':>10}{'loop s':>12}{'vectorized s':>15}{'speedup':>10}{'identical':>12}")
+
+    identical_all = True
+    for size in args.sizes:
+        words = synthetic_words(size)
+        loop_args = (words, FPS, TIMECODE_OFFSET_FRAMES, args.silence_threshold, mapping)
+        vector_args = (words, FPS, TIMECODE_OFFSET_FRAMES, args.silence_threshold, label)
+
+        identical = analyzer._process_words_loop(*loop_args) == words_to_frames(*vector_args)
+        identical_all = identical_all and identical
+
+        loop_seconds = _time(lambda: analyzer._process_words_loop(*loop_args), args.repeat)
+        vector_seconds = _time(lambda: words_to_frames(*vector_args), args.repeat)
+        print(f"{size:>10,}{loop_seconds:12.3f}{vector_seconds:15.3f}"
+              f"{loop_seconds / vector_seconds:9.1f}x{'✅' if identical else '❌':>11}")
+
+    print("=" * 66)
+    return 0 if identical_all else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Streaming uploader for AssemblyAI's /upload endpoint.
+
+Files are streamed in fixed-size chunks over a pooled requests.Session, so a
+500 MB upload never sits in memory and progress can be reported per chunk.
+Failed attempts (connection errors, timeouts, 429 and 5xx responses) are
+retried with exponential backoff and jitter. AssemblyAI's upload endpoint has
+no byte-range resume protocol, so a retry re-streams the file from disk rather
+than re-extracting or re-reading it into memory.
+"""
+
+import os
+import time
+import queue
+import random
+import logging
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Progress callback signature: (bytes_sent, total_bytes or None if unknown)
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024  # 4 MB
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+# Pipe defaults: 256 KB chunks, at most 32 queued (8 MB in flight)
+PIPE_CHUNK_SIZE = 256 * 1024
+PIPE_MAX_CHUNKS = 32
+
+
+def create_http_session(pool_maxsize: int = 16) -> requests.Session:
+    """Create a requests.Session with a connection pool sized for concurrent polling."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class UploadError(RuntimeError):
+    """Raised when an upload fails permanently or exhausts its retries."""
+
+
+class PipeClosedError(RuntimeError):
+    """Raised on the writer side when the reader has stopped consuming the pipe."""
+
+
+class ChunkPipe:
+    """
+    Bounded in-memory byte pipe between an encoder thread and the uploader.
+
+    The writer side is file-like (write/flush/close) so PyAV can mux straight
+    into it; small writes are coalesced into chunk_size chunks. The reader
+    side is an iterator of chunks suitable as a streaming request body. When
+    the queue is full the writer blocks, so memory stays bounded at roughly
+    chunk_size * max_chunks.
+    """
+
+    _EOF = object()
+
+    def __init__(self, chunk_size: int = PIPE_CHUNK_SIZE, max_chunks: int = PIPE_MAX_CHUNKS):
+        self.chunk_size = chunk_size
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_chunks)
+        self._buffer = bytearray()
+        self._reader_closed = False
+        self._writer_closed = False
+        self.bytes_written = 0
+
+    # Writer side
+
+    def write(self, data: bytes) -> int:
+        if self._writer_closed:
+            raise ValueError("write to closed pipe")
+        self._buffer.extend(data)
+        while len(self._buffer) >= self.chunk_size:
+            self._put(bytes(self._buffer[:self.chunk_size]))
+            del self._buffer[:self.chunk_size]
+        self.bytes_written += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        """Flush buffered bytes and signal end of stream to the reader."""
+        if self._writer_closed:
+            return
+        self._writer_closed = True
+        if self._buffer:
+            self._put(bytes(self._buffer))
+            self._buffer.clear()
+        self._put(self._EOF)
+
+    def abort(self, error: BaseException) -> None:
+        """Signal the reader that the writer failed; the reader re-raises `error`."""
+        self._writer_closed = True
+        self._buffer.clear()
+        try:
+            self._put(error)
+        except PipeClosedError:
+            pass
+
+    def _put(self, item) -> None:
+        while True:
+            if self._reader_closed:
+                raise PipeClosedError("Pipe reader closed")
+            try:
+                self._queue.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    # Reader side
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            item = self._queue.get()
+            if item is self._EOF:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+    def close_reader(self) -> None:
+        """Stop consuming; a blocked or future write raises PipeClosedError."""
+        self._reader_closed = True
+        # Unblock a writer waiting on a full queue
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return
+
+
+class StreamingUploader:
+    """Chunked, retrying uploader bound to one pooled HTTP session."""
+
+    def __init__(self, http_session: requests.Session, upload_url: str, headers: Dict[str, str],
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, max_retries: int = 5,
+                 backoff_base: float = 1.0, backoff_max: float = 30.0,
+                 timeout: tuple = (10, 300)):
+        """
+        Args:
+            http_session: Pooled session shared with the rest of the analyzer
+            upload_url: Full URL of the upload endpoint
+            headers: Request headers (authorization)
+            chunk_size: Bytes per streamed chunk
+            max_retries: Retries after the first failed attempt
+            backoff_base: First backoff delay in seconds (doubles per retry)
+            backoff_max: Cap on a single backoff delay in seconds
+            timeout: (connect, read) timeout passed to requests
+        """
+        self.http_session = http_session
+        self.upload_url = upload_url
+        self.headers = headers
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+
+    def upload_file(self, file_path: str, progress_callback: Optional[ProgressCallback] = None) -> str:
+        """
+        Stream a file to the upload endpoint, retrying failed attempts.
+
+        Returns:
+            The upload_url returned by the server
+        """
+        total_bytes = os.path.getsize(file_path)
+        return self._post_with_retry(
+            lambda: self._file_chunks(file_path, total_bytes, progress_callback),
+            description=f"{file_path} ({total_bytes} bytes)"
+        )
+
+    def upload_chunks(self, chunks: Iterable[bytes], total_bytes: Optional[int] = None,
+                      progress_callback: Optional[ProgressCallback] = None) -> str:
+        """
+        Stream an iterable of chunks to the upload endpoint in a single attempt.
+
+        The iterable can only be consumed once, so this does not retry; callers
+        that need retries should keep the data replayable and use upload_file.
+
+        Returns:
+            The upload_url returned by the server
+        """
+        body = self._counted(chunks, total_bytes, progress_callback)
+        response = self._post(body)
+        if response.status_code != 200:
+            raise UploadError(f"Upload failed: {response.status_code} {response.text}")
+        return response.json()["upload_url"]
+
+    def _file_chunks(self, file_path: str, total_bytes: int,
+                     progress_callback: Optional[ProgressCallback]) -> Iterator[bytes]:
+        with open(file_path, "rb") as f:
+            yield from self._counted(iter(lambda: f.read(self.chunk_size), b""), total_bytes, progress_callback)
+
+    def _counted(self, chunks: Iterable[bytes], total_bytes: Optional[int],
+                 progress_callback: Optional[ProgressCallback]) -> Iterator[bytes]:
+        bytes_sent = 0
+        for chunk in chunks:
+            yield chunk
+            bytes_sent += len(chunk)
+            if progress_callback:
+                progress_callback(bytes_sent, total_bytes)
+
+    def _post(self, body: Iterable[bytes]) -> requests.Response:
+        return self.http_session.post(self.upload_url, headers=self.headers, data=body, timeout=self.timeout)
+
+    def _post_with_retry(self, body_factory: Callable[[], Iterable[bytes]], description: str) -> str:
+        attempt = 0
+        while True:
+            try:
+                response = self._post(body_factory())
+                if response.status_code == 200:
+                    return response.json()["upload_url"]
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    raise UploadError(f"Upload failed: {response.status_code} {response.text}")
+                failure = f"HTTP {response.status_code}"
+            except (requests.ConnectionError, requests.Timeout) as e:
+                failure = str(e)
+
+            if attempt >= self.max_retries:
+                raise UploadError(f"Upload of {description} failed after {attempt + 1} attempts: {failure}")
+
+            delay = min(self.backoff_max, self.backoff_base * (2 ** attempt)) * random.uniform(0.5, 1.0)
+            attempt += 1
+            logger.warning(f"Upload attempt {attempt} failed ({failure}), retrying in {delay:.1f}s")
+            time.sleep(delay)
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+StreamingUploader Test Script
+
+Runs the chunked uploader against a local stand-in for AssemblyAI's /upload
+and /transcript endpoints to verify:
+- Chunked streaming and bytes-sent progress reporting
+- Retry with backoff after dropped connections and 5xx responses
+- No retry on permanent (4xx) errors
+- VideoAnalyzer.upload_audio_file progress events over the pooled session
+- Pipelined extract-while-uploading through the bounded ChunkPipe
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the services directory to Python path for imports
+script_dir = Path(__file__).parent
+services_dir = script_dir.parent
+sys.path.insert(0, str(services_dir))
+
+from assetanalysis.fakeassemblyai import FakeAssemblyAI
+
+
+def _make_payload(size: int) -> str:
+    with tempfile.NamedTemporaryFile(suffix=".ogg", delete=False) as f:
+        f.write(os.urandom(size))
+        return f.name
+
+
+def _uploader(server, **kwargs):
+    from assetanalysis.uploader import StreamingUploader, create_http_session
+    return StreamingUploader(create_http_session(), f"{server.base_url}/upload",
+                             headers={"Authorization": "test"}, backoff_base=0.01, **kwargs)
+
+
+def test_chunked_upload_progress():
+    """Upload streams in chunks and reports monotonic progress up to the file size."""
+    print("🔍 Testing chunked upload with progress...")
+
+    payload_path = _make_payload(1024 * 1024 + 123)
+    try:
+        with FakeAssemblyAI() as server:
+            progress = []
+            url = _uploader(server, chunk_size=64 * 1024).upload_file(
+                payload_path, lambda sent, total: progress.append((sent, total)))
+
+            with open(payload_path, "rb") as f:
+                assert server.received == [f.read()], "Server received different bytes"
+            assert url == "https://cdn.example/upload/abc"
+            assert len(progress) == 17, f"Expected 17 chunk callbacks, got {len(progress)}"
+            assert progress[-1] == (os.path.getsize(payload_path),) * 2
+            assert all(a[0] < b[0] for a, b in zip(progress, progress[1:]))
+    finally:
+        os.unlink(payload_path)
+
+    print("✅ Chunked upload streamed and reported progress")
+    return True
+
+
+def test_retry_after_failures():
+    """Dropped connections and 503s are retried until the upload succeeds."""
+    print("\n🔍 Testing retry after dropped connection and 503...")
+
+    payload_path = _make_payload(256 * 1024)
+    try:
+        with FakeAssemblyAI() as server:
+            server.failures = ["drop", 503]
+            _uploader(server, chunk_size=32 * 1024).upload_file(payload_path)
+
+            assert server.attempts == 3, f"Expected 3 attempts, got {server.attempts}"
+            with open(payload_path, "rb") as f:
+                assert server.received == [f.read()], "Retried upload was not complete"
+    finally:
+        os.unlink(payload_path)
+
+    print("✅ Upload recovered after 2 failed attempts")
+    return True
+
+
+def test_no_retry_on_client_error():
+    """Permanent errors fail immediately instead of burning retries."""
+    print("\n🔍 Testing permanent error handling...")
+
+    from assetanalysis.uploader import UploadError
+
+    payload_path = _make_payload(1024)
+    try:
+        with FakeAssemblyAI() as server:
+            server.failures = [401]
+            try:
+                _uploader(server).upload_file(payload_path)
+                raise AssertionError("Expected UploadError for 401")
+            except UploadError:
+                pass
+            assert server.attempts == 1, f"Expected 1 attempt, got {server.attempts}"
+    finally:
+        os.unlink(payload_path)
+
+    print("✅ 401 raised UploadError without retrying")
+    return True
+
+
+def test_analyzer_upload_progress_events():
+    """VideoAnalyzer.upload_audio_file reports upload events through its progress callback."""
+    print("\n🔍 Testing VideoAnalyzer upload progress events...")
+
+    from assetanalysis.videoanalyzer import VideoAnalyzer
+
+    events = []
+    analyzer = VideoAnalyzer(assemblyai_api_key="dummy_key_for_testing",
+                             progress_callback=lambda stage, details: events.append((stage, details)))
+
+    payload_path = _make_payload(10 * 1024 * 1024)
+    try:
+        with FakeAssemblyAI() as server:
+            analyzer.BASE_URL = server.base_url
+            url = analyzer.upload_audio_file(payload_path)
+            assert url == "https://cdn.example/upload/abc"
+    finally:
+        os.unlink(payload_path)
+
+    upload_events = [details for stage, details in events if stage == "upload"]
+    assert upload_events, "No upload progress events reported"
+    assert upload_events[-1]["bytes_sent"] == upload_events[-1]["total_bytes"] == 10 * 1024 * 1024
+
+    print(f"✅ Received {len(upload_events)} upload progress events")
+    return True
+
+
+def _make_audio_clip(seconds: float) -> str:
+    """Write a short 48 kHz stereo AAC clip with PyAV."""
+    import av
+    import math
+    import struct
+
+    with tempfile.NamedTemporaryFile(suffix=".m4a", delete=False) as f:
+        clip_path = f.name
+    with av.open(clip_path, "w") as container:
+        stream = container.add_stream("aac", rate=48000)
+        stream.codec_context.layout = "stereo"
+        samples = 0
+        while samples < seconds * 48000:
+            tone = [int(math.sin(n * 0.05) * 8000) for n in range(samples, samples + 1024)]
+            frame = av.AudioFrame(format="s16", layout="stereo", samples=1024)
+            frame.planes[0].update(struct.pack(f"<{2 * 1024}h", *[s for s in tone for _ in range(2)]))
+            frame.sample_rate = 48000
+            frame.pts = samples
+            samples += 1024
+            for packet in stream.encode(frame):
+                container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+    return clip_path
+
+
+def test_pipelined_extract_upload():
+    """Pipelined mode streams encoded audio to the server without a temp file."""
+    print("\n🔍 Testing pipelined extract-while-uploading...")
+
+    import io
+    import av
+    from assetanalysis.videoanalyzer import VideoAnalyzer
+
+    events = []
+    analyzer = VideoAnalyzer(assemblyai_api_key="dummy_key_for_testing",
+                             progress_callback=lambda stage, details: events.append((stage, details)))
+
+    clip_path = _make_audio_clip(20)
+    try:
+        with FakeAssemblyAI() as server:
+            analyzer.BASE_URL = server.base_url
+            url = analyzer.extract_and_upload_audio(clip_path)
+            assert url == "https://cdn.example/upload/abc"
+            assert len(server.received) == 1
+    finally:
+        os.unlink(clip_path)
+
+    with av.open(io.BytesIO(server.received[0])) as uploaded:
+        stream = uploaded.streams.audio[0]
+        decoded = sum(frame.samples for frame in uploaded.decode(stream)) / stream.codec_context.sample_rate
+        assert stream.codec_context.channels == 1, "Uploaded audio should be mono"
+        assert abs(decoded - 20) < 0.5, f"Uploaded audio is {decoded:.2f}s, expected 20s"
+
+    upload_events = [details for stage, details in events if stage == "upload"]
+    assert upload_events and upload_events[-1]["bytes_sent"] == len(server.received[0])
+
+    print(f"✅ Streamed {len(server.received[0])} bytes of mono speech audio while encoding")
+    return True
+
+
+def main():
+    """Run all tests and provide summary."""
+    print("🧪 StreamingUploader Test Suite")
+    print("=" * 50)
+
+    tests = [
+        ("Chunked Upload", test_chunked_upload_progress),
+        ("Retry After Failures", test_retry_after_failures),
+        ("No Retry On 4xx", test_no_retry_on_client_error),
+        ("Analyzer Progress Events", test_analyzer_upload_progress_events),
+        ("Pipelined Extract/Upload", test_pipelined_extract_upload),
+    ]
+
+    results = []
+
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+        except Exception as e:
+            print(f"❌ {test_name} crashed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{'✅ PASS' if result else '❌ FAIL'} {test_name}")
+    print(f"\n📊 Results: {passed} passed, {len(results) - passed} failed")
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
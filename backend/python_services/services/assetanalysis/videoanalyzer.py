@@ -9,19 +9,51 @@ keyed by frame counts.
 
 import json
 import os
+import asyncio
+import hashlib
 import logging
-import tempfile
 import re
 import time
+import threading
 import requests
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import multiprocessing
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Union, Tuple
+from typing import Dict, List, Any, Optional, Union, Tuple, Callable, AsyncContextManager
 from pathlib import Path
 
-from moviepy import VideoFileClip
 from dotenv import load_dotenv
 import av  # Add at the top with other imports
 
+# Handle imports that work both when run directly and as a module
+try:
+    from .audioextractor import (AUDIO_ENGINES, ENGINE_PYAV, ENGINE_MOVIEPY,
+                                 extract_audio_pyav, extract_audio_moviepy,
+                                 encode_speech_audio, select_speech_codec)
+    from .mediasession import MediaSession
+    from .uploader import StreamingUploader, ChunkPipe, create_http_session
+    from .transcriptcache import (TranscriptCache, CACHE_DIR_NAME, get_transcript_cache, transcript_base,
+                                  raw_transcript_path, read_raw_transcript, write_raw_transcript)
+    from .transcriptwords import words_to_frames
+    from .transcriptcolumns import columnar_path, write_columnar_transcript
+    from .transcriptsegments import build_segment_index, segments_path, transcript_fingerprint, write_segment_index
+    from .transcriptionclient import AsyncTranscriptionClient
+    from .stagetrace import StageTiming, StageTracer
+except ImportError:
+    from audioextractor import (AUDIO_ENGINES, ENGINE_PYAV, ENGINE_MOVIEPY,
+                                extract_audio_pyav, extract_audio_moviepy,
+                                encode_speech_audio, select_speech_codec)
+    from mediasession import MediaSession
+    from uploader import StreamingUploader, ChunkPipe, create_http_session
+    from transcriptcache import (TranscriptCache, CACHE_DIR_NAME, get_transcript_cache, transcript_base,
+                                 raw_transcript_path, read_raw_transcript, write_raw_transcript)
+    from transcriptwords import words_to_frames
+    from transcriptcolumns import columnar_path, write_columnar_transcript
+    from transcriptsegments import build_segment_index, segments_path, transcript_fingerprint, write_segment_index
+    from transcriptionclient import AsyncTranscriptionClient
+    from stagetrace import StageTiming, StageTracer
+
 # Load environment variables from .env file (for API keys)
 # Look for .env file in the python_services directory (up 2 levels from this script)
 env_path = Path(__file__).parent.parent.parent / ".env"
@@ -35,6 +67,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Extraction/upload pipeline modes for VideoAnalyzer.analyze
+PIPELINE_SEQUENTIAL = "sequential"  # Extract to a temp file, then upload it (retryable)
+PIPELINE_PIPELINED = "pipelined"    # Upload while encoding through a bounded in-memory pipe
+PIPELINE_MODES = (PIPELINE_SEQUENTIAL, PIPELINE_PIPELINED)
+
+# Default concurrency limits for VideoAnalyzer.analyze_many (and the API's analysis jobs)
+DEFAULT_MAX_EXTRACTIONS = 4      # CPU-bound probe/extract processes
+DEFAULT_MAX_TRANSCRIPTIONS = 16  # Upload and word-processing threads
+
 
 class ProjectBriefParser:
     """Parse project brief files to extract contextual information for transcription accuracy."""
@@ -204,24 +245,56 @@ class VideoAnalyzer:
     # AssemblyAI API base URL
     BASE_URL = "https://api.assemblyai.com/v2"
     
-    def __init__(self, assemblyai_api_key: Optional[str] = None, brief_path: Optional[str] = None):
+    def __init__(self, assemblyai_api_key: Optional[str] = None, brief_path: Optional[str] = None,
+                 audio_engine: str = ENGINE_PYAV,
+                 progress_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+                 transcript_cache: Union[TranscriptCache, bool, None] = True,
+                 transcription_client: Optional[AsyncTranscriptionClient] = None,
+                 tracer: Optional[StageTracer] = None,
+                 stage_slot: Optional[Callable[[str], AsyncContextManager]] = None):
         """
         Initialize the VideoAnalyzer.
         
         Args:
             assemblyai_api_key: AssemblyAI API key. If None, will use ASSEMBLYAI_API_KEY environment variable.
+                Only needed to transcribe: without one, analyzing media that has no cached
+                transcript fails with a ValueError, while reprocess() works.
             brief_path: Path to project brief file for context enhancement
+            audio_engine: Audio extraction engine, "pyav" (streaming 16 kHz mono speech codec)
+                or "moviepy" (full-rate WAV, the fallback engine)
+            progress_callback: Optional callable receiving (stage, details) as processing advances.
+                Stages are "probe", "extract", "upload", "transcribe" and "process"; upload
+                details include bytes_sent and total_bytes.
+            transcript_cache: TranscriptCache to reuse raw transcripts of previously analyzed media.
+                True (default) uses the shared cache under data/analyzed; False or None disables caching.
+            transcription_client: AsyncTranscriptionClient to submit and wait for transcriptions with,
+                e.g. one shared by every job of a server. Default: a client of this analyzer's own,
+                created on first use on the shared background event loop.
+            tracer: StageTracer recording wall time, CPU time, bytes and peak memory of each stage
+            stage_slot: Called with "extract" or "transcribe", returns an async context manager
+                the async methods hold around probing and extraction, and around upload and
+                transcription, e.g. the job scheduler's stage_slot to limit each across jobs
         """
-        # Set AssemblyAI API key from args or environment
-        self.api_key = assemblyai_api_key or os.environ.get("ASSEMBLYAI_API_KEY")
-        if not self.api_key:
-            raise ValueError("AssemblyAI API key must be provided either as an argument or via ASSEMBLYAI_API_KEY environment variable")
+        # Set AssemblyAI API key from args or environment (checked when first needed)
+        self._api_key = assemblyai_api_key or os.environ.get("ASSEMBLYAI_API_KEY")
         
-        # Initialize headers for API requests
-        self.headers = {
-            "Authorization": self.api_key,
-            "Content-Type": "application/json"
-        }
+        if audio_engine not in AUDIO_ENGINES:
+            raise ValueError(f"Unknown audio engine '{audio_engine}'. Choose from: {', '.join(AUDIO_ENGINES)}")
+        self.audio_engine = audio_engine
+        self.progress_callback = progress_callback
+        self.tracer = tracer
+        self.stage_slot = stage_slot or (lambda stage: nullcontext())
+        
+        # One pooled HTTP session for uploads; transcription requests go through the async client
+        self.http_session = create_http_session(pool_maxsize=DEFAULT_MAX_TRANSCRIPTIONS)
+        self._transcription_client = transcription_client
+        
+        # Per-thread video path, so progress events from analyze_many name their file
+        self._progress_context = threading.local()
+        
+        if transcript_cache is True:
+            transcript_cache = get_transcript_cache(self._find_project_root() / "data" / "analyzed" / CACHE_DIR_NAME)
+        self.transcript_cache = transcript_cache or None
         
         # Initialize brief parser
         self.brief_parser = ProjectBriefParser(brief_path)
@@ -229,26 +302,88 @@ class VideoAnalyzer:
         if self.brief_parser.parsed_data:
             logger.info(f"Brief loaded - Expected speakers: {self.brief_parser.parsed_data.get('speakers', 'Unknown')}")
 
-    def probe_video_file(self, file_path: str) -> Dict[str, Any]:
+    def _report_progress(self, stage: str, **details: Any) -> None:
+        """Send a progress event to the progress callback, if one is set."""
+        if self.progress_callback is None:
+            return
+        video_path = getattr(self._progress_context, "video_path", None)
+        if video_path is not None:
+            details.setdefault("video_path", video_path)
+        try:
+            self.progress_callback(stage, details)
+        except Exception as e:
+            logger.warning(f"Progress callback failed for stage '{stage}': {e}")
+
+    def _trace(self, stage: str, video_path: Optional[str] = None, cpu: bool = True):
+        """Context manager timing a stage with the tracer; yields its StageTiming (unrecorded without a tracer)."""
+        if self.tracer is None:
+            return nullcontext(StageTiming(stage, time.time()))
+        video_path = video_path or getattr(self._progress_context, "video_path", None)
+        return self.tracer.stage(stage, video_path, cpu=cpu)
+
+    def _stage(self, stage: str, cpu: bool = True, **details: Any):
+        """Report a stage's progress event and time the stage (see _trace)."""
+        self._report_progress(stage, **details)
+        return self._trace(stage, details.get("video_path"), cpu=cpu)
+
+    @property
+    def api_key(self) -> str:
+        """The AssemblyAI API key; raises ValueError if none was given or set in the environment."""
+        if not self._api_key:
+            raise ValueError("AssemblyAI API key must be provided either as an argument or via ASSEMBLYAI_API_KEY environment variable")
+        return self._api_key
+
+    @property
+    def transcription_client(self) -> AsyncTranscriptionClient:
+        """Async AssemblyAI client that multiplexes the waits for all of this analyzer's transcripts."""
+        if self._transcription_client is None:
+            self._transcription_client = AsyncTranscriptionClient(self.api_key, self.BASE_URL,
+                                                                  max_connections=DEFAULT_MAX_TRANSCRIPTIONS)
+        return self._transcription_client
+
+    def open_media(self, file_path: str) -> MediaSession:
         """
-        Extract metadata from video file using PyAV, including timecode information.
+        Open a media file once for probing and audio extraction.
+        
         Args:
             file_path: Path to the video file
+            
+        Returns:
+            MediaSession to pass to probe_video_file and extract_audio (close it when done)
+        """
+        return MediaSession(file_path, self._parse_timecode_metadata)
+
+    def probe_video_file(self, file_path: Union[str, MediaSession]) -> Dict[str, Any]:
+        """
+        Extract metadata from video file using PyAV, including timecode information.
+        Args:
+            file_path: Path to the video file, or an open MediaSession (results are cached on it)
         Returns:
             Dict containing fps, duration, resolution, and timecode offset information
         Raises:
             RuntimeError: If video probing fails or required metadata is missing
         """
+        if isinstance(file_path, MediaSession):
+            return self._probe_session(file_path)
+        
         logger.info(f"Probing video file with PyAV: {file_path}")
         file_path = os.path.normpath(file_path)
         if not os.path.exists(file_path):
             raise RuntimeError(f"Video file not found: {file_path}")
         try:
-            container = av.open(file_path)
-            video_stream = None
-            for stream in container.streams.video:
-                video_stream = stream
-                break
+            session = self.open_media(file_path)
+        except Exception as e:
+            logger.error(f"PyAV video probing error: {e}")
+            raise RuntimeError(f"PyAV video probing error: {e}")
+        with session:
+            return self._probe_session(session)
+
+    def _probe_session(self, session: MediaSession) -> Dict[str, Any]:
+        """Probe an open MediaSession, reusing its cached result if already probed."""
+        if session.probe is not None:
+            return session.probe
+        try:
+            video_stream = session.video_stream
             if not video_stream:
                 raise RuntimeError("No video stream found in file")
             fps = float(video_stream.average_rate) if video_stream.average_rate else float(video_stream.base_rate)
@@ -256,31 +391,12 @@ class VideoAnalyzer:
             width = video_stream.width
             height = video_stream.height
             frame_count = video_stream.frames if video_stream.frames else int(duration * fps) if fps else 0
-            # Timecode extraction
-            start_timecode = "00:00:00:00"
-            timecode_offset_frames = 0
-            # 1. Search all streams for a timecode in metadata
-            for i, stream in enumerate(container.streams):
-                if stream.metadata:
-                    tc = self._parse_timecode_metadata(stream.metadata)
-                    if tc:
-                        start_timecode = tc
-                        break
-            # 2. Check container metadata if not found
-            if start_timecode == "00:00:00:00" and container.metadata:
-                tc = self._parse_timecode_metadata(container.metadata)
-                if tc:
-                    start_timecode = tc
-            # 3. Check video stream metadata if not found
-            if start_timecode == "00:00:00:00" and video_stream.metadata:
-                tc = self._parse_timecode_metadata(video_stream.metadata)
-                if tc:
-                    start_timecode = tc
+            # Timecode extraction (stream, container, then video stream metadata; cached on the session)
+            start_timecode = session.start_timecode
             # Convert timecode to frame offset
             timecode_offset_frames = self._parse_timecode_to_frames(start_timecode, fps)
             logger.info(f"PyAV: FPS={fps}, Duration={duration}s, Resolution={width}x{height}, Start TC={start_timecode}, Offset={timecode_offset_frames} frames")
-            container.close()
-            return {
+            session.probe = {
                 "fps": fps,
                 "duration_seconds": duration,
                 "duration_frames": frame_count,
@@ -289,6 +405,7 @@ class VideoAnalyzer:
                 "timecode_offset_frames": timecode_offset_frames,
                 "start_timecode": start_timecode
             }
+            return session.probe
         except Exception as e:
             logger.error(f"PyAV video probing error: {e}")
             raise RuntimeError(f"PyAV video probing error: {e}")
@@ -388,87 +505,140 @@ class VideoAnalyzer:
         
         return 0
     
-    def extract_audio(self, video_path: str) -> str:
-        """Extract audio using MoviePy for standalone operation."""
-        logger.info(f"Extracting audio from: {video_path}")
+    def extract_audio(self, video_path: Union[str, MediaSession]) -> str:
+        """
+        Extract audio for transcription using the configured engine.
         
-        try:
-            # Create temporary file for audio
-            audio_file = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
-            audio_path = audio_file.name
-            audio_file.close()
+        The PyAV engine streams the audio track to a 16 kHz mono speech file;
+        if it fails the MoviePy engine is used as a fallback.
+        
+        Args:
+            video_path: Path to the video file, or an open MediaSession to reuse its container
             
-            # Load video and extract audio using MoviePy
-            video_clip = VideoFileClip(video_path)
+        Returns:
+            Path to a temporary audio file (caller is responsible for deleting it)
+        """
+        session = video_path if isinstance(video_path, MediaSession) else None
+        if session is not None:
+            video_path = session.file_path
+        logger.info(f"Extracting audio from: {video_path} (engine: {self.audio_engine})")
+        
+        try:
+            if self.audio_engine == ENGINE_PYAV:
+                try:
+                    container = session.demux_container() if session is not None else None
+                    return extract_audio_pyav(video_path, container=container)
+                except Exception as e:
+                    logger.warning(f"PyAV audio extraction failed ({e}), falling back to MoviePy")
             
-            try:
-                if video_clip.audio is None:
-                    raise RuntimeError("No audio stream found in video file")
-                
-                # Extract audio with optimal settings for transcription
-                audio_clip = video_clip.audio
-                
-                # Export audio as WAV with settings optimized for speech recognition
-                audio_clip.write_audiofile(audio_path)
-                
-                # Clean up clips
-                audio_clip.close()
-                
-                # Log quality metrics
-                file_size_mb = os.path.getsize(audio_path) / (1024 * 1024)
-                logger.info(f"Extracted audio: {file_size_mb:.2f}MB")
-                
-                return audio_path
-                
-            finally:
-                # Always clean up the video clip
-                video_clip.close()
+            # MoviePy always opens the file itself
+            return extract_audio_moviepy(video_path)
             
         except Exception as e:
             error_message = f"Audio extraction error: {str(e)}"
             logger.error(error_message)
             raise RuntimeError(error_message)
 
-    def upload_audio_file(self, audio_file_path: str) -> str:
+    def _create_uploader(self) -> StreamingUploader:
+        """Create an uploader bound to the analyzer's pooled HTTP session."""
+        return StreamingUploader(
+            self.http_session,
+            f"{self.BASE_URL}/upload",
+            headers={"Authorization": self.api_key}
+        )
+
+    def _report_upload_progress(self, bytes_sent: int, total_bytes: Optional[int]) -> None:
+        timing = self.tracer.current() if self.tracer is not None else None
+        if timing is not None:
+            timing.bytes_out = bytes_sent
+        self._report_progress("upload", bytes_sent=bytes_sent, total_bytes=total_bytes)
+
+    def upload_audio_file(self, audio_file_path: str,
+                          progress_callback: Optional[Callable[[int, Optional[int]], None]] = None) -> str:
         """
         Upload an audio file to AssemblyAI.
         
+        The file is streamed in chunks over the analyzer's pooled HTTP session and
+        failed attempts are retried with backoff.
+        
         Args:
             audio_file_path: Path to the audio file
+            progress_callback: Optional callable receiving (bytes_sent, total_bytes). If None,
+                progress is reported as "upload" events to the analyzer's progress callback.
             
         Returns:
             The URL of the uploaded audio file
         """
         logger.info(f"Uploading audio file to AssemblyAI: {audio_file_path}")
         
-        upload_endpoint = f"{self.BASE_URL}/upload"
-        
-        # Open the audio file in binary mode
-        with open(audio_file_path, "rb") as audio_file:
-            response = requests.post(
-                upload_endpoint,
-                headers={"Authorization": self.api_key},
-                data=audio_file
+        try:
+            upload_url = self._create_uploader().upload_file(
+                audio_file_path, progress_callback or self._report_upload_progress
             )
-            
-        if response.status_code != 200:
-            error_message = f"Upload failed: {response.text}"
-            logger.error(error_message)
-            raise RuntimeError(error_message)
-            
-        upload_url = response.json()["upload_url"]
+        except RuntimeError as e:
+            logger.error(str(e))
+            raise
+        
         logger.info(f"Audio file uploaded successfully: {upload_url}")
         return upload_url
 
-    def transcribe_audio(self, audio_url: str, custom_spell: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
-        """Enhanced transcription with project brief integration."""
-        logger.info(f"Submitting enhanced transcription request")
+    def extract_and_upload_audio(self, video_path: Union[str, MediaSession]) -> str:
+        """
+        Encode audio straight into the upload request (pipelined mode).
+        
+        An encoder thread muxes speech audio into a bounded in-memory ChunkPipe
+        while the uploader streams chunks from it as they arrive, so no temp file
+        is written and the upload finishes shortly after encoding does. The
+        stream cannot be replayed, so a failed upload is not retried here.
+        
+        Args:
+            video_path: Path to the video file, or an open MediaSession to reuse its container
+            
+        Returns:
+            The URL of the uploaded audio file
+        """
+        if isinstance(video_path, MediaSession):
+            session, owns_session = video_path, False
+        else:
+            session, owns_session = self.open_media(video_path), True
         
-        endpoint = f"{self.BASE_URL}/transcript"
+        logger.info(f"Pipelined audio extraction and upload: {session.file_path}")
+        codec = select_speech_codec()
+        pipe = ChunkPipe()
         
+        def encode() -> None:
+            try:
+                stats = encode_speech_audio(session.demux_container(), pipe, codec)
+                pipe.close()
+                logger.info(f"Encoded {stats['duration_seconds']:.1f}s of {codec} audio into upload stream "
+                            f"({pipe.bytes_written / (1024 * 1024):.2f}MB)")
+            except Exception as e:
+                pipe.abort(e)
+        
+        encoder = threading.Thread(target=encode, name="audio-encoder", daemon=True)
+        encoder.start()
+        try:
+            upload_url = self._create_uploader().upload_chunks(
+                pipe, progress_callback=self._report_upload_progress
+            )
+        finally:
+            # Unblock the encoder if the upload stopped early, then wait for it
+            pipe.close_reader()
+            encoder.join()
+            if owns_session:
+                session.close()
+        
+        logger.info(f"Audio stream uploaded successfully: {upload_url}")
+        return upload_url
+
+    def build_transcription_config(self, custom_spell: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Build the AssemblyAI transcription config (everything except audio_url).
+        
+        This is also the config part of the transcript cache key.
+        """
         # Start with base configuration
         json_data = {
-            "audio_url": audio_url,
             "speaker_labels": True,
             "format_text": True,
             "punctuate": True,
@@ -494,55 +664,62 @@ class VideoAnalyzer:
         if all_custom_spellings:
             json_data["custom_spelling"] = all_custom_spellings
         
-        # Log configuration for debugging
-        logger.info(f"Transcription config: speakers_expected={json_data.get('speakers_expected', 'auto')}, "
-                   f"vocabulary_terms={len(json_data.get('word_boost', []))}, "
-                   f"custom_spellings={len(json_data.get('custom_spelling', []))}")
+        return json_data
+
+    def transcribe_audio(self, audio_url: str, custom_spell: Optional[List[Dict[str, Any]]] = None,
+                         audio_duration: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Enhanced transcription with project brief integration.
         
-        # Submit transcription request
-        response = requests.post(endpoint, json=json_data, headers=self.headers)
+        Blocks the calling thread until the transcript completes; async callers
+        should await transcribe_audio_async instead.
+        """
+        video_path = getattr(self._progress_context, "video_path", None)
+        return self.transcription_client.run_coroutine(
+            self.transcribe_audio_async(audio_url, custom_spell, audio_duration, video_path)
+        ).result()
+    
+    async def transcribe_audio_async(self, audio_url: str, custom_spell: Optional[List[Dict[str, Any]]] = None,
+                                     audio_duration: Optional[float] = None,
+                                     video_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Submit a transcription and wait for it on the transcription client's shared poller.
         
-        if response.status_code != 200:
-            error_message = f"Transcription request failed: {response.text}"
-            logger.error(error_message)
-            raise RuntimeError(error_message)
+        Args:
+            audio_url: URL of the uploaded audio
+            custom_spell: Optional list of custom spellings
+            audio_duration: Audio length in seconds, used to pace status polling
+            video_path: Video the audio belongs to, added to progress events
             
-        transcript_id = response.json()["id"]
-        logger.info(f"Enhanced transcription submitted. ID: {transcript_id}")
-        
-        # Poll for completion
-        return self._poll_transcription(transcript_id)
+        Returns:
+            The completed AssemblyAI transcript
+        """
+        progress_details = {"video_path": video_path} if video_path is not None else {}
+        # Awaited on the client's loop alongside other transcriptions, so no CPU time is attributed
+        with self._stage("transcribe", cpu=False, status="submitting", **progress_details):
+            logger.info(f"Submitting enhanced transcription request")
+            
+            config = self.build_transcription_config(custom_spell)
+            
+            # Log configuration for debugging
+            logger.info(f"Transcription config: speakers_expected={config.get('speakers_expected', 'auto')}, "
+                       f"vocabulary_terms={len(config.get('word_boost', []))}, "
+                       f"custom_spellings={len(config.get('custom_spelling', []))}")
+            
+            result = await self.transcription_client.transcribe(audio_url, config, audio_duration,
+                                                                self._transcribe_status_reporter(video_path))
+        logger.info("Transcription completed successfully!")
+        return result
     
-    def _poll_transcription(self, transcript_id: str) -> Dict[str, Any]:
-        """Poll for transcription completion with progress tracking."""
-        polling_endpoint = f"{self.BASE_URL}/transcript/{transcript_id}"
-        start_time = time.time()
+    def _transcribe_status_reporter(self, video_path: Optional[str]) -> Callable[[str, str, float], None]:
+        """Status callback for the transcription client that reports "transcribe" progress events."""
+        progress_details = {"video_path": video_path} if video_path is not None else {}
         
-        while True:
-            try:
-                response = requests.get(polling_endpoint, headers=self.headers, timeout=30)
-                response.raise_for_status()
-                result = response.json()
-                
-                status = result["status"]
-                elapsed = time.time() - start_time
-                
-                logger.info(f"Status: {status} (elapsed: {elapsed:.1f}s)")
-                
-                if status == "completed":
-                    logger.info("Transcription completed successfully!")
-                    return result
-                elif status == "error":
-                    error_msg = result.get('error', 'Unknown error')
-                    raise RuntimeError(f"Transcription failed: {error_msg}")
-                
-                # Progressive backoff
-                wait_time = min(5 + (elapsed // 60), 15)
-                time.sleep(wait_time)
-                
-            except requests.RequestException as e:
-                logger.warning(f"Polling error: {e}, retrying...")
-                time.sleep(10)
+        def report_status(transcript_id: str, status: str, elapsed: float) -> None:
+            self._report_progress("transcribe", status=status, elapsed_seconds=elapsed,
+                                  transcript_id=transcript_id, **progress_details)
+        
+        return report_status
 
     def process_transcript_to_words(self, transcript_data: Dict[str, Any], fps: float, timecode_offset_frames: int = 0, silence_threshold_ms: int = 1000) -> Tuple[List[str], str, List[Dict[str, Any]]]:
         """Enhanced transcript processing with brief-based speaker mapping, timecode offset, and silence detection."""
@@ -561,6 +738,32 @@ class VideoAnalyzer:
         if avg_confidence < 0.8:
             logger.warning(f"Low confidence detected ({avg_confidence:.3f}). Consider audio quality improvements.")
         
+        # Vectorized path; the per-word loop handles timestamps NumPy cannot represent
+        try:
+            speakers, processed_words = words_to_frames(
+                words_data, fps, timecode_offset_frames, silence_threshold_ms,
+                lambda speaker: self._normalize_speaker_label(speaker, speaker_mapping)
+            )
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Falling back to per-word transcript processing: {e}")
+            speakers, processed_words = self._process_words_loop(
+                words_data, fps, timecode_offset_frames, silence_threshold_ms, speaker_mapping
+            )
+        
+        # Log speaker mapping and silence detection results
+        if speaker_mapping:
+            logger.info(f"Applied speaker mapping: {speaker_mapping}")
+        
+        silence_count = len([w for w in processed_words if w["word"] == "**SILENCE**"])
+        logger.info(f"Final speakers: {speakers}")
+        logger.info(f"Detected {silence_count} silence periods (>{silence_threshold_ms}ms)")
+        
+        return speakers, full_transcript, processed_words
+
+    def _process_words_loop(self, words_data: List[Dict[str, Any]], fps: float, timecode_offset_frames: int,
+                            silence_threshold_ms: int, speaker_mapping: Dict[str, str]) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """Per-word reference implementation of transcriptwords.words_to_frames."""
+        
         # Process speakers and words with silence detection
         speakers_set = set()
         processed_words = []
@@ -627,17 +830,7 @@ class VideoAnalyzer:
                 "confidence": word_data.get("confidence", 0)
             })
         
-        speakers = sorted(list(speakers_set))
-        
-        # Log speaker mapping and silence detection results
-        if speaker_mapping:
-            logger.info(f"Applied speaker mapping: {speaker_mapping}")
-        
-        silence_count = len([w for w in processed_words if w["word"] == "**SILENCE**"])
-        logger.info(f"Final speakers: {speakers}")
-        logger.info(f"Detected {silence_count} silence periods (>{silence_threshold_ms}ms)")
-        
-        return speakers, full_transcript, processed_words
+        return sorted(list(speakers_set)), processed_words
 
     def _normalize_speaker_label(self, speaker: str, speaker_mapping: Dict[str, str]) -> str:
         """Normalize speaker labels with brief-based mapping."""
@@ -689,7 +882,35 @@ class VideoAnalyzer:
         logger.info(f"Using fallback path to backend/python_services: {fallback_root}")
         return fallback_root
 
-    def process_video(self, video_path: str, custom_spell: Optional[List[Dict[str, Any]]] = None, silence_threshold_ms: int = 1000) -> Dict[str, Any]:
+    def default_output_path(self, video_path: str, stem: Optional[str] = None) -> str:
+        """
+        Transcript path for a video in the data/analyzed directory (created if missing).
+        
+        Named after the video's stem, or after stem if given (see transcript_stems()).
+        """
+        analyzed_dir = self._find_project_root() / "data" / "analyzed"
+        analyzed_dir.mkdir(parents=True, exist_ok=True)
+        return str(analyzed_dir / f"{stem or Path(video_path).stem}.transcript.json")
+
+    def _build_result(self, file_name: str, fps: float, duration_frames: int, timecode_offset_frames: int,
+                      transcription_result: Dict[str, Any], silence_threshold_ms: int) -> Dict[str, Any]:
+        """Derive the speakers, words and silence markers from a raw transcript."""
+        speakers, full_transcript, processed_words = self.process_transcript_to_words(
+            transcription_result, fps, timecode_offset_frames, silence_threshold_ms
+        )
+        return {
+            "file_name": file_name,
+            "fps": fps,
+            "duration_frames": duration_frames,
+            "timecode_offset_frames": timecode_offset_frames,
+            "speakers": speakers,
+            "full_transcript": full_transcript,
+            "words": processed_words,
+            "silence_threshold_ms": silence_threshold_ms  # Record the threshold used
+        }
+
+    def process_video(self, video_path: str, custom_spell: Optional[List[Dict[str, Any]]] = None, silence_threshold_ms: int = 1000,
+                      pipeline_mode: str = PIPELINE_SEQUENTIAL) -> Dict[str, Any]:
         """
         Process a video file: extract metadata, transcribe, and format results.
         
@@ -697,6 +918,8 @@ class VideoAnalyzer:
             video_path: Path to the video file
             custom_spell: Optional list of custom spellings
             silence_threshold_ms: Minimum silence duration in milliseconds to mark as silence (default: 1000ms)
+            pipeline_mode: "sequential" (extract to a temp file, then upload) or "pipelined"
+                (upload while encoding; falls back to sequential if the pipelined attempt fails)
             
         Returns:
             Dict containing the complete transcript data in the required format
@@ -704,66 +927,187 @@ class VideoAnalyzer:
         Raises:
             Various exceptions based on processing stage
         """
+        result, _ = self._process_video(video_path, custom_spell, silence_threshold_ms, pipeline_mode)
+        return result
+
+    def _process_video(self, video_path: str, custom_spell: Optional[List[Dict[str, Any]]],
+                       silence_threshold_ms: int, pipeline_mode: str) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """process_video that also returns the raw AssemblyAI transcript (None on error)."""
+        prepared = None
         try:
-            # Get the filename without path
-            file_name = os.path.basename(video_path)
-            
+            prepared = self._prepare_media(video_path, custom_spell, pipeline_mode)
+            transcription_result = prepared["transcription_result"]
+            if transcription_result is None:
+                # Steps 3+4: Upload audio and transcribe it with AssemblyAI
+                transcription_result = self._transcribe_and_cache(
+                    prepared["audio_path"], prepared["audio_url"], custom_spell, prepared["cache_key"],
+                    prepared["metadata"].get("duration_seconds")
+                )
+            return self._finish_video(prepared, transcription_result, silence_threshold_ms), transcription_result
+        except Exception as e:
+            return self._error_result(e), None
+        finally:
+            if prepared is not None:
+                self._remove_audio(prepared["audio_path"])
+
+    async def _process_video_async(self, video_path: str, custom_spell: Optional[List[Dict[str, Any]]],
+                                   silence_threshold_ms: int,
+                                   pipeline_mode: str) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """
+        _process_video for the event loop: media work runs in worker threads and the
+        transcription wait is awaited on the transcription client, holding no thread.
+        """
+        prepared = None
+        try:
+            async with self.stage_slot("extract"):
+                prepared = await asyncio.to_thread(self._prepare_media, video_path, custom_spell, pipeline_mode)
+            transcription_result = prepared["transcription_result"]
+            if transcription_result is None:
+                async with self.stage_slot("transcribe"):
+                    audio_url = await asyncio.to_thread(self._upload_if_needed, prepared["audio_path"],
+                                                        prepared["audio_url"])
+                    transcription_result = await self.transcribe_audio_async(
+                        audio_url, custom_spell, prepared["metadata"].get("duration_seconds")
+                    )
+                await asyncio.to_thread(self._cache_transcript, prepared["cache_key"], transcription_result)
+            result = await asyncio.to_thread(self._finish_video, prepared, transcription_result, silence_threshold_ms)
+            return result, transcription_result
+        except Exception as e:
+            return self._error_result(e), None
+        finally:
+            if prepared is not None:
+                self._remove_audio(prepared["audio_path"])
+
+    def _prepare_media(self, video_path: str, custom_spell: Optional[List[Dict[str, Any]]],
+                       pipeline_mode: str) -> Dict[str, Any]:
+        """
+        Steps 1-2 (and 3 in pipelined mode): probe the video and get its audio ready to transcribe.
+        
+        Returns:
+            Dict with file_name, metadata, cache_key, transcription_result (a cached raw
+            transcript or None), audio_path (temporary file to upload, if extracted) and
+            audio_url (if already uploaded)
+        """
+        if pipeline_mode not in PIPELINE_MODES:
+            raise ValueError(f"Unknown pipeline mode '{pipeline_mode}'. Choose from: {', '.join(PIPELINE_MODES)}")
+        
+        # Get the filename without path
+        file_name = os.path.basename(video_path)
+        audio_path = None
+        audio_url = None
+        
+        # Look up a previously transcribed copy of this media with the same config
+        cache_key, transcription_result = self._lookup_cached_transcript(video_path, custom_spell)
+        if transcription_result is None:
+            self.api_key  # Raises before extracting if there is no key to transcribe with
+        
+        # Open the media file once for probing and extraction
+        with self.open_media(video_path) as session:
             # Step 1: Probe video to get metadata
-            metadata = self.probe_video_file(video_path)
-            fps = metadata["fps"]
-            duration_frames = metadata["duration_frames"]
-            timecode_offset_frames = metadata["timecode_offset_frames"]
-            
-            # Step 2: Extract audio
-            audio_path = self.extract_audio(video_path)
+            with self._stage("probe"):
+                metadata = self.probe_video_file(session)
             
-            try:
-                # Step 3: Upload audio to AssemblyAI
-                audio_url = self.upload_audio_file(audio_path)
-                
-                # Step 4: Transcribe audio using AssemblyAI
-                transcription_result = self.transcribe_audio(audio_url, custom_spell)
-                
-                # Step 5: Process transcript to extract speakers, word-level data, and silence detection with timecode offset
-                speakers, full_transcript, processed_words = self.process_transcript_to_words(
-                    transcription_result, fps, timecode_offset_frames, silence_threshold_ms
-                )
-                
-                # Build the final result
-                result = {
-                    "file_name": file_name,
-                    "fps": fps,
-                    "duration_frames": duration_frames,
-                    "timecode_offset_frames": timecode_offset_frames,
-                    "speakers": speakers,
-                    "full_transcript": full_transcript,
-                    "words": processed_words,
-                    "silence_threshold_ms": silence_threshold_ms  # Record the threshold used
-                }
-                
-                logger.info(f"Successfully processed video: {file_name}")
-                logger.info(f"Detected speakers: {', '.join(speakers)}")
-                return result
-                
-            finally:
-                # Clean up the temporary audio file
-                if os.path.exists(audio_path):
-                    os.unlink(audio_path)
-                    logger.info(f"Removed temporary audio file: {audio_path}")
+            if transcription_result is not None:
+                # Cache hit: no extraction, upload or transcription needed
+                self._report_progress("transcribe", status="cached")
             
-        except Exception as e:
-            error_message = str(e)
-            logger.error(f"Error processing video: {error_message}")
-            timestamp = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+            # Steps 2+3 overlapped: encode audio straight into the upload
+            elif pipeline_mode == PIPELINE_PIPELINED:
+                if self.audio_engine != ENGINE_PYAV:
+                    logger.warning("Pipelined mode requires the PyAV engine, using sequential mode")
+                else:
+                    try:
+                        # One stage: the upload runs while the audio is encoded
+                        with self._stage("extract", pipelined=True) as timing:
+                            timing.bytes_in = os.path.getsize(video_path)
+                            audio_url = self.extract_and_upload_audio(session)
+                    except Exception as e:
+                        logger.warning(f"Pipelined extract/upload failed ({e}), retrying sequentially")
             
-            return {
-                "error": error_message,
-                "timestamp": timestamp
-            }
+            # Step 2: Extract audio
+            if transcription_result is None and audio_url is None:
+                with self._stage("extract") as timing:
+                    timing.bytes_in = os.path.getsize(video_path)
+                    audio_path = self.extract_audio(session)
+                    timing.bytes_out = os.path.getsize(audio_path)
+        
+        return {
+            "file_name": file_name,
+            "metadata": metadata,
+            "cache_key": cache_key,
+            "transcription_result": transcription_result,
+            "audio_path": audio_path,
+            "audio_url": audio_url
+        }
+
+    def _finish_video(self, prepared: Dict[str, Any], transcription_result: Dict[str, Any],
+                      silence_threshold_ms: int) -> Dict[str, Any]:
+        """Step 5: process the transcript to extract speakers, word-level data and silences."""
+        with self._stage("process"):
+            metadata = prepared["metadata"]
+            result = self._build_result(prepared["file_name"], metadata["fps"], metadata["duration_frames"],
+                                        metadata["timecode_offset_frames"], transcription_result, silence_threshold_ms)
+        
+        logger.info(f"Successfully processed video: {prepared['file_name']}")
+        logger.info(f"Detected speakers: {', '.join(result['speakers'])}")
+        return result
+
+    def _remove_audio(self, audio_path: Optional[str]) -> None:
+        """Clean up a temporary audio file."""
+        if audio_path and os.path.exists(audio_path):
+            os.unlink(audio_path)
+            logger.info(f"Removed temporary audio file: {audio_path}")
+
+    def _error_result(self, error: Exception) -> Dict[str, Any]:
+        """Result dict for a failed analysis."""
+        error_message = str(error)
+        logger.error(f"Error processing video: {error_message}")
+        timestamp = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+        
+        return {
+            "error": error_message,
+            "timestamp": timestamp
+        }
+
+    def _lookup_cached_transcript(self, video_path: str, custom_spell: Optional[List[Dict[str, Any]]]
+                                  ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """Return (cache key, cached raw transcript or None); the key is None when caching is off."""
+        if self.transcript_cache is None:
+            return None, None
+        cache_key = self.transcript_cache.key_for(video_path, self.build_transcription_config(custom_spell))
+        return cache_key, self.transcript_cache.get(cache_key)
+
+    def _transcribe_and_cache(self, audio_path: Optional[str], audio_url: Optional[str],
+                              custom_spell: Optional[List[Dict[str, Any]]], cache_key: Optional[str],
+                              audio_duration: Optional[float] = None) -> Dict[str, Any]:
+        """Upload extracted audio (unless already uploaded), transcribe it and cache the raw transcript."""
+        audio_url = self._upload_if_needed(audio_path, audio_url)
+        transcription_result = self.transcribe_audio(audio_url, custom_spell, audio_duration)
+        self._cache_transcript(cache_key, transcription_result)
+        return transcription_result
+
+    def _upload_if_needed(self, audio_path: Optional[str], audio_url: Optional[str]) -> str:
+        """Upload extracted audio unless the pipelined mode already uploaded it."""
+        if audio_url is None:
+            audio_size = os.path.getsize(audio_path)
+            with self._stage("upload", bytes_sent=0, total_bytes=audio_size) as timing:
+                timing.bytes_in = audio_size
+                audio_url = self.upload_audio_file(audio_path)
+        return audio_url
+
+    def _cache_transcript(self, cache_key: Optional[str], transcription_result: Dict[str, Any]) -> None:
+        """Store a fresh raw transcript in the transcript cache (if caching is on)."""
+        if cache_key is None:
+            return
+        try:
+            self.transcript_cache.put(cache_key, transcription_result)
+        except OSError as e:
+            logger.warning(f"Could not cache transcript: {e}")
     
     def analyze(self, video_path: str, output_path: Optional[str] = None, 
                 custom_spell: Optional[List[Dict[str, Any]]] = None,
-                brief_path: Optional[str] = None, silence_threshold_ms: int = 1000) -> Dict[str, Any]:
+                brief_path: Optional[str] = None, silence_threshold_ms: int = 1000,
+                pipeline_mode: str = PIPELINE_SEQUENTIAL, columnar: bool = False) -> Dict[str, Any]:
         """
         Enhanced analyze method with optional brief integration and silence detection.
         
@@ -773,6 +1117,8 @@ class VideoAnalyzer:
             custom_spell: Optional list of custom spellings
             brief_path: Path to project brief file for context
             silence_threshold_ms: Minimum silence duration in milliseconds to mark as silence (default: 1000ms)
+            pipeline_mode: "sequential" or "pipelined" (upload audio while it is being encoded)
+            columnar: Also write a memory-mappable <name>.transcript.cols next to the JSON
         """
         # Load brief if provided and not already loaded
         if brief_path and not self.brief_parser.brief_content:
@@ -783,48 +1129,417 @@ class VideoAnalyzer:
             raise FileNotFoundError(f"Video file not found: {video_path}")
         
         # Process the video with silence detection
-        result = self.process_video(video_path, custom_spell, silence_threshold_ms)
+        result, raw_transcript = self._process_video(video_path, custom_spell, silence_threshold_ms, pipeline_mode)
         
         # Always use the data/analyzed directory relative to backend/python_services
         if output_path is None:
-            # Find backend/python_services directory
-            python_services_dir = self._find_project_root()
-            
-            # Build path to data/analyzed directory within python_services
-            analyzed_dir = python_services_dir / "data" / "analyzed"
+            output_path = self.default_output_path(video_path)
+            logger.info(f"Auto-generated output path: {output_path}")
+        
+        # Write results to file
+        self._save_result(output_path, result, raw_transcript, columnar)
+        
+        # For API usage, return the result with error information instead of exiting
+        # The calling code can check for "error" in the result
+        return result
+
+    async def analyze_async(self, video_path: str, output_path: Optional[str] = None,
+                            custom_spell: Optional[List[Dict[str, Any]]] = None,
+                            brief_path: Optional[str] = None, silence_threshold_ms: int = 1000,
+                            pipeline_mode: str = PIPELINE_SEQUENTIAL, columnar: bool = False) -> Dict[str, Any]:
+        """
+        analyze() for asyncio callers such as the API server.
+        
+        Probing, extraction, upload and word processing run in worker threads, while
+        the wait for AssemblyAI is awaited on the transcription client, so a job costs
+        no thread while its transcript is being processed. Takes the same arguments
+        as analyze().
+        """
+        if brief_path and not self.brief_parser.brief_content:
+            self.brief_parser.load_brief(brief_path)
+        
+        if not os.path.isfile(video_path):
+            raise FileNotFoundError(f"Video file not found: {video_path}")
+        
+        result, raw_transcript = await self._process_video_async(video_path, custom_spell, silence_threshold_ms,
+                                                                 pipeline_mode)
+        
+        if output_path is None:
+            output_path = self.default_output_path(video_path)
+            logger.info(f"Auto-generated output path: {output_path}")
+        
+        await asyncio.to_thread(self._save_result, output_path, result, raw_transcript, columnar)
+        return result
+
+    async def resume_async(self, video_path: str, transcript_id: str, output_path: Optional[str] = None,
+                           custom_spell: Optional[List[Dict[str, Any]]] = None, silence_threshold_ms: int = 1000,
+                           columnar: bool = False) -> Dict[str, Any]:
+        """
+        Finish an analysis whose audio was already submitted to AssemblyAI.
+        
+        Used to recover jobs interrupted by a server restart: instead of extracting,
+        uploading and paying for a new transcription, the video is re-probed and the
+        existing transcript_id is awaited.
+        
+        Args:
+            video_path: Path to the video file
+            transcript_id: AssemblyAI transcript ID of the earlier submission
+            output_path: Path to save the output JSON (default: data/analyzed)
+            custom_spell: Custom spellings used for the submission (part of the cache key)
+            silence_threshold_ms: Minimum silence duration in milliseconds to mark as silence
+            columnar: Also write a memory-mappable <name>.transcript.cols next to the JSON
             
-            # Ensure the directory exists
-            analyzed_dir.mkdir(parents=True, exist_ok=True)
+        Returns:
+            The analysis result (with an "error" key on failure), as from analyze()
+        """
+        try:
+            if not os.path.isfile(video_path):
+                raise FileNotFoundError(f"Video file not found: {video_path}")
+            def probe() -> Dict[str, Any]:
+                with self._stage("probe"):
+                    return self.probe_video_file(video_path)
+            async with self.stage_slot("extract"):
+                metadata = await asyncio.to_thread(probe)
             
-            # Create filename from video filename
-            video_filename = Path(video_path).stem  # Gets filename without extension
-            output_filename = f"{video_filename}.transcript.json"
-            output_path = str(analyzed_dir / output_filename)
+            logger.info(f"Resuming transcript {transcript_id} for {os.path.basename(video_path)}")
+            async with self.stage_slot("transcribe"):
+                with self._trace("transcribe", video_path, cpu=False):
+                    transcription_result = await self.transcription_client.wait(
+                        transcript_id, metadata.get("duration_seconds"), self._transcribe_status_reporter(None),
+                        poll_now=True
+                    )
+            if self.transcript_cache is not None:
+                cache_key = await asyncio.to_thread(self.transcript_cache.key_for, video_path,
+                                                    self.build_transcription_config(custom_spell))
+                await asyncio.to_thread(self._cache_transcript, cache_key, transcription_result)
             
-            logger.info(f"Auto-generated output path: {output_path}")
+            prepared = {"file_name": os.path.basename(video_path), "metadata": metadata}
+            result = await asyncio.to_thread(self._finish_video, prepared, transcription_result, silence_threshold_ms)
+        except Exception as e:
+            result, transcription_result = self._error_result(e), None
         
-        # Write results to file
+        if output_path is None:
+            output_path = self.default_output_path(video_path)
+        await asyncio.to_thread(self._save_result, output_path, result, transcription_result, columnar)
+        return result
+
+    def _save_result(self, output_path: str, result: Dict[str, Any], raw_transcript: Optional[Dict[str, Any]],
+                     columnar: bool) -> None:
+        """Write the transcript JSON plus its segment index, columnar and raw transcript sidecars."""
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(result, f, indent=2, ensure_ascii=False)
         
         logger.info(f"Transcript saved to: {output_path}")
+        self._write_segment_index(output_path, result)
+        self._write_columnar(output_path, result, columnar)
         
-        # For API usage, return the result with error information instead of exiting
-        # The calling code can check for "error" in the result
+        # Keep the raw transcript alongside so reprocess() can re-derive words without re-transcribing
+        if raw_transcript is not None:
+            try:
+                write_raw_transcript(raw_transcript_path(output_path), raw_transcript)
+            except OSError as e:
+                logger.warning(f"Could not save raw transcript: {e}")
+
+    def analyze_many(self, video_paths: List[str], output_dir: Optional[str] = None,
+                     custom_spell: Optional[List[Dict[str, Any]]] = None,
+                     brief_path: Optional[str] = None, silence_threshold_ms: int = 1000,
+                     max_extractions: int = DEFAULT_MAX_EXTRACTIONS,
+                     max_transcriptions: int = DEFAULT_MAX_TRANSCRIPTIONS,
+                     columnar: bool = False) -> List[Dict[str, Any]]:
+        """
+        Analyze many video files with separate limits for extraction and transcription.
+        
+        Probing and audio extraction are CPU-bound and run in a pool of
+        max_extractions worker processes. As each file's audio is ready, it is
+        uploaded in a pool of max_transcriptions threads and submitted to
+        AssemblyAI; waiting for the transcript happens on the transcription
+        client's shared poller and holds no thread, and word processing goes
+        back to the thread pool once the transcript is done. A slow
+        transcription never holds up extraction or upload of the next file.
+        Cached transcripts skip extraction.
+        
+        Progress events carry a video_path detail; after each file finishes a
+        "batch" event reports completed, failed and total counts. Files with the
+        same name in different folders get distinct output files (see
+        transcript_stems()).
+        
+        Args:
+            video_paths: Video files to analyze
+            output_dir: Directory for the .transcript.json files (default: data/analyzed)
+            custom_spell: Optional list of custom spellings (applied to every file)
+            brief_path: Path to project brief file for context
+            silence_threshold_ms: Minimum silence duration in milliseconds to mark as silence
+            max_extractions: Concurrent probe/extract processes
+            max_transcriptions: Threads for concurrent uploads and word processing
+            columnar: Also write .transcript.cols files
+            
+        Returns:
+            One dict per input file, in input order, with video_path, output_file and
+            result (the analyze() result, which has an "error" key on failure)
+        """
+        if brief_path and not self.brief_parser.brief_content:
+            self.brief_parser.load_brief(brief_path)
+        
+        total = len(video_paths)
+        outcomes: List[Optional[Dict[str, Any]]] = [None] * total
+        counts = {"completed": 0, "failed": 0}
+        counts_lock = threading.Lock()
+        all_finished = threading.Event()
+        if total == 0:
+            all_finished.set()
+        
+        stems = transcript_stems(video_paths)
+        
+        def output_path_for(video_path: str) -> str:
+            if output_dir is None:
+                return self.default_output_path(video_path, stems[video_path])
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+            return str(Path(output_dir) / f"{stems[video_path]}.transcript.json")
+        
+        def finish(index: int, result: Dict[str, Any], raw_transcript: Optional[Dict[str, Any]]) -> None:
+            video_path = video_paths[index]
+            output_file = output_path_for(video_path)
+            try:
+                self._save_result(output_file, result, raw_transcript, columnar)
+            except Exception as e:
+                result = self._error_result(e)
+            outcomes[index] = {"video_path": video_path, "output_file": output_file, "result": result}
+            with counts_lock:
+                counts["failed" if "error" in result else "completed"] += 1
+                finished = dict(counts)
+            self._report_progress("batch", video_path=video_path, total=total, **finished)
+            if finished["completed"] + finished["failed"] == total:
+                all_finished.set()
+        
+        def complete(index: int, metadata: Dict[str, Any], cache_key: Optional[str],
+                     get_transcript: Callable[[], Dict[str, Any]]) -> None:
+            """Cache the finished transcript and derive the words (runs in the I/O pool)."""
+            video_path = video_paths[index]
+            self._progress_context.video_path = video_path
+            try:
+                raw_transcript = get_transcript()
+                self._cache_transcript(cache_key, raw_transcript)
+                with self._stage("process"):
+                    result = self._build_result(os.path.basename(video_path), metadata["fps"],
+                                                metadata["duration_frames"], metadata["timecode_offset_frames"],
+                                                raw_transcript, silence_threshold_ms)
+            except Exception as e:
+                result, raw_transcript = self._error_result(e), None
+            finally:
+                self._progress_context.video_path = None
+            finish(index, result, raw_transcript)
+        
+        def transcribe(index: int, extraction: Dict[str, Any], cache_key: Optional[str],
+                       cached: Optional[Dict[str, Any]]) -> None:
+            """Upload extracted audio and submit it; complete() runs when the transcript is done."""
+            video_path = video_paths[index]
+            metadata = extraction["metadata"]
+            if cached is not None:
+                complete(index, metadata, None, lambda: cached)
+                return
+            audio_path = extraction.get("audio_path")
+            self._progress_context.video_path = video_path
+            try:
+                audio_url = self._upload_if_needed(audio_path, None)
+                # The transcription wait runs on the client's event loop, not on this thread
+                transcription = self.transcription_client.run_coroutine(self.transcribe_audio_async(
+                    audio_url, custom_spell, metadata.get("duration_seconds"), video_path
+                ))
+            except Exception as e:
+                finish(index, self._error_result(e), None)
+                return
+            finally:
+                self._progress_context.video_path = None
+                self._remove_audio(audio_path)
+            transcription.add_done_callback(
+                lambda future: io_pool.submit(complete, index, metadata, cache_key, future.result)
+            )
+        
+        # Worker processes are spawned, not forked, so they never inherit this process's threads
+        extract_pool = ProcessPoolExecutor(max_workers=max(1, min(max_extractions, total)),
+                                           mp_context=multiprocessing.get_context("spawn"))
+        io_pool = ThreadPoolExecutor(max_workers=max(1, max_transcriptions), thread_name_prefix="analysis-io")
+        try:
+            pending = {}
+            for index, video_path in enumerate(video_paths):
+                try:
+                    if not os.path.isfile(video_path):
+                        raise FileNotFoundError(f"Video file not found: {video_path}")
+                    cache_key, cached = self._lookup_cached_transcript(video_path, custom_spell)
+                    if cached is None:
+                        self.api_key  # Raises before extracting if there is no key to transcribe with
+                except Exception as e:
+                    finish(index, self._error_result(e), None)
+                    continue
+                self._report_progress("extract", video_path=video_path, status="queued")
+                future = extract_pool.submit(_probe_and_extract, video_path, self._api_key,
+                                             self.audio_engine, cached is None)
+                pending[future] = (index, cache_key, cached)
+            
+            for future in as_completed(pending):
+                index, cache_key, cached = pending[future]
+                try:
+                    extraction = future.result()
+                except Exception as e:
+                    finish(index, self._error_result(e), None)
+                    continue
+                self._report_progress("extract", video_path=video_paths[index], status="done")
+                if self.tracer is not None:
+                    for timing in extraction["stages"]:
+                        self.tracer.add(StageTiming(**timing))
+                io_pool.submit(transcribe, index, extraction, cache_key, cached)
+            
+            all_finished.wait()
+        finally:
+            extract_pool.shutdown(wait=True, cancel_futures=True)
+            io_pool.shutdown(wait=True)
+        
+        logger.info(f"Batch finished: {counts['completed']} completed, {counts['failed']} failed of {total}")
+        return outcomes
+
+    def _write_segment_index(self, transcript_path: str, result: Dict[str, Any]) -> None:
+        """Segmenter stage: write the utterance segment index the edit agents cut from."""
+        if "words" not in result:
+            return
+        index_path = segments_path(transcript_path)
+        try:
+            with self._trace("segment"):
+                index = build_segment_index(result, transcript_fingerprint(transcript_path))
+                write_segment_index(index_path, index)
+            logger.info(f"Segment index ({len(index['segments'])} segments) saved to: {index_path}")
+        except OSError as e:
+            logger.warning(f"Could not save segment index: {e}")
+
+    def _write_columnar(self, transcript_path: str, result: Dict[str, Any], enabled: bool) -> None:
+        """Write the columnar copy of a transcript, or remove one that would now be stale."""
+        cols_path = columnar_path(transcript_path)
+        try:
+            if enabled and "words" in result:
+                write_columnar_transcript(cols_path, result)
+                logger.info(f"Columnar transcript saved to: {cols_path}")
+            elif cols_path.exists():
+                cols_path.unlink()
+        except OSError as e:
+            logger.warning(f"Could not update columnar transcript: {e}")
+
+    def reprocess(self, transcript_path: str, silence_threshold_ms: int = 1000,
+                  brief_path: Optional[str] = None, output_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Re-derive the word list of an analyzed video from its stored raw transcript.
+        
+        Re-runs only process_transcript_to_words, so a new silence threshold or
+        speaker mapping takes milliseconds instead of a full re-transcription.
+        
+        Args:
+            transcript_path: Path to a .transcript.json written by analyze()
+            silence_threshold_ms: Minimum silence duration in milliseconds to mark as silence
+            brief_path: Project brief to (re)load the speaker mapping from
+            output_path: Where to save the result (default: overwrite transcript_path)
+            
+        Returns:
+            Dict containing the transcript data in the same format as analyze()
+            
+        Raises:
+            FileNotFoundError: If the transcript or its raw transcript sidecar is missing
+        """
+        raw_path = raw_transcript_path(transcript_path)
+        if not raw_path.exists():
+            raise FileNotFoundError(f"No raw transcript for {transcript_path} (expected {raw_path}); "
+                                    f"re-run analysis to create it")
+        
+        with open(transcript_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+        if "error" in previous:
+            raise RuntimeError(f"Cannot reprocess a failed analysis: {previous['error']}")
+        
+        if brief_path:
+            self.brief_parser.load_brief(brief_path)
+        
+        raw_transcript = read_raw_transcript(raw_path)
+        result = self._build_result(previous["file_name"], previous["fps"], previous["duration_frames"],
+                                    previous["timecode_offset_frames"], raw_transcript, silence_threshold_ms)
+        
+        output_path = output_path or transcript_path
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        self._write_segment_index(output_path, result)
+        # Keep an existing columnar copy in sync with the rewritten JSON
+        self._write_columnar(output_path, result, columnar_path(transcript_path).exists())
+        if Path(output_path).resolve() != Path(transcript_path).resolve():
+            write_raw_transcript(raw_transcript_path(output_path), raw_transcript)
+        
+        logger.info(f"Reprocessed transcript saved to: {output_path}")
         return result
   
   
+def transcript_stems(video_paths: List[str],
+                     stem_of: Callable[[str], str] = lambda path: Path(path).stem) -> Dict[str, str]:
+    """
+    Output file stem for each of a batch's videos: the video's own stem, or, when
+    another video in the batch has the same stem (e.g. two cameras' C0001.MP4),
+    the stem plus a short hash of the video's absolute path.
+    
+    Args:
+        video_paths: The batch's input paths
+        stem_of: Stem of an input path (transcript_base for .transcript.json inputs)
+    """
+    counts: Dict[str, int] = {}
+    for video_path in video_paths:
+        stem = stem_of(video_path).casefold()
+        counts[stem] = counts.get(stem, 0) + 1
+    stems = {}
+    for video_path in video_paths:
+        stem = stem_of(video_path)
+        if counts[stem.casefold()] > 1:
+            digest = hashlib.sha1(os.path.abspath(video_path).encode("utf-8")).hexdigest()[:8]
+            stem = f"{stem}-{digest}"
+        stems[video_path] = stem
+    return stems
+
+
+def _probe_and_extract(video_path: str, api_key: str, audio_engine: str, extract: bool) -> Dict[str, Any]:
+    """
+    analyze_many worker: probe a video and extract its audio in a pool process.
+    
+    Returns:
+        Dict with the probe metadata, the temporary audio_path (None if not extracted)
+        and the stage timings measured in the worker
+    """
+    tracer = StageTracer()
+    analyzer = VideoAnalyzer(assemblyai_api_key=api_key, audio_engine=audio_engine, transcript_cache=False,
+                             tracer=tracer)
+    analyzer._progress_context.video_path = video_path
+    with analyzer.open_media(video_path) as session:
+        with analyzer._trace("probe"):
+            metadata = analyzer.probe_video_file(session)
+        audio_path = None
+        if extract:
+            with analyzer._trace("extract") as timing:
+                timing.bytes_in = os.path.getsize(video_path)
+                audio_path = analyzer.extract_audio(session)
+                timing.bytes_out = os.path.getsize(audio_path)
+    return {"metadata": metadata, "audio_path": audio_path, "stages": tracer.timings()}
+
+
 def main():
     """Enhanced command-line entry point with brief support and silence detection."""
     import argparse
     
     parser = argparse.ArgumentParser(description="Enhanced video transcript analyzer with project brief integration and silence detection")
-    parser.add_argument("video_path", help="Path to the video file")
-    parser.add_argument("--output", "-o", help="Path to save the output JSON")
+    parser.add_argument("video_paths", nargs="+", metavar="video_path",
+                        help="Path to the video file (or a .transcript.json with --reprocess); several paths run as a batch")
+    parser.add_argument("--output", "-o", help="Path to save the output JSON (output directory for a batch or several --reprocess paths)")
     parser.add_argument("--api-key", help="AssemblyAI API key (defaults to ASSEMBLYAI_API_KEY env var)")
     parser.add_argument("--custom-spell", help="JSON file containing custom spellings", type=str)
     parser.add_argument("--brief", help="Path to project brief file for enhanced accuracy", type=str)
     parser.add_argument("--silence-threshold", help="Minimum silence duration in milliseconds to mark as silence (default: 1000)", type=int, default=1000)
+    parser.add_argument("--audio-engine", help="Audio extraction engine (default: pyav)", choices=AUDIO_ENGINES, default=ENGINE_PYAV)
+    parser.add_argument("--pipeline", help="Extraction/upload pipeline mode (default: sequential)", choices=PIPELINE_MODES, default=PIPELINE_SEQUENTIAL)
+    parser.add_argument("--no-cache", help="Always re-transcribe instead of reusing cached transcripts", action="store_true")
+    parser.add_argument("--columnar", help="Also write a memory-mappable .transcript.cols file", action="store_true")
+    parser.add_argument("--max-extractions", help=f"Batch: concurrent extraction processes (default: {DEFAULT_MAX_EXTRACTIONS})", type=int, default=DEFAULT_MAX_EXTRACTIONS)
+    parser.add_argument("--max-transcriptions", help=f"Batch: concurrent uploads (default: {DEFAULT_MAX_TRANSCRIPTIONS})", type=int, default=DEFAULT_MAX_TRANSCRIPTIONS)
+    parser.add_argument("--reprocess", help="Re-derive words from an existing .transcript.json and its raw transcript", action="store_true")
     
     args = parser.parse_args()
     
@@ -835,8 +1550,29 @@ def main():
             with open(args.custom_spell, 'r') as f:
                 custom_spell = json.load(f)
         
-        analyzer = VideoAnalyzer(assemblyai_api_key=args.api_key, brief_path=args.brief)
-        result = analyzer.analyze(args.video_path, args.output, custom_spell, args.brief, args.silence_threshold)
+        analyzer = VideoAnalyzer(assemblyai_api_key=args.api_key, brief_path=args.brief,
+                                 audio_engine=args.audio_engine, transcript_cache=not args.no_cache)
+        if args.reprocess:
+            # Several transcripts each keep their name in the --output directory
+            stems = transcript_stems(args.video_paths, stem_of=transcript_base)
+            for transcript_path in args.video_paths:
+                output_path = args.output
+                if args.output and len(args.video_paths) > 1:
+                    Path(args.output).mkdir(parents=True, exist_ok=True)
+                    output_path = str(Path(args.output) / f"{stems[transcript_path]}.transcript.json")
+                analyzer.reprocess(transcript_path, args.silence_threshold, args.brief, output_path)
+            return
+        
+        if len(args.video_paths) > 1:
+            outcomes = analyzer.analyze_many(args.video_paths, args.output, custom_spell, args.brief,
+                                             args.silence_threshold, args.max_extractions,
+                                             args.max_transcriptions, args.columnar)
+            if any("error" in outcome["result"] for outcome in outcomes):
+                exit(1)
+            return
+        
+        result = analyzer.analyze(args.video_paths[0], args.output, custom_spell, args.brief, args.silence_threshold,
+                                  args.pipeline, args.columnar)
         
         # Exit with error code if processing failed (only for command-line usage)
         if "error" in result:
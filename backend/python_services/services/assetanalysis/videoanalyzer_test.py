@@ -8,6 +8,9 @@ Simple test script to verify VideoAnalyzer functionality including:
 - Error handling
 - Output path generation
 - Import verification
+- Batch analysis across the extraction process pool and transcription threads,
+  against the local AssemblyAI stand-in (fakeassemblyai.py)
+- Stage timings recorded by the stage tracer and their metrics histograms
 """
 
 import os
@@ -108,13 +111,14 @@ def test_videoanalyzer_initialization():
                 print("⚠️  API key is placeholder value")
                 print("   Update backend/python_services/.env with your actual AssemblyAI API key")
             
-            # Test without API key (should fail gracefully)
+            # Without an API key the analyzer is created, and only transcribing needs the key
+            analyzer = VideoAnalyzer()
             try:
-                analyzer = VideoAnalyzer()
+                analyzer.api_key
                 print("❌ Should have failed without API key")
                 return False
             except ValueError as e:
-                print("✅ Correctly requires API key when not in environment")
+                print("✅ Correctly requires API key to transcribe when not in environment")
         
         # Test with dummy API key
         try:
@@ -163,8 +167,21 @@ def test_output_path_generation():
     try:
         from assetanalysis.videoanalyzer import VideoAnalyzer
         
+        from assetanalysis.videoanalyzer import transcript_stems
+        
         analyzer = VideoAnalyzer(assemblyai_api_key="dummy_key_for_testing")
         
+        # Same-named clips from two cameras must not overwrite each other's transcript
+        batch = [os.path.join("cam_a", "C0001.MP4"), os.path.join("cam_b", "C0001.MP4"),
+                 os.path.join("cam_b", "c0001.mov"), os.path.join("cam_a", "C0002.MP4")]
+        stems = transcript_stems(batch)
+        assert stems[batch[3]] == "C0002"
+        assert len(set(stems.values())) == 4 and all(stems[path].startswith("C0001-") for path in batch[:2])
+        assert stems == transcript_stems(batch), "Stems should not change between calls"
+        outputs = {analyzer.default_output_path(path, stems[path]) for path in batch}
+        assert len(outputs) == 4
+        print(f"✅ Colliding names get distinct outputs: {sorted(stems.values())}")
+        
         # Create a dummy video file for path testing
         with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as f:
             dummy_video_path = f.name
@@ -243,12 +260,417 @@ def test_error_handling():
         print(f"❌ Error handling test failed: {e}")
         return False
 
+def test_transcript_cache():
+    """Test transcript cache keys, hits and LRU eviction."""
+    print("\n🔍 Testing transcript cache...")
+    
+    try:
+        import time
+        from assetanalysis.transcriptcache import TranscriptCache, media_fingerprint
+        
+        with tempfile.TemporaryDirectory() as cache_dir:
+            media_path = os.path.join(cache_dir, "clip.mp4")
+            with open(media_path, "wb") as f:
+                f.write(os.urandom(3 * 1024 * 1024))
+            
+            cache = TranscriptCache(os.path.join(cache_dir, "cache"), max_bytes=2500)
+            key = cache.key_for(media_path, {"speech_model": "best"})
+            
+            if key != cache.key_for(media_path, {"speech_model": "best"}):
+                print("❌ Cache key is not stable")
+                return False
+            if key == cache.key_for(media_path, {"speech_model": "nano"}):
+                print("❌ Cache key ignores transcription config")
+                return False
+            print(f"✅ Stable cache key: {key}")
+            
+            if cache.get(key) is not None:
+                print("❌ Empty cache returned a transcript")
+                return False
+            
+            transcript = {"text": "hello", "words": [{"text": "hello", "start": 0, "end": 400}]}
+            cache.put(key, transcript)
+            if cache.get(key) != transcript:
+                print("❌ Cached transcript did not round-trip")
+                return False
+            print("✅ Cached transcript round-trips")
+            
+            # Fill past max_bytes with incompressible entries; the oldest ones are evicted
+            for i in range(5):
+                time.sleep(0.01)
+                cache.put(f"filler-{i}", {"text": os.urandom(600).hex(), "words": []})
+            stats = cache.stats()
+            if stats["total_bytes"] > cache.max_bytes or cache.get(key) is not None:
+                print(f"❌ LRU eviction did not bound the cache: {stats}")
+                return False
+            print(f"✅ LRU eviction kept cache at {stats['total_bytes']} bytes ({stats['evictions']} evicted)")
+            
+            # Fingerprint samples the file, so a change outside the sampled blocks is a known blind spot,
+            # but a size change always changes it
+            with open(media_path, "ab") as f:
+                f.write(b"x")
+            if media_fingerprint(media_path) == key.split("-")[0]:
+                print("❌ Fingerprint did not change with file size")
+                return False
+            print("✅ Fingerprint changes with file size")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Transcript cache test failed: {e}")
+        return False
+
+def test_reprocess():
+    """Test re-deriving words from the raw transcript sidecar."""
+    print("\n🔍 Testing reprocess from raw transcript...")
+    
+    try:
+        from assetanalysis.videoanalyzer import VideoAnalyzer
+        from assetanalysis.transcriptcache import raw_transcript_path, write_raw_transcript
+        
+        analyzer = VideoAnalyzer(assemblyai_api_key="dummy_key_for_testing")
+        raw = {
+            "id": "abc", "status": "completed", "text": "one two three",
+            "words": [
+                {"text": "one", "start": 0, "end": 400, "confidence": 0.9, "speaker": "A", "channel": None},
+                {"text": "two", "start": 1000, "end": 1400, "confidence": 0.95, "speaker": "A"},
+                {"text": "three", "start": 3000, "end": 3400, "confidence": 0.99, "speaker": "B"}
+            ],
+            "utterances": [{"text": "dropped from the compact form"}]
+        }
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            transcript_path = os.path.join(tmp_dir, "clip.transcript.json")
+            original = analyzer._build_result("clip.mp4", 25.0, 250, 90000, raw, 1000)
+            with open(transcript_path, "w") as f:
+                json.dump(original, f)
+            write_raw_transcript(raw_transcript_path(transcript_path), raw)
+            
+            if not raw_transcript_path(transcript_path).name == "clip.assemblyai.json.gz":
+                print(f"❌ Unexpected sidecar name: {raw_transcript_path(transcript_path)}")
+                return False
+            
+            same = analyzer.reprocess(transcript_path, silence_threshold_ms=1000)
+            if same != original:
+                print("❌ Reprocessing with the same threshold changed the result")
+                return False
+            print("✅ Same threshold reproduces the original words")
+            
+            tighter = analyzer.reprocess(transcript_path, silence_threshold_ms=500)
+            silences = [w for w in tighter["words"] if w["word"] == "**SILENCE**"]
+            if len(silences) != 2 or tighter["silence_threshold_ms"] != 500:
+                print(f"❌ Expected 2 silences at 500ms, got {len(silences)}")
+                return False
+            with open(transcript_path) as f:
+                if json.load(f) != tighter:
+                    print("❌ Reprocessed transcript was not saved")
+                    return False
+            print("✅ Lower threshold adds silence markers and overwrites the transcript")
+            
+            from assetanalysis.transcriptsegments import load_segment_index, segments_path
+            with open(segments_path(transcript_path)) as f:
+                index = json.load(f)
+            segments = [(s["id"], s["speaker"], s["frame_in"], s["frame_out"], s["text"]) for s in index["segments"]]
+            if segments != [(0, "A", 90000, 90010, "one"), (1, "A", 90025, 90035, "two"), (2, "B", 90075, 90085, "three")] \
+                    or len(index["silences"]) != 2 or load_segment_index(transcript_path) != index:
+                print(f"❌ Unexpected segment index: {segments}, {index['silences']}")
+                return False
+            print("✅ Segment index written next to the transcript, split at the silences")
+            
+            # Reprocessing never calls AssemblyAI, so it works without an API key
+            saved_key = os.environ.pop("ASSEMBLYAI_API_KEY", None)
+            try:
+                keyless = VideoAnalyzer().reprocess(transcript_path, silence_threshold_ms=1000)
+            finally:
+                if saved_key is not None:
+                    os.environ["ASSEMBLYAI_API_KEY"] = saved_key
+            if keyless != same:
+                print("❌ Reprocessing without an API key gave a different result")
+                return False
+            print("✅ Reprocess works without an AssemblyAI API key")
+            
+            # An index cut at the old threshold is not reused for the reprocessed transcript, however new its mtime
+            with open(segments_path(transcript_path)) as f:
+                current = json.load(f)
+            with open(segments_path(transcript_path), "w") as f:
+                json.dump(index, f)
+            rebuilt = load_segment_index(transcript_path, keyless)
+            if rebuilt != current or rebuilt["silence_threshold_ms"] != 1000 or rebuilt == index:
+                print("❌ Stale segment index from another threshold was reused")
+                return False
+            print("✅ Segment index is rebuilt when the transcript or threshold changed")
+            
+            os.unlink(raw_transcript_path(transcript_path))
+            try:
+                analyzer.reprocess(transcript_path)
+                print("❌ Reprocess without a raw transcript should fail")
+                return False
+            except FileNotFoundError:
+                print("✅ Missing raw transcript raises FileNotFoundError")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Reprocess test failed: {e}")
+        return False
+
+def test_vectorized_word_processing():
+    """Test that the vectorized word path matches the per-word loop exactly."""
+    print("\n🔍 Testing vectorized word processing...")
+    
+    try:
+        import random
+        from assetanalysis.videoanalyzer import VideoAnalyzer
+        from assetanalysis.transcriptwords import words_to_frames
+        
+        analyzer = VideoAnalyzer(assemblyai_api_key="dummy_key_for_testing")
+        mapping = {"A": "Host", "B": "Guest"}
+        
+        # Edge cases: half-frame rounding, blanks before a gap, bad timestamps, missing fields, floats
+        edge_words = [
+            {"text": "half", "start": 20, "end": 60, "confidence": 0.9, "speaker": "A"},
+            {"text": " ", "start": 100, "end": 120, "speaker": "B"},
+            {"text": "gap", "start": 1120, "end": 1120, "confidence": 1, "speaker": "speaker_b"},
+            {"text": "nospeaker", "start": 2500.5, "end": 2600.25},
+            {"text": "none", "start": 2700, "end": 2650, "confidence": None, "speaker": None},
+            {"start": 5000, "end": 5100},
+            {"text": "after", "start": 7000, "end": 7300, "confidence": 0.5, "speaker": "unknown"}
+        ]
+        rng = random.Random(7)
+        random_words, t = [], 0
+        for _ in range(5000):
+            t += rng.choice((0, 40, 90, 400, 1000, 2500))
+            end = t + rng.choice((0, 10, 250, 700))
+            random_words.append({"text": rng.choice(("so", "", "um")), "start": t, "end": end,
+                                 "confidence": rng.random(), "speaker": rng.choice("ABC")})
+            t = end
+        
+        for words in (edge_words, random_words, []):
+            for fps, offset, threshold in ((25.0, 0, 1000), (23.976, 86314, 500), (29.97, -40, 0)):
+                expected = analyzer._process_words_loop(words, fps, offset, threshold, mapping)
+                actual = words_to_frames(words, fps, offset, threshold,
+                                         lambda speaker: analyzer._normalize_speaker_label(speaker, mapping))
+                if json.dumps(actual) != json.dumps(expected):
+                    print(f"❌ Output differs for {len(words)} words at {fps}fps, offset {offset}, threshold {threshold}")
+                    return False
+        print("✅ Vectorized output is identical to the per-word loop")
+        
+        # Non-numeric timestamps still fail the same way via the loop fallback
+        try:
+            analyzer.process_transcript_to_words({"words": [{"text": "x", "start": None, "end": 10}]}, 25.0)
+            print("❌ Expected TypeError for a missing timestamp")
+            return False
+        except TypeError:
+            print("✅ Non-numeric timestamps fall back to the per-word loop")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Vectorized word processing test failed: {e}")
+        return False
+
+def test_columnar_transcript():
+    """Test the columnar transcript format round-trips and is preferred when fresh."""
+    print("\n🔍 Testing columnar transcript format...")
+    
+    try:
+        import time
+        from assetanalysis.transcriptcolumns import (ColumnarTranscript, columnar_path, load_transcript,
+                                                     write_columnar_transcript)
+        
+        transcript = {
+            "file_name": "clip.mp4", "fps": 23.976, "duration_frames": 2400, "timecode_offset_frames": 86314,
+            "speakers": ["Guest", "Host"], "full_transcript": "Héllo there. Wörld",
+            "words": [
+                {"word": "Héllo", "speaker": "Host", "frame_in": 86314, "frame_out": 86320, "confidence": 0.91},
+                {"word": "**SILENCE**", "speaker": "**SILENCE**", "frame_in": 86320, "frame_out": 86350,
+                 "confidence": 1.0, "duration_ms": 1250},
+                {"word": "there.", "speaker": "Guest", "frame_in": 86350, "frame_out": 86360, "confidence": None},
+                {"word": "Héllo", "speaker": "Host", "frame_in": 86360, "frame_out": 86361, "confidence": 0.5}
+            ],
+            "silence_threshold_ms": 1000
+        }
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_path = os.path.join(tmp_dir, "clip.transcript.json")
+            with open(json_path, "w") as f:
+                json.dump(transcript, f)
+            time.sleep(0.01)
+            write_columnar_transcript(columnar_path(json_path), transcript)
+            
+            with ColumnarTranscript(columnar_path(json_path)) as columnar:
+                if columnar.to_dict() != transcript or list(columnar) != list(transcript):
+                    print("❌ Columnar transcript did not round-trip")
+                    return False
+                words = columnar["words"]
+                if words[1] != transcript["words"][1] or words[-1] != transcript["words"][-1] or len(words) != 4:
+                    print("❌ Random access to columnar words is wrong")
+                    return False
+                if json.dumps(dict(columnar), default=list) != json.dumps(transcript):
+                    print("❌ Columnar transcript does not serialize like the JSON")
+                    return False
+                del words
+            print("✅ Columnar transcript round-trips with lazy word access")
+            
+            # Without a reference cycle, dropping the transcript frees it (and its map) at once, without gc
+            import gc
+            import weakref
+            gc.disable()
+            try:
+                columnar = ColumnarTranscript(columnar_path(json_path))
+                list(columnar["words"])
+                released = weakref.ref(columnar)
+                del columnar
+                if released() is not None:
+                    print("❌ Columnar transcript is only freed by the garbage collector")
+                    return False
+            finally:
+                gc.enable()
+            print("✅ Columnar transcript is freed as soon as it is dropped")
+            
+            if not isinstance(load_transcript(json_path), ColumnarTranscript):
+                print("❌ load_transcript ignored a fresh columnar file")
+                return False
+            time.sleep(0.01)
+            with open(json_path, "w") as f:
+                json.dump(transcript, f)
+            if load_transcript(json_path) != transcript or isinstance(load_transcript(json_path), ColumnarTranscript):
+                print("❌ load_transcript used a stale columnar file")
+                return False
+            print("✅ load_transcript prefers fresh columnar files and falls back to JSON")
+            
+            empty = dict(transcript, words=[], speakers=[], full_transcript="")
+            write_columnar_transcript(columnar_path(json_path), empty)
+            with ColumnarTranscript(columnar_path(json_path)) as columnar:
+                if columnar.to_dict() != empty:
+                    print("❌ Empty transcript did not round-trip")
+                    return False
+            print("✅ Empty transcript round-trips")
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Columnar transcript test failed: {e}")
+        return False
+
+def _make_video_clip(seconds: float, directory: str, name: str) -> str:
+    """Write a small 25 fps video with a stereo AAC track and a 01:00:00:00 start timecode."""
+    import av
+    import numpy as np
+
+    clip_path = os.path.join(directory, name)
+    with av.open(clip_path, "w") as container:
+        container.metadata["timecode"] = "01:00:00:00"
+        video = container.add_stream("mpeg4", rate=25)
+        video.width, video.height, video.pix_fmt = 64, 48, "yuv420p"
+        audio = container.add_stream("aac", rate=48000)
+        audio.codec_context.layout = "stereo"
+        for i in range(int(seconds * 25)):
+            frame = av.VideoFrame.from_ndarray(np.full((48, 64, 3), i % 255, np.uint8), format="rgb24")
+            for packet in video.encode(frame):
+                container.mux(packet)
+        for start in range(0, int(seconds * 48000), 1024):
+            tone = (np.sin(np.arange(start, start + 1024) * 0.05) * 0.3).astype(np.float32)
+            frame = av.AudioFrame.from_ndarray(np.stack([tone, tone]), format="fltp", layout="stereo")
+            frame.sample_rate, frame.pts = 48000, start
+            for packet in audio.encode(frame):
+                container.mux(packet)
+        for stream in (video, audio):
+            for packet in stream.encode(None):
+                container.mux(packet)
+    return clip_path
+
+def test_analyze_many():
+    """analyze_many extracts in worker processes and returns per-file results in input order."""
+    print("\n🔍 Testing batch analysis...")
+
+    from assetanalysis.videoanalyzer import VideoAnalyzer
+    from assetanalysis.fakeassemblyai import FakeAssemblyAI
+
+    events = []
+    analyzer = VideoAnalyzer(assemblyai_api_key="dummy_key_for_testing", transcript_cache=False,
+                             progress_callback=lambda stage, details: events.append((stage, details)))
+
+    with tempfile.TemporaryDirectory() as tmp_dir, FakeAssemblyAI() as server:
+        analyzer.BASE_URL = server.base_url
+        clips = [_make_video_clip(3, tmp_dir, f"cam{i}.mp4") for i in range(3)]
+        missing = os.path.join(tmp_dir, "missing.mp4")
+        outcomes = analyzer.analyze_many(clips + [missing], output_dir=os.path.join(tmp_dir, "out"),
+                                         max_extractions=2, max_transcriptions=2, columnar=True)
+
+        assert [o["video_path"] for o in outcomes] == clips + [missing], "Results are not in input order"
+        for outcome in outcomes[:3]:
+            result = outcome["result"]
+            assert "error" not in result, result
+            assert result["timecode_offset_frames"] == 90000 and result["fps"] == 25.0
+            assert [w["word"] for w in result["words"]] == ["Hello", "**SILENCE**", "again."]
+            with open(outcome["output_file"]) as f:
+                assert json.load(f) == result
+            assert os.path.exists(outcome["output_file"].replace(".transcript.json", ".transcript.cols"))
+        assert "not found" in outcomes[3]["result"]["error"]
+        assert len(server.received) == 3 and len(server.transcripts) == 3
+
+    batch_events = [details for stage, details in events if stage == "batch"]
+    assert batch_events[-1]["completed"] == 3 and batch_events[-1]["failed"] == 1
+    assert batch_events[-1]["total"] == 4
+    assert all("video_path" in details for stage, details in events), "Progress event without video_path"
+
+    print(f"✅ Analyzed {len(clips)} clips in a batch; missing file reported per file")
+    return True
+
+def test_stage_tracing():
+    """The stage tracer times every stage of an analysis; the timings feed the metrics histograms."""
+    print("\n🔍 Testing stage tracing...")
+
+    from assetanalysis.videoanalyzer import VideoAnalyzer
+    from assetanalysis.stagetrace import StageTracer
+    from assetanalysis.fakeassemblyai import FakeAssemblyAI
+    sys.path.insert(0, str(services_dir.parent))
+    from shared.metrics import StageMetrics
+
+    finished = []
+    tracer = StageTracer(on_stage=lambda timing: finished.append(timing.stage))
+    analyzer = VideoAnalyzer(assemblyai_api_key="dummy_key_for_testing", transcript_cache=False, tracer=tracer)
+
+    with tempfile.TemporaryDirectory() as tmp_dir, FakeAssemblyAI() as server:
+        analyzer.BASE_URL = server.base_url
+        analyzer.transcription_client._interval = lambda pending: 0.05  # Poll fast instead of pacing by audio duration
+        clip = _make_video_clip(3, tmp_dir, "traced.mp4")
+        result = analyzer.analyze(clip, os.path.join(tmp_dir, "traced.transcript.json"))
+        assert "error" not in result, result
+        clip_size = os.path.getsize(clip)
+
+    stages = {timing["stage"]: timing for timing in tracer.timings()}
+    assert finished == ["probe", "extract", "upload", "transcribe", "process", "segment"], finished
+    assert stages["extract"]["bytes_in"] == clip_size and stages["extract"]["bytes_out"] > 0
+    assert stages["upload"]["bytes_in"] == stages["upload"]["bytes_out"] == stages["extract"]["bytes_out"]
+    assert stages["transcribe"]["cpu_seconds"] is None, "Awaited stage should not report CPU time"
+    for name in ("probe", "extract", "upload", "process"):
+        assert stages[name]["cpu_seconds"] is not None and stages[name]["wall_seconds"] > 0, stages[name]
+    if sys.platform != "win32":
+        assert stages["process"]["peak_rss_bytes"] > 0
+
+    metrics = StageMetrics()
+    metrics.observe_job("completed", tracer.timings())
+    snapshot = metrics.snapshot()
+    assert snapshot["jobs"] == {"completed": 1}
+    assert snapshot["stages"]["upload"]["bytes_out"]["buckets"]["+Inf"] == 1
+    exposition = metrics.render_prometheus()
+    assert 'analysis_stage_wall_seconds_count{stage="transcribe"} 1' in exposition
+    assert 'analysis_stage_cpu_seconds_count{stage="transcribe"}' not in exposition
+
+    print(f"✅ Traced {len(stages)} stages: " + ", ".join(
+        f"{name} {timing['wall_seconds'] * 1000:.0f}ms" for name, timing in stages.items()))
+    return True
+
 def test_dependency_availability():
     """Test if required dependencies are available."""
     print("\n🔍 Testing dependency availability...")
     
     dependencies = {
-        'moviepy': 'MoviePy package for video processing (with bundled FFmpeg)',
+        'av': 'PyAV for probing and streaming audio extraction (with bundled FFmpeg)',
+        'numpy': 'NumPy for vectorized transcript processing',
+        'moviepy': 'MoviePy package for fallback audio extraction (with bundled FFmpeg)',
         'requests': 'HTTP requests for API communication',
         'dotenv': 'Environment variable management',
         'pathlib': 'Path handling (built-in)',
@@ -290,6 +712,12 @@ def main():
         ("File Validation", test_file_validation),
         ("Output Path Generation", test_output_path_generation),
         ("Error Handling", test_error_handling),
+        ("Transcript Cache", test_transcript_cache),
+        ("Reprocess", test_reprocess),
+        ("Vectorized Words", test_vectorized_word_processing),
+        ("Columnar Transcript", test_columnar_transcript),
+        ("Batch Analysis", test_analyze_many),
+        ("Stage Tracing", test_stage_tracing),
     ]
     
     results = []
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Per-job progress event fan-out.
+
+JobEventHub keeps one JobEventBroadcaster per job that has subscribers. A
+producer publishes each job store change once, from any thread; the
+broadcaster copies it into every subscriber's queue on the hub's event loop,
+so the cost of producing events does not grow with the number of
+subscribers, and jobs nobody watches cost a dict lookup per update.
+
+Subscriber queues are bounded: a subscriber that falls behind loses its
+oldest events, never blocks the producer. Events are the changed job
+fields, so consumers that need the full state merge them into a snapshot.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Events buffered per subscriber before the oldest are dropped
+SUBSCRIBER_QUEUE_SIZE = 256
+
+
+class JobEventBroadcaster:
+    """Fans one job's events out to its subscribers' queues (used on the hub's loop only)."""
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.subscribers: Set[asyncio.Queue] = set()
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        for queue in self.subscribers:
+            if queue.full():
+                queue.get_nowait()  # Slow subscriber: drop its oldest event
+            queue.put_nowait(event)
+
+
+class JobEventHub:
+    """Registry of job event broadcasters, created on first subscribe and dropped with the last subscriber."""
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self._loop = loop
+        self._broadcasters: Dict[str, JobEventBroadcaster] = {}
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Set the event loop subscribers run on (e.g. on app startup)."""
+        self._loop = loop
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        """Start receiving a job's events; must be called on the hub's loop."""
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        broadcaster = self._broadcasters.get(job_id)
+        if broadcaster is None:
+            broadcaster = self._broadcasters[job_id] = JobEventBroadcaster(job_id)
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        broadcaster.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue) -> None:
+        """Stop receiving a job's events; must be called on the hub's loop."""
+        broadcaster = self._broadcasters.get(job_id)
+        if broadcaster is None:
+            return
+        broadcaster.subscribers.discard(queue)
+        if not broadcaster.subscribers:
+            del self._broadcasters[job_id]
+
+    def subscriber_count(self, job_id: str) -> int:
+        broadcaster = self._broadcasters.get(job_id)
+        return len(broadcaster.subscribers) if broadcaster is not None else 0
+
+    def publish(self, job_id: str, fields: Dict[str, Any]) -> None:
+        """Publish changed job fields to the job's subscribers; safe to call from any thread."""
+        if job_id not in self._broadcasters or self._loop is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._publish, job_id, dict(fields))
+        except RuntimeError:
+            pass  # Loop closed during shutdown
+
+    def _publish(self, job_id: str, event: Dict[str, Any]) -> None:
+        broadcaster = self._broadcasters.get(job_id)
+        if broadcaster is not None:
+            broadcaster.publish(event)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Job Event Hub Test Script
+
+Checks that:
+- Events published from other threads reach every subscriber of the job, once each
+- Slow subscribers drop their oldest events instead of blocking the producer
+- Broadcasters are removed with their last subscriber
+"""
+
+import sys
+import asyncio
+import threading
+from pathlib import Path
+
+# Add the python_services directory to Python path for imports
+script_dir = Path(__file__).parent
+sys.path.insert(0, str(script_dir.parent))
+
+
+def test_fan_out():
+    """One published event per update is fanned out to all of the job's subscribers."""
+    print("🔍 Testing event fan-out...")
+
+    from shared.jobevents import JobEventHub
+
+    async def scenario():
+        hub = JobEventHub()
+        queues = [hub.subscribe("job-1") for _ in range(3)]
+        other = hub.subscribe("job-2")
+        assert hub.subscriber_count("job-1") == 3
+
+        # Producer thread, like the scheduler's listener
+        producer = threading.Thread(target=lambda: [hub.publish("job-1", {"percent": n}) for n in range(5)])
+        producer.start()
+        await asyncio.to_thread(producer.join)
+        await asyncio.sleep(0)
+
+        for queue in queues:
+            received = [queue.get_nowait()["percent"] for _ in range(queue.qsize())]
+            assert received == list(range(5)), f"Unexpected events: {received}"
+        assert other.empty(), "Event leaked to another job's subscriber"
+
+        for queue in queues:
+            hub.unsubscribe("job-1", queue)
+        assert hub.subscriber_count("job-1") == 0 and "job-1" not in hub._broadcasters
+        hub.publish("job-1", {"percent": 99})  # No subscribers: ignored
+        await asyncio.sleep(0)
+        assert other.empty()
+
+    asyncio.run(scenario())
+    print("✅ Every subscriber got each event once; broadcaster removed with its last subscriber")
+    return True
+
+
+def test_slow_subscriber():
+    """A subscriber that never reads keeps only the newest events."""
+    print("\n🔍 Testing slow subscriber...")
+
+    from shared.jobevents import JobEventHub, SUBSCRIBER_QUEUE_SIZE
+
+    async def scenario():
+        hub = JobEventHub()
+        slow = hub.subscribe("job-1")
+        for n in range(SUBSCRIBER_QUEUE_SIZE + 10):
+            hub.publish("job-1", {"percent": n})
+        await asyncio.sleep(0)
+        assert slow.qsize() == SUBSCRIBER_QUEUE_SIZE
+        assert slow.get_nowait()["percent"] == 10, "Oldest events should have been dropped"
+
+    asyncio.run(scenario())
+    print("✅ Slow subscriber dropped its oldest events without blocking")
+    return True
+
+
+def main():
+    """Run all tests and provide summary."""
+    print("🧪 Job Event Hub Test Suite")
+    print("=" * 50)
+
+    tests = [
+        ("Fan-Out", test_fan_out),
+        ("Slow Subscriber", test_slow_subscriber),
+    ]
+
+    results = []
+
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+        except Exception as e:
+            print(f"❌ {test_name} crashed: {e!r}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{'✅ PASS' if result else '❌ FAIL'} {test_name}")
+    print(f"\n📊 Results: {passed} passed, {len(results) - passed} failed")
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Job scheduler with a priority queue and a pool of worker processes.
+
+The API process only enqueues jobs and reads their status from the job store.
+A dispatcher thread hands queued jobs (highest priority first, then oldest) to
+worker processes with free capacity; each worker runs up to jobs_per_worker
+jobs concurrently as asyncio tasks on its own event loop, so blocking media
+work never touches the API server's loop. Workers publish progress as
+("update", job_id, fields) messages that a listener thread in the API process
+applies to the job store, which keeps the store single-writer. Every
+change the scheduler writes is also passed to an optional on_update
+callback, e.g. to push progress events to subscribers.
+
+Stages of a job that need their own concurrency limit (e.g. audio
+extraction and transcription) run inside stage_slot(stage). Slots are granted
+by the listener thread, so the limits hold across all workers: at most
+stage_limits[stage] jobs hold a stage's slot at once, and at most the job's
+own stage_limits[stage] among the jobs of its batch_id.
+
+Cancelling a queued job drops it from the queue; cancelling a running job
+cancels its task in the worker. A worker that dies fails its running jobs,
+gives up their slots and is replaced; the listener thread checks for dead
+workers every WORKER_CHECK_SECONDS, however busy the other workers keep it.
+On stop(), running jobs are left in "processing" so the next start can
+recover them.
+"""
+
+import time
+import heapq
+import queue
+import asyncio
+import logging
+import itertools
+import threading
+import contextvars
+import multiprocessing
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+try:
+    from .jobstore import JobStore, STATUS_CANCELLED, STATUS_FAILED, STATUS_PROCESSING, STATUS_QUEUED
+except ImportError:
+    from jobstore import JobStore, STATUS_CANCELLED, STATUS_FAILED, STATUS_PROCESSING, STATUS_QUEUED
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 2
+DEFAULT_JOBS_PER_WORKER = 4
+# Seconds between checks for dead worker processes
+WORKER_CHECK_SECONDS = 1
+
+# A job runner: async function receiving the job dict and an update(**fields) callable
+JobRunner = Callable[[Dict[str, Any], Callable[..., None]], Awaitable[None]]
+
+# In a worker process: its index and outbox, the pending slot requests, and the job each task runs
+_worker_outbox: Optional[Tuple[int, Any]] = None
+_slot_requests: Dict[Tuple[str, str], asyncio.Future] = {}
+_current_job: contextvars.ContextVar = contextvars.ContextVar("current_job", default=None)
+
+
+def cancelled_fields() -> Dict[str, Any]:
+    """Job store fields for a cancelled job."""
+    return {"status": STATUS_CANCELLED, "message": "Job cancelled", "progress": "Job cancelled",
+            "completed_at": datetime.now().isoformat()}
+
+
+def failed_fields(error: str) -> Dict[str, Any]:
+    """Job store fields for a job that failed outside of its runner's own error handling."""
+    return {"status": STATUS_FAILED, "message": f"Analysis failed with error: {error}", "error": error,
+            "progress": "Analysis failed", "completed_at": datetime.now().isoformat()}
+
+
+@asynccontextmanager
+async def stage_slot(stage: str) -> AsyncIterator[None]:
+    """
+    Hold one of the scheduler's slots for a stage of the job being run, e.g.
+    "extract" (see module docstring). Waits until the slot is granted; the slot
+    is given back when the block exits or the job is cancelled. Outside of a
+    scheduler worker, this does not wait.
+    """
+    job = _current_job.get()
+    if _worker_outbox is None or job is None:
+        yield
+        return
+    index, outbox = _worker_outbox
+    key = (job["job_id"], stage)
+    _slot_requests[key] = asyncio.get_running_loop().create_future()
+    outbox.put(("acquire", index, job["job_id"], stage, job.get("batch_id"),
+                (job.get("stage_limits") or {}).get(stage)))
+    try:
+        await _slot_requests[key]
+        yield
+    finally:
+        _slot_requests.pop(key, None)
+        outbox.put(("release", index, job["job_id"], stage))
+
+
+def _worker_main(index: int, inbox, outbox, run_job: JobRunner,
+                 on_broadcast: Optional[Callable[..., None]], jobs_per_worker: int) -> None:
+    """Worker process entry point."""
+    asyncio.run(_worker_loop(index, inbox, outbox, run_job, on_broadcast, jobs_per_worker))
+
+
+async def _worker_loop(index: int, inbox, outbox, run_job: JobRunner,
+                       on_broadcast: Optional[Callable[..., None]], jobs_per_worker: int) -> None:
+    global _worker_outbox
+    _worker_outbox = (index, outbox)
+    tasks: Dict[str, asyncio.Task] = {}
+    cancel_requested: Set[str] = set()  # Cancels that arrived before their "run" message
+    stopping = False
+
+    async def run(job: Dict[str, Any]) -> None:
+        job_id = job["job_id"]
+        _current_job.set(job)
+
+        def update(**fields: Any) -> None:
+            outbox.put(("update", job_id, fields))
+
+        try:
+            await run_job(job, update)
+        except asyncio.CancelledError:
+            if not stopping:
+                update(**cancelled_fields())
+        except Exception as e:
+            logger.exception(f"Job {job_id} crashed in worker {index}")
+            update(**failed_fields(str(e)))
+        finally:
+            tasks.pop(job_id, None)
+            outbox.put(("done", index, job_id))
+
+    while True:
+        message = await asyncio.to_thread(inbox.get)
+        kind = message[0]
+        if kind == "run":
+            job = message[1]
+            if job["job_id"] in cancel_requested:
+                cancel_requested.discard(job["job_id"])
+                outbox.put(("update", job["job_id"], cancelled_fields()))
+                outbox.put(("done", index, job["job_id"]))
+            else:
+                tasks[job["job_id"]] = asyncio.create_task(run(job))
+        elif kind == "cancel":
+            task = tasks.get(message[1])
+            if task is not None:
+                task.cancel()
+            else:
+                cancel_requested.add(message[1])
+        elif kind == "grant":
+            request = _slot_requests.get((message[1], message[2]))
+            if request is not None and not request.done():
+                request.set_result(None)
+        elif kind == "broadcast":
+            if on_broadcast is not None:
+                try:
+                    on_broadcast(*message[1])
+                except Exception as e:
+                    logger.warning(f"Broadcast handler failed in worker {index}: {e}")
+        elif kind == "stop":
+            stopping = True
+            for task in list(tasks.values()):
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            return
+
+
+@dataclass
+class _Worker:
+    index: int
+    process: Any
+    inbox: Any
+    running: Set[str] = field(default_factory=set)
+
+
+class JobScheduler:
+    """Priority queue of jobs dispatched to a pool of worker processes."""
+
+    def __init__(self, job_store: JobStore, run_job: JobRunner, workers: int = DEFAULT_WORKERS,
+                 jobs_per_worker: int = DEFAULT_JOBS_PER_WORKER,
+                 on_broadcast: Optional[Callable[..., None]] = None,
+                 on_update: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+                 stage_limits: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            job_store: Store the jobs live in (only this process writes to it)
+            run_job: Module-level async runner executed in the workers
+            workers: Number of worker processes
+            jobs_per_worker: Jobs each worker runs concurrently
+            on_broadcast: Module-level function each worker calls with the arguments of broadcast()
+            on_update: Called with (job_id, fields) after each job store update, from the
+                scheduler's threads or the caller of cancel()
+            stage_limits: Jobs that may hold each stage's slot at once (see stage_slot());
+                stages not listed are only limited per batch
+        """
+        self.job_store = job_store
+        self.run_job = run_job
+        self.workers = max(1, workers)
+        self.jobs_per_worker = max(1, jobs_per_worker)
+        self.on_broadcast = on_broadcast
+        self.on_update = on_update
+        self.stage_limits = dict(stage_limits or {})
+        self._context = multiprocessing.get_context("spawn")
+        self._outbox = None
+        self._workers: List[_Worker] = []
+        self._queue: List = []
+        self._queued: Set[str] = set()
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._stopping = False
+        # Slot requests not yet granted, oldest first: (worker index, job_id, stage, batch_id, batch limit)
+        self._slot_waiters: List[Tuple[int, str, str, Optional[str], Optional[int]]] = []
+        # Granted slots: (job_id, stage) -> (worker index, batch_id)
+        self._slot_holders: Dict[Tuple[str, str], Tuple[int, Optional[str]]] = {}
+
+    def start(self) -> None:
+        """Start the worker processes and the dispatcher and listener threads."""
+        self._outbox = self._context.Queue()
+        self._workers = [self._spawn(index) for index in range(self.workers)]
+        self._threads = [
+            threading.Thread(target=self._dispatch_loop, name="job-dispatcher", daemon=True),
+            threading.Thread(target=self._listen_loop, name="job-listener", daemon=True)
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"Job scheduler started: {self.workers} workers x {self.jobs_per_worker} jobs")
+
+    def _spawn(self, index: int) -> _Worker:
+        inbox = self._context.Queue()
+        # Spawned, not forked, so workers never inherit the API server's threads or event loop
+        process = self._context.Process(
+            target=_worker_main,
+            args=(index, inbox, self._outbox, self.run_job, self.on_broadcast, self.jobs_per_worker),
+            name=f"analysis-worker-{index}",
+            daemon=True
+        )
+        process.start()
+        return _Worker(index, process, inbox)
+
+    def submit(self, job_id: str, priority: int = 0) -> None:
+        """Queue a job that is already in the job store with status "queued"; higher priority runs first."""
+        with self._condition:
+            heapq.heappush(self._queue, (-priority, next(self._sequence), job_id))
+            self._queued.add(job_id)
+            self._condition.notify_all()
+
+    def cancel(self, job_id: str) -> Optional[str]:
+        """
+        Cancel a queued or running job.
+
+        Returns:
+            "cancelled" if it was dropped from the queue, "cancelling" if its worker
+            was asked to stop it, or None if the scheduler does not know the job
+        """
+        with self._condition:
+            if job_id in self._queued:
+                # Lazily removed from the heap when the dispatcher reaches it
+                self._queued.discard(job_id)
+                self._update(job_id, **cancelled_fields())
+                return "cancelled"
+            for worker in self._workers:
+                if job_id in worker.running:
+                    worker.inbox.put(("cancel", job_id))
+                    return "cancelling"
+        return None
+
+    def broadcast(self, *args: Any) -> None:
+        """Call on_broadcast(*args) in every worker (e.g. to forward a webhook)."""
+        for worker in self._workers:
+            worker.inbox.put(("broadcast", args))
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue length and per-worker load."""
+        with self._condition:
+            return {
+                "queued": len(self._queued),
+                "workers": [{
+                    "index": worker.index,
+                    "pid": worker.process.pid,
+                    "alive": worker.process.is_alive(),
+                    "running": sorted(worker.running)
+                } for worker in self._workers],
+                "jobs_per_worker": self.jobs_per_worker,
+                "stage_slots": {
+                    stage: {
+                        "limit": self.stage_limits.get(stage),
+                        "held": sum(1 for _, held in self._slot_holders if held == stage),
+                        "waiting": sum(1 for waiter in self._slot_waiters if waiter[2] == stage)
+                    } for stage in sorted(set(self.stage_limits) | {stage for _, stage in self._slot_holders})
+                }
+            }
+
+    def _free_worker(self) -> Optional[_Worker]:
+        candidates = [worker for worker in self._workers
+                      if len(worker.running) < self.jobs_per_worker and worker.process.is_alive()]
+        return min(candidates, key=lambda worker: len(worker.running)) if candidates else None
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._condition:
+                while not self._stopping and not (self._queued and self._free_worker()):
+                    self._condition.wait(timeout=1)
+                if self._stopping:
+                    return
+                _, _, job_id = heapq.heappop(self._queue)
+                if job_id not in self._queued:
+                    continue  # Cancelled while queued
+                self._queued.discard(job_id)
+                worker = self._free_worker()
+                worker.running.add(job_id)
+
+            job = self.job_store.get(job_id)
+            if job is None or job["status"] not in (STATUS_QUEUED, STATUS_PROCESSING):
+                self._release(worker, job_id)
+                continue
+            self._update(job_id, status=STATUS_PROCESSING, worker=worker.index,
+                         message=f"Assigned to analysis worker {worker.index}")
+            job["worker"] = worker.index
+            worker.inbox.put(("run", job))
+
+    def _update(self, job_id: str, **fields: Any) -> None:
+        """Write fields to the job store and pass them on to on_update."""
+        self.job_store.update(job_id, **fields)
+        if self.on_update is not None:
+            try:
+                self.on_update(job_id, fields)
+            except Exception as e:
+                logger.warning(f"Update callback failed for job {job_id}: {e}")
+
+    def _release(self, worker: _Worker, job_id: str) -> None:
+        with self._condition:
+            worker.running.discard(job_id)
+            self._condition.notify_all()
+
+    def _listen_loop(self) -> None:
+        checked = time.monotonic()
+        while not self._stopping:
+            # On a timer, not only when the outbox is quiet: busy workers can keep it from ever being empty
+            if time.monotonic() - checked >= WORKER_CHECK_SECONDS:
+                self._replace_dead_workers()
+                checked = time.monotonic()
+            try:
+                message = self._outbox.get(timeout=WORKER_CHECK_SECONDS)
+            except queue.Empty:
+                continue
+            kind = message[0]
+            if kind == "update":
+                _, job_id, fields = message
+                try:
+                    self._update(job_id, **fields)
+                except KeyError:
+                    pass  # Deleted meanwhile
+                except Exception as e:
+                    logger.warning(f"Could not record progress of job {job_id}: {e}")
+            elif kind == "done":
+                _, index, job_id = message
+                self._release(self._workers[index], job_id)
+            elif kind == "acquire":
+                with self._condition:
+                    self._slot_waiters.append(message[1:])
+                    self._grant_slots()
+            elif kind == "release":
+                _, _, job_id, stage = message
+                with self._condition:
+                    self._slot_holders.pop((job_id, stage), None)
+                    self._slot_waiters = [waiter for waiter in self._slot_waiters
+                                          if (waiter[1], waiter[2]) != (job_id, stage)]
+                    self._grant_slots()
+
+    def _grant_slots(self) -> None:
+        """Grant waiting slot requests, oldest first, as far as the stage and batch limits allow."""
+        waiting = []
+        for index, job_id, stage, batch_id, batch_limit in self._slot_waiters:
+            holders = [held_batch for (_, held_stage), (_, held_batch) in self._slot_holders.items()
+                       if held_stage == stage]
+            limit = self.stage_limits.get(stage)
+            if (limit is not None and len(holders) >= limit) or (
+                    batch_id is not None and batch_limit is not None and holders.count(batch_id) >= batch_limit):
+                waiting.append((index, job_id, stage, batch_id, batch_limit))
+                continue
+            self._slot_holders[(job_id, stage)] = (index, batch_id)
+            self._workers[index].inbox.put(("grant", job_id, stage))
+        self._slot_waiters = waiting
+
+    def _replace_dead_workers(self) -> None:
+        with self._condition:
+            if self._stopping:
+                return
+            for position, worker in enumerate(self._workers):
+                if worker.process.is_alive():
+                    continue
+                logger.error(f"Analysis worker {worker.index} exited with code {worker.process.exitcode}, "
+                             f"replacing it")
+                for job_id in worker.running:
+                    try:
+                        self._update(job_id, **failed_fields(
+                            f"Analysis worker exited unexpectedly (exit code {worker.process.exitcode})"))
+                    except KeyError:
+                        pass
+                # Its jobs are gone, and so are the slots they held or waited for
+                self._slot_holders = {key: holder for key, holder in self._slot_holders.items()
+                                      if holder[0] != worker.index}
+                self._slot_waiters = [waiter for waiter in self._slot_waiters if waiter[0] != worker.index]
+                self._workers[position] = self._spawn(worker.index)
+            self._grant_slots()
+            self._condition.notify_all()
+
+    def stop(self, timeout: float = 10) -> None:
+        """Stop the workers; running jobs stay "processing" so they can be recovered on the next start."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        for worker in self._workers:
+            worker.inbox.put(("stop",))
+        for worker in self._workers:
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join()
+        for thread in self._threads:
+            thread.join(timeout)
+        logger.info("Job scheduler stopped")
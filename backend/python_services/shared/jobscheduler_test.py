@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Job Scheduler Test Script
+
+Runs real worker processes against an in-memory job store and checks:
+- Higher priority queued jobs are dispatched first, with progress reaching the store
+- Cancelling a queued job and a running job
+- A crashed worker fails its job and is replaced
+- Stage slots limit a stage across workers and within a batch
+"""
+
+import os
+import sys
+import time
+import asyncio
+from datetime import datetime
+from pathlib import Path
+
+# Add the python_services directory to Python path for imports
+script_dir = Path(__file__).parent
+sys.path.insert(0, str(script_dir.parent))
+
+
+async def _test_runner(job, update):
+    """Job runner executed in the workers; behaviour is driven by the job's fields."""
+    from shared.jobscheduler import stage_slot
+
+    update(progress="started", started_at=time.time())
+    if job.get("crash"):
+        # Let the queue's feeder thread finish sending "started" first
+        await asyncio.sleep(job.get("seconds", 0.2))
+        os._exit(3)
+    if job.get("chatty"):
+        # Keeps the scheduler's outbox busy with progress messages
+        for step in range(int(job.get("seconds", 0.1) / 0.05)):
+            update(progress=f"step {step}")
+            await asyncio.sleep(0.05)
+    if job.get("stage"):
+        async with stage_slot(job["stage"]):
+            update(slot_started=time.time())
+            await asyncio.sleep(job.get("seconds", 0.1))
+            update(slot_finished=time.time())
+    else:
+        await asyncio.sleep(job.get("seconds", 0.1))
+    update(status="completed", progress="done", completed_at=datetime.now().isoformat())
+
+
+def _scheduler(**kwargs):
+    from shared.jobstore import MemoryJobStore
+    from shared.jobscheduler import JobScheduler
+    store = MemoryJobStore()
+    scheduler = JobScheduler(store, _test_runner, **kwargs)
+    scheduler.start()
+    return store, scheduler
+
+
+def _submit(store, scheduler, job_id, priority=0, **fields):
+    store.create({"job_id": job_id, "status": "queued", "created_at": datetime.now().isoformat(),
+                  "completed_at": None, "result": None, **fields})
+    scheduler.submit(job_id, priority)
+
+
+def _wait_for(predicate, timeout=20):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_priority_and_progress():
+    """With one slot, queued jobs run highest priority first; updates land in the store."""
+    print("🔍 Testing priority dispatch...")
+
+    store, scheduler = _scheduler(workers=1, jobs_per_worker=1)
+    try:
+        _submit(store, scheduler, "first", seconds=0.5)
+        assert _wait_for(lambda: store.get("first")["status"] == "processing"), "first job never dispatched"
+        _submit(store, scheduler, "low", priority=0)
+        _submit(store, scheduler, "high", priority=5)
+
+        assert _wait_for(lambda: all(store.get(j)["status"] == "completed" for j in ("first", "low", "high")))
+        started = {job_id: store.get(job_id)["started_at"] for job_id in ("first", "low", "high")}
+        assert started["first"] < started["high"] < started["low"], f"Unexpected order: {started}"
+        assert store.get("high")["progress"] == "done" and store.get("high")["worker"] == 0
+        assert scheduler.stats()["queued"] == 0
+    finally:
+        scheduler.stop()
+
+    print("✅ Higher priority job overtook the earlier queued one")
+    return True
+
+
+def test_cancellation():
+    """Queued jobs are dropped, running jobs are cancelled in the worker, and capacity is freed."""
+    print("\n🔍 Testing cancellation...")
+
+    store, scheduler = _scheduler(workers=1, jobs_per_worker=1)
+    try:
+        _submit(store, scheduler, "running", seconds=30)
+        assert _wait_for(lambda: store.get("running").get("progress") == "started"), "job never started"
+        _submit(store, scheduler, "waiting")
+
+        assert scheduler.cancel("waiting") == "cancelled"
+        assert store.get("waiting")["status"] == "cancelled"
+        assert scheduler.cancel("running") == "cancelling"
+        assert _wait_for(lambda: store.get("running")["status"] == "cancelled", timeout=5)
+        assert scheduler.cancel("running") is None
+
+        _submit(store, scheduler, "after")
+        assert _wait_for(lambda: store.get("after")["status"] == "completed"), "slot not freed"
+        assert store.get("waiting").get("started_at") is None, "cancelled queued job ran"
+    finally:
+        scheduler.stop()
+
+    print("✅ Queued and running jobs cancelled; the worker kept serving")
+    return True
+
+
+def test_worker_crash():
+    """A worker process that dies fails its job and is respawned."""
+    print("\n🔍 Testing worker crash recovery...")
+
+    store, scheduler = _scheduler(workers=1, jobs_per_worker=2)
+    try:
+        pid = scheduler.stats()["workers"][0]["pid"]
+        _submit(store, scheduler, "crash", crash=True)
+        assert _wait_for(lambda: store.get("crash")["status"] == "failed"), "crashed job not failed"
+        assert "exited unexpectedly" in store.get("crash")["error"]
+
+        _submit(store, scheduler, "next")
+        assert _wait_for(lambda: store.get("next")["status"] == "completed"), "replacement worker idle"
+        worker = scheduler.stats()["workers"][0]
+        assert worker["pid"] != pid and worker["alive"]
+    finally:
+        scheduler.stop()
+
+    print("✅ Crashed worker's job failed and a new worker took over")
+    return True
+
+
+def test_crash_while_busy():
+    """A dead worker is noticed while another worker keeps sending progress."""
+    print("\n🔍 Testing worker crash during a stream of progress messages...")
+
+    store, scheduler = _scheduler(workers=2, jobs_per_worker=1)
+    try:
+        _submit(store, scheduler, "chatty", chatty=True, seconds=8)
+        assert _wait_for(lambda: store.get("chatty").get("worker") is not None), "chatty job never started"
+        _submit(store, scheduler, "crash", crash=True, seconds=0.5)
+        started = time.monotonic()
+        assert _wait_for(lambda: store.get("crash")["status"] == "failed", timeout=5), "crash not noticed"
+        noticed = time.monotonic() - started
+        assert store.get("chatty")["status"] == "processing", "The busy worker should keep running"
+    finally:
+        scheduler.stop()
+
+    print(f"✅ Crash noticed after {noticed:.1f}s while the other worker kept reporting")
+    return True
+
+
+def _overlap(store, first, second):
+    first, second = store.get(first), store.get(second)
+    return first["slot_started"] < second["slot_finished"] and second["slot_started"] < first["slot_finished"]
+
+
+def test_stage_slots():
+    """A stage limit holds across workers; a batch's own limit holds among its jobs only."""
+    print("\n🔍 Testing stage slots...")
+
+    store, scheduler = _scheduler(workers=2, jobs_per_worker=3, stage_limits={"extract": 1})
+    try:
+        for job_id in ("extract-1", "extract-2", "extract-3"):
+            _submit(store, scheduler, job_id, stage="extract", seconds=0.3)
+        batch = {"batch_id": "batch", "stage_limits": {"transcribe": 1}}
+        _submit(store, scheduler, "batch-1", stage="transcribe", seconds=0.6, **batch)
+        _submit(store, scheduler, "batch-2", stage="transcribe", seconds=0.6, **batch)
+        _submit(store, scheduler, "single", stage="transcribe", seconds=0.6)
+
+        jobs = ("extract-1", "extract-2", "extract-3", "batch-1", "batch-2", "single")
+        assert _wait_for(lambda: all(store.get(j)["status"] == "completed" for j in jobs))
+        for first, second in (("extract-1", "extract-2"), ("extract-1", "extract-3"), ("extract-2", "extract-3")):
+            assert not _overlap(store, first, second), f"{first} and {second} extracted at once"
+        assert not _overlap(store, "batch-1", "batch-2"), "Batch jobs transcribed at once"
+        assert _overlap(store, "batch-1", "single") or _overlap(store, "batch-2", "single")
+        slots = scheduler.stats()["stage_slots"]
+        assert slots["extract"] == {"limit": 1, "held": 0, "waiting": 0}, slots
+    finally:
+        scheduler.stop()
+
+    print("✅ One extraction at a time over 2 workers; batch transcriptions one at a time")
+    return True
+
+
+def main():
+    """Run all tests and provide summary."""
+    print("🧪 Job Scheduler Test Suite")
+    print("=" * 50)
+
+    tests = [
+        ("Priority And Progress", test_priority_and_progress),
+        ("Cancellation", test_cancellation),
+        ("Worker Crash", test_worker_crash),
+        ("Crash While Busy", test_crash_while_busy),
+        ("Stage Slots", test_stage_slots),
+    ]
+
+    results = []
+
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+        except Exception as e:
+            print(f"❌ {test_name} crashed: {e!r}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{'✅ PASS' if result else '❌ FAIL'} {test_name}")
+    print(f"\n📊 Results: {passed} passed, {len(results) - passed} failed")
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
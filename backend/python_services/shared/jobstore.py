@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Analysis job stores.
+
+Jobs are plain dicts (job_id, status, created_at, result, ...). JobStore is the
+interface the API server uses; MemoryJobStore keeps jobs in a dict for tests
+and throwaway servers, and SQLiteJobStore persists them in an embedded SQLite
+database in WAL mode, so jobs survive restarts and `uvicorn --reload`.
+
+The SQLite store keeps the fields that are filtered or sorted on (status,
+created_at, completed_at, batch_id, transcript_id) in indexed columns, the
+rest of the job as JSON, and the (potentially large) result in its own column
+so listing jobs never loads results.
+"""
+
+import os
+import json
+import sqlite3
+import logging
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Job statuses
+STATUS_QUEUED = "queued"
+STATUS_PROCESSING = "processing"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+UNFINISHED_STATUSES = (STATUS_QUEUED, STATUS_PROCESSING)
+
+# Finished jobs are deleted this long after completion
+DEFAULT_TTL_SECONDS = int(os.environ.get("ANALYSIS_JOB_TTL_HOURS", str(7 * 24))) * 3600
+
+DEFAULT_PAGE_SIZE = 50
+
+
+class JobStore:
+    """Interface of analysis job stores. All methods are thread-safe."""
+
+    def create(self, job: Dict[str, Any]) -> None:
+        """Add a new job (must have job_id, status and created_at)."""
+        raise NotImplementedError
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the full job, or None if it does not exist."""
+        raise NotImplementedError
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        """
+        Set fields of a job.
+
+        Raises:
+            KeyError: If the job does not exist
+        """
+        raise NotImplementedError
+
+    def delete(self, job_id: str) -> bool:
+        """Delete a job; returns False if it did not exist."""
+        raise NotImplementedError
+
+    def list(self, status: Optional[str] = None, batch_id: Optional[str] = None,
+             limit: Optional[int] = DEFAULT_PAGE_SIZE, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        List jobs, newest first, without their results.
+
+        Returns:
+            Tuple of (jobs on this page, total number of matching jobs)
+        """
+        raise NotImplementedError
+
+    def unfinished(self) -> List[Dict[str, Any]]:
+        """Full records of queued and processing jobs, oldest first (for recovery on startup)."""
+        raise NotImplementedError
+
+    def purge_expired(self, ttl_seconds: int = DEFAULT_TTL_SECONDS) -> int:
+        """Delete finished jobs completed more than ttl_seconds ago; returns the number deleted."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release the store's resources."""
+
+
+def _cutoff(ttl_seconds: int) -> str:
+    return (datetime.now() - timedelta(seconds=ttl_seconds)).isoformat()
+
+
+class MemoryJobStore(JobStore):
+    """Job store backed by a dict; jobs are lost when the process exits."""
+
+    def __init__(self):
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def create(self, job: Dict[str, Any]) -> None:
+        with self._lock:
+            self._jobs[job["job_id"]] = dict(job)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        with self._lock:
+            self._jobs[job_id].update(fields)
+
+    def delete(self, job_id: str) -> bool:
+        with self._lock:
+            return self._jobs.pop(job_id, None) is not None
+
+    def list(self, status: Optional[str] = None, batch_id: Optional[str] = None,
+             limit: Optional[int] = DEFAULT_PAGE_SIZE, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        with self._lock:
+            jobs = [job for job in self._jobs.values()
+                    if (status is None or job["status"] == status)
+                    and (batch_id is None or job.get("batch_id") == batch_id)]
+        jobs.sort(key=lambda job: job["created_at"], reverse=True)
+        page = jobs[offset:] if limit is None else jobs[offset:offset + limit]
+        return [{k: v for k, v in job.items() if k != "result"} for job in page], len(jobs)
+
+    def unfinished(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            jobs = [dict(job) for job in self._jobs.values() if job["status"] in UNFINISHED_STATUSES]
+        return sorted(jobs, key=lambda job: job["created_at"])
+
+    def purge_expired(self, ttl_seconds: int = DEFAULT_TTL_SECONDS) -> int:
+        cutoff = _cutoff(ttl_seconds)
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job["status"] not in UNFINISHED_STATUSES and (job.get("completed_at") or "") < cutoff]
+            for job_id in expired:
+                del self._jobs[job_id]
+        return len(expired)
+
+
+# Job fields stored in their own (indexed) columns rather than the JSON data column
+INDEXED_FIELDS = ("status", "created_at", "completed_at", "batch_id", "transcript_id")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    completed_at TEXT,
+    batch_id TEXT,
+    transcript_id TEXT,
+    data TEXT NOT NULL,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS jobs_created ON jobs (created_at);
+CREATE INDEX IF NOT EXISTS jobs_batch ON jobs (batch_id) WHERE batch_id IS NOT NULL;
+"""
+
+
+class SQLiteJobStore(JobStore):
+    """Job store in an SQLite database (WAL mode), safe across restarts and crashes."""
+
+    def __init__(self, db_path: Union[str, Path]):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by the event loop and worker threads, serialized by the lock
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # With WAL, NORMAL only risks the last transactions on power loss, never corruption
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA busy_timeout=5000")
+            self._conn.executescript(SCHEMA)
+
+    @staticmethod
+    def _split(job: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any], Any]:
+        columns = {field: job.get(field) for field in INDEXED_FIELDS}
+        data = {k: v for k, v in job.items() if k not in INDEXED_FIELDS and k not in ("job_id", "result")}
+        return columns, data, job.get("result")
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row, with_result: bool = True) -> Dict[str, Any]:
+        job = {"job_id": row["job_id"]}
+        job.update(json.loads(row["data"]))
+        job.update({field: row[field] for field in INDEXED_FIELDS})
+        if with_result:
+            job["result"] = json.loads(row["result"]) if row["result"] is not None else None
+        return job
+
+    def create(self, job: Dict[str, Any]) -> None:
+        columns, data, result = self._split(job)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, status, created_at, completed_at, batch_id, transcript_id, data, result) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job["job_id"], columns["status"], columns["created_at"], columns["completed_at"],
+                 columns["batch_id"], columns["transcript_id"], json.dumps(data),
+                 json.dumps(result) if result is not None else None)
+            )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row is not None else None
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        assignments = {field: fields[field] for field in INDEXED_FIELDS if field in fields}
+        if "result" in fields:
+            result = fields["result"]
+            assignments["result"] = json.dumps(result) if result is not None else None
+        data_fields = {k: v for k, v in fields.items() if k not in INDEXED_FIELDS and k not in ("job_id", "result")}
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+                if row is None:
+                    raise KeyError(job_id)
+                if data_fields:
+                    data = json.loads(row["data"])
+                    data.update(data_fields)
+                    assignments["data"] = json.dumps(data)
+                if assignments:
+                    self._conn.execute(
+                        f"UPDATE jobs SET {', '.join(f'{column} = ?' for column in assignments)} WHERE job_id = ?",
+                        (*assignments.values(), job_id)
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def delete(self, job_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,)).rowcount > 0
+
+    def list(self, status: Optional[str] = None, batch_id: Optional[str] = None,
+             limit: Optional[int] = DEFAULT_PAGE_SIZE, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        conditions, params = [], []
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        if batch_id is not None:
+            conditions.append("batch_id = ?")
+            params.append(batch_id)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        columns = ", ".join(("job_id", "data") + INDEXED_FIELDS)
+
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM jobs {where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT {columns} FROM jobs {where} ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                (*params, -1 if limit is None else limit, offset)
+            ).fetchall()
+        return [self._row_to_job(row, with_result=False) for row in rows], total
+
+    def unfinished(self) -> List[Dict[str, Any]]:
+        placeholders = ", ".join("?" * len(UNFINISHED_STATUSES))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM jobs WHERE status IN ({placeholders}) ORDER BY created_at", UNFINISHED_STATUSES
+            ).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def purge_expired(self, ttl_seconds: int = DEFAULT_TTL_SECONDS) -> int:
+        placeholders = ", ".join("?" * len(UNFINISHED_STATUSES))
+        with self._lock:
+            deleted = self._conn.execute(
+                f"DELETE FROM jobs WHERE status NOT IN ({placeholders}) AND IFNULL(completed_at, '') < ?",
+                (*UNFINISHED_STATUSES, _cutoff(ttl_seconds))
+            ).rowcount
+        if deleted:
+            logger.info(f"Purged {deleted} expired analysis jobs")
+        return deleted
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def create_job_store(backend: str = "sqlite", db_path: Optional[Union[str, Path]] = None) -> JobStore:
+    """
+    Create a job store.
+
+    Args:
+        backend: "sqlite" (persistent) or "memory"
+        db_path: SQLite database file (required for the sqlite backend)
+    """
+    if backend == "memory":
+        return MemoryJobStore()
+    if backend == "sqlite":
+        if db_path is None:
+            raise ValueError("The sqlite job store needs a db_path")
+        return SQLiteJobStore(db_path)
+    raise ValueError(f"Unknown job store backend '{backend}'. Choose from: sqlite, memory")
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Job Store Test Script
+
+Checks both job store backends for:
+- Create/get/update/delete round trips, with results kept out of listings
+- Status filtering and newest-first pagination
+- TTL retention of finished jobs only
+- SQLite persistence across reopening (what a server restart sees)
+"""
+
+import sys
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the python_services directory to Python path for imports
+script_dir = Path(__file__).parent
+sys.path.insert(0, str(script_dir.parent))
+
+
+def _job(index: int, status: str = "queued", age_minutes: int = 0, **fields):
+    created_at = (datetime.now() - timedelta(minutes=age_minutes)).isoformat()
+    return {"job_id": f"job-{index}", "status": status, "created_at": created_at, "completed_at": None,
+            "video_path": f"/media/clip{index}.mp4", "result": None, "progress": "Job queued", **fields}
+
+
+def _stores(tmp_dir: str):
+    from shared.jobstore import create_job_store
+    return [create_job_store("memory"), create_job_store("sqlite", Path(tmp_dir) / "jobs.db")]
+
+
+def test_crud_and_listing():
+    """Both backends store, update, page through and delete jobs the same way."""
+    print("🔍 Testing job store CRUD and pagination...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for store in _stores(tmp_dir):
+            name = type(store).__name__
+            for i in range(7):
+                store.create(_job(i, status="completed" if i % 2 else "queued", age_minutes=10 - i,
+                                  batch_id="b1" if i < 3 else None))
+
+            store.update("job-2", status="completed", result={"words": [1, 2, 3]}, output_file="/out.json",
+                         transcript_id="t-2")
+            job = store.get("job-2")
+            assert job["status"] == "completed" and job["result"] == {"words": [1, 2, 3]}, name
+            assert job["output_file"] == "/out.json" and job["transcript_id"] == "t-2", name
+            assert job["video_path"] == "/media/clip2.mp4", name
+            assert store.get("missing") is None, name
+
+            page, total = store.list(limit=3, offset=0)
+            assert total == 7 and [j["job_id"] for j in page] == ["job-6", "job-5", "job-4"], name
+            assert all("result" not in j for j in page), f"{name}: listing loaded results"
+            page, total = store.list(status="completed", limit=10, offset=1)
+            assert total == 4 and [j["job_id"] for j in page] == ["job-3", "job-2", "job-1"], name
+            assert store.list(batch_id="b1", limit=None)[1] == 3, name
+
+            assert [j["job_id"] for j in store.unfinished()] == ["job-0", "job-4", "job-6"], name
+
+            try:
+                store.update("missing", status="failed")
+                raise AssertionError(f"{name}: expected KeyError")
+            except KeyError:
+                pass
+            assert store.delete("job-0") and not store.delete("job-0"), name
+            store.close()
+
+    print("✅ Memory and SQLite stores agree on CRUD, filters and pages")
+    return True
+
+
+def test_ttl_and_persistence():
+    """Expired finished jobs are purged, unfinished ones kept; SQLite jobs survive reopening."""
+    print("\n🔍 Testing retention and persistence...")
+
+    from shared.jobstore import SQLiteJobStore
+
+    old = (datetime.now() - timedelta(days=10)).isoformat()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "jobs.db"
+        store = SQLiteJobStore(db_path)
+        store.create(_job(1, status="completed", completed_at=old))
+        store.create(_job(2, status="failed", completed_at=datetime.now().isoformat()))
+        store.create(_job(3, status="processing", transcript_id="t-3"))
+
+        # Concurrent updates from worker threads
+        threads = [threading.Thread(target=lambda n=n: store.update("job-3", progress=f"step {n}"))
+                   for n in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert store.purge_expired(ttl_seconds=7 * 24 * 3600) == 1
+        assert store.get("job-1") is None and store.get("job-2") is not None
+        store.close()
+
+        reopened = SQLiteJobStore(db_path)
+        mode = reopened._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal", f"Expected WAL journal mode, got {mode}"
+        unfinished = reopened.unfinished()
+        assert [j["job_id"] for j in unfinished] == ["job-3"] and unfinished[0]["transcript_id"] == "t-3"
+        assert unfinished[0]["progress"].startswith("step ")
+        reopened.close()
+
+    print("✅ Expired job purged; unfinished job and transcript ID survived reopening")
+    return True
+
+
+def main():
+    """Run all tests and provide summary."""
+    print("🧪 Job Store Test Suite")
+    print("=" * 50)
+
+    tests = [
+        ("CRUD And Listing", test_crud_and_listing),
+        ("Retention And Persistence", test_ttl_and_persistence),
+    ]
+
+    results = []
+
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+        except Exception as e:
+            print(f"❌ {test_name} crashed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{'✅ PASS' if result else '❌ FAIL'} {test_name}")
+    print(f"\n📊 Results: {passed} passed, {len(results) - passed} failed")
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
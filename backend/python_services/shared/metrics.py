@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Aggregate histograms for GET /metrics.
+
+StageMetrics keeps one cumulative histogram per (stage, measure) for the
+measures recorded by the stage tracer (wall and CPU seconds, bytes in and
+out, peak memory); HistogramMetric is a single histogram, e.g. of chatbot
+time to first token. Both render in the Prometheus text exposition format,
+or as dicts for JSON.
+"""
+
+import math
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+SECONDS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+BYTES_BUCKETS = tuple(64 * 1024 * 4 ** n for n in range(10))         # 64KB .. 16GB
+MEMORY_BUCKETS = tuple(64 * 1024 * 1024 * 2 ** n for n in range(9))  # 64MB .. 16GB
+
+# Measure name -> (histogram buckets, Prometheus metric name, help text)
+STAGE_MEASURES: Dict[str, Tuple[Sequence[float], str, str]] = {
+    "wall_seconds": (SECONDS_BUCKETS, "analysis_stage_wall_seconds", "Wall time of analysis stages"),
+    "cpu_seconds": (SECONDS_BUCKETS, "analysis_stage_cpu_seconds", "CPU time of analysis stages"),
+    "bytes_in": (BYTES_BUCKETS, "analysis_stage_bytes_in", "Bytes read by analysis stages"),
+    "bytes_out": (BYTES_BUCKETS, "analysis_stage_bytes_out", "Bytes produced or sent by analysis stages"),
+    "peak_rss_bytes": (MEMORY_BUCKETS, "analysis_stage_peak_rss_bytes",
+                       "Worker peak resident memory at the end of analysis stages"),
+}
+
+
+class Histogram:
+    """Cumulative histogram with fixed upper bounds (plus +Inf). Not thread-safe on its own."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """(upper bound, observations <= bound) pairs, ending with (inf, count)."""
+        total, pairs = 0, []
+        for bound, count in zip(self.buckets + (math.inf,), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == math.inf else repr(float(bound)) if bound != int(bound) else str(int(bound))
+
+
+def _histogram_snapshot(histogram: Histogram) -> Dict[str, Any]:
+    return {
+        "count": histogram.count,
+        "sum": histogram.sum,
+        "buckets": {_format_bound(bound): count for bound, count in histogram.cumulative()}
+    }
+
+
+def _histogram_lines(name: str, histogram: Histogram, labels: str = "") -> List[str]:
+    """Prometheus sample lines of a histogram; labels is e.g. 'stage="probe"'."""
+    separator = "," if labels else ""
+    lines = [f'{name}_bucket{{{labels}{separator}le="{_format_bound(bound)}"}} {count}'
+             for bound, count in histogram.cumulative()]
+    suffix = f"{{{labels}}}" if labels else ""
+    lines.append(f"{name}_sum{suffix} {histogram.sum}")
+    lines.append(f"{name}_count{suffix} {histogram.count}")
+    return lines
+
+
+def render_counters(name: str, help_text: str, label: str, counts: Dict[str, int]) -> str:
+    """A labelled counter family in the Prometheus text exposition format."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+    lines += [f'{name}{{{label}="{value}"}} {count}' for value, count in sorted(counts.items())]
+    return "\n".join(lines) + "\n"
+
+
+class HistogramMetric:
+    """A single named histogram; thread-safe."""
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float] = SECONDS_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self._histogram = Histogram(buckets)
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._histogram.observe(value)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return _histogram_snapshot(self._histogram)
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+            lines += _histogram_lines(self.name, self._histogram)
+        return "\n".join(lines) + "\n"
+
+
+class StageMetrics:
+    """Histograms of stage timings across all jobs; thread-safe."""
+
+    def __init__(self):
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._jobs: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def observe_job(self, status: str, stages: Optional[Iterable[Dict[str, Any]]]) -> None:
+        """Record a finished job's status and the timings of its stages."""
+        with self._lock:
+            self._jobs[status] = self._jobs.get(status, 0) + 1
+            for timing in stages or ():
+                for measure, (buckets, _, _) in STAGE_MEASURES.items():
+                    value = timing.get(measure)
+                    if value is None:
+                        continue
+                    key = (timing["stage"], measure)
+                    if key not in self._histograms:
+                        self._histograms[key] = Histogram(buckets)
+                    self._histograms[key].observe(value)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Job counts plus, per stage and measure, count, sum and cumulative bucket counts."""
+        with self._lock:
+            stages: Dict[str, Dict[str, Any]] = {}
+            for (stage, measure), histogram in sorted(self._histograms.items()):
+                stages.setdefault(stage, {})[measure] = _histogram_snapshot(histogram)
+            return {"jobs": dict(self._jobs), "stages": stages}
+
+    def render_prometheus(self) -> str:
+        """The histograms in the Prometheus text exposition format."""
+        lines = ["# HELP analysis_jobs_finished_total Analysis jobs finished, by status",
+                 "# TYPE analysis_jobs_finished_total counter"]
+        with self._lock:
+            for status, count in sorted(self._jobs.items()):
+                lines.append(f'analysis_jobs_finished_total{{status="{status}"}} {count}')
+            for measure, (_, name, help_text) in STAGE_MEASURES.items():
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for (stage, key_measure), histogram in sorted(self._histograms.items()):
+                    if key_measure == measure:
+                        lines += _histogram_lines(name, histogram, f'stage="{stage}"')
+        return "\n".join(lines) + "\n"
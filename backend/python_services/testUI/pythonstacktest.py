@@ -7,7 +7,7 @@ Features:
 - Drag and drop video file selection
 - Click to browse file selection
 - Submit analysis jobs to FastAPI server
-- Real-time status monitoring
+- Real-time status monitoring (server-sent progress events, polling as fallback)
 - Job results display
 """
 
@@ -355,6 +355,40 @@ class VideoAnalysisTestUI:
     
     def monitor_job_status(self):
         """Background thread function to monitor job status"""
+        try:
+            self.follow_job_events()
+            return
+        except Exception as e:
+            if self.stop_status_updates or not self.current_job_id:
+                return
+            self.root.after(0, self.update_status_display, f"Event stream unavailable ({e}), polling status")
+        self.poll_job_status()
+    
+    def follow_job_events(self):
+        """Follow the job's server-sent progress events until it finishes"""
+        job_id = self.current_job_id
+        with requests.get(
+            f"{self.api_base_url}/analysis/status/{job_id}/events",
+            stream=True,
+            timeout=(10, 60)  # Read timeout well above the server's keep-alive interval
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines(decode_unicode=True):
+                if self.stop_status_updates:
+                    return
+                if not line or not line.startswith("data: "):
+                    continue  # Keep-alive comments and event separators
+                event = json.loads(line[len("data: "):])
+                self.root.after(0, self.update_job_progress_display, event)
+                if event["type"] == "done":
+                    # The event stream carries progress only; the result comes from the status endpoint
+                    status_data = requests.get(f"{self.api_base_url}/analysis/status/{job_id}", timeout=10).json()
+                    self.root.after(0, self.on_job_complete, status_data)
+                    return
+        raise RuntimeError("event stream closed before the job finished")
+    
+    def poll_job_status(self):
+        """Poll the job status every few seconds until it finishes"""
         while not self.stop_status_updates and self.current_job_id:
             try:
                 response = requests.get(
@@ -369,7 +403,7 @@ class VideoAnalysisTestUI:
                     self.root.after(0, self.update_job_status_display, status_data)
                     
                     # Check if job is complete
-                    if status_data["status"] in ["completed", "failed"]:
+                    if status_data["status"] in ["completed", "failed", "cancelled"]:
                         self.root.after(0, self.on_job_complete, status_data)
                         break
                 
@@ -408,6 +442,17 @@ class VideoAnalysisTestUI:
         
         self.update_status_display(display_text)
     
+    def update_job_progress_display(self, event: Dict[str, Any]):
+        """Update the status display with a progress event"""
+        display_text = f"Status: {event['status'].upper()}"
+        if event.get("percent") is not None:
+            display_text += f" ({event['percent']:.0f}%)"
+        if event.get("progress"):
+            display_text += f" - {event['progress']}"
+        if event.get("error"):
+            display_text += f"\nError: {event['error']}"
+        self.update_status_display(display_text)
+    
     def on_job_complete(self, status_data: Dict[str, Any]):
         """Handle job completion"""
         self.stop_status_updates = True
@@ -422,6 +467,9 @@ class VideoAnalysisTestUI:
             error_msg = status_data.get('error', 'Unknown error')
             self.update_status_display(f"❌ Analysis failed: {error_msg}")
         
+        elif status_data["status"] == "cancelled":
+            self.update_status_display("⏹️ Analysis cancelled")
+        
         # Re-enable submit button
         self.submit_btn.configure(state="normal")
         self.current_job_id = None